@@ -0,0 +1,80 @@
+"""add append-only agent_states delta log
+
+Revision ID: add_agent_state_deltas_001
+Revises: add_users_uuid_001
+Create Date: 2026-03-01
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "add_agent_state_deltas_001"
+down_revision: Union[str, Sequence[str], None] = "add_users_uuid_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create workflow_run_agent_state_deltas (base snapshot stays in workflow_runs.agent_states)."""
+    from sqlalchemy import inspect
+
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    is_pg = bind.dialect.name == "postgresql"
+    json_type = sa.JSON()
+    json_default = sa.text("'{}'::jsonb") if is_pg else "{}"
+    if is_pg:
+        from sqlalchemy.dialects.postgresql import JSONB
+
+        json_type = JSONB()
+
+    def _has_index(table: str, name: str) -> bool:
+        try:
+            return any(idx.get("name") == name for idx in inspector.get_indexes(table))
+        except Exception:
+            return False
+
+    if "workflow_run_agent_state_deltas" not in tables:
+        op.create_table(
+            "workflow_run_agent_state_deltas",
+            sa.Column(
+                "id",
+                sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+                primary_key=True,
+                autoincrement=True,
+            ),
+            sa.Column(
+                "run_id",
+                sa.String(),
+                sa.ForeignKey("workflow_runs.id", ondelete="cascade"),
+                nullable=False,
+            ),
+            sa.Column("kind", sa.String(length=32), nullable=False),
+            sa.Column("payload", json_type, nullable=False, server_default=json_default),
+            sa.Column("size_bytes", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+        tables.add("workflow_run_agent_state_deltas")
+
+    if "workflow_run_agent_state_deltas" in tables and not _has_index(
+        "workflow_run_agent_state_deltas",
+        "ix_workflow_run_agent_state_deltas_run_id",
+    ):
+        op.create_index(
+            "ix_workflow_run_agent_state_deltas_run_id",
+            "workflow_run_agent_state_deltas",
+            ["run_id", "id"],
+        )
+
+
+def downgrade() -> None:
+    from sqlalchemy import inspect
+
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "workflow_run_agent_state_deltas" in set(inspector.get_table_names()):
+        op.drop_table("workflow_run_agent_state_deltas")
@@ -0,0 +1,78 @@
+"""add composed_plan_cache
+
+Revision ID: add_composed_plan_cache_001
+Revises: add_agent_state_deltas_001
+Create Date: 2026-03-20
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "add_composed_plan_cache_001"
+down_revision: Union[str, Sequence[str], None] = "add_agent_state_deltas_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create composed_plan_cache (compose_task plans reused across recurring runs)."""
+    from sqlalchemy import inspect
+
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    is_pg = bind.dialect.name == "postgresql"
+    json_type = sa.JSON()
+    json_default = sa.text("'{}'::jsonb") if is_pg else "{}"
+    if is_pg:
+        from sqlalchemy.dialects.postgresql import JSONB
+
+        json_type = JSONB()
+
+    def _has_index(table: str, name: str) -> bool:
+        try:
+            return any(idx.get("name") == name for idx in inspector.get_indexes(table))
+        except Exception:
+            return False
+
+    if "composed_plan_cache" not in tables:
+        op.create_table(
+            "composed_plan_cache",
+            sa.Column("cache_key", sa.String(length=64), primary_key=True),
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("workflow_id", sa.String(), nullable=True),
+            sa.Column("schema_version", sa.Integer(), nullable=False),
+            sa.Column("capability_fingerprint", sa.String(length=64), nullable=False),
+            sa.Column("plan", json_type, nullable=False, server_default=json_default),
+            sa.Column("hits", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("last_hit_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        tables.add("composed_plan_cache")
+
+    if "composed_plan_cache" in tables:
+        if not _has_index("composed_plan_cache", "ix_composed_plan_cache_user_id"):
+            op.create_index(
+                "ix_composed_plan_cache_user_id",
+                "composed_plan_cache",
+                ["user_id", "workflow_id"],
+            )
+        if not _has_index("composed_plan_cache", "ix_composed_plan_cache_expires_at"):
+            op.create_index(
+                "ix_composed_plan_cache_expires_at",
+                "composed_plan_cache",
+                ["expires_at"],
+            )
+
+
+def downgrade() -> None:
+    from sqlalchemy import inspect
+
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "composed_plan_cache" in set(inspector.get_table_names()):
+        op.drop_table("composed_plan_cache")
@@ -8,6 +8,7 @@ import numpy as np
 from PIL import Image
 
 from computer_use_agent.core.engine import LMMEngineOpenAI
+from computer_use_agent.utils.image_handle import ImageHandle, materialize_messages
 
 
 class LMMAgent:
@@ -48,22 +49,6 @@ class LMMAgent:
             return base64.b64encode(image_content).decode("utf-8")
         raise TypeError(f"Unsupported image content type: {type(image_content)}")
 
-    @staticmethod
-    def _guess_image_mime(image_bytes: bytes) -> str:
-        if image_bytes.startswith(b"\x89PNG\r\n\x1a\n"):
-            return "image/png"
-        if image_bytes[:3] == b"\xff\xd8\xff":
-            return "image/jpeg"
-        if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
-            return "image/webp"
-        return "image/png"
-
-    @classmethod
-    def _image_bytes_to_data_url(cls, image_bytes: bytes) -> str:
-        mime = cls._guess_image_mime(image_bytes)
-        encoded = base64.b64encode(image_bytes).decode("utf-8")
-        return f"data:{mime};base64,{encoded}"
-
     def reset(self) -> None:
         self.messages = [
             {
@@ -116,14 +101,20 @@ class LMMAgent:
         if image_content is not None:
             images = image_content if isinstance(image_content, list) else [image_content]
             for image in images:
-                if isinstance(image, bytes):
-                    url = self._image_bytes_to_data_url(image)
+                # Messages hold handles; data URLs are built once, when a request is sent.
+                if isinstance(image, ImageHandle):
+                    url = image
+                elif isinstance(image, (bytes, bytearray)):
+                    url = ImageHandle.from_bytes(image)
                 elif isinstance(image, str):
                     with open(image, "rb") as image_file:
-                        url = self._image_bytes_to_data_url(image_file.read())
+                        url = ImageHandle.from_bytes(image_file.read())
+                elif isinstance(image, np.ndarray):
+                    buffer = BytesIO()
+                    Image.fromarray(image).save(buffer, format="PNG")
+                    url = ImageHandle.from_bytes(buffer.getvalue(), "image/png")
                 else:
-                    encoded = self.encode_image(image)
-                    url = f"data:image/png;base64,{encoded}"
+                    raise TypeError(f"Unsupported image content type: {type(image)}")
                 message["content"].append(
                     {
                         "type": "image_url",
@@ -150,9 +141,9 @@ class LMMAgent:
         **kwargs: Any,
     ) -> str:
         if messages is None:
-            messages = list(self.messages)
+            messages = materialize_messages(self.messages)
         else:
-            messages = list(messages)
+            messages = materialize_messages(list(messages))
 
         if user_message:
             messages.append(
@@ -0,0 +1,173 @@
+"""
+Bounded cache of grounding results for the current screen.
+
+Retries, reflection steps and multi-part actions (both ends of a drag, click
+then type) often ask the grounding model to locate the same element on a
+screen that has not changed. `GroundingCoordCache` maps (screen, normalized
+referring expression, grounding model id) to coordinates so those repeats are
+answered locally.
+
+By default screens must be byte-identical (`Screenshot.digest`): a whole
+frame perceptual hash barely moves when a button shifts by a few dozen
+pixels or the page scrolls one line, so a tolerant match could return a
+point on the wrong element. A Hamming tolerance on `Screenshot.dhash`
+(so a blinking cursor or clock tick still hits) is opt-in via
+`max_distance`; with it, a hit also requires the tile around the cached
+point to be unchanged. When a lookup or store sees a different screen,
+every cached entry is dropped: coordinates are only trusted for the screen
+they were grounded on.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from computer_use_agent.utils.image_processor import ImageProcessor
+from computer_use_agent.utils.screenshot import Screenshot
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " \t\n\"'`.,;:!?"
+# Tolerant matches re-check this many screenshot pixels around the cached point.
+TILE_RADIUS = 32
+# Mean absolute grayscale difference allowed within that tile.
+TILE_TOLERANCE = 2.0
+
+
+def normalize_ref_expr(ref_expr: str) -> str:
+    """Case-fold and collapse whitespace so trivially different phrasings share a key."""
+    text = _WHITESPACE_RE.sub(" ", (ref_expr or "").casefold())
+    return text.strip(_EDGE_PUNCTUATION)
+
+
+@dataclass
+class _Entry:
+    screen: Union[str, int]
+    coords: List[int]
+    tile: Optional[np.ndarray] = None
+
+
+def _tile(shot: Screenshot, coords: List[int], coord_size: Optional[Tuple[int, int]]) -> np.ndarray:
+    """Grayscale patch of `shot` around `coords` (given in `coord_size` space, default the shot's)."""
+    gray = shot.array(gray=True)
+    height, width = gray.shape[:2]
+    space_w, space_h = coord_size or (width, height)
+    x = int(round(coords[0] * width / max(space_w, 1)))
+    y = int(round(coords[1] * height / max(space_h, 1)))
+    return gray[
+        max(0, y - TILE_RADIUS) : min(height, y + TILE_RADIUS),
+        max(0, x - TILE_RADIUS) : min(width, x + TILE_RADIUS),
+    ].copy()
+
+
+def _tile_matches(cached: Optional[np.ndarray], current: np.ndarray) -> bool:
+    if cached is None or cached.shape != current.shape or not cached.size:
+        return False
+    diff = np.abs(cached.astype(np.int16) - current.astype(np.int16))
+    return float(diff.mean()) <= TILE_TOLERANCE
+
+
+class GroundingCoordCache:
+    def __init__(self, max_entries: int = 256, max_distance: int = 0, hash_size: int = 16) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.max_distance = max(0, int(max_distance))
+        self.hash_size = hash_size
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._screen: Optional[Union[str, int]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _screen_key(self, shot: Screenshot) -> Union[str, int]:
+        return shot.dhash(self.hash_size) if self.max_distance else shot.digest
+
+    def _same_screen(self, a: Union[str, int], b: Union[str, int]) -> bool:
+        if not self.max_distance:
+            return a == b
+        return ImageProcessor.hamming_distance(a, b) <= self.max_distance
+
+    def _observe_screen(self, screen: Union[str, int]) -> None:
+        """Drop everything if the screen changed (beyond the tolerance). Caller holds the lock."""
+        current = self._screen
+        if current is not None and self._same_screen(current, screen):
+            return
+        if self._entries:
+            self._entries.clear()
+            self.invalidations += 1
+        self._screen = screen
+
+    def get(
+        self,
+        shot: Screenshot,
+        ref_expr: str,
+        model_id: str,
+        coord_size: Optional[Tuple[int, int]] = None,
+    ) -> Optional[List[int]]:
+        """Cached coordinates, or None. `coord_size` is the (w, h) space coordinates are in."""
+        if not self.enabled:
+            return None
+        screen = self._screen_key(shot)
+        key = (model_id, normalize_ref_expr(ref_expr))
+        with self._lock:
+            self._observe_screen(screen)
+            entry = self._entries.get(key)
+            if entry is not None and self.max_distance and entry.screen != screen:
+                # Tolerant match: only trust the point if its neighbourhood did not change.
+                if not _tile_matches(entry.tile, _tile(shot, entry.coords, coord_size)):
+                    del self._entries[key]
+                    entry = None
+            if entry is None or not self._same_screen(entry.screen, screen):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry.coords)
+
+    def put(
+        self,
+        shot: Screenshot,
+        ref_expr: str,
+        model_id: str,
+        coords: List[int],
+        coord_size: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        screen = self._screen_key(shot)
+        key = (model_id, normalize_ref_expr(ref_expr))
+        tile = _tile(shot, coords, coord_size) if self.max_distance else None
+        with self._lock:
+            self._observe_screen(screen)
+            self._entries[key] = _Entry(screen=screen, coords=list(coords), tile=tile)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._screen = None
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+            }
+
+
+__all__ = ["GroundingCoordCache", "normalize_ref_expr"]
@@ -1,20 +1,17 @@
 import base64
 import re
-import time
 from collections import defaultdict
-from io import BytesIO
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-import httpx
-import pytesseract
-from PIL import Image
-from pytesseract import Output
-
 from computer_use_agent.coder.code_agent import CodeAgent
 from computer_use_agent.core.mllm import LMMAgent
 from computer_use_agent.memory.procedural_memory import PROCEDURAL_MEMORY
-from computer_use_agent.utils.common_utils import call_llm_safe, compress_image
+from computer_use_agent.grounding.coord_cache import GroundingCoordCache
+from computer_use_agent.grounding.grounding_client import get_grounding_client
+from computer_use_agent.grounding.ocr_cache import OcrCache, Region, build_ocr_table
+from computer_use_agent.utils.common_utils import call_llm_safe
+from computer_use_agent.utils.screenshot import Screenshot
 from shared.latency_logger import LATENCY_LOGGER
 from shared.streaming import emit_event
 from shared.text_utils import safe_ascii
@@ -71,8 +68,7 @@ def _decode_screenshot_data(screenshot_data: object) -> bytes:
 
 
 def _get_image_size(image_bytes: bytes) -> Tuple[int, int]:
-    with Image.open(BytesIO(image_bytes)) as img:
-        return img.size
+    return Screenshot.from_data(image_bytes).size
 
 
 def _is_probable_norm_1000(x: float, y: float, img_w: int, img_h: int) -> bool:
@@ -307,6 +303,9 @@ class OSWorldACI(ACI):
         grounding_timeout: float = 10.0,
         grounding_max_retries: int = 3,
         grounding_api_key: Optional[str] = None,
+        grounding_deadline: Optional[float] = None,
+        grounding_cache_size: int = 256,
+        grounding_cache_max_distance: int = 0,
         grounding_inference_fn: Optional[
             Callable[[bytes, str], Tuple[float, float]]
         ] = None,
@@ -365,7 +364,15 @@ class OSWorldACI(ACI):
         self.grounding_timeout = grounding_timeout
         self.grounding_max_retries = grounding_max_retries
         self.grounding_api_key = grounding_api_key
+        # Overall budget for one grounding call across retries (default: timeout * retries).
+        self.grounding_deadline = grounding_deadline
         self.grounding_inference_fn = grounding_inference_fn
+        # Coordinates for repeated referring expressions on an unchanged screen.
+        self.coord_cache = GroundingCoordCache(
+            max_entries=grounding_cache_size, max_distance=grounding_cache_max_distance
+        )
+        # Word boxes per screenshot; unchanged tiles are not re-read between frames.
+        self.ocr_cache = OcrCache()
         self._logged_grounding_absence = False
         if self.grounding_base_url:
             logger.info("Grounding service configured: %s", self.grounding_base_url)
@@ -399,11 +406,12 @@ class OSWorldACI(ACI):
         )
 
         try:
-            image_bytes = _decode_screenshot_data(screenshot_data)
+            shot = Screenshot.from_data(screenshot_data)
         except Exception as exc:
             raise ValueError(
                 "Failed to decode screenshot for grounding inference"
             ) from exc
+        image_bytes = shot.raw
 
         source = "fallback"
         coords: Optional[List[int]] = None
@@ -415,8 +423,17 @@ class OSWorldACI(ACI):
             int(self.engine_params_for_grounding.get("grounding_height") or self.height),
             1,
         )
+        model_id = self._grounding_model_id(grounding_width, grounding_height)
+        try:
+            coords = self.coord_cache.get(
+                shot, ref_expr, model_id, coord_size=(grounding_width, grounding_height)
+            )
+        except Exception as exc:
+            logger.debug("Grounding cache lookup failed: %s", exc)
 
-        if self.grounding_inference_fn is not None:
+        if coords is not None:
+            source = "cache"
+        elif self.grounding_inference_fn is not None:
             x_norm, y_norm = self.grounding_inference_fn(image_bytes, ref_expr)
             x = min(max(0, round(x_norm * grounding_width)), grounding_width - 1)
             y = min(max(0, round(y_norm * grounding_height)), grounding_height - 1)
@@ -424,7 +441,7 @@ class OSWorldACI(ACI):
             source = "custom_inference"
         else:
             if self.grounding_base_url:
-                coords = self._grounding_service_coords(image_bytes, ref_expr)
+                coords = self._grounding_service_coords(shot, ref_expr)
                 if coords:
                     source = "service"
                 else:
@@ -461,7 +478,7 @@ class OSWorldACI(ACI):
                 if not point:
                     raise RuntimeError(f"Failed to parse grounding coordinates from: {response}")
                 try:
-                    img_w, img_h = _get_image_size(image_bytes)
+                    img_w, img_h = shot.size
                 except Exception as exc:
                     logger.warning("Failed to read screenshot size for fallback grounding: %s", exc)
                     img_w, img_h = grounding_width, grounding_height
@@ -478,6 +495,11 @@ class OSWorldACI(ACI):
 
         if coords is None:
             raise RuntimeError("Failed to generate grounding coordinates")
+        if source != "cache":
+            self.coord_cache.put(
+                shot, ref_expr, model_id, coords, coord_size=(grounding_width, grounding_height)
+            )
+        cache_stats = self.coord_cache.stats()
 
         # Log completion to hierarchical logger
         if grounding_logger:
@@ -485,6 +507,7 @@ class OSWorldACI(ACI):
                 "ref_expr": ref_expr,
                 "coords": coords,
                 "source": source,
+                "cache": cache_stats,
             })
 
         emit_event(
@@ -493,12 +516,23 @@ class OSWorldACI(ACI):
                 "ref_expr": ref_expr,
                 "coords": coords,
                 "source": source,
+                "cache_hit_rate": cache_stats["hit_rate"],
             },
         )
         return coords
 
+    def _grounding_model_id(self, grounding_width: int, grounding_height: int) -> str:
+        """Identifies the grounding backend and output space, for cache keys."""
+        if self.grounding_inference_fn is not None:
+            backend = "fn:" + getattr(self.grounding_inference_fn, "__qualname__", repr(self.grounding_inference_fn))
+        elif self.grounding_base_url:
+            backend = f"service:{self.grounding_base_url}"
+        else:
+            backend = f"llm:{self.engine_params_for_grounding.get('model')}"
+        return f"{backend}@{grounding_width}x{grounding_height}"
+
     def _grounding_service_coords(
-        self, image_bytes: bytes, prompt: str
+        self, shot: Screenshot, prompt: str
     ) -> Optional[List[int]]:
         if not self.grounding_base_url:
             if not self._logged_grounding_absence:
@@ -509,21 +543,20 @@ class OSWorldACI(ACI):
             return None
 
         try:
-            with Image.open(BytesIO(image_bytes)) as img:
-                width, height = img.size
+            width, height = shot.size
         except Exception as exc:
             logger.error("Failed to read screenshot for grounding service: %s", exc)
             logger.warning("Falling back to LLM grounding due to image read failure.")
             return None
 
-        return self._invoke_grounding_service(image_bytes, prompt, width, height)
+        return self._invoke_grounding_service(shot, prompt, width, height)
 
     def _invoke_grounding_service(
-        self, image_bytes: bytes, prompt: str, width: int, height: int
+        self, shot: Screenshot, prompt: str, width: int, height: int
     ) -> Optional[List[int]]:
+        # Encoded once per screenshot; later grounding calls on the same frame reuse it.
         with LATENCY_LOGGER.measure("grounding", "compress_image"):
-            compressed_image = compress_image(image_bytes=image_bytes)
-        image_base64 = base64.b64encode(compressed_image).decode("utf-8")
+            image_base64 = shot.webp_base64
 
         messages: List[Dict[str, Any]] = []
         if self.grounding_system_prompt:
@@ -553,124 +586,115 @@ class OSWorldACI(ACI):
             "top_p": 0.9,
         }
 
-        url = f"{self.grounding_base_url.rstrip('/')}/call_llm"
+        grounding_width = self.engine_params_for_grounding.get("grounding_width") or self.width
+        grounding_height = self.engine_params_for_grounding.get("grounding_height") or self.height
 
-        headers = {}
-        if self.grounding_api_key:
-            headers["Authorization"] = f"Bearer {self.grounding_api_key}"
+        def _parse(data: Any) -> List[int]:
+            result_items = [data] if isinstance(data, dict) else data
+            if not result_items:
+                raise ValueError("Empty grounding response")
+            text = (
+                result_items[0].get("response")
+                or result_items[0].get("text")
+                or ""
+            )
+            coords = _parse_xy_from_text(text)
+            if not coords:
+                raise ValueError(f"No coordinates found in response: {text}")
+            return _normalize_point_to_dims(
+                coords[0],
+                coords[1],
+                img_w=width,
+                img_h=height,
+                target_w=grounding_width,
+                target_h=grounding_height,
+                allow_norm_1000=None,
+            )
 
-        for attempt in range(self.grounding_max_retries):
-            try:
-                emit_event(
-                    "grounding.generate_coords.service_attempt",
-                    {
-                        "attempt": attempt + 1,
-                        "prompt": prompt,
-                    },
-                )
-                with LATENCY_LOGGER.measure(
-                    "grounding", "runpod_call", extra={"attempt": attempt + 1}
-                ):
-                    with httpx.Client(timeout=self.grounding_timeout) as client:
-                        response = client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-                result_items = [data] if isinstance(data, dict) else data
-                if not result_items:
-                    raise ValueError("Empty grounding response")
-                text = (
-                    result_items[0].get("response")
-                    or result_items[0].get("text")
-                    or ""
-                )
-                coords = _parse_xy_from_text(text)
-                if not coords:
-                    raise ValueError(f"No coordinates found in response: {text}")
-                grounding_width = self.engine_params_for_grounding.get("grounding_width") or self.width
-                grounding_height = self.engine_params_for_grounding.get("grounding_height") or self.height
-                coords_payload = _normalize_point_to_dims(
-                    coords[0],
-                    coords[1],
-                    img_w=width,
-                    img_h=height,
-                    target_w=grounding_width,
-                    target_h=grounding_height,
-                    allow_norm_1000=None,
-                )
-                emit_event(
-                    "grounding.generate_coords.service_success",
-                    {
-                        "attempt": attempt + 1,
-                        "coords": coords_payload,
-                    },
-                )
-                return coords_payload
-            except Exception as exc:
-                logger.warning(
-                    "Grounding service attempt %d failed: %s", attempt + 1, exc
-                )
-                emit_event(
-                    "grounding.generate_coords.service_retry",
-                    {
-                        "attempt": attempt + 1,
-                        "error": str(exc),
-                    },
+        def _on_attempt(attempt: int) -> None:
+            emit_event(
+                "grounding.generate_coords.service_attempt",
+                {
+                    "attempt": attempt,
+                    "prompt": prompt,
+                },
+            )
+
+        def _on_retry(attempt: int, exc: Exception) -> None:
+            logger.warning("Grounding service attempt %d failed: %s", attempt, exc)
+            emit_event(
+                "grounding.generate_coords.service_retry",
+                {
+                    "attempt": attempt,
+                    "error": str(exc),
+                },
+            )
+
+        client = get_grounding_client(self.grounding_base_url, api_key=self.grounding_api_key)
+        try:
+            with LATENCY_LOGGER.measure("grounding", "runpod_call"):
+                coords_payload = client.post_json(
+                    "/call_llm",
+                    payload,
+                    timeout_s=self.grounding_timeout,
+                    max_attempts=self.grounding_max_retries,
+                    deadline_s=self.grounding_deadline,
+                    on_attempt=_on_attempt,
+                    on_retry=_on_retry,
+                    parse=_parse,
                 )
-                time.sleep(1.0)
-        logger.error(
-            "All grounding service attempts failed after %d retries; using fallback coordinates.",
-            self.grounding_max_retries,
-        )
+        except Exception as exc:
+            logger.error(
+                "All grounding service attempts failed (%s); using fallback coordinates.",
+                exc,
+            )
+            emit_event(
+                "grounding.generate_coords.service_failed",
+                {
+                    "attempts": self.grounding_max_retries,
+                    "prompt": prompt,
+                },
+            )
+            return None
         emit_event(
-            "grounding.generate_coords.service_failed",
+            "grounding.generate_coords.service_success",
             {
-                "attempts": self.grounding_max_retries,
-                "prompt": prompt,
+                "coords": coords_payload,
             },
         )
-        return None
+        return coords_payload
 
     # Calls pytesseract to generate word level bounding boxes for text grounding
-    def get_ocr_elements(self, screenshot_data: Union[str, bytes]) -> Tuple[str, List]:
-        image_bytes = _decode_screenshot_data(screenshot_data)
-        image = Image.open(BytesIO(image_bytes))
-        image_data = pytesseract.image_to_data(image, output_type=Output.DICT)
-
-        # Clean text by removing leading and trailing spaces and non-alphabetical characters, but keeping punctuation
-        for i, word in enumerate(image_data["text"]):
-            image_data["text"][i] = re.sub(
-                r"^[^a-zA-Z\s.,!?;:\-\+]+|[^a-zA-Z\s.,!?;:\-\+]+$", "", word
-            )
+    def get_ocr_elements(
+        self, screenshot_data: Union[str, bytes], region: Optional[Region] = None
+    ) -> Tuple[str, List]:
+        shot = Screenshot.from_data(screenshot_data)
+        with LATENCY_LOGGER.measure("grounding", "ocr", {"region": bool(region)}):
+            words = self.ocr_cache.words(shot, region=region)
 
         ocr_elements = []
-        ocr_table = "Text Table:\nWord id\tText\n"
         # Obtain the <id, text, group number, word number> for each valid element
-        grouping_map = defaultdict(list)
-        ocr_id = 0
-        for i in range(len(image_data["text"])):
-            block_num = image_data["block_num"][i]
-            if image_data["text"][i]:
-                grouping_map[block_num].append(image_data["text"][i])
-                ocr_table += f"{ocr_id}\t{image_data['text'][i]}\n"
-                ocr_elements.append(
-                    {
-                        "id": ocr_id,
-                        "text": image_data["text"][i],
-                        "group_num": block_num,
-                        "word_num": len(grouping_map[block_num]),
-                        "left": image_data["left"][i],
-                        "top": image_data["top"][i],
-                        "width": image_data["width"][i],
-                        "height": image_data["height"][i],
-                    }
-                )
-                ocr_id += 1
+        grouping_map = defaultdict(int)
+        for ocr_id, word in enumerate(words):
+            grouping_map[word["block"]] += 1
+            ocr_elements.append(
+                {
+                    "id": ocr_id,
+                    "text": word["text"],
+                    "group_num": word["block"],
+                    "word_num": grouping_map[word["block"]],
+                    "left": word["left"],
+                    "top": word["top"],
+                    "width": word["width"],
+                    "height": word["height"],
+                }
+            )
 
-        return ocr_table, ocr_elements
+        return build_ocr_table(ocr_elements), ocr_elements
 
     # Given the state and worker's text phrase, generate the coords of the first/last word in the phrase
     def generate_text_coords(
-        self, phrase: str, obs: Dict, alignment: str = ""
+        self, phrase: str, obs: Dict, alignment: str = "", region: Optional[Region] = None
     ) -> List[int]:
 
         emit_event(
@@ -681,7 +705,9 @@ class OSWorldACI(ACI):
             },
         )
 
-        ocr_table, ocr_elements = self.get_ocr_elements(obs["screenshot"])
+        ocr_table, ocr_elements = self.get_ocr_elements(obs["screenshot"], region=region)
+        if not ocr_elements:
+            raise RuntimeError(f"OCR found no text to ground phrase: {phrase}")
 
         alignment_prompt = ""
         if alignment == "start":
@@ -709,7 +735,7 @@ class OSWorldACI(ACI):
             text_id = int(numericals[-1])
         else:
             text_id = 0
-        elem = ocr_elements[text_id]
+        elem = ocr_elements[min(text_id, len(ocr_elements) - 1)]
 
         # Compute the element coordinates
         if alignment == "start":
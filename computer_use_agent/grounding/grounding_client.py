@@ -0,0 +1,137 @@
+"""
+Long-lived HTTP client for the external grounding service.
+
+`OSWorldACI` used to open a new `httpx.Client` for every attempt (a fresh TCP
+and TLS handshake per grounding call) and retried after a flat one-second
+sleep. `GroundingServiceClient` keeps one pooled client per service URL for the
+life of the process, retries with jittered exponential backoff, and bounds
+each call by an overall deadline so retries cannot stretch a step indefinitely.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+_BACKOFF_BASE_S = 0.25
+_BACKOFF_CAP_S = 4.0
+# Don't start an attempt with less than this much of the deadline left.
+_MIN_ATTEMPT_BUDGET_S = 0.05
+
+
+class GroundingDeadlineExceeded(TimeoutError):
+    """Raised when the overall deadline expires before a successful attempt."""
+
+
+def backoff_delay(attempt: int, *, base_s: float = _BACKOFF_BASE_S, cap_s: float = _BACKOFF_CAP_S) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0.0, min(cap_s, base_s * (2 ** max(attempt, 0))))
+
+
+class GroundingServiceClient:
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        api_key: Optional[str] = None,
+        max_connections: int = 8,
+        transport: Optional[httpx.BaseTransport] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=120.0,
+            ),
+            transport=transport,
+        )
+
+    def post_json(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        *,
+        timeout_s: float,
+        max_attempts: int,
+        deadline_s: Optional[float] = None,
+        on_attempt: Optional[Callable[[int], None]] = None,
+        on_retry: Optional[Callable[[int, Exception], None]] = None,
+        parse: Optional[Callable[[Any], Any]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> Any:
+        """
+        POST `payload` and return `parse(response.json())`, retrying failures.
+
+        Each attempt's timeout is `timeout_s`, clipped to whatever remains of
+        `deadline_s` (default: `timeout_s * max_attempts`). Errors raised by
+        `parse` count as failed attempts too. Re-raises the last error.
+        """
+        attempts = max(1, int(max_attempts))
+        budget = deadline_s if deadline_s is not None else timeout_s * attempts
+        deadline = time.monotonic() + budget
+        last_exc: Optional[Exception] = None
+        for attempt in range(attempts):
+            remaining = deadline - time.monotonic()
+            if remaining < _MIN_ATTEMPT_BUDGET_S:
+                break
+            if on_attempt is not None:
+                on_attempt(attempt + 1)
+            try:
+                response = self._client.post(path, json=payload, timeout=min(timeout_s, remaining))
+                response.raise_for_status()
+                data = response.json()
+                return parse(data) if parse is not None else data
+            except Exception as exc:
+                last_exc = exc
+                if on_retry is not None:
+                    on_retry(attempt + 1, exc)
+                if attempt + 1 >= attempts:
+                    break
+                delay = min(backoff_delay(attempt), max(0.0, deadline - time.monotonic()))
+                if delay:
+                    sleep(delay)
+        if last_exc is None:
+            raise GroundingDeadlineExceeded(f"grounding deadline of {budget:.1f}s exhausted")
+        raise last_exc
+
+    def close(self) -> None:
+        self._client.close()
+
+
+_clients: Dict[tuple, GroundingServiceClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_grounding_client(base_url: str, *, api_key: Optional[str] = None) -> GroundingServiceClient:
+    """Process-wide client for (base_url, api_key); created on first use."""
+    key = (base_url.rstrip("/"), api_key or "")
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = GroundingServiceClient(base_url, api_key=api_key)
+        return client
+
+
+def close_grounding_clients() -> None:
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+__all__ = [
+    "GroundingDeadlineExceeded",
+    "GroundingServiceClient",
+    "backoff_delay",
+    "close_grounding_clients",
+    "get_grounding_client",
+]
@@ -0,0 +1,291 @@
+"""
+Cached, incremental OCR for text-span grounding.
+
+`OSWorldACI.get_ocr_elements` used to run Tesseract over the full screenshot on
+every call (well over a second of CPU at 1080p), even when the screen had not
+changed. `OcrCache` keeps word boxes per screenshot digest and, for a new
+frame of the same size, only re-reads the tiles that differ from the previous
+frame: words outside the changed areas are carried over, words inside them
+are replaced by OCR of the changed crops. Callers can also restrict OCR to a
+region of interest, and `build_ocr_table` renders the prompt table in one
+pass.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from computer_use_agent.utils.image_processor import changed_tile_mask, tile_mask_rects
+from computer_use_agent.utils.screenshot import Screenshot
+
+# (left, top, width, height) in screenshot pixels.
+Region = Tuple[int, int, int, int]
+OcrFunction = Callable[[Image.Image], Dict[str, List[Any]]]
+
+_EDGE_NOISE_RE = re.compile(r"^[^a-zA-Z\s.,!?;:\-\+]+|[^a-zA-Z\s.,!?;:\-\+]+$")
+_HAS_LETTER_RE = re.compile(r"[a-zA-Z]")
+
+
+def tesseract_image_to_data(image: Image.Image) -> Dict[str, List[Any]]:
+    import pytesseract
+    from pytesseract import Output
+
+    return pytesseract.image_to_data(image, output_type=Output.DICT)
+
+
+def _words_from_data(data: Dict[str, List[Any]], offset: Tuple[int, int] = (0, 0), block_base: int = 0) -> List[Dict[str, Any]]:
+    """Clean Tesseract output into word dicts in screenshot coordinates."""
+    dx, dy = offset
+    words = []
+    for i, raw in enumerate(data.get("text") or []):
+        # Strip non-alphabetical characters from the edges, but keep punctuation.
+        text = _EDGE_NOISE_RE.sub("", raw or "")
+        # Tokens with no letters left (rules, bullets, icon glyphs) only bloat the prompt.
+        if not text or not _HAS_LETTER_RE.search(text):
+            continue
+        words.append(
+            {
+                "text": text,
+                "block": block_base + int(data["block_num"][i]),
+                "left": int(data["left"][i]) + dx,
+                "top": int(data["top"][i]) + dy,
+                "width": int(data["width"][i]),
+                "height": int(data["height"][i]),
+            }
+        )
+    return words
+
+
+def _intersects(word: Dict[str, Any], rect: Tuple[int, int, int, int]) -> bool:
+    x0, y0, x1, y1 = rect
+    return not (
+        word["left"] >= x1
+        or word["left"] + word["width"] <= x0
+        or word["top"] >= y1
+        or word["top"] + word["height"] <= y0
+    )
+
+
+def _inside(word: Dict[str, Any], region: Region) -> bool:
+    left, top, width, height = region
+    cx = word["left"] + word["width"] / 2
+    cy = word["top"] + word["height"] / 2
+    return left <= cx < left + width and top <= cy < top + height
+
+
+def _merge_rects(rects: List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+    merged = list(rects)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(i + 1, len(merged)):
+                a, b = merged[i], merged[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    merged[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    del merged[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return merged
+
+
+def _reading_order(words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Order words by text line (vertical centre within a line's span), then left to right.
+
+    This is geometric, not Tesseract's block/paragraph/line order: in a
+    multi-column layout it interleaves the columns line by line. Every scan
+    path returns words in this order, so word ids agree between a full scan
+    and a partial rescan of the same frame.
+    """
+    lines: List[Tuple[float, float, List[Dict[str, Any]]]] = []
+    for word in sorted(words, key=lambda w: (w["top"] + w["height"] / 2, w["left"])):
+        cy = word["top"] + word["height"] / 2
+        if lines and lines[-1][0] <= cy <= lines[-1][1]:
+            top, bottom, members = lines[-1]
+            lines[-1] = (min(top, word["top"]), max(bottom, word["top"] + word["height"]), members)
+            members.append(word)
+        else:
+            lines.append((word["top"], word["top"] + word["height"], [word]))
+    return [word for _, _, members in lines for word in sorted(members, key=lambda w: w["left"])]
+
+
+def build_ocr_table(elements: List[Dict[str, Any]]) -> str:
+    """Render the `Word id<TAB>Text` table expected by the text-span prompt."""
+    rows = ["Text Table:", "Word id\tText"]
+    rows.extend(f"{element['id']}\t{element['text']}" for element in elements)
+    return "\n".join(rows) + "\n"
+
+
+class OcrCache:
+    def __init__(
+        self,
+        *,
+        max_entries: int = 8,
+        tile_size: int = 64,
+        margin: int = 6,
+        full_rescan_ratio: float = 0.5,
+        ocr_fn: Optional[OcrFunction] = None,
+    ) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.tile_size = max(8, int(tile_size))
+        self.margin = max(0, int(margin))
+        self.full_rescan_ratio = full_rescan_ratio
+        self.ocr_fn: OcrFunction = ocr_fn or tesseract_image_to_data
+        self.hits = 0
+        self.full_scans = 0
+        self.partial_scans = 0
+        self.ocr_pixels = 0
+        self._entries: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._previous: Optional[Tuple[np.ndarray, List[Dict[str, Any]]]] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def words(self, shot: Screenshot, region: Optional[Region] = None) -> List[Dict[str, Any]]:
+        """Word boxes for `shot`, optionally limited to words centred in `region`."""
+        with self._lock:
+            words = self._entries.get(shot.digest)
+            if words is not None:
+                self._entries.move_to_end(shot.digest)
+                self.hits += 1
+            else:
+                # With a region of interest, only take the incremental path;
+                # if the whole frame would need reading, read just the region.
+                words = self._scan(shot, allow_full_scan=region is None)
+                if words is None:
+                    return list(self._region_words(shot, region))
+                self._store(shot.digest, words)
+        if region is None:
+            return list(words)
+        return [word for word in words if _inside(word, region)]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "full_scans": self.full_scans,
+                "partial_scans": self.partial_scans,
+                "ocr_pixels": self.ocr_pixels,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._previous = None
+
+    # ------------------------------------------------------------------ #
+    # Internals (caller holds the lock)
+    # ------------------------------------------------------------------ #
+
+    def _store(self, digest: str, words: List[Dict[str, Any]]) -> None:
+        self._entries[digest] = words
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _ocr_crop(self, shot: Screenshot, rect: Tuple[int, int, int, int], block_base: int) -> List[Dict[str, Any]]:
+        x0, y0, x1, y1 = rect
+        image = shot.pil()
+        crop = image if (x0, y0, x1, y1) == (0, 0, image.width, image.height) else image.crop(rect)
+        self.ocr_pixels += (x1 - x0) * (y1 - y0)
+        return _words_from_data(self.ocr_fn(crop), offset=(x0, y0), block_base=block_base)
+
+    def _region_words(self, shot: Screenshot, region: Region) -> List[Dict[str, Any]]:
+        key = f"{shot.digest}@{','.join(str(int(v)) for v in region)}"
+        words = self._entries.get(key)
+        if words is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return words
+        words = self._ocr_region(shot, region)
+        self._store(key, words)
+        return words
+
+    def _ocr_region(self, shot: Screenshot, region: Region) -> List[Dict[str, Any]]:
+        width, height = shot.size
+        left, top, w, h = region
+        rect = (max(0, left), max(0, top), min(width, left + w), min(height, top + h))
+        if rect[2] <= rect[0] or rect[3] <= rect[1]:
+            return []
+        self.partial_scans += 1
+        return _reading_order(self._ocr_crop(shot, rect, block_base=0))
+
+    def _scan(self, shot: Screenshot, *, allow_full_scan: bool = True) -> Optional[List[Dict[str, Any]]]:
+        gray = shot.array(gray=True)
+        previous = self._previous
+        rects = None
+        if previous is not None and previous[0].shape == gray.shape:
+            rects = self._changed_rects(previous[0], gray)
+
+        if rects is None:
+            if not allow_full_scan:
+                return None
+            self.full_scans += 1
+            width, height = shot.size
+            words = _reading_order(self._ocr_crop(shot, (0, 0, width, height), block_base=0))
+        elif not rects:
+            words = list(previous[1])
+        else:
+            words = self._rescan(shot, previous[1], rects, gray.shape)
+        self._previous = (gray, words)
+        return words
+
+    def _changed_rects(self, before: np.ndarray, after: np.ndarray) -> Optional[List[Tuple[int, int, int, int]]]:
+        """Pixel rects covering changed tiles, or None when a full rescan is cheaper."""
+        mask = changed_tile_mask(before, after, self.tile_size)
+        if not mask.any():
+            return []
+        if mask.mean() > self.full_rescan_ratio:
+            return None
+        return tile_mask_rects(mask, self.tile_size, after.shape[:2], margin=self.margin)
+
+    def _rescan(
+        self,
+        shot: Screenshot,
+        previous_words: List[Dict[str, Any]],
+        rects: List[Tuple[int, int, int, int]],
+        shape: Tuple[int, int],
+    ) -> List[Dict[str, Any]]:
+        height, width = shape
+        # Grow each changed rect over the old words it cuts through, so a word
+        # straddling a tile edge is re-read whole rather than half-kept.
+        rects = _merge_rects(rects)
+        for _ in range(3):
+            grown = []
+            for rect in rects:
+                x0, y0, x1, y1 = rect
+                for word in previous_words:
+                    if _intersects(word, rect):
+                        x0 = min(x0, max(0, word["left"] - self.margin))
+                        y0 = min(y0, max(0, word["top"] - self.margin))
+                        x1 = max(x1, min(width, word["left"] + word["width"] + self.margin))
+                        y1 = max(y1, min(height, word["top"] + word["height"] + self.margin))
+                grown.append((x0, y0, x1, y1))
+            grown = _merge_rects(grown)
+            if grown == rects:
+                break
+            rects = grown
+
+        kept = [word for word in previous_words if not any(_intersects(word, rect) for rect in rects)]
+        block_base = max((word["block"] for word in previous_words), default=0)
+        fresh: List[Dict[str, Any]] = []
+        for rect in rects:
+            found = self._ocr_crop(shot, rect, block_base=block_base)
+            block_base = max((word["block"] for word in found), default=block_base)
+            fresh.extend(found)
+        self.partial_scans += 1
+        # Carried-over and re-read words interleave on screen; put them back in
+        # the same line-by-line order a full scan is sorted into.
+        return _reading_order(kept + fresh)
+
+
+__all__ = ["OcrCache", "Region", "build_ocr_table", "tesseract_image_to_data"]
@@ -25,6 +25,8 @@ DEFAULT_WORKER_CONFIG: Dict[str, Any] = {
     "max_trajectory_length": 1,
     "enable_reflection": True,
     "post_action_worker_delay": 1.5,
+    "adaptive_settle": True,
+    "narration_lag_limit": 1,
 }
 
 def _resolve_grounding_base_url() -> Optional[str]:
@@ -65,6 +67,8 @@ DEFAULT_GROUNDING_CONFIG: Dict[str, Any] = {
     "grounding_timeout": 10.0,
     "grounding_max_retries": 3,
     "grounding_api_key": None,
+    "grounding_cache_size": 256,
+    "grounding_cache_max_distance": 0,
 }
 
 
@@ -108,6 +112,9 @@ class WorkerConfig:
     max_trajectory_length: int = 1
     enable_reflection: bool = True
     post_action_worker_delay: float = 1.5
+    adaptive_settle: bool = True
+    # Behavior narrations allowed to run behind the step loop (0 = inline).
+    narration_lag_limit: int = 1
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "WorkerConfig":
@@ -118,6 +125,8 @@ class WorkerConfig:
             max_trajectory_length=merged.get("max_trajectory_length", 1),
             enable_reflection=merged.get("enable_reflection", True),
             post_action_worker_delay=merged.get("post_action_worker_delay", 1.5),
+            adaptive_settle=bool(merged.get("adaptive_settle", True)),
+            narration_lag_limit=int(merged.get("narration_lag_limit", 1)),
         )
 
 
@@ -132,6 +141,8 @@ class GroundingConfig:
     grounding_timeout: float = 10.0
     grounding_max_retries: int = 3
     grounding_api_key: Optional[str] = None
+    grounding_cache_size: int = 256
+    grounding_cache_max_distance: int = 0  # dHash tolerance; 0 = exact screenshot match
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "GroundingConfig":
@@ -155,6 +166,8 @@ class GroundingConfig:
             grounding_timeout=merged.get("grounding_timeout", 10.0),
             grounding_max_retries=merged.get("grounding_max_retries", 3),
             grounding_api_key=api_key,
+            grounding_cache_size=int(merged.get("grounding_cache_size", 256)),
+            grounding_cache_max_distance=int(merged.get("grounding_cache_max_distance", 0)),
         )
 
 
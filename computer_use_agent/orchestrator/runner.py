@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import base64
-import copy
 import logging
 import os
 from datetime import datetime, timezone
@@ -20,9 +19,11 @@ from computer_use_agent.orchestrator.data_types import (
     RunnerResult,
     RunnerStep,
 )
+from computer_use_agent.utils.image_handle import externalize_message_images, resolve_message_images
 from computer_use_agent.utils.local_env import LocalEnv
-from computer_use_agent.utils.behavior_narrator import BehaviorNarrator
+from computer_use_agent.utils.behavior_narrator import BehaviorNarrator, NarrationQueue
 from computer_use_agent.utils.computer_use_html_logger import ComputerUseHtmlLogger
+from computer_use_agent.orchestrator.screen_settle import classify_action, wait_for_screen_settle
 from shared.latency_logger import LATENCY_LOGGER
 from shared.streaming import emit_event
 from shared import agent_signal
@@ -99,6 +100,10 @@ def _build_grounding_prompts(
     }
 
 
+def _is_image_part(part: Any) -> bool:
+    return isinstance(part, dict) and part.get("type", "") in {"image", "image_url"}
+
+
 def _prune_images_in_messages(
     messages: List[Dict[str, Any]],
     *,
@@ -108,40 +113,42 @@ def _prune_images_in_messages(
     """
     Optionally remove older image parts to reduce payload size.
     If persist_images is False: strip all image parts.
-    If persist_images is True: keep images in the last `keep_image_turns` messages; strip older ones.
+    If persist_images is True: keep images in the last `keep_image_turns` messages
+    that carry images; strip older ones.
+
+    Structural only: messages without images to drop are returned as-is, and
+    image parts are references (ImageHandle or URL strings), so nothing large
+    is copied.
     """
     if not messages:
         return []
 
+    keep = max(0, keep_image_turns) if persist_images else 0
+    image_turns = [idx for idx, msg in enumerate(messages) if any(map(_is_image_part, msg.get("content") or []))]
+    keep_from = image_turns[-keep] if 0 < keep <= len(image_turns) else (0 if keep else len(messages))
+
     pruned: List[Dict[str, Any]] = []
-    total = len(messages)
     for idx, msg in enumerate(messages):
         content = msg.get("content", [])
-        if not isinstance(content, list):
+        if idx >= keep_from or not isinstance(content, list) or not any(map(_is_image_part, content)):
             pruned.append(msg)
             continue
-
-        new_content = []
-        for part in content:
-            if not isinstance(part, dict):
-                new_content.append(part)
-                continue
-            part_type = part.get("type", "")
-            if not persist_images:
-                if part_type in {"image", "image_url"}:
-                    continue
-            else:
-                # keep images only for the last keep_image_turns messages
-                if part_type in {"image", "image_url"} and idx < total - keep_image_turns:
-                    continue
-            new_content.append(part)
-
-        new_msg = dict(msg)
-        new_msg["content"] = new_content
-        pruned.append(new_msg)
+        pruned.append({**msg, "content": [part for part in content if not _is_image_part(part)]})
     return pruned
 
 
+def _snapshot_messages(messages: List[Dict[str, Any]], images: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Detached, JSON-ready copies of conversation messages.
+
+    Message and part dicts are copied (the worker edits text parts in place),
+    but strings are shared, and each image becomes a `{"$image": digest}`
+    reference into `images`, so a frame present in both the generator and
+    reflection histories is serialized once.
+    """
+    kept = [msg for msg in messages if msg.get("role") not in {"developer", "system"}]
+    return externalize_message_images(kept, images)
+
 
 def _build_trajectory_till_now(
     steps: List[RunnerStep],
@@ -149,19 +156,11 @@ def _build_trajectory_till_now(
     reflection_messages: List[Dict[str, Any]],
 ) -> Dict[str, Any]:
     """Build a snapshot of the trajectory so far for persistence/resume."""
-    filtered_generator = [
-        copy.deepcopy(msg)
-        for msg in generator_messages
-        if msg.get("role") not in {"developer", "system"}
-    ]
-    filtered_reflection = [
-        copy.deepcopy(msg)
-        for msg in reflection_messages
-        if msg.get("role") not in {"developer", "system"}
-    ]
+    images: Dict[str, str] = {}
     return {
-        "generator_messages": filtered_generator,
-        "reflection_messages": filtered_reflection,
+        "generator_messages": _snapshot_messages(generator_messages, images),
+        "reflection_messages": _snapshot_messages(reflection_messages, images),
+        "images": images,
     }
 
 
@@ -369,6 +368,33 @@ def runner(
     grounding_cfg = request.grounding
     worker_cfg = request.worker
     worker_post_action_delay = max(worker_cfg.post_action_worker_delay, 0.0)
+    adaptive_settle = bool(worker_cfg.adaptive_settle)
+
+    def _capture_after(step_index: int, action: str, fixed_delay: float) -> tuple[bytes, bool]:
+        """
+        Wait for the screen to react to `action` and return (after screenshot, settled).
+
+        With adaptive settle the runner polls until frames stop changing; otherwise
+        it sleeps `fixed_delay` and captures once (settled is then always False).
+        """
+        if not adaptive_settle:
+            agent_signal.sleep_with_interrupt(fixed_delay)
+            with LATENCY_LOGGER.measure("runner", "capture_screenshot", extra={"phase": "after", "step": step_index}):
+                return controller.capture_screenshot(), False
+        action_type = classify_action(action)
+        with LATENCY_LOGGER.measure("runner", "screen_settle", extra={"step": step_index, "action_type": action_type}):
+            result = wait_for_screen_settle(controller.capture_screenshot, action_type=action_type)
+        emit_event(
+            "runner.step.screen_settle",
+            {
+                "step": step_index,
+                "action_type": action_type,
+                "settled": result.settled,
+                "elapsed_s": round(result.elapsed_s, 3),
+                "frames": result.frames,
+            },
+        )
+        return result.frame, result.settled
 
     def _perform_run() -> RunnerResult:
         # Store orchestrator state in closure for handback capture
@@ -391,6 +417,8 @@ def runner(
             grounding_timeout=grounding_cfg.grounding_timeout,
             grounding_max_retries=grounding_cfg.grounding_max_retries,
             grounding_api_key=grounding_cfg.grounding_api_key,
+            grounding_cache_size=grounding_cfg.grounding_cache_size,
+            grounding_cache_max_distance=grounding_cfg.grounding_cache_max_distance,
         )
         
         agent = AgentS3(
@@ -407,8 +435,9 @@ def runner(
                 traj_state = _inference_update.get("trajectory_till_now") or {}
                 gen_msgs = traj_state.get("generator_messages") or []
                 ref_msgs = traj_state.get("reflection_messages") or []
-                agent.executor.generator_agent.messages = copy.deepcopy(gen_msgs)
-                agent.executor.reflection_agent.messages = copy.deepcopy(ref_msgs)
+                images = traj_state.get("images") or {}
+                agent.executor.generator_agent.messages = resolve_message_images(gen_msgs, images)
+                agent.executor.reflection_agent.messages = resolve_message_images(ref_msgs, images)
                 # Mark resume mode and bump turn_count to skip initial copy
                 agent.executor.resume_mode = True
             except Exception as exc:
@@ -421,8 +450,32 @@ def runner(
         completion_reason = "MAX_STEPS_REACHED"
         status = "in_progress"
         start_step_index = 1
-        previous_behavior_result: Optional[Dict[str, Any]] = None
-        
+        previous_behavior_result: Optional[Any] = None
+
+        def _on_narration_done(record: RunnerStep, log_kwargs: Dict[str, Any]):
+            def _finish(behavior: Optional[Dict[str, Any]]) -> None:
+                behavior_artifacts = behavior.pop("artifacts", None) if isinstance(behavior, dict) else None
+                record.behavior_fact_thoughts = behavior.get("fact_thoughts") if behavior else None
+                record.behavior_fact_answer = behavior.get("fact_answer") if behavior else None
+                emit_event(
+                    "runner.step.behavior",
+                    {
+                        "step": record.step_index,
+                        "fact_answer": record.behavior_fact_answer,
+                        "fact_thoughts": record.behavior_fact_thoughts,
+                    },
+                )
+                html_logger.log_step(
+                    **log_kwargs,
+                    behavior_fact=record.behavior_fact_answer,
+                    behavior_thoughts=record.behavior_fact_thoughts,
+                    marked_before_img=(behavior_artifacts or {}).get("marked_before_img_bytes"),
+                    marked_after_img=(behavior_artifacts or {}).get("marked_after_img_bytes"),
+                    zoomed_after_img=(behavior_artifacts or {}).get("zoomed_after_img_bytes"),
+                )
+
+            return _finish
+
 
         emit_event(
             "runner.started",
@@ -455,365 +508,354 @@ def runner(
         agent_signal.raise_if_exit_requested()
         agent_signal.wait_for_resume()
 
-        for step_index in range(start_step_index, max_steps + start_step_index):
-            agent_signal.raise_if_exit_requested()
-            agent_signal.wait_for_resume()
-
-            emit_event(
-                "runner.step.started",
-                {
-                    "step": step_index,
-                },
-            )
-
-            step_before_bytes = before_screenshot_bytes
-            observation = {
-                "screenshot": before_screenshot_bytes,
-                "previous_behavior": previous_behavior_result,
-                "reflection_screenshot": reflection_screenshot_bytes,
-            }
-
-            agent_signal.raise_if_exit_requested()
-            agent_signal.wait_for_resume()
-
-            with LATENCY_LOGGER.measure("runner", "agent_predict", extra={"step": step_index}):
-                info, actions = agent.predict(
-                    instruction=request.task, observation=observation
-                )
-            action = actions[0] if actions else ""
-            exec_code = info.get("exec_code", action)
-
-            execution_result: Dict[str, Any] = {}
-            normalized = action.strip().upper()
-            did_click_action = False
-            handback_request: Optional[str] = None
-
-            agent_payload = {
-                "plan": info.get("plan"),
-                "reflection": info.get("reflection"),
-                "reflection_thoughts": info.get("reflection_thoughts"),
-            }
-            if info.get("code_agent_output") is not None:
-                agent_payload["code_agent_output"] = info.get("code_agent_output")
-            emit_event(
-                "runner.step.agent_response",
-                {
-                    "step": step_index,
-                    "action": action,
-                    "exec_code": exec_code,
-                    "normalized_action": normalized,
-                    "info": {k: v for k, v in agent_payload.items() if v is not None},
-                },
-            )
-
-            after_screenshot_bytes = before_screenshot_bytes
-            execution_mode = "noop"
-            execution_details: Dict[str, Any] = {"step": step_index}
+        # Narration runs behind the step loop; the next step's worker joins it
+        # after its own reflection call, and records/logs are finalized in order.
+        # The queue is closed even when the loop exits on an exit request or error.
+        narration_queue = NarrationQueue(behavior_narrator, lag_limit=worker_cfg.narration_lag_limit)
+        try:
+            for step_index in range(start_step_index, max_steps + start_step_index):
+                agent_signal.raise_if_exit_requested()
+                agent_signal.wait_for_resume()
+                narration_queue.drain(wait=False)
 
-            if normalized == "DONE":
-                execution_mode = "final_screenshot"
                 emit_event(
-                    "runner.step.execution.started",
+                    "runner.step.started",
                     {
                         "step": step_index,
-                        "mode": execution_mode,
                     },
                 )
-                status = "success"
-                completion_reason = "DONE"
-                with LATENCY_LOGGER.measure("runner", "capture_screenshot", extra={"phase": "after", "step": step_index}):
-                    after_screenshot_bytes = controller.capture_screenshot()
-                execution_details["status"] = status
-                execution_details["completion_reason"] = completion_reason
-            elif normalized == "FAIL":
-                execution_mode = "failure_screenshot"
-                emit_event(
-                    "runner.step.execution.started",
-                    {
-                        "step": step_index,
-                        "mode": execution_mode,
-                    },
-                )
-                status = "failed"
-                completion_reason = "FAIL"
-                with LATENCY_LOGGER.measure("runner", "capture_screenshot", extra={"phase": "after", "step": step_index}):
-                    after_screenshot_bytes = controller.capture_screenshot()
-                execution_details["status"] = status
-                execution_details["completion_reason"] = completion_reason
-            elif action.strip().startswith("HANDBACK_TO_HUMAN:"):
-                # Handback to human - extract request and capture state
-                execution_mode = "handback_to_human"
-                handback_request = action.strip()[len("HANDBACK_TO_HUMAN:"):].strip()
+
+                step_before_bytes = before_screenshot_bytes
+                observation = {
+                    "screenshot": before_screenshot_bytes,
+                    "previous_behavior": previous_behavior_result,
+                    "reflection_screenshot": reflection_screenshot_bytes,
+                }
+
+                agent_signal.raise_if_exit_requested()
+                agent_signal.wait_for_resume()
+
+                with LATENCY_LOGGER.measure("runner", "agent_predict", extra={"step": step_index}):
+                    info, actions = agent.predict(
+                        instruction=request.task, observation=observation
+                    )
+                action = actions[0] if actions else ""
+                exec_code = info.get("exec_code", action)
+
+                execution_result: Dict[str, Any] = {}
+                normalized = action.strip().upper()
+                did_click_action = False
+                screen_settled = False
+                handback_request: Optional[str] = None
+
+                agent_payload = {
+                    "plan": info.get("plan"),
+                    "reflection": info.get("reflection"),
+                    "reflection_thoughts": info.get("reflection_thoughts"),
+                }
+                if info.get("code_agent_output") is not None:
+                    agent_payload["code_agent_output"] = info.get("code_agent_output")
                 emit_event(
-                    "runner.step.execution.started",
+                    "runner.step.agent_response",
                     {
                         "step": step_index,
-                        "mode": execution_mode,
-                        "handback_request": handback_request,
+                        "action": action,
+                        "exec_code": exec_code,
+                        "normalized_action": normalized,
+                        "info": {k: v for k, v in agent_payload.items() if v is not None},
                     },
                 )
+
+                after_screenshot_bytes = before_screenshot_bytes
+                execution_mode = "noop"
+                execution_details: Dict[str, Any] = {"step": step_index}
+
+                if normalized == "DONE":
+                    execution_mode = "final_screenshot"
+                    emit_event(
+                        "runner.step.execution.started",
+                        {
+                            "step": step_index,
+                            "mode": execution_mode,
+                        },
+                    )
+                    status = "success"
+                    completion_reason = "DONE"
+                    with LATENCY_LOGGER.measure("runner", "capture_screenshot", extra={"phase": "after", "step": step_index}):
+                        after_screenshot_bytes = controller.capture_screenshot()
+                    execution_details["status"] = status
+                    execution_details["completion_reason"] = completion_reason
+                elif normalized == "FAIL":
+                    execution_mode = "failure_screenshot"
+                    emit_event(
+                        "runner.step.execution.started",
+                        {
+                            "step": step_index,
+                            "mode": execution_mode,
+                        },
+                    )
+                    status = "failed"
+                    completion_reason = "FAIL"
+                    with LATENCY_LOGGER.measure("runner", "capture_screenshot", extra={"phase": "after", "step": step_index}):
+                        after_screenshot_bytes = controller.capture_screenshot()
+                    execution_details["status"] = status
+                    execution_details["completion_reason"] = completion_reason
+                elif action.strip().startswith("HANDBACK_TO_HUMAN:"):
+                    # Handback to human - extract request and capture state
+                    execution_mode = "handback_to_human"
+                    handback_request = action.strip()[len("HANDBACK_TO_HUMAN:"):].strip()
+                    emit_event(
+                        "runner.step.execution.started",
+                        {
+                            "step": step_index,
+                            "mode": execution_mode,
+                            "handback_request": handback_request,
+                        },
+                    )
                 
-                # Capture handback screenshot
-                with LATENCY_LOGGER.measure("runner", "capture_screenshot", extra={"phase": "handback", "step": step_index}):
-                    handback_screenshot_bytes = controller.capture_screenshot()
-                handback_screenshot_b64 = base64.b64encode(handback_screenshot_bytes).decode("utf-8")
+                    # Capture handback screenshot
+                    with LATENCY_LOGGER.measure("runner", "capture_screenshot", extra={"phase": "handback", "step": step_index}):
+                        handback_screenshot_bytes = controller.capture_screenshot()
+                    handback_screenshot_b64 = base64.b64encode(handback_screenshot_bytes).decode("utf-8")
                 
-                # Build partial trajectory markdown for persistence
-                partial_trajectory_md = _build_trajectory_markdown(
-                    steps,
-                    status="attention",
-                    completion_reason="HANDOFF_TO_HUMAN",
-                    is_resume_flow=_is_resume_flow,
-                    handback_inference=_inference_update.get("inference_result") if _inference_update else None,
-                    include_final_status=False,
-                )
+                    # Build partial trajectory markdown for persistence
+                    narration_queue.drain()
+                    partial_trajectory_md = _build_trajectory_markdown(
+                        steps,
+                        status="attention",
+                        completion_reason="HANDOFF_TO_HUMAN",
+                        is_resume_flow=_is_resume_flow,
+                        handback_inference=_inference_update.get("inference_result") if _inference_update else None,
+                        include_final_status=False,
+                    )
                 
-                # Get run_id from context
-                run_id = RUN_LOG_ID.get()
-                handback_timestamp = datetime.now(timezone.utc).isoformat()
+                    # Get run_id from context
+                    run_id = RUN_LOG_ID.get()
+                    handback_timestamp = datetime.now(timezone.utc).isoformat()
                 
-                if run_id:
-                    # Build FULL cross-agent snapshot
-                    from shared.db.workflow_runs import get_agent_states, update_agent_states
-                    from dataclasses import asdict
+                    if run_id:
+                        # Build FULL cross-agent snapshot
+                        from shared.db.workflow_runs import get_agent_states, update_agent_states
+                        from dataclasses import asdict
                     
-                    # Read existing agent_states to preserve MCP state if present
-                    existing_states = {}
-                    try:
-                        existing_states = get_agent_states(run_id)
-                    except Exception as e:
-                        logger.warning("Could not read existing agent_states: %s", e)
+                        # Read existing agent_states to preserve MCP state if present
+                        existing_states = {}
+                        try:
+                            existing_states = get_agent_states(run_id)
+                        except Exception as e:
+                            logger.warning("Could not read existing agent_states: %s", e)
                     
-                    # Build the full snapshot
-                    full_snapshot = {
-                        "version": 1,
-                        "updated_at": handback_timestamp,
-                    }
+                        # Build the full snapshot
+                        full_snapshot = {
+                            "version": 1,
+                            "updated_at": handback_timestamp,
+                        }
                     
-                    # 1. Include orchestrator state if available
-                    if _orchestrator_state:
-                        full_snapshot["orchestrator"] = _orchestrator_state
-                    elif existing_states.get("orchestrator"):
-                        # Preserve existing orchestrator state
-                        full_snapshot["orchestrator"] = existing_states["orchestrator"]
+                        # 1. Include orchestrator state if available
+                        if _orchestrator_state:
+                            full_snapshot["orchestrator"] = _orchestrator_state
+                        elif existing_states.get("orchestrator"):
+                            # Preserve existing orchestrator state
+                            full_snapshot["orchestrator"] = existing_states["orchestrator"]
                     
-                    # 2. Build computer_use state
-                    worker_executor = cast(Worker, agent.executor)
-                    generator_messages = getattr(worker_executor.generator_agent, "messages", []) or []
-                    reflection_messages = getattr(worker_executor.reflection_agent, "messages", []) or []
-                    reflection_messages_for_snapshot = copy.deepcopy(reflection_messages)
-                    # Mirror the last assistant message from the generator into the reflection history
-                    try:
-                        last_assistant = next(
-                            (
-                                msg
-                                for msg in reversed(generator_messages)
-                                if isinstance(msg, dict) and msg.get("role") == "assistant"
+                        # 2. Build computer_use state
+                        worker_executor = cast(Worker, agent.executor)
+                        generator_messages = getattr(worker_executor.generator_agent, "messages", []) or []
+                        reflection_messages = getattr(worker_executor.reflection_agent, "messages", []) or []
+                        reflection_messages_for_snapshot = list(reflection_messages)
+                        # Mirror the last assistant message from the generator into the reflection history
+                        try:
+                            last_assistant = next(
+                                (
+                                    msg
+                                    for msg in reversed(generator_messages)
+                                    if isinstance(msg, dict) and msg.get("role") == "assistant"
+                                ),
+                                None,
+                            )
+                            if last_assistant:
+                                reflection_messages_for_snapshot.append(last_assistant)
+                        except Exception:
+                            pass
+
+                        computer_use_snapshot = {
+                            "status": "attention",
+                            "completion_reason": "HANDOFF_TO_HUMAN",
+                            "step_index_next": step_index + 1,
+                            "trajectory_till_now": _build_trajectory_till_now(
+                                steps,
+                                generator_messages,
+                                reflection_messages_for_snapshot,
                             ),
-                            None,
-                        )
-                        if last_assistant:
-                            reflection_messages_for_snapshot.append(copy.deepcopy(last_assistant))
-                    except Exception:
-                        pass
-
-                    computer_use_snapshot = {
-                        "status": "attention",
-                        "completion_reason": "HANDOFF_TO_HUMAN",
-                        "step_index_next": step_index + 1,
-                        "trajectory_till_now": _build_trajectory_till_now(
-                            steps,
-                            generator_messages,
-                            reflection_messages_for_snapshot,
-                        ),
-                        "runner": {
-                            "trajectory_md": partial_trajectory_md,
-                        },
-                        "handback_request": handback_request,
-                        "handback_screenshot_b64": handback_screenshot_b64,
-                        "request": {
-                            "task": request.task,
-                            "worker": asdict(request.worker),
-                            "grounding": asdict(request.grounding),
-                            "controller": asdict(request.controller),
-                            "platform": request.platform,
-                            "enable_code_execution": request.enable_code_execution,
-                            "tool_constraints": asdict(request.tool_constraints)
-                            if request.tool_constraints
-                            else None,
-                        },
-                    }
+                            "runner": {
+                                "trajectory_md": partial_trajectory_md,
+                            },
+                            "handback_request": handback_request,
+                            "handback_screenshot_b64": handback_screenshot_b64,
+                            "request": {
+                                "task": request.task,
+                                "worker": asdict(request.worker),
+                                "grounding": asdict(request.grounding),
+                                "controller": asdict(request.controller),
+                                "platform": request.platform,
+                                "enable_code_execution": request.enable_code_execution,
+                                "tool_constraints": asdict(request.tool_constraints)
+                                if request.tool_constraints
+                                else None,
+                            },
+                        }
                     
-                    # 3. Include MCP state if present in existing states
-                    agents_section = {"computer_use": computer_use_snapshot}
-                    if existing_states.get("agents", {}).get("mcp"):
-                        agents_section["mcp"] = existing_states["agents"]["mcp"]
+                        # 3. Include MCP state if present in existing states
+                        agents_section = {"computer_use": computer_use_snapshot}
+                        if existing_states.get("agents", {}).get("mcp"):
+                            agents_section["mcp"] = existing_states["agents"]["mcp"]
                     
-                    full_snapshot["agents"] = agents_section
+                        full_snapshot["agents"] = agents_section
                     
-                    try:
-                        # Write the full snapshot (replaces existing)
-                        update_agent_states(run_id, full_snapshot)
-                        # Mark run as needing attention
-                        mark_run_attention(run_id, summary=f"Human attention required: {handback_request[:200]}")
-                        logger.info("Full handback snapshot persisted for run_id=%s", run_id)
-                    except Exception as e:
-                        logger.error("Failed to persist handback state: %s", e)
+                        try:
+                            # Write the full snapshot (replaces existing)
+                            update_agent_states(run_id, full_snapshot)
+                            # Mark run as needing attention
+                            mark_run_attention(run_id, summary=f"Human attention required: {handback_request[:200]}")
+                            logger.info("Full handback snapshot persisted for run_id=%s", run_id)
+                        except Exception as e:
+                            logger.error("Failed to persist handback state: %s", e)
                     
-                    # Emit human_attention.required event
+                        # Emit human_attention.required event
+                        emit_event(
+                            "human_attention.required",
+                            {
+                                "request": handback_request,
+                                "step_index": step_index,
+                                "timestamp": handback_timestamp,
+                                "run_id": run_id,
+                            },
+                        )
+                    else:
+                        logger.warning("No run_id in context; handback state not persisted")
+                
+                    # Record the handback step
+                    steps.append(
+                        RunnerStep(
+                            step_index=step_index,
+                            plan=info.get("plan", ""),
+                            action=action,
+                            exec_code=exec_code,
+                            execution_result={},
+                            reflection=info.get("reflection"),
+                            reflection_thoughts=info.get("reflection_thoughts"),
+                            info=info,
+                            behavior_fact_thoughts=None,
+                            behavior_fact_answer=None,
+                            action_kind="handback",
+                            handback_request=handback_request,
+                            handback_screenshot_b64=handback_screenshot_b64,
+                        )
+                    )
+                
+                    status = "attention"
+                    completion_reason = "HANDOFF_TO_HUMAN"
+                    after_screenshot_bytes = handback_screenshot_bytes
+                    execution_details["status"] = status
+                    execution_details["completion_reason"] = completion_reason
+                    execution_details["handback_request"] = handback_request
+                
                     emit_event(
-                        "human_attention.required",
+                        "runner.step.execution.completed",
                         {
-                            "request": handback_request,
-                            "step_index": step_index,
-                            "timestamp": handback_timestamp,
-                            "run_id": run_id,
+                            **execution_details,
+                            "mode": execution_mode,
+                            "did_click": False,
                         },
                     )
-                else:
-                    logger.warning("No run_id in context; handback state not persisted")
                 
-                # Record the handback step
-                steps.append(
-                    RunnerStep(
-                        step_index=step_index,
-                        plan=info.get("plan", ""),
-                        action=action,
-                        exec_code=exec_code,
-                        execution_result={},
-                        reflection=info.get("reflection"),
-                        reflection_thoughts=info.get("reflection_thoughts"),
-                        info=info,
-                        behavior_fact_thoughts=None,
-                        behavior_fact_answer=None,
-                        action_kind="handback",
-                        handback_request=handback_request,
-                        handback_screenshot_b64=handback_screenshot_b64,
+                    emit_event(
+                        "runner.step.completed",
+                        {
+                            "step": step_index,
+                            "status": status,
+                            "action": action,
+                            "completion_reason": completion_reason,
+                        },
                     )
-                )
-                
-                status = "attention"
-                completion_reason = "HANDOFF_TO_HUMAN"
-                after_screenshot_bytes = handback_screenshot_bytes
-                execution_details["status"] = status
-                execution_details["completion_reason"] = completion_reason
-                execution_details["handback_request"] = handback_request
                 
+                    # Break out of the loop - run is paused for human attention
+                    break
+                elif normalized in {"WAIT", "WAIT;"} or action.strip().startswith("WAIT"):
+                    execution_mode = "wait"
+                    emit_event(
+                        "runner.step.execution.started",
+                        {
+                            "step": step_index,
+                            "mode": execution_mode,
+                        },
+                    )
+                    after_screenshot_bytes, screen_settled = _capture_after(step_index, action, 1.5)
+                elif action.strip():
+                    execution_mode = "controller_execute"
+                    emit_event(
+                        "runner.step.execution.started",
+                        {
+                            "step": step_index,
+                            "mode": execution_mode,
+                            "exec_code": exec_code,
+                        },
+                    )
+                    with LATENCY_LOGGER.measure("runner", "execute_action", extra={"step": step_index}):
+                        execution_result = _execute_remote_pyautogui(controller, action)
+                    if "pyautogui.click" in action.lower():
+                        did_click_action = True
+                    after_screenshot_bytes, screen_settled = _capture_after(step_index, action, 1.0)
+                    try:
+                        agent.executor.update_latest_screenshot(after_screenshot_bytes)
+                    except Exception:
+                        pass
+                    execution_details["result"] = execution_result
+                else:
+                    execution_mode = "noop"
+                    emit_event(
+                        "runner.step.execution.started",
+                        {
+                            "step": step_index,
+                            "mode": execution_mode,
+                        },
+                    )
+                    after_screenshot_bytes, screen_settled = _capture_after(step_index, action, 1.0)
+
                 emit_event(
                     "runner.step.execution.completed",
                     {
                         **execution_details,
                         "mode": execution_mode,
-                        "did_click": False,
-                    },
-                )
-                
-                emit_event(
-                    "runner.step.completed",
-                    {
-                        "step": step_index,
-                        "status": status,
-                        "action": action,
-                        "completion_reason": completion_reason,
-                    },
-                )
-                
-                # Break out of the loop - run is paused for human attention
-                break
-            elif normalized in {"WAIT", "WAIT;"} or action.strip().startswith("WAIT"):
-                execution_mode = "wait"
-                emit_event(
-                    "runner.step.execution.started",
-                    {
-                        "step": step_index,
-                        "mode": execution_mode,
-                    },
-                )
-                agent_signal.sleep_with_interrupt(1.5)
-                with LATENCY_LOGGER.measure("runner", "capture_screenshot", extra={"phase": "after", "step": step_index}):
-                    after_screenshot_bytes = controller.capture_screenshot()
-            elif action.strip():
-                execution_mode = "controller_execute"
-                emit_event(
-                    "runner.step.execution.started",
-                    {
-                        "step": step_index,
-                        "mode": execution_mode,
-                        "exec_code": exec_code,
+                        "did_click": did_click_action if execution_mode == "controller_execute" else False,
                     },
                 )
-                with LATENCY_LOGGER.measure("runner", "execute_action", extra={"step": step_index}):
-                    execution_result = _execute_remote_pyautogui(controller, action)
-                if "pyautogui.click" in action.lower():
-                    did_click_action = True
-                agent_signal.sleep_with_interrupt(1.0)
-                with LATENCY_LOGGER.measure("runner", "capture_screenshot", extra={"phase": "after", "step": step_index}):
-                    after_screenshot_bytes = controller.capture_screenshot()
-                try:
-                    agent.executor.update_latest_screenshot(after_screenshot_bytes)
-                except Exception:
-                    pass
-                execution_details["result"] = execution_result
-            else:
-                execution_mode = "noop"
-                emit_event(
-                    "runner.step.execution.started",
-                    {
-                        "step": step_index,
-                        "mode": execution_mode,
-                    },
-                )
-                agent_signal.sleep_with_interrupt(1.0)
-                with LATENCY_LOGGER.measure("runner", "capture_screenshot", extra={"phase": "after", "step": step_index}):
-                    after_screenshot_bytes = controller.capture_screenshot()
-
-            emit_event(
-                "runner.step.execution.completed",
-                {
-                    **execution_details,
-                    "mode": execution_mode,
-                    "did_click": did_click_action if execution_mode == "controller_execute" else False,
-                },
-            )
-
-            step_completion_reason = completion_reason if status != "in_progress" else None
-            html_logger.log_step(
-                step_index=step_index,
-                action=action,
-                exec_code=exec_code,
-                execution_mode=execution_mode,
-                status=status,
-                completion_reason=step_completion_reason,
-                plan=info.get("plan"),
-                reflection=info.get("reflection"),
-                handback_request=handback_request if execution_mode == "handback_to_human" else None,
-                behavior_fact=None,
-                behavior_thoughts=None,
-                before_img=step_before_bytes,
-                after_img=after_screenshot_bytes,
-                delayed_after_img=None,
-                marked_before_img=None,
-                marked_after_img=None,
-                zoomed_after_img=None,
-            )
-
-            agent_signal.raise_if_exit_requested()
-            agent_signal.wait_for_resume()
-
-            with LATENCY_LOGGER.measure("runner", "behavior_narrator", extra={"step": step_index}):
-                behavior = behavior_narrator.judge(
-                    screenshot_num=step_index,
-                    before_img_bytes=before_screenshot_bytes,
-                    after_img_bytes=after_screenshot_bytes,
-                    pyautogui_action=action,
+
+                step_completion_reason = completion_reason if status != "in_progress" else None
+                html_logger.log_step(
+                    step_index=step_index,
+                    action=action,
+                    exec_code=exec_code,
+                    execution_mode=execution_mode,
+                    status=status,
+                    completion_reason=step_completion_reason,
+                    plan=info.get("plan"),
+                    reflection=info.get("reflection"),
+                    handback_request=handback_request if execution_mode == "handback_to_human" else None,
+                    behavior_fact=None,
+                    behavior_thoughts=None,
+                    before_img=step_before_bytes,
+                    after_img=after_screenshot_bytes,
+                    delayed_after_img=None,
+                    marked_before_img=None,
+                    marked_after_img=None,
+                    zoomed_after_img=None,
                 )
 
-            behavior_artifacts = None
-            if isinstance(behavior, dict):
-                behavior_artifacts = behavior.pop("artifacts", None)
+                agent_signal.raise_if_exit_requested()
+                agent_signal.wait_for_resume()
 
-            steps.append(
-                RunnerStep(
+                step_record = RunnerStep(
                     step_index=step_index,
                     plan=info.get("plan", ""),
                     action=action,
@@ -822,89 +864,68 @@ def runner(
                     reflection=info.get("reflection"),
                     reflection_thoughts=info.get("reflection_thoughts"),
                     info=info,
-                    behavior_fact_thoughts=behavior.get("fact_thoughts") if behavior else None,
-                    behavior_fact_answer=behavior.get("fact_answer") if behavior else None,
                     action_kind="gui",
                 )
-            )
-
-            previous_behavior_result = behavior
-
-            emit_event(
-                "runner.step.completed",
-                {
-                    "step": step_index,
-                    "status": status if normalized in {"DONE", "FAIL"} else "in_progress",
+                steps.append(step_record)
+                is_final = normalized in {"DONE", "FAIL"}
+
+                delayed_after_screenshot_bytes = after_screenshot_bytes
+                # A settled after-frame already reflects the click's effects; only
+                # re-capture when settle timed out or fixed delays are in use.
+                # Captured before submitting so a synchronous narration logs it.
+                if not is_final and did_click_action and worker_post_action_delay > 0 and not screen_settled:
+                    agent_signal.raise_if_exit_requested()
+                    agent_signal.wait_for_resume()
+                    agent_signal.sleep_with_interrupt(worker_post_action_delay)
+                    with LATENCY_LOGGER.measure("runner", "capture_screenshot", extra={"phase": "after_delayed", "step": step_index}):
+                        delayed_after_screenshot_bytes = controller.capture_screenshot()
+
+                narration_log_kwargs: Dict[str, Any] = {
+                    "step_index": step_index,
                     "action": action,
-                    "completion_reason": completion_reason if normalized in {"DONE", "FAIL"} else None,
-                },
-            )
-            emit_event(
-                "runner.step.behavior",
-                {
-                    "step": step_index,
-                    "fact_answer": behavior.get("fact_answer") if behavior else None,
-                    "fact_thoughts": behavior.get("fact_thoughts") if behavior else None,
-                },
-            )
-
-            if normalized in {"DONE", "FAIL"}:
-                html_logger.log_step(
+                    "exec_code": exec_code,
+                    "execution_mode": execution_mode,
+                    "status": status if is_final else "in_progress",
+                    "completion_reason": completion_reason if is_final else None,
+                    "plan": info.get("plan"),
+                    "reflection": info.get("reflection"),
+                    "handback_request": None,
+                    "before_img": step_before_bytes,
+                    "after_img": after_screenshot_bytes,
+                    "delayed_after_img": (
+                        delayed_after_screenshot_bytes
+                        if delayed_after_screenshot_bytes != after_screenshot_bytes
+                        else None
+                    ),
+                }
+                previous_behavior_result = narration_queue.submit(
                     step_index=step_index,
-                    action=action,
-                    exec_code=exec_code,
-                    execution_mode=execution_mode,
-                    status=status,
-                    completion_reason=completion_reason,
-                    plan=info.get("plan"),
-                    reflection=info.get("reflection"),
-                    handback_request=None,
-                    behavior_fact=behavior.get("fact_answer") if behavior else None,
-                    behavior_thoughts=behavior.get("fact_thoughts") if behavior else None,
-                    before_img=step_before_bytes,
-                    after_img=after_screenshot_bytes,
-                    delayed_after_img=None,
-                    marked_before_img=(behavior_artifacts or {}).get("marked_before_img_bytes"),
-                    marked_after_img=(behavior_artifacts or {}).get("marked_after_img_bytes"),
-                    zoomed_after_img=(behavior_artifacts or {}).get("zoomed_after_img_bytes"),
+                    before_img_bytes=before_screenshot_bytes,
+                    after_img_bytes=after_screenshot_bytes,
+                    pyautogui_action=action,
+                    on_done=_on_narration_done(step_record, narration_log_kwargs),
                 )
-                break
 
-            delayed_after_screenshot_bytes = after_screenshot_bytes
-            if did_click_action and worker_post_action_delay > 0:
-                agent_signal.raise_if_exit_requested()
-                agent_signal.wait_for_resume()
-                agent_signal.sleep_with_interrupt(worker_post_action_delay)
-                with LATENCY_LOGGER.measure("runner", "capture_screenshot", extra={"phase": "after_delayed", "step": step_index}):
-                    delayed_after_screenshot_bytes = controller.capture_screenshot()
-
-            reflection_screenshot_bytes = delayed_after_screenshot_bytes
-            before_screenshot_bytes = delayed_after_screenshot_bytes
-
-            html_logger.log_step(
-                step_index=step_index,
-                action=action,
-                exec_code=exec_code,
-                execution_mode=execution_mode,
-                status="in_progress",
-                completion_reason=None,
-                plan=info.get("plan"),
-                reflection=info.get("reflection"),
-                handback_request=None,
-                behavior_fact=behavior.get("fact_answer") if behavior else None,
-                behavior_thoughts=behavior.get("fact_thoughts") if behavior else None,
-                before_img=step_before_bytes,
-                after_img=after_screenshot_bytes,
-                delayed_after_img=delayed_after_screenshot_bytes
-                if delayed_after_screenshot_bytes != after_screenshot_bytes
-                else None,
-                marked_before_img=(behavior_artifacts or {}).get("marked_before_img_bytes"),
-                marked_after_img=(behavior_artifacts or {}).get("marked_after_img_bytes"),
-                zoomed_after_img=(behavior_artifacts or {}).get("zoomed_after_img_bytes"),
-            )
-
-        else:
-            status = "timeout"
+                emit_event(
+                    "runner.step.completed",
+                    {
+                        "step": step_index,
+                        "status": status if is_final else "in_progress",
+                        "action": action,
+                        "completion_reason": completion_reason if is_final else None,
+                    },
+                )
+
+                if is_final:
+                    break
+
+                reflection_screenshot_bytes = delayed_after_screenshot_bytes
+                before_screenshot_bytes = delayed_after_screenshot_bytes
+
+            else:
+                status = "timeout"
+        finally:
+            narration_queue.close()
 
         grounding_prompts = _build_grounding_prompts(
             grounding_cfg.grounding_system_prompt
@@ -944,6 +965,8 @@ def runner(
                 "completion_reason": completion_reason,
                 "steps": len(steps),
                 "handback_request": handback_request_str,
+                "grounding_cache": grounding_agent.coord_cache.stats(),
+                "screenshot_store": html_logger.store_stats(),
             },
         )
 
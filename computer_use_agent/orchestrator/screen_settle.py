@@ -0,0 +1,137 @@
+"""
+Adaptive screen-settle detection for the computer-use loop.
+
+After an action the runner used to sleep a fixed 1.0–1.5s before taking the
+after-screenshot: wasted time for instant UI changes, too short for slow page
+loads. `wait_for_screen_settle` instead polls screenshots, compares perceptual
+hashes (`ImageProcessor.dhash`) and returns as soon as the screen has stayed
+unchanged for a stability window, bounded by per-action minimum/maximum waits.
+The last polled frame doubles as the after-screenshot.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional
+
+from computer_use_agent.utils.image_processor import ImageProcessor
+from shared import agent_signal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SettleConfig:
+    min_wait_s: float = 0.3  # always give the UI this long to start reacting
+    max_wait_s: float = 5.0  # stop polling (and use the latest frame) after this
+    stable_s: float = 0.5  # screen must be unchanged for this long
+    poll_s: float = 0.25
+    hash_size: int = 16
+    max_distance: int = 2  # dHash bits allowed to differ (cursor blink, clock tick)
+
+
+SETTLE_DEFAULTS: Dict[str, SettleConfig] = {
+    "click": SettleConfig(min_wait_s=0.3, max_wait_s=6.0, stable_s=0.6),
+    "type": SettleConfig(min_wait_s=0.2, max_wait_s=3.0, stable_s=0.4),
+    "hotkey": SettleConfig(min_wait_s=0.3, max_wait_s=6.0, stable_s=0.6),
+    "scroll": SettleConfig(min_wait_s=0.2, max_wait_s=3.0, stable_s=0.4),
+    "drag": SettleConfig(min_wait_s=0.3, max_wait_s=4.0, stable_s=0.5),
+    "wait": SettleConfig(min_wait_s=1.0, max_wait_s=10.0, stable_s=1.0),
+    "noop": SettleConfig(min_wait_s=0.2, max_wait_s=2.0, stable_s=0.4),
+    "default": SettleConfig(),
+}
+
+_ACTION_PATTERNS = (
+    ("drag", re.compile(r"pyautogui\.(dragTo|dragRel|drag)\b|mouseDown", re.IGNORECASE)),
+    ("hotkey", re.compile(r"pyautogui\.(hotkey|press|keyDown)\b", re.IGNORECASE)),
+    ("type", re.compile(r"pyautogui\.(write|typewrite)\b", re.IGNORECASE)),
+    ("scroll", re.compile(r"pyautogui\.(scroll|hscroll|vscroll)\b", re.IGNORECASE)),
+    ("click", re.compile(r"pyautogui\.(click|doubleClick|tripleClick|rightClick|middleClick)\b", re.IGNORECASE)),
+)
+
+
+def classify_action(action: str) -> str:
+    """Map an executed action string to a SETTLE_DEFAULTS key."""
+    text = (action or "").strip()
+    if not text:
+        return "noop"
+    if text.upper().startswith("WAIT"):
+        return "wait"
+    # Multi-statement actions take the first matching kind in _ACTION_PATTERNS order.
+    for name, pattern in _ACTION_PATTERNS:
+        if pattern.search(text):
+            return name
+    return "default"
+
+
+def settle_config_for(action_type: str, **overrides: float) -> SettleConfig:
+    config = SETTLE_DEFAULTS.get(action_type) or SETTLE_DEFAULTS["default"]
+    return replace(config, **overrides) if overrides else config
+
+
+@dataclass
+class SettleResult:
+    frame: bytes
+    settled: bool
+    elapsed_s: float
+    frames: int
+    action_type: str
+
+
+_EPSILON_S = 1e-6
+
+
+def wait_for_screen_settle(
+    capture: Callable[[], bytes],
+    *,
+    action_type: str = "default",
+    config: Optional[SettleConfig] = None,
+    sleep: Callable[[float], None] = agent_signal.sleep_with_interrupt,
+    clock: Callable[[], float] = time.monotonic,
+) -> SettleResult:
+    """
+    Poll `capture` until consecutive frames stay perceptually identical for
+    `stable_s`, or `max_wait_s` elapses. Returns the last frame captured.
+    """
+    cfg = config or settle_config_for(action_type)
+    started = clock()
+    sleep(cfg.min_wait_s)
+
+    frame = capture()
+    frames = 1
+    last_hash = ImageProcessor.dhash(frame, hash_size=cfg.hash_size)
+    stable_since = clock()
+    while True:
+        now = clock()
+        if now - stable_since >= cfg.stable_s - _EPSILON_S:
+            settled = True
+            break
+        if now - started >= cfg.max_wait_s - _EPSILON_S:
+            settled = False
+            break
+        sleep(min(cfg.poll_s, max(0.0, cfg.max_wait_s - (now - started))))
+        frame = capture()
+        frames += 1
+        current = ImageProcessor.dhash(frame, hash_size=cfg.hash_size)
+        if ImageProcessor.hamming_distance(current, last_hash) > cfg.max_distance:
+            stable_since = clock()
+        last_hash = current
+
+    elapsed = clock() - started
+    logger.debug(
+        "screen settle action=%s settled=%s elapsed=%.2fs frames=%s", action_type, settled, elapsed, frames
+    )
+    return SettleResult(frame=frame, settled=settled, elapsed_s=elapsed, frames=frames, action_type=action_type)
+
+
+__all__ = [
+    "SETTLE_DEFAULTS",
+    "SettleConfig",
+    "SettleResult",
+    "classify_action",
+    "settle_config_for",
+    "wait_for_screen_settle",
+]
@@ -0,0 +1,89 @@
+from pathlib import Path
+import sys
+import time
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from computer_use_agent.grounding.coord_cache import GroundingCoordCache, normalize_ref_expr
+from computer_use_agent.utils.screenshot import Screenshot
+
+
+def _screen(dialog: bool = False, cursor: bool = False, button_x: int = 400) -> Screenshot:
+    img = np.full((360, 640, 3), 235, dtype=np.uint8)
+    cv2.rectangle(img, (0, 0), (640, 30), (50, 50, 50), -1)
+    cv2.rectangle(img, (40, 60), (300, 320), (30, 120, 200), -1)
+    cv2.rectangle(img, (button_x, 200), (button_x + 40, 214), (60, 60, 60), -1)
+    if cursor:
+        cv2.line(img, (400, 100), (400, 112), (0, 0, 0), 1)
+    if dialog:
+        cv2.rectangle(img, (160, 80), (560, 300), (250, 250, 250), -1)
+    ok, buf = cv2.imencode(".png", img)
+    assert ok
+    return Screenshot(buf.tobytes())
+
+
+MODEL = "service:http://grounding.test@1920x1080"
+
+
+def test_repeated_lookup_on_unchanged_screen_hits():
+    cache = GroundingCoordCache()
+    shot = _screen()
+    assert cache.get(shot, "the Save button", MODEL) is None
+    cache.put(shot, "the Save button", MODEL, [812, 440])
+
+    started = time.perf_counter()
+    for _ in range(100):
+        assert cache.get(shot, "  The  save button. ", MODEL) == [812, 440]
+    assert (time.perf_counter() - started) / 100 < 1e-3
+    assert cache.get(shot, "the Save button", "llm:o4-mini@1920x1080") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 100 and stats["misses"] == 2
+
+
+def test_default_requires_an_identical_screen():
+    cache = GroundingCoordCache()
+    cache.put(_screen(), "OK button", MODEL, [420, 207])
+
+    assert cache.get(_screen(), "OK button", MODEL) == [420, 207]
+    # A 30px layout shift leaves the whole-frame dHash within 2 bits; it must still miss.
+    assert cache.get(_screen(button_x=430), "OK button", MODEL) is None
+    assert cache.get(_screen(cursor=True), "OK button", MODEL) is None
+
+
+def test_opt_in_tolerance_rechecks_the_tile_around_the_point():
+    cache = GroundingCoordCache(max_distance=2)
+    cache.put(_screen(), "OK button", MODEL, [1260, 621], coord_size=(1920, 1080))
+
+    assert cache.get(_screen(button_x=430), "OK button", MODEL, coord_size=(1920, 1080)) is None
+    assert cache.stats()["invalidations"] == 0
+
+
+def test_small_changes_tolerated_but_screen_change_invalidates():
+    cache = GroundingCoordCache(max_distance=2)
+    cache.put(_screen(), "search box", MODEL, [100, 200])
+
+    assert cache.get(_screen(cursor=True), "search box", MODEL) == [100, 200]
+    assert cache.get(_screen(dialog=True), "search box", MODEL) is None
+    assert cache.stats()["invalidations"] == 1
+    # Returning to the original screen does not resurrect dropped entries.
+    assert cache.get(_screen(), "search box", MODEL) is None
+
+
+def test_disabled_and_bounded():
+    disabled = GroundingCoordCache(max_entries=0)
+    shot = _screen()
+    disabled.put(shot, "x", MODEL, [1, 2])
+    assert disabled.get(shot, "x", MODEL) is None
+
+    cache = GroundingCoordCache(max_entries=2)
+    for name in ("a", "b", "c"):
+        cache.put(shot, name, MODEL, [0, 0])
+    assert cache.get(shot, "a", MODEL) is None
+    assert cache.stats()["entries"] == 2
+    assert normalize_ref_expr("  The\n Save  button. ") == "the save button"
@@ -0,0 +1,86 @@
+from pathlib import Path
+import sys
+
+import cv2
+import httpx
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from computer_use_agent.grounding import grounding_client
+from computer_use_agent.grounding.grounding_client import GroundingServiceClient
+from computer_use_agent.utils.screenshot import Screenshot
+
+
+def _client(handler):
+    return GroundingServiceClient("http://grounding.test", transport=httpx.MockTransport(handler))
+
+
+def test_retries_with_jittered_backoff_then_succeeds(monkeypatch):
+    calls = []
+    sleeps = []
+    monkeypatch.setattr(grounding_client.random, "uniform", lambda lo, hi: hi)
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"response": "click(10, 20)"})
+
+    result = _client(handler).post_json(
+        "/call_llm", {"x": 1}, timeout_s=5, max_attempts=3, sleep=sleeps.append
+    )
+
+    assert result == {"response": "click(10, 20)"}
+    assert len(calls) == 3
+    assert sleeps == [0.25, 0.5]
+
+
+def test_parse_errors_count_as_failed_attempts():
+    retries = []
+    client = _client(lambda request: httpx.Response(200, json={"response": "no coords"}))
+
+    def parse(data):
+        raise ValueError("no coordinates")
+
+    with pytest.raises(ValueError, match="no coordinates"):
+        client.post_json(
+            "/call_llm",
+            {},
+            timeout_s=5,
+            max_attempts=2,
+            parse=parse,
+            on_retry=lambda attempt, exc: retries.append(attempt),
+            sleep=lambda s: None,
+        )
+    assert retries == [1, 2]
+
+
+def test_deadline_clips_attempt_timeouts():
+    seen = []
+
+    def handler(request):
+        seen.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json={})
+
+    _client(handler).post_json("/call_llm", {}, timeout_s=30, max_attempts=3, deadline_s=2)
+    assert 0 < seen[0] <= 2
+
+
+def test_screenshot_decodes_and_encodes_once():
+    img = np.zeros((90, 160, 3), dtype=np.uint8)
+    ok, buf = cv2.imencode(".png", img)
+    assert ok
+    raw = buf.tobytes()
+
+    shot = Screenshot.from_data(raw)
+    assert shot.size == (160, 90)
+    assert shot._pil is None  # size came from the PNG header
+    first = shot.webp_base64
+    assert Screenshot.from_data(raw) is shot
+    assert Screenshot.from_data("data:image/png;base64," + shot.base64) is shot
+    assert shot.webp_base64 is first
+    assert shot.webp[:4] == b"RIFF"
@@ -0,0 +1,101 @@
+from pathlib import Path
+import copy
+import gc
+import json
+import os
+import resource
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from computer_use_agent.core.mllm import LMMAgent
+from computer_use_agent.orchestrator.runner import _build_trajectory_till_now, _prune_images_in_messages
+from computer_use_agent.utils.image_handle import ImageHandle, live_image_count, resolve_message_images
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+class _Engine:
+    def __init__(self):
+        self.requests = []
+
+    def generate(self, messages, **kwargs):
+        self.requests.append(messages)
+        return "ok"
+
+
+def _screenshot(step: int, size: int = 1 << 20) -> bytes:
+    return PNG_HEADER + step.to_bytes(4, "big") + os.urandom(size)
+
+
+def test_messages_hold_shared_handles_and_materialize_on_send():
+    engine = _Engine()
+    agent = LMMAgent(engine=engine)
+    shot = _screenshot(0, size=64)
+    agent.add_message("first", image_content=shot, role="user")
+    agent.add_message("again", image_content=shot, role="user")
+
+    first = agent.messages[1]["content"][1]["image_url"]["url"]
+    second = agent.messages[2]["content"][1]["image_url"]["url"]
+    assert isinstance(first, ImageHandle) and first is second
+    assert copy.deepcopy(agent.messages)[1]["content"][1]["image_url"]["url"] is first
+
+    agent.get_response()
+    sent_url = engine.requests[0][1]["content"][1]["image_url"]["url"]
+    assert isinstance(sent_url, str) and sent_url.startswith("data:image/png;base64,")
+    # Messages without images are passed through, not rebuilt.
+    assert engine.requests[0][0] is agent.messages[0]
+
+
+def test_structural_pruning_keeps_latest_image_turns():
+    agent = LMMAgent(engine=_Engine())
+    for step in range(5):
+        agent.add_message(f"step {step}", image_content=_screenshot(step, size=16), role="user")
+        agent.add_message("reply", role="assistant")
+
+    pruned = _prune_images_in_messages(agent.messages, keep_image_turns=2, persist_images=True)
+
+    with_images = [i for i, msg in enumerate(pruned) if len(msg["content"]) > 1]
+    assert with_images == [7, 9]
+    assert pruned[9] is agent.messages[9]
+    assert all(len(msg["content"]) == 1 for msg in _prune_images_in_messages(agent.messages))
+
+
+def test_peak_rss_stays_flat_over_200_step_run():
+    engine = _Engine()
+    generator = LMMAgent(engine=engine)
+    peaks = {}
+    for step in range(200):
+        generator.add_message(f"Step {step}: observe", image_content=_screenshot(step), role="user")
+        generator.get_response()
+        generator.add_message("pyautogui.click(10, 10)", role="assistant")
+        generator.messages = _prune_images_in_messages(generator.messages, keep_image_turns=2, persist_images=True)
+        engine.requests.clear()
+        if step % 20 == 0:
+            snapshot = _build_trajectory_till_now([], generator.messages, [])
+            json.dumps(snapshot)
+            del snapshot
+        if step in (50, 199):
+            gc.collect()
+            peaks[step] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+
+    assert live_image_count() <= 4
+    # ~1 MiB of new screenshot bytes per step; retaining them would add ~150 MiB.
+    assert peaks[199] - peaks[50] < 32 * 1024
+
+
+def test_snapshot_serializes_each_image_once_and_resolves_to_handles():
+    shot = _screenshot(7, size=4096)
+    generator = LMMAgent(engine=_Engine())
+    reflection = LMMAgent(engine=_Engine())
+    generator.add_message("observe", image_content=shot, role="user")
+    reflection.add_message("reflect", image_content=shot, role="user")
+
+    snapshot = json.loads(json.dumps(_build_trajectory_till_now([], generator.messages, reflection.messages)))
+
+    assert len(snapshot["images"]) == 1
+    restored = resolve_message_images(snapshot["generator_messages"], snapshot["images"])
+    handle = restored[0]["content"][1]["image_url"]["url"]
+    assert handle is generator.messages[1]["content"][1]["image_url"]["url"]
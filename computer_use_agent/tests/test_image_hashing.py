@@ -0,0 +1,91 @@
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from computer_use_agent.utils import image_processor
+from computer_use_agent.utils.image_processor import (
+    DecodedImageCache,
+    ImageProcessor,
+    hash_bits_to_int,
+    pack_hash_bits,
+)
+
+
+def _png(seed: int) -> bytes:
+    rng = np.random.default_rng(seed)
+    img = cv2.resize(rng.integers(0, 255, (12, 18, 3), dtype=np.uint8), (360, 240), interpolation=cv2.INTER_NEAREST)
+    ok, buf = cv2.imencode(".png", img)
+    assert ok
+    return buf.tobytes()
+
+
+def _loop_dhash(image_bytes: bytes, hash_size: int) -> int:
+    color = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    gray = cv2.cvtColor(color, cv2.COLOR_BGR2GRAY)
+    pixels = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA).astype(np.float32)
+    value = 0
+    for bit in (pixels[:, 1:] > pixels[:, :-1]).flatten():
+        value = (value << 1) | int(bit)
+    return value
+
+
+@pytest.mark.parametrize("hash_size", [8, 16, 5])
+def test_vectorized_dhash_matches_bitwise_reference(hash_size):
+    frame = _png(1)
+    assert ImageProcessor.dhash(frame, hash_size=hash_size) == _loop_dhash(frame, hash_size)
+
+
+@pytest.mark.parametrize("method", ["dhash", "ahash", "phash"])
+def test_batch_hashing_matches_single_frame_hashes(method):
+    frames = [_png(seed) for seed in range(4)]
+    batch = ImageProcessor.hash_frames(frames, method=method)
+    single = getattr(ImageProcessor, f"{method}_bits")
+    assert batch.shape == (4, 1) and batch.dtype == np.uint64
+    for row, frame in zip(batch, frames):
+        assert np.array_equal(row, single(frame))
+
+
+def test_hamming_distance_on_ints_and_packed_words():
+    bits = np.zeros((3, 100), dtype=bool)
+    bits[1, :7] = True
+    bits[2, 90:] = True
+    packed = pack_hash_bits(bits)
+    assert packed.shape == (3, 2)
+    assert ImageProcessor.hamming_distance(packed, packed[0]).tolist() == [0, 7, 10]
+    a, b = (hash_bits_to_int(row, 100) for row in packed[1:])
+    assert ImageProcessor.hamming_distance(a, b) == 17
+
+
+def test_similar_frames_hash_close_and_different_frames_far():
+    base = cv2.imdecode(np.frombuffer(_png(7), np.uint8), cv2.IMREAD_COLOR)
+    noisy = np.clip(base.astype(np.int16) + 3, 0, 255).astype(np.uint8)
+    other = cv2.imdecode(np.frombuffer(_png(8), np.uint8), cv2.IMREAD_COLOR)
+    hashes = ImageProcessor.hash_frames([base, noisy, other], method="phash")
+    distances = ImageProcessor.hamming_distance(hashes, hashes[0])
+    assert distances[1] <= 4
+    assert distances[2] >= 16
+
+
+def test_decoded_image_cache_decodes_each_screenshot_once(monkeypatch):
+    cache = DecodedImageCache(max_entries=2)
+    monkeypatch.setattr(image_processor, "_DECODED_CACHE", cache)
+    frame = _png(3)
+
+    ImageProcessor.dhash(frame)
+    ImageProcessor.phash(frame)
+    ImageProcessor.ahash(frame)
+    decoded = ImageProcessor.decode_image(frame)
+
+    # One colour decode and one grayscale conversion, shared by every consumer.
+    assert cache.misses == 2
+    assert not decoded.flags.writeable
+    ImageProcessor.decode_image(_png(4))
+    ImageProcessor.decode_image(_png(5))
+    assert len(cache._entries) == 2
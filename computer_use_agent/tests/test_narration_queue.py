@@ -0,0 +1,121 @@
+from pathlib import Path
+import sys
+import threading
+import time
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from computer_use_agent.utils.behavior_narrator import NarrationQueue, PendingNarration, resolve_narration
+
+JUDGE_LATENCY_S = 0.2
+
+
+class _FakeNarrator:
+    def __init__(self, latency_s: float = JUDGE_LATENCY_S, fail_on=()):
+        self.latency_s = latency_s
+        self.fail_on = set(fail_on)
+        self.threads = []
+
+    def judge(self, screenshot_num, before_img_bytes, after_img_bytes, pyautogui_action):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(self.latency_s)
+        if screenshot_num in self.fail_on:
+            raise RuntimeError("judge failed")
+        return {
+            "fact_thoughts": f"thoughts {screenshot_num}",
+            "fact_answer": f"Fact Caption from Screenshot {screenshot_num}: {pyautogui_action}",
+        }
+
+
+def _submit(queue: NarrationQueue, step: int, done: list) -> PendingNarration:
+    return queue.submit(
+        step_index=step,
+        before_img_bytes=b"before",
+        after_img_bytes=b"after",
+        pyautogui_action=f"pyautogui.click({step}, {step})",
+        on_done=lambda behavior: done.append((step, behavior)),
+    )
+
+
+def test_submit_returns_before_the_judge_finishes():
+    narrator = _FakeNarrator()
+    queue = NarrationQueue(narrator, lag_limit=1)
+    done: list = []
+
+    started = time.perf_counter()
+    pending = _submit(queue, 1, done)
+    assert time.perf_counter() - started < JUDGE_LATENCY_S / 2
+    assert not pending.done() and done == []
+
+    behavior = resolve_narration(pending)
+    assert behavior["fact_answer"].endswith("pyautogui.click(1, 1)")
+    assert narrator.threads[0].startswith("narrator")
+
+    queue.close()
+    assert done == [(1, behavior)]
+
+
+def test_step_loop_overlaps_narration_with_the_next_step():
+    queue = NarrationQueue(_FakeNarrator(), lag_limit=1)
+    done: list = []
+    step_work_s = JUDGE_LATENCY_S
+
+    started = time.perf_counter()
+    previous = None
+    for step in range(1, 5):
+        # The worker's reflection call runs before it needs the narration.
+        time.sleep(step_work_s)
+        behavior = resolve_narration(previous)
+        if step > 1:
+            assert behavior["fact_answer"].startswith(f"Fact Caption from Screenshot {step - 1}")
+        previous = _submit(queue, step, done)
+    queue.close()
+    elapsed = time.perf_counter() - started
+
+    serial = 4 * (step_work_s + JUDGE_LATENCY_S)
+    assert elapsed < serial - 2 * JUDGE_LATENCY_S
+    assert [step for step, _ in done] == [1, 2, 3, 4]
+
+
+def test_lag_limit_bounds_pending_narrations_and_finishes_in_order():
+    queue = NarrationQueue(_FakeNarrator(latency_s=0.05), lag_limit=2)
+    done: list = []
+    for step in range(1, 6):
+        _submit(queue, step, done)
+        assert queue.pending_count() <= 2
+    # Callbacks only ever run on this thread, oldest first.
+    assert [step for step, _ in done] == list(range(1, len(done) + 1))
+    queue.drain()
+    assert queue.pending_count() == 0
+    assert [step for step, _ in done] == [1, 2, 3, 4, 5]
+    queue.close()
+
+
+def test_failed_narration_resolves_to_none():
+    queue = NarrationQueue(_FakeNarrator(latency_s=0.0, fail_on={2}), lag_limit=1)
+    done: list = []
+    _submit(queue, 1, done)
+    pending = _submit(queue, 2, done)
+    assert resolve_narration(pending) is None
+    queue.close()
+    assert done[1] == (2, None)
+    assert done[0][1]["fact_answer"].startswith("Fact Caption from Screenshot 1")
+
+
+def test_zero_lag_limit_narrates_inline():
+    narrator = _FakeNarrator(latency_s=0.0)
+    queue = NarrationQueue(narrator, lag_limit=0)
+    done: list = []
+    pending = _submit(queue, 1, done)
+    assert pending.done()
+    assert done[0][0] == 1
+    assert narrator.threads == [threading.current_thread().name]
+    queue.close()
+
+
+def test_resolve_narration_passes_plain_values_through():
+    behavior = {"fact_answer": "x"}
+    assert resolve_narration(behavior) is behavior
+    assert resolve_narration(None) is None
@@ -0,0 +1,136 @@
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from computer_use_agent.grounding.ocr_cache import OcrCache, build_ocr_table
+from computer_use_agent.utils.screenshot import Screenshot
+
+
+class _LayoutOcr:
+    """Fake OCR engine: each word is drawn as a box in its own gray level."""
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.calls = []
+
+    def __call__(self, image):
+        self.calls.append(image.size)
+        pixels = np.asarray(image.convert("L"))
+        data = {key: [] for key in ("text", "block_num", "left", "top", "width", "height")}
+        for (_, _, width, height), text in self.layout.items():
+            ys, xs = np.nonzero(pixels == _level(text))
+            if len(xs) == 0 or np.ptp(xs) + 1 != width or np.ptp(ys) + 1 != height:
+                continue  # absent or cut by the crop edge
+            data["text"].append(text)
+            data["block_num"].append(1)
+            data["left"].append(int(xs.min()))
+            data["top"].append(int(ys.min()))
+            data["width"].append(width)
+            data["height"].append(height)
+        return data
+
+
+_VOCAB = ["File", "Edit", "Hello", "World", "Footer", "---", "Notes", "Draft"]
+
+
+def _level(text):
+    return 10 + _VOCAB.index(text) * 20
+
+
+def _render(layout):
+    img = np.full((480, 640), 255, dtype=np.uint8)
+    for (left, top, width, height), text in layout.items():
+        img[top : top + height, left : left + width] = _level(text)
+    ok, buf = cv2.imencode(".png", img)
+    assert ok
+    return Screenshot(buf.tobytes())
+
+
+LAYOUT = {
+    (20, 20, 80, 20): "File",
+    (120, 20, 80, 20): "Edit",
+    (20, 200, 120, 20): "Hello",
+    (400, 400, 100, 20): "Footer",
+    (300, 300, 40, 20): "---",
+}
+
+
+def test_same_screenshot_is_read_once():
+    engine = _LayoutOcr(LAYOUT)
+    cache = OcrCache(ocr_fn=engine)
+    shot = _render(LAYOUT)
+
+    first = cache.words(shot)
+    second = cache.words(shot)
+
+    assert [w["text"] for w in first] == [w["text"] for w in second]
+    assert len(engine.calls) == 1
+    # Tokens without letters are dropped.
+    assert "---" not in {w["text"] for w in first}
+
+
+def test_only_changed_tiles_are_re_read():
+    engine = _LayoutOcr(LAYOUT)
+    cache = OcrCache(ocr_fn=engine)
+    cache.words(_render(LAYOUT))
+
+    # One word replaced in place: only that box's pixels change.
+    changed = {box: ("World" if text == "Hello" else text) for box, text in LAYOUT.items()}
+    engine.layout = changed
+    engine.calls.clear()
+
+    words = cache.words(_render(changed))
+
+    # Same line-by-line order a full scan of the new frame produces.
+    assert [w["text"] for w in words] == ["File", "Edit", "World", "Footer"]
+    assert len(engine.calls) == 1
+    width, height = engine.calls[0]
+    assert width * height < 640 * 480 / 4
+    world = next(w for w in words if w["text"] == "World")
+    assert (world["left"], world["top"]) == (20, 200)
+
+
+def test_full_scan_and_rescan_agree_on_two_column_order():
+    # Listed column by column, the way Tesseract reports separate blocks.
+    columns = {
+        (20, 20, 80, 20): "File",
+        (20, 200, 120, 20): "Hello",
+        (400, 22, 80, 20): "Notes",
+        (400, 202, 80, 20): "Footer",
+    }
+    engine = _LayoutOcr(columns)
+    cache = OcrCache(ocr_fn=engine)
+    full = cache.words(_render(columns))
+    assert [w["text"] for w in full] == ["File", "Notes", "Hello", "Footer"]
+
+    changed = {box: ("Draft" if text == "Notes" else text) for box, text in columns.items()}
+    engine.layout = changed
+    rescanned = cache.words(_render(changed))
+    fresh = OcrCache(ocr_fn=_LayoutOcr(changed)).words(_render(changed))
+
+    assert cache.partial_scans == 1
+    # Word ids are assigned by position in this list, so the orders must match.
+    assert [w["text"] for w in rescanned] == [w["text"] for w in fresh] == ["File", "Draft", "Hello", "Footer"]
+
+
+def test_region_of_interest_reads_only_the_crop():
+    engine = _LayoutOcr(LAYOUT)
+    cache = OcrCache(ocr_fn=engine)
+    shot = _render(LAYOUT)
+
+    words = cache.words(shot, region=(0, 0, 320, 60))
+    assert sorted(w["text"] for w in words) == ["Edit", "File"]
+    assert engine.calls == [(320, 60)]
+    cache.words(shot, region=(0, 0, 320, 60))
+    assert len(engine.calls) == 1
+
+
+def test_build_ocr_table():
+    table = build_ocr_table([{"id": 0, "text": "File"}, {"id": 1, "text": "Edit"}])
+    assert table == "Text Table:\nWord id\tText\n0\tFile\n1\tEdit\n"
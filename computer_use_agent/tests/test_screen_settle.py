@@ -0,0 +1,94 @@
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from computer_use_agent.orchestrator.screen_settle import (
+    SettleConfig,
+    classify_action,
+    wait_for_screen_settle,
+)
+
+
+def _frame(progress: int) -> bytes:
+    """Synthetic 320x200 screen: a page whose content bar grows as it 'loads'."""
+    img = np.full((200, 320, 3), 240, dtype=np.uint8)
+    cv2.rectangle(img, (0, 0), (320, 24), (60, 60, 60), -1)
+    if progress:
+        cv2.rectangle(img, (20, 40), (20 + progress * 28, 180), (30, 120, 200), -1)
+    ok, buf = cv2.imencode(".png", img)
+    assert ok
+    return buf.tobytes()
+
+
+class _Replay:
+    """Replays a recorded frame sequence against a fake clock (one frame per capture)."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.index = 0
+        self.now = 0.0
+        self.slept = []
+
+    def capture(self):
+        frame = self.frames[min(self.index, len(self.frames) - 1)]
+        self.index += 1
+        return frame
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+    def clock(self):
+        return self.now
+
+
+CONFIG = SettleConfig(min_wait_s=0.2, max_wait_s=3.0, stable_s=0.5, poll_s=0.25)
+
+
+def test_returns_once_screen_is_stable():
+    frames = [_frame(0)] * 10
+    replay = _Replay(frames)
+
+    result = wait_for_screen_settle(replay.capture, config=CONFIG, sleep=replay.sleep, clock=replay.clock)
+
+    assert result.settled
+    # min wait + two polls spanning the stability window.
+    assert result.elapsed_s == pytest.approx(0.7)
+    assert result.frames == 3
+
+
+def test_waits_out_a_page_load_and_returns_final_frame():
+    loading = [_frame(p) for p in (1, 2, 3, 4, 5, 6, 7, 8)]
+    loaded = _frame(9)
+    replay = _Replay(loading + [loaded] * 10)
+
+    result = wait_for_screen_settle(replay.capture, config=CONFIG, sleep=replay.sleep, clock=replay.clock)
+
+    assert result.settled
+    assert result.frame == loaded
+    assert result.elapsed_s > 2.0
+
+
+def test_gives_up_at_max_wait_on_a_never_ending_animation():
+    frames = [_frame(p % 10) for p in range(100)]
+    replay = _Replay(frames)
+
+    result = wait_for_screen_settle(replay.capture, config=CONFIG, sleep=replay.sleep, clock=replay.clock)
+
+    assert not result.settled
+    assert result.elapsed_s == pytest.approx(CONFIG.max_wait_s)
+
+
+def test_classify_action_picks_per_action_defaults():
+    assert classify_action("") == "noop"
+    assert classify_action("WAIT") == "wait"
+    assert classify_action("import pyautogui; pyautogui.click(10, 20)") == "click"
+    assert classify_action("pyautogui.write('hi'); pyautogui.press('enter')") == "hotkey"
+    assert classify_action("pyautogui.scroll(-5)") == "scroll"
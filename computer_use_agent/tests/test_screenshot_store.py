@@ -0,0 +1,73 @@
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from computer_use_agent.utils.computer_use_html_logger import ComputerUseHtmlLogger
+from computer_use_agent.utils.screenshot_store import ScreenshotStore
+
+
+def _page(text: str = "", seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    img = rng.integers(0, 255, (360, 640, 3), dtype=np.uint8)
+    cv2.rectangle(img, (20, 300), (400, 340), (255, 255, 255), -1)
+    cv2.putText(img, text, (24, 330), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+    return img
+
+
+def _png(img: np.ndarray, level: int = 3) -> bytes:
+    ok, buf = cv2.imencode(".png", img, [cv2.IMWRITE_PNG_COMPRESSION, level])
+    assert ok
+    return buf.tobytes()
+
+
+def _pixels(data: bytes) -> np.ndarray:
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+
+def test_unique_frames_written_once_and_near_duplicates_stored_as_deltas(tmp_path):
+    store = ScreenshotStore(tmp_path)
+    first = _png(_page("Hello"))
+
+    key = store.put(first)
+    assert store.put(first) is key
+    same = store.put(_png(_page("Hello"), level=9))
+    typed = _page("Hello, world")
+    delta = store.put(_png(typed))
+    fresh = store.put(_png(_page(seed=1)))
+
+    assert (key.kind, same.kind, delta.kind, fresh.kind) == ("key", "same", "delta", "key")
+    assert same.key_path == delta.key_path == key.key_path
+    assert delta.tiles and all(tile.y >= 288 for tile in delta.tiles)
+    assert store.load(key.digest) == first
+    assert np.array_equal(_pixels(store.load(delta.digest)), typed)
+
+    stats = store.stats()
+    assert stats["frames"] == 5 and stats["duplicates"] == 1 and stats["keyframes"] == 2
+    assert stats["stored_bytes"] < stats["input_bytes"] * 0.5
+    assert len(list((tmp_path / "frames").iterdir())) == 2
+
+
+def test_html_log_references_store_instead_of_inlining(tmp_path, monkeypatch):
+    monkeypatch.setenv("COMPUTER_USE_LOG_DIR", str(tmp_path))
+    monkeypatch.delenv("COMPUTER_USE_LOG_INLINE_IMAGES", raising=False)
+    logger = ComputerUseHtmlLogger("run-1")
+    frame = _png(_page("Hello"))
+    for step in range(3):
+        logger.log_step(
+            step_index=step, action="WAIT", exec_code="WAIT", execution_mode="gui", status="ok",
+            completion_reason=None, plan=None, reflection=None, handback_request=None,
+            behavior_fact=None, behavior_thoughts=None, before_img=frame, after_img=frame,
+            delayed_after_img=None, marked_before_img=None, marked_after_img=None, zoomed_after_img=None,
+        )
+
+    page = logger.path.read_text()
+    assert "base64," not in page
+    assert page.count('src="computer-use-run-1-frames/frames/') == 6
+    assert logger.path.stat().st_size < len(frame)
+    assert logger.store_stats()["keyframes"] == 1
@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from pathlib import Path
+import sys
+import threading
+import time
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from computer_use_agent.worker import worker as worker_module
+from computer_use_agent.worker.worker import Worker
+
+LATENCY_S = 0.2
+SYSTEM_PROMPT = "Task: TASK_DESCRIPTION\n... apps and windows information inserted dynamically ...\n### END OF GUIDELINES"
+
+
+class _FakeController:
+    def __init__(self):
+        self.calls = []
+
+    def get_apps(self, exclude_system=True):
+        self.calls.append(("apps", threading.current_thread().name))
+        time.sleep(LATENCY_S)
+        return {"status": "success", "apps": ["Finder", "Safari"]}
+
+    def get_active_windows(self, exclude_system=True):
+        self.calls.append(("windows", threading.current_thread().name))
+        time.sleep(LATENCY_S)
+        return {"status": "success", "windows": [{"app_name": "Safari"}]}
+
+
+class _FakeGrounding:
+    def __init__(self, controller):
+        self.env = type("Env", (), {"controller": controller})()
+        self.knowledge = []
+        self.last_code_agent_result = None
+        self.handback_inference = None
+
+    def assign_screenshot(self, obs):
+        self.obs = obs
+
+    def set_task_context(self, instruction):
+        self.instruction = instruction
+
+    def wait(self, seconds):
+        return f"WAIT {seconds}"
+
+
+class _FakeGenerator:
+    def __init__(self):
+        self.system_prompt = SYSTEM_PROMPT
+        self.messages = []
+
+    def add_system_prompt(self, prompt):
+        self.system_prompt = prompt
+
+    def add_message(self, text, image_content=None, role="user"):
+        self.messages.append((role, text))
+
+
+def _worker(monkeypatch):
+    controller = _FakeController()
+    worker = Worker.__new__(Worker)
+    worker.grounding_agent = _FakeGrounding(controller)
+    worker.generator_agent = _FakeGenerator()
+    worker.temperature = 0.0
+    worker.use_thinking = False
+    worker._prep_pool = None
+    worker._apps_windows_lock = threading.Lock()
+    worker._apps_windows_cache = OrderedDict()
+    worker.turn_count = 0
+    worker.worker_history = []
+    worker.screenshot_inputs = []
+    worker.update_latest_screenshot = lambda screenshot: None
+    worker.flush_messages = lambda: None
+
+    def reflection(instruction, obs):
+        time.sleep(LATENCY_S)
+        return "looks fine", None
+
+    worker._generate_reflection = reflection
+    monkeypatch.setattr(worker_module, "call_llm_formatted", lambda *args, **kwargs: "```python\nagent.done()\n```")
+    monkeypatch.setattr(worker_module, "create_pyautogui_code", lambda agent, code, obs: code)
+    return worker, controller
+
+
+def test_apps_and_windows_fetch_overlaps_reflection(monkeypatch):
+    worker, controller = _worker(monkeypatch)
+    timings = []
+    monkeypatch.setattr(
+        worker_module.LATENCY_LOGGER,
+        "log_event",
+        lambda component, event, duration_ms, extra=None: timings.append(extra) if event == "step_timings" else None,
+    )
+
+    started = time.perf_counter()
+    info, actions = worker.generate_next_action("open Safari", {"screenshot": b"screen-1"})
+    elapsed = time.perf_counter() - started
+
+    # Reflection, apps and windows each take LATENCY_S; run in sequence they would take 3x.
+    assert elapsed < 2 * LATENCY_S
+    assert actions == ["agent.done()"]
+    assert all(name.startswith("worker-prep") for _, name in controller.calls)
+    assert "4. Currently available apps (2 total): Finder, Safari" in worker.generator_agent.system_prompt
+    assert "\n   - Safari" in worker.generator_agent.system_prompt
+    phases = timings[0]["phases"]
+    assert phases["reflection"] >= LATENCY_S * 1000 * 0.9
+    assert phases["overlapped"] > 0 and timings[0]["apps_windows_cached"] is False
+
+
+def test_apps_and_windows_info_is_cached_per_screenshot(monkeypatch):
+    worker, controller = _worker(monkeypatch)
+
+    first = worker._apps_and_windows_info_for({"screenshot": b"screen-1"})
+    again = worker._apps_and_windows_info_for({"screenshot": b"screen-1"})
+    changed = worker._apps_and_windows_info_for({"screenshot": b"screen-2"})
+
+    assert first[1] is False and again[1] is True and changed[1] is False
+    assert again[0] == first[0] == changed[0]
+    assert len(controller.calls) == 4
+    assert again[2] < LATENCY_S * 1000 / 2
+
+
+def test_failed_fetch_is_not_cached(monkeypatch):
+    worker, controller = _worker(monkeypatch)
+    controller.get_apps = lambda exclude_system=True: {"status": "error"}
+    controller.get_active_windows = lambda exclude_system=True: {"status": "error"}
+
+    assert worker._apps_and_windows_info_for({"screenshot": b"screen-1"})[:2] == ("", False)
+    assert not worker._apps_windows_cache
+
+
+def test_code_agent_result_formatting():
+    result = {
+        "task_instruction": "sum column B",
+        "steps_executed": 2,
+        "budget": 5,
+        "completion_reason": "DONE",
+        "summary": "Summed.",
+        "execution_history": [
+            {"action": "Run this:\n```python\nprint(1)\n```"},
+            {"action": "echo ok"},
+        ],
+    }
+    worker = Worker.__new__(Worker)
+    assert worker._format_code_agent_result(result) == (
+        "\nCODE AGENT RESULT:\n"
+        "Task/Subtask Instruction: sum column B\n"
+        "Steps Completed: 2\n"
+        "Max Steps: 5\n"
+        "Completion Reason: DONE\n"
+        "Summary: Summed.\n"
+        "Execution History:\n"
+        "Step 1: \n```python\nprint(1)\n```\n"
+        "Step 2: \necho ok\n"
+        "\n"
+    )
+    assert "Step 1: ```python\nprint(1)\n```\n" in worker._format_code_agent_log(result)
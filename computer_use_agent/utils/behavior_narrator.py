@@ -8,14 +8,23 @@ from computer_use_agent.utils.common_utils import (
 from computer_use_agent.utils.formatters import (
     THOUGHTS_ANSWER_TAG_FORMATTER,
 )
+from computer_use_agent.utils.image_handle import ImageHandle
+from computer_use_agent.utils.screenshot import Screenshot
+from shared.latency_logger import LATENCY_LOGGER
 from shared.streaming import emit_event
 from PIL import Image, ImageDraw, ImageFont
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import BytesIO
-from typing import Any, Dict
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
 import base64
+import contextvars
 import cv2
+import logging
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 
 class BehaviorNarrator:
     def __init__(self, engine_params):
@@ -134,8 +143,8 @@ class BehaviorNarrator:
             bytes: The zoomed image in bytes.
             bytes: The original image with bounding box in bytes (if add_bounding_box is True). Otherwise, returns original bytes.
         """
-        # Find zoom dimensions
-        img = Image.open(BytesIO(image_bytes)).convert("RGB")
+        # Find zoom dimensions (decoded once per frame and shared; convert() copies)
+        img = Screenshot.from_data(image_bytes).pil().convert("RGB")
         cx, cy = x - width // 2, y - height // 2  # Center coordinates
         W, H = img.size
         left = min(max(cx, 0), W - width)
@@ -189,7 +198,7 @@ class BehaviorNarrator:
             }
         # Prepare ANNOTATED BEFORE image
         mouse_actions = BehaviorNarrator.extract_mouse_action(pyautogui_action)
-        before_img = Image.open(BytesIO(before_img_bytes))
+        before_img = Screenshot.from_data(before_img_bytes).pil().copy()
         BehaviorNarrator.mark_action(mouse_actions, before_img)
         out_buffer = BytesIO()
         before_img.save(out_buffer, format="PNG")
@@ -237,10 +246,11 @@ class BehaviorNarrator:
                 "zoomed_after_img_bytes": zoomed_after_img_bytes,
             }
         else:
+            # Same frame the worker attaches next step: share its handle and data URL.
             after_img_message = {
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:image/png;base64,{base64.b64encode(after_img_bytes).decode('utf-8')}",
+                    "url": ImageHandle.from_bytes(after_img_bytes),
                     "detail": "high",
                 },
             }
@@ -293,3 +303,103 @@ class BehaviorNarrator:
             },
         )
         return result
+
+
+class PendingNarration:
+    """A narration running on a NarrationQueue; `result()` is the join point."""
+
+    def __init__(self, step_index: int, future: Future) -> None:
+        self.step_index = step_index
+        self._future = future
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        try:
+            if self._future.done():
+                return self._future.result()
+            with LATENCY_LOGGER.measure("runner", "behavior_narrator_wait", extra={"step": self.step_index}):
+                return self._future.result()
+        except Exception as exc:
+            logger.warning("Behavior narration for step %s failed: %s", self.step_index, exc)
+            return None
+
+
+def resolve_narration(value: Any) -> Optional[Dict[str, Any]]:
+    """Wait for a pending narration; plain dicts (or None) pass through."""
+    if isinstance(value, PendingNarration):
+        return value.result()
+    return value
+
+
+class NarrationQueue:
+    """
+    Runs `BehaviorNarrator.judge` off the step's critical path.
+
+    At most `lag_limit` narrations are pending; submitting beyond that waits
+    for the oldest. `on_done` callbacks run on the caller's thread, in step
+    order, from `submit` and `drain`, so trajectory records and logs are
+    finalized deterministically. `lag_limit=0` narrates synchronously.
+    """
+
+    def __init__(self, narrator: BehaviorNarrator, *, lag_limit: int = 1) -> None:
+        self.narrator = narrator
+        self.lag_limit = max(0, int(lag_limit))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self.lag_limit:
+            self._executor = ThreadPoolExecutor(max_workers=self.lag_limit, thread_name_prefix="narrator")
+        self._pending: Deque[Tuple[PendingNarration, Callable[[Optional[Dict[str, Any]]], None]]] = deque()
+
+    def submit(
+        self,
+        *,
+        step_index: int,
+        before_img_bytes: bytes,
+        after_img_bytes: bytes,
+        pyautogui_action: str,
+        on_done: Callable[[Optional[Dict[str, Any]]], None],
+    ) -> PendingNarration:
+        kwargs = {
+            "screenshot_num": step_index,
+            "before_img_bytes": before_img_bytes,
+            "after_img_bytes": after_img_bytes,
+            "pyautogui_action": pyautogui_action,
+        }
+        if self._executor is None:
+            future: Future = Future()
+            try:
+                future.set_result(self._judge(kwargs))
+            except Exception as exc:
+                future.set_exception(exc)
+            pending = PendingNarration(step_index, future)
+            on_done(pending.result())
+            return pending
+
+        while len(self._pending) >= self.lag_limit:
+            self._finish_oldest()
+        ctx = contextvars.copy_context()
+        pending = PendingNarration(step_index, self._executor.submit(ctx.run, self._judge, kwargs))
+        self._pending.append((pending, on_done))
+        return pending
+
+    def drain(self, *, wait: bool = True) -> None:
+        """Finalize finished narrations in order; with `wait`, all of them."""
+        while self._pending and (wait or self._pending[0][0].done()):
+            self._finish_oldest()
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def close(self) -> None:
+        self.drain(wait=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def _judge(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        with LATENCY_LOGGER.measure("runner", "behavior_narrator", extra={"step": kwargs["screenshot_num"]}):
+            return self.narrator.judge(**kwargs)
+
+    def _finish_oldest(self) -> None:
+        pending, on_done = self._pending.popleft()
+        on_done(pending.result())
@@ -6,7 +6,9 @@ import os
 import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
+
+from computer_use_agent.utils.screenshot_store import FrameRef, ScreenshotStore
 
 _DEFAULT_LOG_DIR = "logs/computer_use_logs"
 _FOOTER = "\n</main>\n</body>\n</html>\n"
@@ -46,6 +48,11 @@ class ComputerUseHtmlLogger:
         log_dir = Path(os.getenv("COMPUTER_USE_LOG_DIR", _DEFAULT_LOG_DIR)).expanduser()
         self.path = log_dir / f"computer-use-{self.run_id}.html"
         self._lock = threading.Lock()
+        # Screenshots go to a per-run content-addressed store next to the HTML
+        # file; set COMPUTER_USE_LOG_INLINE_IMAGES=1 for a self-contained file.
+        self.store: Optional[ScreenshotStore] = None
+        if os.getenv("COMPUTER_USE_LOG_INLINE_IMAGES", "").lower() not in {"1", "true", "yes"}:
+            self.store = ScreenshotStore(log_dir / f"computer-use-{self.run_id}-frames")
         self._init_file()
 
     def _init_file(self) -> None:
@@ -76,6 +83,8 @@ class ComputerUseHtmlLogger:
     figure { margin: 0; }
     figcaption { font-size: 12px; color: #555; margin-bottom: 4px; }
     img { width: 100%; height: auto; border: 1px solid #ddd; border-radius: 6px; background: #fafafa; }
+    .frame { position: relative; }
+    .frame img.tile { position: absolute; height: auto; border: 0; border-radius: 0; background: none; }
   </style>
 </head>
 <body>
@@ -244,14 +253,39 @@ class ComputerUseHtmlLogger:
     def _render_image(self, label: str, image_bytes: Optional[bytes]) -> list[str]:
         if not image_bytes:
             return []
-        uri = _data_uri(image_bytes)
         safe_label = html.escape(label)
-        return [
-            "<figure>",
-            f"<figcaption>{safe_label}</figcaption>",
-            f'<img src="{uri}" alt="{safe_label}" loading="lazy">',
-            "</figure>",
-        ]
+        ref = self._store_image(image_bytes)
+        if ref is None:
+            body = [f'<img src="{_data_uri(image_bytes)}" alt="{safe_label}" loading="lazy">']
+        else:
+            body = self._render_ref(ref, safe_label)
+        return ["<figure>", f"<figcaption>{safe_label}</figcaption>", *body, "</figure>"]
+
+    def _store_image(self, image_bytes: bytes) -> Optional[FrameRef]:
+        if self.store is None:
+            return None
+        try:
+            return self.store.put(image_bytes)
+        except Exception:
+            return None
+
+    def _render_ref(self, ref: FrameRef, safe_label: str) -> list[str]:
+        base = html.escape(self.store.root.name)
+        key_img = f'<img src="{base}/{html.escape(ref.key_path)}" alt="{safe_label}" loading="lazy">'
+        if not ref.tiles:
+            return [key_img]
+        lines = ['<div class="frame">', key_img]
+        for tile in ref.tiles:
+            style = (
+                f"left:{tile.x / ref.width * 100:.4f}%;top:{tile.y / ref.height * 100:.4f}%;"
+                f"width:{tile.width / ref.width * 100:.4f}%"
+            )
+            lines.append(f'<img class="tile" src="{base}/{html.escape(tile.path)}" style="{style}" alt="">')
+        lines.append("</div>")
+        return lines
+
+    def store_stats(self) -> Dict[str, Any]:
+        return self.store.stats() if self.store is not None else {}
 
     def log_run_end(self, status: str, completion_reason: str) -> None:
         ts = datetime.now(timezone.utc).isoformat()
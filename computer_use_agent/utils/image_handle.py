@@ -0,0 +1,198 @@
+"""
+Content-addressed image handles for LLM message histories.
+
+`LMMAgent` messages used to embed every screenshot as a multi-megabyte base64
+data URL, and snapshots deep-copied the whole history. Messages now carry an
+`ImageHandle` in place of the URL string: an immutable reference to bytes
+that are stored once per digest (identical screenshots share one handle) and
+whose data URL is built lazily and cached. Handles are materialized back into
+plain URL strings only where a payload leaves the process (the LLM request,
+persisted snapshots), and copying a message history copies references.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import threading
+import weakref
+from typing import Any, Dict, List, Optional
+
+
+def _guess_mime(data: bytes) -> str:
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png"
+
+
+class ImageHandle:
+    """Immutable image bytes plus a lazily built, cached data URL."""
+
+    __slots__ = ("digest", "data", "mime", "_data_url", "__weakref__")
+
+    def __init__(self, data: bytes, digest: str, mime: Optional[str] = None) -> None:
+        self.data = data
+        self.digest = digest
+        self.mime = mime or _guess_mime(data)
+        self._data_url: Optional[str] = None
+
+    @classmethod
+    def from_bytes(cls, data: bytes, mime: Optional[str] = None) -> "ImageHandle":
+        """Return the live handle for these bytes, creating it if needed."""
+        return _STORE.intern(bytes(data), mime)
+
+    @classmethod
+    def from_data_url(cls, url: str) -> "ImageHandle":
+        header, _, encoded = url.partition("base64,")
+        mime = header[len("data:") :].rstrip(";") if header.startswith("data:") else None
+        return cls.from_bytes(base64.b64decode(encoded), mime or None)
+
+    @property
+    def data_url(self) -> str:
+        if self._data_url is None:
+            encoded = base64.b64encode(self.data).decode("ascii")
+            self._data_url = f"data:{self.mime};base64,{encoded}"
+        return self._data_url
+
+    # Handles are immutable: copies are the handle itself.
+    def __copy__(self) -> "ImageHandle":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ImageHandle":
+        return self
+
+    def __reduce__(self):
+        return (ImageHandle.from_bytes, (self.data, self.mime))
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ImageHandle) and other.digest == self.digest
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging aid
+        return f"ImageHandle({self.mime}, bytes={len(self.data)}, digest={self.digest[:8]})"
+
+
+class _ImageStore:
+    """Digest -> live handle. Entries disappear once no message references them."""
+
+    def __init__(self) -> None:
+        self._handles: "weakref.WeakValueDictionary[str, ImageHandle]" = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def intern(self, data: bytes, mime: Optional[str]) -> ImageHandle:
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        with self._lock:
+            handle = self._handles.get(digest)
+            if handle is None:
+                handle = ImageHandle(data, digest, mime)
+                self._handles[digest] = handle
+            return handle
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+
+_STORE = _ImageStore()
+
+
+def live_image_count() -> int:
+    return len(_STORE)
+
+
+def _materialize_part(part: Any) -> Any:
+    if not isinstance(part, dict):
+        return part
+    image_url = part.get("image_url")
+    if isinstance(image_url, ImageHandle):
+        return {**part, "image_url": image_url.data_url}
+    if isinstance(image_url, dict) and isinstance(image_url.get("url"), ImageHandle):
+        return {**part, "image_url": {**image_url, "url": image_url["url"].data_url}}
+    return part
+
+
+def materialize_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Messages with handles replaced by data URL strings. Only messages and
+    parts that hold a handle are rebuilt; everything else is shared.
+    """
+    result = []
+    for message in messages:
+        content = message.get("content") if isinstance(message, dict) else None
+        if not isinstance(content, list):
+            result.append(message)
+            continue
+        parts = [_materialize_part(part) for part in content]
+        if any(new is not old for new, old in zip(parts, content)):
+            message = {**message, "content": parts}
+        result.append(message)
+    return result
+
+
+IMAGE_REF_KEY = "$image"
+
+
+def _ref_for(url: Any, images: Dict[str, str]) -> Any:
+    if isinstance(url, ImageHandle):
+        images.setdefault(url.digest, url.data_url)
+        return {IMAGE_REF_KEY: url.digest}
+    if isinstance(url, str) and url.startswith("data:"):
+        digest = hashlib.blake2b(url.encode("ascii", "ignore"), digest_size=16).hexdigest()
+        images.setdefault(digest, url)
+        return {IMAGE_REF_KEY: digest}
+    return url
+
+
+def _detach(messages: List[Dict[str, Any]], convert) -> List[Dict[str, Any]]:
+    result = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            parts = []
+            for part in content:
+                if isinstance(part, dict):
+                    part = dict(part)
+                    image_url = part.get("image_url")
+                    if isinstance(image_url, dict) and "url" in image_url:
+                        part["image_url"] = {**image_url, "url": convert(image_url.get("url"))}
+                    elif image_url is not None:
+                        part["image_url"] = convert(image_url)
+                parts.append(part)
+            content = parts
+        result.append({**message, "content": content})
+    return result
+
+
+def externalize_message_images(messages: List[Dict[str, Any]], images: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    JSON-ready copy of `messages` with image URLs replaced by `{"$image": digest}`
+    references; each distinct image's data URL is added to `images` once.
+    """
+    return _detach(messages, lambda url: _ref_for(url, images))
+
+
+def resolve_message_images(messages: List[Dict[str, Any]], images: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Inverse of `externalize_message_images`: references become shared ImageHandles."""
+
+    def convert(url: Any) -> Any:
+        if isinstance(url, dict) and IMAGE_REF_KEY in url:
+            data_url = images.get(url[IMAGE_REF_KEY])
+            return ImageHandle.from_data_url(data_url) if data_url else url
+        return url
+
+    return _detach(messages, convert)
+
+
+__all__ = [
+    "IMAGE_REF_KEY",
+    "ImageHandle",
+    "externalize_message_images",
+    "live_image_count",
+    "materialize_messages",
+    "resolve_message_images",
+]
@@ -8,9 +8,11 @@ for common encoding, resizing, and annotation tasks.
 from __future__ import annotations
 
 import base64
+import hashlib
 import math
-from io import BytesIO
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import cv2  # type: ignore
 import numpy as np
@@ -57,9 +59,9 @@ class ImageProcessor:
 
     @staticmethod
     def downscale_image_bytes(image: bytes, max_w: int = 1280, max_h: int = 720) -> bytes:
-        np_img = np.frombuffer(image, dtype=np.uint8)
-        img = cv2.imdecode(np_img, cv2.IMREAD_COLOR)
-        if img is None:
+        try:
+            img = ImageProcessor.decode_image(image)
+        except ValueError:
             return image
         height, width = img.shape[:2]
         scale = min(max_w / float(width), max_h / float(height), 1.0)
@@ -118,24 +120,111 @@ class ImageProcessor:
     # ------------------------------------------------------------------ #
 
     @staticmethod
-    def dhash(image_bytes: bytes, hash_size: int = 8) -> int:
+    def decode_image(image: Union[bytes, np.ndarray], *, gray: bool = False) -> np.ndarray:
+        """
+        Decode screenshot bytes to a BGR (or grayscale) array, memoized by content.
+
+        Every consumer of the same screenshot within a step shares one decode.
+        Cached arrays are read-only; copy before mutating. Arrays pass through
+        (converted to grayscale when requested).
+        """
+        if isinstance(image, np.ndarray):
+            if gray and image.ndim == 3:
+                return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            return image
+        return _DECODED_CACHE.get(image, gray=gray)
+
+    @staticmethod
+    def _hash_input(image: Union[bytes, np.ndarray], width: int, height: int) -> np.ndarray:
+        gray = ImageProcessor.decode_image(image, gray=True)
+        return cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    @staticmethod
+    def dhash_bits(image: Union[bytes, np.ndarray], hash_size: int = 8) -> np.ndarray:
+        """Difference hash as packed uint64 words (horizontal gradient signs)."""
+        pixels = ImageProcessor._hash_input(image, hash_size + 1, hash_size)
+        return pack_hash_bits((pixels[:, 1:] > pixels[:, :-1]).ravel())
+
+    @staticmethod
+    def ahash_bits(image: Union[bytes, np.ndarray], hash_size: int = 8) -> np.ndarray:
+        """Average hash as packed uint64 words (pixels brighter than the mean)."""
+        pixels = ImageProcessor._hash_input(image, hash_size, hash_size)
+        return pack_hash_bits((pixels > pixels.mean()).ravel())
+
+    @staticmethod
+    def phash_bits(image: Union[bytes, np.ndarray], hash_size: int = 8, highfreq_factor: int = 4) -> np.ndarray:
+        """Perceptual hash as packed uint64 words (low-frequency DCT signs vs median)."""
+        side = hash_size * highfreq_factor
+        pixels = ImageProcessor._hash_input(image, side, side)
+        low = cv2.dct(pixels)[:hash_size, :hash_size]
+        # Skip the DC term so overall brightness does not dominate the median.
+        median = np.median(low.ravel()[1:])
+        return pack_hash_bits((low > median).ravel())
+
+    @staticmethod
+    def hash_frames(
+        frames: Sequence[Union[bytes, np.ndarray]],
+        *,
+        method: str = "dhash",
+        hash_size: int = 8,
+    ) -> np.ndarray:
+        """
+        Hash many frames at once; returns an (n, words) uint64 array.
+
+        Frames are decoded (through the cache) and downscaled individually, then
+        thresholded as one stacked array.
+        """
+        if method == "dhash":
+            width, height = hash_size + 1, hash_size
+        elif method == "ahash":
+            width, height = hash_size, hash_size
+        elif method == "phash":
+            width = height = hash_size * 4
+        else:
+            raise ValueError(f"Unknown hash method: {method}")
+        words = -(-hash_size * hash_size // 64)
+        if not frames:
+            return np.zeros((0, words), dtype=np.uint64)
+        stack = np.stack([ImageProcessor._hash_input(frame, width, height) for frame in frames])
+        if method == "dhash":
+            bits = stack[:, :, 1:] > stack[:, :, :-1]
+        elif method == "ahash":
+            bits = stack > stack.mean(axis=(1, 2), keepdims=True)
+        else:
+            low = np.stack([cv2.dct(pixels)[:hash_size, :hash_size] for pixels in stack])
+            flat = low.reshape(len(frames), -1)
+            bits = low > np.median(flat[:, 1:], axis=1)[:, None, None]
+        return pack_hash_bits(bits.reshape(len(frames), -1))
+
+    @staticmethod
+    def hamming_distance(a: Union[int, np.ndarray], b: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """
+        Bit distance between hashes. Ints give an int; packed uint64 arrays are
+        compared along the last axis and broadcast (e.g. one hash vs a batch).
+        """
+        if isinstance(a, (int, np.integer)) and isinstance(b, (int, np.integer)):
+            return (int(a) ^ int(b)).bit_count()
+        xor = np.bitwise_xor(np.asarray(a, dtype=np.uint64), np.asarray(b, dtype=np.uint64))
+        return np.bitwise_count(xor).sum(axis=-1, dtype=np.int64)
+
+    @staticmethod
+    def dhash(image_bytes: Union[bytes, np.ndarray], hash_size: int = 8) -> int:
         try:
-            from PIL import Image  # Pillow may be optional
+            return hash_bits_to_int(ImageProcessor.dhash_bits(image_bytes, hash_size), hash_size * hash_size)
         except Exception:
             return 0
 
+    @staticmethod
+    def ahash(image_bytes: Union[bytes, np.ndarray], hash_size: int = 8) -> int:
         try:
-            img = (
-                Image.open(BytesIO(image_bytes))
-                .convert("L")
-                .resize((hash_size + 1, hash_size), Image.LANCZOS)
-            )
-            pixels = np.asarray(img)
-            diff = pixels[:, 1:] > pixels[:, :-1]
-            value = 0
-            for bit in diff.flatten():
-                value = (value << 1) | int(bit)
-            return value
+            return hash_bits_to_int(ImageProcessor.ahash_bits(image_bytes, hash_size), hash_size * hash_size)
+        except Exception:
+            return 0
+
+    @staticmethod
+    def phash(image_bytes: Union[bytes, np.ndarray], hash_size: int = 8) -> int:
+        try:
+            return hash_bits_to_int(ImageProcessor.phash_bits(image_bytes, hash_size), hash_size * hash_size)
         except Exception:
             return 0
 
@@ -377,6 +466,109 @@ class ImageProcessor:
         )
 
 
+# ---------------------------------------------------------------------- #
+# Hash packing + decoded image cache
+# ---------------------------------------------------------------------- #
+
+
+def pack_hash_bits(bits: np.ndarray) -> np.ndarray:
+    """
+    Pack boolean hash bits along the last axis into uint64 words, first bit
+    most significant; a (n, bits) batch yields (n, words).
+    """
+    flat = np.asarray(bits, dtype=bool)
+    nbits = flat.shape[-1]
+    pad = (-nbits) % 64
+    if pad:
+        flat = np.concatenate([flat, np.zeros(flat.shape[:-1] + (pad,), dtype=bool)], axis=-1)
+    packed = np.packbits(flat, axis=-1)
+    return packed.reshape(packed.shape[:-1] + (-1, 8)).view(">u8").reshape(packed.shape[:-1] + (-1,)).astype(np.uint64)
+
+
+def hash_bits_to_int(words: np.ndarray, nbits: int) -> int:
+    """Convert packed words back to the legacy int form (first bit most significant)."""
+    value = int.from_bytes(np.asarray(words, dtype=">u8").tobytes(), "big")
+    return value >> ((-nbits) % 64)
+
+
+class DecodedImageCache:
+    """Small LRU of decoded screenshots keyed by a digest of the encoded bytes."""
+
+    def __init__(self, max_entries: int = 8) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[bytes, bool], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image_bytes: bytes, *, gray: bool = False) -> np.ndarray:
+        key = (hashlib.blake2b(image_bytes, digest_size=16).digest(), gray)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        if gray:
+            color = self.get(image_bytes, gray=False)
+            decoded = cv2.cvtColor(color, cv2.COLOR_BGR2GRAY) if color.ndim == 3 else color
+        else:
+            decoded = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if decoded is None:
+                raise ValueError("Failed to decode image bytes")
+        decoded.setflags(write=False)
+        with self._lock:
+            self._entries[key] = decoded
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return decoded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_DECODED_CACHE = DecodedImageCache()
+
+
+# ---------------------------------------------------------------------- #
+# Tile-level frame differences
+# ---------------------------------------------------------------------- #
+
+
+def changed_tile_mask(before: np.ndarray, after: np.ndarray, tile: int) -> np.ndarray:
+    """(rows, cols) bool mask of `tile`-sized tiles whose pixels differ."""
+    height, width = after.shape[:2]
+    rows, cols = -(-height // tile), -(-width // tile)
+    diff = before != after
+    if diff.ndim == 3:
+        diff = diff.any(axis=2)
+    padded = np.zeros((rows * tile, cols * tile), dtype=bool)
+    padded[:height, :width] = diff
+    return padded.reshape(rows, tile, cols, tile).any(axis=(1, 3))
+
+
+def tile_mask_rects(mask: np.ndarray, tile: int, shape: Tuple[int, int], margin: int = 0) -> List[Tuple[int, int, int, int]]:
+    """Pixel (x0, y0, x1, y1) rects bounding each 8-connected group of set tiles."""
+    height, width = shape
+    count, _, boxes, _ = cv2.connectedComponentsWithStats(mask.astype(np.uint8), connectivity=8)
+    rects = []
+    for x, y, w, h, _area in boxes[1:count]:
+        rects.append(
+            (
+                max(0, int(x) * tile - margin),
+                max(0, int(y) * tile - margin),
+                min(width, int(x + w) * tile + margin),
+                min(height, int(y + h) * tile + margin),
+            )
+        )
+    return rects
+
+
 # ---------------------------------------------------------------------- #
 # Module-level convenience wrappers (retain legacy function names)
 # ---------------------------------------------------------------------- #
@@ -393,6 +585,11 @@ create_system_message = _DEFAULT_PROCESSOR.create_system_message
 create_user_message = _DEFAULT_PROCESSOR.create_user_message
 create_assistant_message = _DEFAULT_PROCESSOR.create_assistant_message
 dhash = ImageProcessor.dhash
+ahash = ImageProcessor.ahash
+phash = ImageProcessor.phash
+decode_image = ImageProcessor.decode_image
+hash_frames = ImageProcessor.hash_frames
+hamming_distance = ImageProcessor.hamming_distance
 round_by_factor = ImageProcessor.round_by_factor
 ceil_by_factor = ImageProcessor.ceil_by_factor
 floor_by_factor = ImageProcessor.floor_by_factor
@@ -413,6 +610,16 @@ __all__ = [
     "create_user_message",
     "create_assistant_message",
     "dhash",
+    "ahash",
+    "phash",
+    "decode_image",
+    "hash_frames",
+    "hamming_distance",
+    "pack_hash_bits",
+    "hash_bits_to_int",
+    "DecodedImageCache",
+    "changed_tile_mask",
+    "tile_mask_rects",
     "round_by_factor",
     "ceil_by_factor",
     "floor_by_factor",
@@ -0,0 +1,183 @@
+"""
+Per-step screenshot wrapper that decodes and encodes each frame at most once.
+
+Grounding used to decode the same screenshot several times per request (base64
+decode, PIL open for the size, PIL open again for WEBP compression, base64
+again for the payload). `Screenshot` memoizes each derived form lazily, and
+`Screenshot.from_data` returns the same object for the same frame so repeated
+grounding calls within a step (e.g. both ends of a drag) share the work.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import struct
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from computer_use_agent.utils.image_processor import ImageProcessor
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _decode_data(data: Union[str, bytes]) -> bytes:
+    if isinstance(data, str):
+        text = data.strip()
+        if text.startswith("data:"):
+            text = text.split("base64,", 1)[-1]
+        return base64.b64decode(text)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data)
+    raise ValueError(f"Unsupported screenshot type: {type(data)}")
+
+
+class Screenshot:
+    """Immutable screenshot bytes plus lazily cached decoded/encoded forms."""
+
+    def __init__(self, raw: bytes) -> None:
+        self.raw = raw
+        self._lock = threading.Lock()
+        self._size: Optional[Tuple[int, int]] = None
+        self._pil: Optional[Image.Image] = None
+        self._webp: Optional[bytes] = None
+        self._webp_b64: Optional[str] = None
+        self._b64: Optional[str] = None
+        self._digest: Optional[str] = None
+        self._dhashes: Dict[int, int] = {}
+
+    # ------------------------------------------------------------------ #
+    # Construction
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def from_data(cls, data: Union["Screenshot", str, bytes]) -> "Screenshot":
+        """Wrap raw bytes or a (data-URL) base64 string, reusing recent instances."""
+        if isinstance(data, Screenshot):
+            return data
+        shot = _RECENT.last_for(data)
+        if shot is not None:
+            return shot
+        shot = _RECENT.get_or_create(_decode_data(data))
+        _RECENT.remember_input(data, shot)
+        return shot
+
+    # ------------------------------------------------------------------ #
+    # Derived forms
+    # ------------------------------------------------------------------ #
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            self._digest = hashlib.blake2b(self.raw, digest_size=16).hexdigest()
+        return self._digest
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height), read from the PNG header when possible."""
+        if self._size is None:
+            raw = self.raw
+            if raw[:8] == _PNG_SIGNATURE and raw[12:16] == b"IHDR":
+                self._size = struct.unpack(">II", raw[16:24])
+            else:
+                self._size = self.pil().size
+        return self._size
+
+    def dhash(self, hash_size: int = 16) -> int:
+        """Perceptual difference hash of the frame, memoized per hash size."""
+        value = self._dhashes.get(hash_size)
+        if value is None:
+            value = self._dhashes[hash_size] = ImageProcessor.dhash(self.raw, hash_size=hash_size)
+        return value
+
+    def pil(self) -> Image.Image:
+        """Decoded PIL image (shared; copy before drawing on it)."""
+        with self._lock:
+            if self._pil is None:
+                image = Image.open(BytesIO(self.raw))
+                image.load()
+                self._pil = image
+                self._size = image.size
+            return self._pil
+
+    def array(self, *, gray: bool = False) -> np.ndarray:
+        """Decoded BGR (or grayscale) array via the shared ImageProcessor cache."""
+        return ImageProcessor.decode_image(self.raw, gray=gray)
+
+    @property
+    def base64(self) -> str:
+        if self._b64 is None:
+            self._b64 = base64.b64encode(self.raw).decode("ascii")
+        return self._b64
+
+    @property
+    def webp(self) -> bytes:
+        """WEBP re-encoding used for grounding payloads (smaller than PNG)."""
+        if self._webp is None:
+            image = self.pil()
+            output = BytesIO()
+            image.save(output, format="WEBP")
+            with self._lock:
+                self._webp = output.getvalue()
+        return self._webp
+
+    @property
+    def webp_base64(self) -> str:
+        if self._webp_b64 is None:
+            self._webp_b64 = base64.b64encode(self.webp).decode("ascii")
+        return self._webp_b64
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging aid
+        return f"Screenshot(bytes={len(self.raw)}, digest={self.digest[:8]})"
+
+
+class _RecentScreenshots:
+    """A few most recent Screenshot objects, keyed by content digest."""
+
+    def __init__(self, max_entries: int = 4) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Screenshot]" = OrderedDict()
+        self._lock = threading.Lock()
+        # The same observation object is usually passed several times per step;
+        # remembering it skips the base64 decode and digest on repeat calls.
+        self._last_input: Optional[Tuple[object, Screenshot]] = None
+
+    def last_for(self, data: object) -> Optional[Screenshot]:
+        last = self._last_input
+        if last is not None and last[0] is data:
+            return last[1]
+        return None
+
+    def remember_input(self, data: object, shot: Screenshot) -> None:
+        if isinstance(data, (str, bytes)):
+            self._last_input = (data, shot)
+
+    def get_or_create(self, raw: bytes) -> Screenshot:
+        key = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        with self._lock:
+            shot = self._entries.get(key)
+            if shot is not None:
+                self._entries.move_to_end(key)
+                return shot
+            shot = Screenshot(raw)
+            shot._digest = key
+            self._entries[key] = shot
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return shot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._last_input = None
+
+
+_RECENT = _RecentScreenshots()
+
+
+__all__ = ["Screenshot"]
@@ -0,0 +1,206 @@
+"""
+Per-run, content-addressed screenshot storage.
+
+A computer-use run captures several screenshots per step, and consecutive
+frames are often identical (waits, no-op actions) or differ in a few tiles
+(typing, short scrolls, a blinking caret). `ScreenshotStore` writes each
+unique frame once under its digest:
+
+- an exact repeat returns the existing `FrameRef` and writes nothing;
+- a frame whose pixels match the current keyframe is a "same" reference;
+- a frame that differs from the keyframe in a few tiles is stored as a
+  "delta": PNG crops of the changed tile groups, positioned over the keyframe;
+- anything else becomes a new keyframe, written verbatim.
+
+Loggers embed references (paths relative to the store root) instead of base64
+payloads; `load` reconstructs any frame pixel-exactly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from computer_use_agent.utils.image_processor import ImageProcessor, changed_tile_mask, tile_mask_rects
+
+logger = logging.getLogger(__name__)
+
+_EXTENSIONS = {
+    b"\x89PNG\r\n\x1a\n": ".png",
+    b"\xff\xd8\xff": ".jpg",
+}
+
+
+def _extension(image_bytes: bytes) -> str:
+    for magic, ext in _EXTENSIONS.items():
+        if image_bytes.startswith(magic):
+            return ext
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return ".webp"
+    return ".bin"
+
+
+@dataclass(frozen=True)
+class TileRef:
+    x: int
+    y: int
+    width: int
+    height: int
+    path: str
+
+
+@dataclass(frozen=True)
+class FrameRef:
+    digest: str
+    kind: str  # "key" | "same" | "delta"
+    key_path: str  # keyframe file, relative to the store root
+    width: int
+    height: int
+    tiles: Tuple[TileRef, ...] = field(default_factory=tuple)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ScreenshotStore:
+    def __init__(
+        self,
+        root: Path,
+        *,
+        tile_size: int = 32,
+        max_delta_ratio: float = 0.25,
+        max_delta_bytes_ratio: float = 0.5,
+    ) -> None:
+        self.root = Path(root)
+        self.tile_size = tile_size
+        self.max_delta_ratio = max_delta_ratio
+        self.max_delta_bytes_ratio = max_delta_bytes_ratio
+        self._refs: Dict[str, FrameRef] = {}
+        self._key: Optional[Tuple[FrameRef, np.ndarray]] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "frames": 0,
+            "duplicates": 0,
+            "keyframes": 0,
+            "same": 0,
+            "deltas": 0,
+            "input_bytes": 0,
+            "stored_bytes": 0,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Writing
+    # ------------------------------------------------------------------ #
+
+    def put(self, image_bytes: bytes) -> FrameRef:
+        digest = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+        with self._lock:
+            self._stats["frames"] += 1
+            self._stats["input_bytes"] += len(image_bytes)
+            ref = self._refs.get(digest)
+            if ref is not None:
+                self._stats["duplicates"] += 1
+                return ref
+            ref = self._put_new(digest, image_bytes)
+            self._refs[digest] = ref
+            self._append_index(ref)
+            return ref
+
+    def _put_new(self, digest: str, image_bytes: bytes) -> FrameRef:
+        pixels = ImageProcessor.decode_image(image_bytes)
+        height, width = pixels.shape[:2]
+        if self._key is not None and self._key[1].shape == pixels.shape:
+            key_ref, key_pixels = self._key
+            mask = changed_tile_mask(key_pixels, pixels, self.tile_size)
+            if not mask.any():
+                self._stats["same"] += 1
+                return FrameRef(digest, "same", key_ref.key_path, width, height)
+            if mask.mean() <= self.max_delta_ratio:
+                ref = self._try_delta(digest, image_bytes, pixels, mask, key_ref)
+                if ref is not None:
+                    return ref
+
+        key_path = f"frames/{digest}{_extension(image_bytes)}"
+        self._write(key_path, image_bytes)
+        ref = FrameRef(digest, "key", key_path, width, height)
+        self._key = (ref, pixels)
+        self._stats["keyframes"] += 1
+        return ref
+
+    def _try_delta(
+        self, digest: str, image_bytes: bytes, pixels: np.ndarray, mask: np.ndarray, key_ref: FrameRef
+    ) -> Optional[FrameRef]:
+        encoded: List[Tuple[Tuple[int, int, int, int], bytes]] = []
+        for x0, y0, x1, y1 in tile_mask_rects(mask, self.tile_size, pixels.shape[:2]):
+            ok, buf = cv2.imencode(".png", pixels[y0:y1, x0:x1])
+            if not ok:
+                return None
+            encoded.append(((x0, y0, x1, y1), buf.tobytes()))
+        # Many scattered tiles can cost more than a fresh keyframe.
+        if sum(len(data) for _, data in encoded) > self.max_delta_bytes_ratio * len(image_bytes):
+            return None
+        tiles = []
+        for index, ((x0, y0, x1, y1), data) in enumerate(encoded):
+            path = f"tiles/{digest}-{index}.png"
+            self._write(path, data)
+            tiles.append(TileRef(x0, y0, x1 - x0, y1 - y0, path))
+        self._stats["deltas"] += 1
+        return FrameRef(digest, "delta", key_ref.key_path, pixels.shape[1], pixels.shape[0], tuple(tiles))
+
+    def _write(self, relative: str, data: bytes) -> None:
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        self._stats["stored_bytes"] += len(data)
+
+    def _append_index(self, ref: FrameRef) -> None:
+        try:
+            with open(self.root / "index.jsonl", "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(ref.to_dict(), separators=(",", ":")) + "\n")
+        except OSError as exc:
+            logger.debug("Failed to append screenshot index: %s", exc)
+
+    # ------------------------------------------------------------------ #
+    # Reading
+    # ------------------------------------------------------------------ #
+
+    def get(self, digest: str) -> Optional[FrameRef]:
+        with self._lock:
+            return self._refs.get(digest)
+
+    def load(self, digest: str) -> bytes:
+        """Frame bytes for `digest`: the original file for keyframes, else a rebuilt PNG."""
+        ref = self.get(digest)
+        if ref is None:
+            raise KeyError(digest)
+        key_bytes = (self.root / ref.key_path).read_bytes()
+        if ref.kind != "delta":
+            return key_bytes
+        pixels = ImageProcessor.decode_image(key_bytes).copy()
+        for tile in ref.tiles:
+            crop = cv2.imdecode(np.frombuffer((self.root / tile.path).read_bytes(), np.uint8), cv2.IMREAD_COLOR)
+            pixels[tile.y : tile.y + tile.height, tile.x : tile.x + tile.width] = crop
+        ok, buf = cv2.imencode(".png", pixels)
+        if not ok:
+            raise ValueError(f"Failed to re-encode frame {digest}")
+        return buf.tobytes()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        stats["unique_frames"] = stats["frames"] - stats["duplicates"]
+        stats["savings_ratio"] = (
+            round(1 - stats["stored_bytes"] / stats["input_bytes"], 4) if stats["input_bytes"] else 0.0
+        )
+        return stats
+
+
+__all__ = ["FrameRef", "ScreenshotStore", "TileRef"]
@@ -8,7 +8,14 @@ import textwrap
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 import base64
+import contextvars
 import copy
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
 
 from computer_use_agent.grounding.grounding_agent import ACI
 from computer_use_agent.core.module import BaseModule
@@ -20,11 +27,14 @@ from computer_use_agent.utils.common_utils import (
     split_thinking_response,
     create_pyautogui_code,
 )
+from computer_use_agent.utils.behavior_narrator import resolve_narration
+from computer_use_agent.utils.screenshot import Screenshot
 from computer_use_agent.utils.formatters import (
     SINGLE_ACTION_FORMATTER,
     CODE_VALID_FORMATTER,
     CALL_CODE_AGENT_SUBTASK_REQUIRED_FORMATTER,
 )
+from shared.latency_logger import LATENCY_LOGGER
 from shared.streaming import emit_event
 from shared.text_utils import safe_ascii
 from shared.hierarchical_logger import (
@@ -34,6 +44,20 @@ from shared.hierarchical_logger import (
 
 logger = logging.getLogger("desktopenv.agent")
 
+# Apps/windows info is reused while the screen is unchanged (same screenshot digest).
+APPS_WINDOWS_CACHE_SIZE = 8
+PREP_WORKERS = 3
+_APPS_WINDOWS_SECTION = re.compile(r"\n4\. Currently available apps.*?(?=\n### END OF GUIDELINES|$)", re.DOTALL)
+
+
+@contextmanager
+def _phase(timings: Dict[str, float], name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = (time.perf_counter() - started) * 1000
+
 
 class Worker(BaseModule):
     _SYSTEM_PROMPT_PATH = Path(__file__).with_name("system_prompt.txt")
@@ -131,6 +155,9 @@ class Worker(BaseModule):
         self.grounding_agent = grounding_agent
         self.max_trajectory_length = max_trajectory_length
         self.enable_reflection = enable_reflection
+        self._prep_pool: Optional[ThreadPoolExecutor] = None
+        self._apps_windows_lock = threading.Lock()
+        self._apps_windows_cache: "OrderedDict[str, str]" = OrderedDict()
 
         self.reset()
 
@@ -162,6 +189,8 @@ class Worker(BaseModule):
         self.cost_this_turn = 0
         self.screenshot_inputs = []
         self.latest_gui_screenshot = None
+        with self._apps_windows_lock:
+            self._apps_windows_cache.clear()
 
     def _extract_response_field(self, payload: Any, key: str) -> Any:
         if isinstance(payload, dict):
@@ -449,8 +478,70 @@ class Worker(BaseModule):
             )
         return reflection, reflection_thoughts
 
+    def _prep_executor(self) -> ThreadPoolExecutor:
+        if self._prep_pool is None:
+            self._prep_pool = ThreadPoolExecutor(
+                max_workers=PREP_WORKERS, thread_name_prefix="worker-prep"
+            )
+        return self._prep_pool
+
+    def _submit(self, fn, *args) -> Future:
+        """Run `fn` on the step-preparation pool, keeping the caller's context (run id, emitter)."""
+        return self._prep_executor().submit(contextvars.copy_context().run, fn, *args)
+
+    def _fetch_apps_info(self, controller: Any) -> str:
+        try:
+            apps_data = controller.get_apps(exclude_system=True)
+            if isinstance(apps_data, dict):
+                if apps_data.get("status") == "success":
+                    app_names = apps_data.get("apps", [])
+                    if app_names:
+                        return (
+                            f"\n4. Currently available apps ({len(app_names)} total): "
+                            f"{', '.join(app_names)}"
+                        )
+                else:
+                    logger.warning(
+                        "Apps API returned non-success status: %s",
+                        apps_data.get("status"),
+                    )
+            else:
+                logger.warning("Unexpected /apps response: %s", apps_data)
+        except Exception as e:
+            logger.warning(f"Failed to fetch apps: {e}", exc_info=True)
+        return ""
+
+    def _fetch_windows_info(self, controller: Any) -> str:
+        try:
+            windows_data = controller.get_active_windows(exclude_system=True)
+            if isinstance(windows_data, dict):
+                if windows_data.get("status") == "success":
+                    windows = windows_data.get("windows", [])
+                    if windows:
+                        lines = [
+                            "\n5. Currently active windows you can switch to if needed "
+                            f"({len(windows)} total):"
+                        ]
+                        for window in windows:
+                            app_name = window.get("app_name") or window.get(
+                                "title", "Unknown"
+                            )
+                            lines.append(f"\n   - {app_name}")
+                        return "".join(lines)
+                    logger.info("Active windows API returned zero windows.")
+                    return "\n5. Currently, no applications/windows are open."
+                logger.warning(
+                    "Windows API returned non-success status: %s",
+                    windows_data.get("status"),
+                )
+            else:
+                logger.warning("Unexpected /active_windows response: %s", windows_data)
+        except Exception as e:
+            logger.warning(f"Failed to fetch windows: {e}", exc_info=True)
+        return ""
+
     def _fetch_apps_and_windows_info(self) -> str:
-        """Fetch current apps and windows information from the server API."""
+        """Fetch current apps and windows information from the server API (both calls concurrently)."""
         try:
             controller = getattr(
                 getattr(self.grounding_agent, "env", None), "controller", None
@@ -459,69 +550,177 @@ class Worker(BaseModule):
                 logger.warning("Controller unavailable, skipping apps/windows info")
                 return ""
 
-            apps_info = ""
-            windows_info = ""
-            
-            try:
-                apps_data = controller.get_apps(exclude_system=True)
-                if isinstance(apps_data, dict):
-                    if apps_data.get("status") == "success":
-                        app_names = apps_data.get("apps", [])
-                        if app_names:
-                            apps_info = (
-                                f"\n4. Currently available apps ({len(app_names)} total): "
-                                f"{', '.join(app_names)}"
-                            )
-                    else:
-                        logger.warning(
-                            "Apps API returned non-success status: %s",
-                            apps_data.get("status"),
-                        )
-                else:
-                    logger.warning("Unexpected /apps response: %s", apps_data)
-            except Exception as e:
-                logger.warning(f"Failed to fetch apps: {e}", exc_info=True)
-            
-            try:
-                windows_data = controller.get_active_windows(exclude_system=True)
-                if isinstance(windows_data, dict):
-                    if windows_data.get("status") == "success":
-                        windows = windows_data.get("windows", [])
-                        if windows:
-                            windows_info = (
-                                "\n5. Currently active windows you can switch to if needed "
-                                f"({len(windows)} total):"
-                            )
-                            for window in windows:
-                                app_name = window.get("app_name") or window.get(
-                                    "title", "Unknown"
-                                )
-                                windows_info += f"\n   - {app_name}"
-                        else:
-                            logger.info("Active windows API returned zero windows.")
-                            windows_info = "\n5. Currently, no applications/windows are open."
-                    else:
-                        logger.warning(
-                            "Windows API returned non-success status: %s",
-                            windows_data.get("status"),
-                        )
-                else:
-                    logger.warning("Unexpected /active_windows response: %s", windows_data)
-            except Exception as e:
-                logger.warning(f"Failed to fetch windows: {e}", exc_info=True)
-            
-            return apps_info + windows_info
-            
+            apps_info = self._submit(self._fetch_apps_info, controller)
+            windows_info = self._fetch_windows_info(controller)
+            return apps_info.result() + windows_info
+
         except Exception as e:
             logger.warning(f"Error fetching apps/windows info: {e}")
             return ""
 
+    def _apps_and_windows_info_for(self, obs: Dict) -> Tuple[str, bool, float]:
+        """
+        Apps/windows info for the screen in `obs`, cached per screenshot digest.
+
+        Returns (info, cache hit, fetch time in ms). Empty results are not
+        cached so a failed fetch is retried next step.
+        """
+        started = time.perf_counter()
+        digest = None
+        screenshot = obs.get("screenshot")
+        if screenshot:
+            try:
+                digest = Screenshot.from_data(screenshot).digest
+            except Exception:
+                digest = None
+        if digest is not None:
+            with self._apps_windows_lock:
+                cached = self._apps_windows_cache.get(digest)
+                if cached is not None:
+                    self._apps_windows_cache.move_to_end(digest)
+                    return cached, True, (time.perf_counter() - started) * 1000
+        info = self._fetch_apps_and_windows_info()
+        if digest is not None and info:
+            with self._apps_windows_lock:
+                self._apps_windows_cache[digest] = info
+                while len(self._apps_windows_cache) > APPS_WINDOWS_CACHE_SIZE:
+                    self._apps_windows_cache.popitem(last=False)
+        return info, False, (time.perf_counter() - started) * 1000
+
+    def _update_apps_and_windows_prompt(self, apps_windows_info: str) -> None:
+        """Put the current apps/windows section into the generator system prompt."""
+        # Get current system prompt
+        current_sys_prompt = self.generator_agent.system_prompt
+        placeholder = "... apps and windows information inserted dynamically ..."
+
+        # Check if placeholder exists (first turn) or if apps/windows section already exists (subsequent turns)
+        if placeholder in current_sys_prompt:
+            # First turn: replace placeholder
+            updated_sys_prompt = current_sys_prompt.replace(placeholder, apps_windows_info)
+            self.generator_agent.add_system_prompt(updated_sys_prompt)
+            return
+        if "Currently available apps" in current_sys_prompt:
+            # Subsequent turns: replace existing apps/windows section
+            # Pattern to match the apps/windows section (from "4. Currently available apps" to just before "### END OF GUIDELINES")
+            match = _APPS_WINDOWS_SECTION.search(current_sys_prompt)
+            if match:
+                # Replace the existing section
+                self.generator_agent.add_system_prompt(
+                    current_sys_prompt[: match.start()]
+                    + apps_windows_info
+                    + current_sys_prompt[match.end() :]
+                )
+                return
+        # Otherwise insert before "### END OF GUIDELINES"
+        end_guidelines_start = current_sys_prompt.find("### END OF GUIDELINES")
+        if end_guidelines_start != -1:
+            self.generator_agent.add_system_prompt(
+                current_sys_prompt[:end_guidelines_start]
+                + apps_windows_info
+                + "\n\n"
+                + current_sys_prompt[end_guidelines_start:]
+            )
+        else:
+            logger.warning("Could not find insertion point for apps/windows info in system prompt")
+
+    @staticmethod
+    def _format_code_step(number: int, action: str, separator: str) -> str:
+        """One code-agent history step, with its python/bash snippet re-fenced."""
+        for language in ("python", "bash"):
+            marker = f"```{language}"
+            if marker in action:
+                code_start = action.find(marker) + len(marker)
+                code_end = action.find("```", code_start)
+                if code_end != -1:
+                    code = action[code_start:code_end].strip()
+                    return f"Step {number}:{separator}```{language}\n{code}\n```\n"
+                break
+        return f"Step {number}:{separator}{action}\n"
+
+    @staticmethod
+    def _code_agent_header(code_result: Dict[str, Any]) -> List[str]:
+        return [
+            "\nCODE AGENT RESULT:\n",
+            f"Task/Subtask Instruction: {code_result['task_instruction']}\n",
+            f"Steps Completed: {code_result['steps_executed']}\n",
+            f"Max Steps: {code_result['budget']}\n",
+            f"Completion Reason: {code_result['completion_reason']}\n",
+            f"Summary: {code_result['summary']}\n",
+        ]
+
+    def _format_code_agent_result(self, code_result: Dict[str, Any]) -> str:
+        """Code agent result section of the generator message."""
+        parts = self._code_agent_header(code_result)
+        if code_result["execution_history"]:
+            parts.append("Execution History:\n")
+            for i, step in enumerate(code_result["execution_history"]):
+                parts.append(self._format_code_step(i + 1, step["action"], " \n"))
+        parts.append("\n")
+        return "".join(parts)
+
+    def _format_code_agent_log(self, code_result: Dict[str, Any]) -> str:
+        """Same section for the log, with the execution history truncated."""
+        parts = self._code_agent_header(code_result)
+        if code_result["execution_history"]:
+            parts.append("Execution History (truncated):\n")
+            # Only log first 3 steps and last 2 steps to keep logs manageable
+            total_steps = len(code_result["execution_history"])
+            for i, step in enumerate(code_result["execution_history"]):
+                if i < 3 or i >= total_steps - 2:  # First 3 and last 2 steps
+                    parts.append(self._format_code_step(i + 1, step["action"], " "))
+                elif i == 3 and total_steps > 5:
+                    parts.append(f"... (truncated {total_steps - 5} steps) ...\n")
+        return "".join(parts)
+
+    @staticmethod
+    def _save_code_agent_result(code_result: Dict[str, Any], step_number: int) -> None:
+        """Write the code agent result to a timestamped file in logs/ (runs off the critical path)."""
+        try:
+            # Create logs directory if it doesn't exist
+            logs_dir = "logs"
+            os.makedirs(logs_dir, exist_ok=True)
+
+            # Generate filename with timestamp
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"logs/code_agent_result_step_{step_number}_{timestamp}.txt"
+
+            lines = [
+                f"CODE AGENT RESULT - Step {step_number}\n",
+                f"Timestamp: {datetime.now().isoformat()}\n",
+                f"Task/Subtask Instruction: {code_result['task_instruction']}\n",
+                f"Steps Completed: {code_result['steps_executed']}\n",
+                f"Max Steps: {code_result['budget']}\n",
+                f"Completion Reason: {code_result['completion_reason']}\n",
+                f"Summary: {code_result['summary']}\n",
+            ]
+            if code_result["execution_history"]:
+                lines.append("\nExecution History:\n")
+                for i, step in enumerate(code_result["execution_history"]):
+                    lines.append(f"\nStep {i+1}:\n")
+                    lines.append(f"Action: {step['action']}\n")
+                    if "thoughts" in step:
+                        lines.append(f"Thoughts: {step['thoughts']}\n")
+
+            with open(filename, "w", encoding="utf-8", errors="backslashreplace") as f:
+                f.write("".join(lines))
+
+            logger.info(f"Code agent result saved to: {filename}")
+        except Exception as e:
+            logger.error(f"Failed to save code agent result to file: {e}")
+
     def generate_next_action(self, instruction: str, obs: Dict) -> Tuple[Dict, List]:
         """
         Predict the next action(s) based on the current observation.
+
+        Step preparation overlaps where it can: the apps/windows fetch
+        (cached per screenshot digest) runs while reflection is generated,
+        and the code agent result file is written in the background.
+        Per-phase timings are logged as `worker.step_timings`.
         """
 
         current_step = self.turn_count + 1
+        step_started = time.perf_counter()
+        timings: Dict[str, float] = {}
 
         # Get hierarchical logger if available
         h_logger = get_hierarchical_logger()
@@ -542,16 +741,18 @@ class Worker(BaseModule):
             },
         )
 
+        # Independent of reflection: start it first so the two overlap.
+        apps_windows = self._submit(self._apps_and_windows_info_for, obs)
+
         self.grounding_agent.assign_screenshot(obs)
         self.grounding_agent.set_task_context(instruction)
-        previous_behavior = obs.get("previous_behavior")
 
         if self.turn_count > 0:
-            generator_message = ""
+            message_parts: List[str] = []
         elif getattr(self, "resume_mode", False):
-            generator_message = "The current state screenshot is provided below."
+            message_parts = ["The current state screenshot is provided below."]
         else:
-            generator_message = "The initial screen is provided. No action has been taken yet."
+            message_parts = ["The initial screen is provided. No action has been taken yet."]
 
         # Load the task into the system prompt
         if self.turn_count == 0:
@@ -561,11 +762,19 @@ class Worker(BaseModule):
             self.generator_agent.add_system_prompt(prompt_with_instructions)
 
         # Get the per-step reflection
-        reflection, reflection_thoughts = self._generate_reflection(instruction, obs)
+        with _phase(timings, "reflection"):
+            reflection, reflection_thoughts = self._generate_reflection(instruction, obs)
+        # The previous step's narration may still be running; join it only now,
+        # after reflection, so the two model calls overlap.
+        with _phase(timings, "narration_wait"):
+            previous_behavior = resolve_narration(obs.get("previous_behavior"))
+        build_started = time.perf_counter()
         if reflection:
-            generator_message += f"REFLECTION: You may use this reflection on the previous action and overall trajectory:\n{reflection}\n"
+            message_parts.append(
+                f"REFLECTION: You may use this reflection on the previous action and overall trajectory:\n{reflection}\n"
+            )
         if previous_behavior and previous_behavior.get("fact_answer"):
-            generator_message += (
+            message_parts.append(
                 "\nBehavior Narrator — Previous Step Outcome\n"
                 "Use this as an objective summary of visual changes from the last action. "
                 "Treat it as high-signal evidence to verify success/failure and guide your next step; "
@@ -574,7 +783,7 @@ class Worker(BaseModule):
             )
 
         # Get the grounding agent's knowledge base buffer
-        generator_message += (
+        message_parts.append(
             f"\nCurrent Text Buffer = [{','.join(self.grounding_agent.knowledge)}]\n"
         )
 
@@ -584,132 +793,16 @@ class Worker(BaseModule):
             and self.grounding_agent.last_code_agent_result is not None
         ):
             code_result = self.grounding_agent.last_code_agent_result
-            generator_message += f"\nCODE AGENT RESULT:\n"
-            generator_message += (
-                f"Task/Subtask Instruction: {code_result['task_instruction']}\n"
-            )
-            generator_message += f"Steps Completed: {code_result['steps_executed']}\n"
-            generator_message += f"Max Steps: {code_result['budget']}\n"
-            generator_message += (
-                f"Completion Reason: {code_result['completion_reason']}\n"
-            )
-            generator_message += f"Summary: {code_result['summary']}\n"
-            if code_result["execution_history"]:
-                generator_message += f"Execution History:\n"
-                for i, step in enumerate(code_result["execution_history"]):
-                    action = step["action"]
-                    # Format code snippets with proper backticks
-                    if "```python" in action:
-                        # Extract Python code and format it
-                        code_start = action.find("```python") + 9
-                        code_end = action.find("```", code_start)
-                        if code_end != -1:
-                            python_code = action[code_start:code_end].strip()
-                            generator_message += (
-                                f"Step {i+1}: \n```python\n{python_code}\n```\n"
-                            )
-                        else:
-                            generator_message += f"Step {i+1}: \n{action}\n"
-                    elif "```bash" in action:
-                        # Extract Bash code and format it
-                        code_start = action.find("```bash") + 7
-                        code_end = action.find("```", code_start)
-                        if code_end != -1:
-                            bash_code = action[code_start:code_end].strip()
-                            generator_message += (
-                                f"Step {i+1}: \n```bash\n{bash_code}\n```\n"
-                            )
-                        else:
-                            generator_message += f"Step {i+1}: \n{action}\n"
-                    else:
-                        generator_message += f"Step {i+1}: \n{action}\n"
-            generator_message += "\n"
-
-            # Save code agent result to text file
-            try:
-                import os
-                from datetime import datetime
-
-                # Create logs directory if it doesn't exist
-                logs_dir = "logs"
-                if not os.path.exists(logs_dir):
-                    os.makedirs(logs_dir)
-
-                # Generate filename with timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = (
-                    f"logs/code_agent_result_step_{self.turn_count + 1}_{timestamp}.txt"
-                )
+            message_parts.append(self._format_code_agent_result(code_result))
 
-                with open(
-                    filename, "w", encoding="utf-8", errors="backslashreplace"
-                ) as f:
-                    f.write(f"CODE AGENT RESULT - Step {self.turn_count + 1}\n")
-                    f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-                    f.write(
-                        f"Task/Subtask Instruction: {code_result['task_instruction']}\n"
-                    )
-                    f.write(f"Steps Completed: {code_result['steps_executed']}\n")
-                    f.write(f"Max Steps: {code_result['budget']}\n")
-                    f.write(f"Completion Reason: {code_result['completion_reason']}\n")
-                    f.write(f"Summary: {code_result['summary']}\n")
-                    if code_result["execution_history"]:
-                        f.write(f"\nExecution History:\n")
-                        for i, step in enumerate(code_result["execution_history"]):
-                            f.write(f"\nStep {i+1}:\n")
-                            f.write(f"Action: {step['action']}\n")
-                            if "thoughts" in step:
-                                f.write(f"Thoughts: {step['thoughts']}\n")
-
-                logger.info(f"Code agent result saved to: {filename}")
-            except Exception as e:
-                logger.error(f"Failed to save code agent result to file: {e}")
+            # Save code agent result to text file, off the critical path
+            self._submit(self._save_code_agent_result, code_result, self.turn_count + 1)
 
             # Log the code agent result section for debugging (truncated execution history)
-            log_message = f"\nCODE AGENT RESULT:\n"
-            log_message += (
-                f"Task/Subtask Instruction: {code_result['task_instruction']}\n"
-            )
-            log_message += f"Steps Completed: {code_result['steps_executed']}\n"
-            log_message += f"Max Steps: {code_result['budget']}\n"
-            log_message += f"Completion Reason: {code_result['completion_reason']}\n"
-            log_message += f"Summary: {code_result['summary']}\n"
-            if code_result["execution_history"]:
-                log_message += f"Execution History (truncated):\n"
-                # Only log first 3 steps and last 2 steps to keep logs manageable
-                total_steps = len(code_result["execution_history"])
-                for i, step in enumerate(code_result["execution_history"]):
-                    if i < 3 or i >= total_steps - 2:  # First 3 and last 2 steps
-                        action = step["action"]
-                        if "```python" in action:
-                            code_start = action.find("```python") + 9
-                            code_end = action.find("```", code_start)
-                            if code_end != -1:
-                                python_code = action[code_start:code_end].strip()
-                                log_message += (
-                                    f"Step {i+1}: ```python\n{python_code}\n```\n"
-                                )
-                            else:
-                                log_message += f"Step {i+1}: {action}\n"
-                        elif "```bash" in action:
-                            code_start = action.find("```bash") + 7
-                            code_end = action.find("```", code_start)
-                            if code_end != -1:
-                                bash_code = action[code_start:code_end].strip()
-                                log_message += (
-                                    f"Step {i+1}: ```bash\n{bash_code}\n```\n"
-                                )
-                            else:
-                                log_message += f"Step {i+1}: {action}\n"
-                        else:
-                            log_message += f"Step {i+1}: {action}\n"
-                    elif i == 3 and total_steps > 5:
-                        log_message += f"... (truncated {total_steps - 5} steps) ...\n"
-
             logger.info(
                 "WORKER_CODE_AGENT_RESULT_SECTION - Step %s: Code agent result added to generator message:\n%s",
                 self.turn_count + 1,
-                safe_ascii(log_message),
+                safe_ascii(self._format_code_agent_log(code_result)),
             )
 
             # Reset the code agent result after adding it to context
@@ -721,12 +814,10 @@ class Worker(BaseModule):
             and self.grounding_agent.handback_inference is not None
         ):
             handback_inference = self.grounding_agent.handback_inference
-            generator_message += "\nHANDBACK TO HUMAN RESULT:\n"
-            generator_message += (
-                f"You previously requested human intervention and the run was paused.\n"
-            )
-            generator_message += f"{handback_inference}\n"
-            generator_message += (
+            message_parts.append(
+                "\nHANDBACK TO HUMAN RESULT:\n"
+                "You previously requested human intervention and the run was paused.\n"
+                f"{handback_inference}\n"
                 "Use this information to understand what happened during the pause "
                 "and continue with the task accordingly.\n"
             )
@@ -735,56 +826,19 @@ class Worker(BaseModule):
             )
             # Reset the handback inference after adding it to context
             self.grounding_agent.handback_inference = None
+        generator_message = "".join(message_parts)
+        timings["prompt_build"] = (time.perf_counter() - build_started) * 1000
 
         # Update system prompt with current apps and windows information
-        apps_windows_info = self._fetch_apps_and_windows_info()
+        with _phase(timings, "apps_windows_wait"):
+            try:
+                apps_windows_info, apps_windows_cached, apps_windows_ms = apps_windows.result()
+            except Exception as e:
+                logger.warning(f"Error fetching apps/windows info: {e}")
+                apps_windows_info, apps_windows_cached, apps_windows_ms = "", False, 0.0
+        timings["apps_windows"] = apps_windows_ms
         if apps_windows_info:
-            # Get current system prompt
-            current_sys_prompt = self.generator_agent.system_prompt
-            placeholder = "... apps and windows information inserted dynamically ..."
-            
-            # Check if placeholder exists (first turn) or if apps/windows section already exists (subsequent turns)
-            if placeholder in current_sys_prompt:
-                # First turn: replace placeholder
-                updated_sys_prompt = current_sys_prompt.replace(placeholder, apps_windows_info)
-                self.generator_agent.add_system_prompt(updated_sys_prompt)
-            elif "Currently available apps" in current_sys_prompt:
-                # Subsequent turns: replace existing apps/windows section
-                # Pattern to match the apps/windows section (from "4. Currently available apps" to just before "### END OF GUIDELINES")
-                pattern = r'\n4\. Currently available apps.*?(?=\n### END OF GUIDELINES|$)'
-                match = re.search(pattern, current_sys_prompt, re.DOTALL)
-                if match:
-                    # Replace the existing section
-                    updated_sys_prompt = (
-                        current_sys_prompt[:match.start()] + 
-                        apps_windows_info + 
-                        current_sys_prompt[match.end():]
-                    )
-                    self.generator_agent.add_system_prompt(updated_sys_prompt)
-                else:
-                    # Fallback: insert before "### END OF GUIDELINES"
-                    end_guidelines_start = current_sys_prompt.find("### END OF GUIDELINES")
-                    if end_guidelines_start != -1:
-                        updated_sys_prompt = (
-                            current_sys_prompt[:end_guidelines_start] + 
-                            apps_windows_info + "\n\n" +
-                            current_sys_prompt[end_guidelines_start:]
-                        )
-                        self.generator_agent.add_system_prompt(updated_sys_prompt)
-                    else:
-                        logger.warning("Could not find insertion point for apps/windows info in system prompt")
-            else:
-                # If neither placeholder nor existing section found, insert before "### END OF GUIDELINES"
-                end_guidelines_start = current_sys_prompt.find("### END OF GUIDELINES")
-                if end_guidelines_start != -1:
-                    updated_sys_prompt = (
-                        current_sys_prompt[:end_guidelines_start] + 
-                        apps_windows_info + "\n\n" +
-                        current_sys_prompt[end_guidelines_start:]
-                    )
-                    self.generator_agent.add_system_prompt(updated_sys_prompt)
-                else:
-                    logger.warning("Could not find insertion point for apps/windows info in system prompt")
+            self._update_apps_and_windows_prompt(apps_windows_info)
 
         # Finalize the generator message
         screenshot_bytes = obs.get("screenshot")
@@ -805,22 +859,25 @@ class Worker(BaseModule):
             },
         )
 
+        timings["prep"] = (time.perf_counter() - step_started) * 1000
+
         # Generate the plan and next action
         format_checkers = [
             SINGLE_ACTION_FORMATTER,
             CALL_CODE_AGENT_SUBTASK_REQUIRED_FORMATTER,
             partial(CODE_VALID_FORMATTER, self.grounding_agent, obs),
         ]
-        plan = call_llm_formatted(
-            self.generator_agent,
-            format_checkers,
-            temperature=self.temperature,
-            use_thinking=self.use_thinking,
-            reasoning_effort="medium",
-            reasoning_summary="auto",
-            max_output_tokens=6500,
-            cost_source="worker.generator",
-        )
+        with _phase(timings, "generator"):
+            plan = call_llm_formatted(
+                self.generator_agent,
+                format_checkers,
+                temperature=self.temperature,
+                use_thinking=self.use_thinking,
+                reasoning_effort="medium",
+                reasoning_summary="auto",
+                max_output_tokens=6500,
+                cost_source="worker.generator",
+            )
         self.worker_history.append(plan)
         self.generator_agent.add_message(plan, role="assistant")
         logger.info("PLAN:\n %s", plan)
@@ -871,6 +928,21 @@ class Worker(BaseModule):
             },
         )
 
+        # Step timings: the apps/windows fetch ran alongside reflection, so only
+        # the part not hidden behind it (apps_windows_wait) was on the critical path.
+        step_timings = {name: round(ms, 1) for name, ms in timings.items()}
+        step_timings["overlapped"] = round(max(0.0, apps_windows_ms - timings["apps_windows_wait"]), 1)
+        LATENCY_LOGGER.log_event(
+            "worker",
+            "step_timings",
+            timings["prep"],
+            extra={"step": current_step, "phases": step_timings, "apps_windows_cached": apps_windows_cached},
+        )
+        emit_event(
+            "worker.step.timings",
+            {"step": current_step, "phases": step_timings, "apps_windows_cached": apps_windows_cached},
+        )
+
         # Log step completion to hierarchical logger
         if worker_logger:
             worker_logger.log_event("step.completed", {
@@ -878,6 +950,7 @@ class Worker(BaseModule):
                 "plan": plan,
                 "has_reflection": reflection is not None,
                 "has_code_agent_output": executor_info.get("code_agent_output") is not None,
+                "timings_ms": step_timings,
             })
 
         self.turn_count += 1
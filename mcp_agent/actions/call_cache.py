@@ -0,0 +1,274 @@
+"""Run-scoped memoization for read-only MCP tool calls.
+
+Wrappers opt in by setting ``__tb_read_only__ = True``. Within a single planner
+run (keyed by ``AgentContext.request_id``) identical read-only calls are served
+from a bounded TTL cache, and concurrent identical calls are coalesced so only
+one reaches the provider. Any non-read-only call on a provider invalidates that
+provider's entries.
+
+Sandbox plans run in a subprocess, so the cache is handed across the process
+boundary as a JSON file (see ``export_state``/``load_state``).
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, str]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def cache_enabled() -> bool:
+    return os.getenv("MCP_TOOL_CACHE_ENABLED", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def is_read_only(func: Callable[..., Any]) -> bool:
+    """Return True when the wrapper is marked as free of side effects."""
+    return getattr(func, "__tb_read_only__", False) is True
+
+
+def canonical_key(provider: str, tool: str, payload: Dict[str, Any]) -> CacheKey:
+    """Build the cache key from provider, tool and a canonical JSON rendering of args."""
+    args = json.dumps(payload or {}, sort_keys=True, default=str, separators=(",", ":"))
+    return (provider, tool, args)
+
+
+def _is_cacheable(result: Any) -> bool:
+    return isinstance(result, dict) and bool(result.get("successful", result.get("success")))
+
+
+@dataclass
+class _InFlight:
+    event: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class ToolCallCache:
+    """Bounded TTL cache with single-flight coalescing for one run."""
+
+    def __init__(self, *, ttl_s: Optional[float] = None, max_entries: Optional[int] = None) -> None:
+        self.ttl_s = ttl_s if ttl_s is not None else _env_float("MCP_TOOL_CACHE_TTL_S", 300.0)
+        self.max_entries = max(
+            1, max_entries if max_entries is not None else _env_int("MCP_TOOL_CACHE_MAX_ENTRIES", 256)
+        )
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[CacheKey, _InFlight] = {}
+        self._generations: Dict[str, int] = {}
+        self._written: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _lookup_locked(self, key: CacheKey, now: float) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, result = entry
+        if expires_at <= now:
+            self._entries.pop(key, None)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, result
+
+    def _store_locked(self, key: CacheKey, result: Any, expires_at: float) -> None:
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def call(
+        self,
+        provider: str,
+        tool: str,
+        payload: Dict[str, Any],
+        fn: Callable[[], Any],
+    ) -> Any:
+        """Return a cached result for the call or run ``fn`` once for all concurrent callers."""
+        key = canonical_key(provider, tool, payload)
+        with self._lock:
+            found, result = self._lookup_locked(key, time.monotonic())
+            if found:
+                self.hits += 1
+                return copy.deepcopy(result)
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _InFlight()
+                self._in_flight[key] = flight
+                self.misses += 1
+                generation = self._generations.get(provider, 0)
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        else:
+            flight.result = result
+            if _is_cacheable(result):
+                with self._lock:
+                    # A write on the provider while we were in flight makes this result stale.
+                    if self._generations.get(provider, 0) == generation:
+                        self._store_locked(key, copy.deepcopy(result), time.monotonic() + self.ttl_s)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.event.set()
+
+    def invalidate_provider(self, provider: str, *, record: bool = True) -> int:
+        """Drop every entry for ``provider``; returns the number of evicted entries."""
+        with self._lock:
+            if record:
+                self._written.add(provider)
+            self._generations[provider] = self._generations.get(provider, 0) + 1
+            stale = [key for key in self._entries if key[0] == provider]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            logger.debug("Invalidated %d cached %s tool result(s)", len(stale), provider)
+        return len(stale)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "entries": len(self._entries),
+            }
+
+    def export_state(self, *, entries_only: bool = False) -> Dict[str, Any]:
+        """Serialize live entries (with remaining TTL) for another process.
+
+        ``entries_only`` omits the write log and counters, which is what a fresh
+        sandbox needs and keeps a re-read of an untouched file side-effect free.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entries = [
+                {"key": list(key), "ttl_s": expires_at - now, "result": result}
+                for key, (expires_at, result) in self._entries.items()
+                if expires_at > now
+            ]
+            if entries_only:
+                return {"entries": entries}
+            return {
+                "entries": entries,
+                "invalidated": sorted(self._written),
+                "hits": self.hits,
+                "coalesced": self.coalesced,
+            }
+
+    def load_state(self, state: Dict[str, Any], *, merge_stats: bool = False) -> None:
+        """Apply state produced by ``export_state`` in another process."""
+        if not isinstance(state, dict):
+            return
+        for provider in state.get("invalidated") or []:
+            self.invalidate_provider(provider, record=False)
+        now = time.monotonic()
+        with self._lock:
+            for entry in state.get("entries") or []:
+                try:
+                    provider, tool, args = entry["key"]
+                    ttl = float(entry["ttl_s"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if ttl > 0:
+                    self._store_locked((provider, tool, args), entry.get("result"), now + ttl)
+            if merge_stats:
+                self.hits += int(state.get("hits") or 0)
+                self.coalesced += int(state.get("coalesced") or 0)
+
+    def dump_to_file(self, path: str, *, entries_only: bool = False) -> None:
+        try:
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump(self.export_state(entries_only=entries_only), fh, default=str)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Failed to export tool call cache to %s: %s", path, exc)
+
+    def load_from_file(self, path: str, *, merge_stats: bool = False) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                state = json.load(fh)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.warning("Failed to load tool call cache from %s: %s", path, exc)
+            return
+        self.load_state(state, merge_stats=merge_stats)
+
+
+_RUN_CACHES: "OrderedDict[str, ToolCallCache]" = OrderedDict()
+_RUN_CACHES_LOCK = threading.Lock()
+_MAX_RUN_CACHES = 64
+
+
+def get_run_cache(run_key: Optional[str]) -> Optional[ToolCallCache]:
+    """Return the cache for a run, creating it on first use (None when disabled)."""
+    if not run_key or not cache_enabled():
+        return None
+    with _RUN_CACHES_LOCK:
+        cache = _RUN_CACHES.get(run_key)
+        if cache is None:
+            cache = ToolCallCache()
+            _RUN_CACHES[run_key] = cache
+            while len(_RUN_CACHES) > _MAX_RUN_CACHES:
+                _RUN_CACHES.popitem(last=False)
+        else:
+            _RUN_CACHES.move_to_end(run_key)
+        return cache
+
+
+def drop_run_cache(run_key: Optional[str]) -> None:
+    if not run_key:
+        return
+    with _RUN_CACHES_LOCK:
+        _RUN_CACHES.pop(run_key, None)
+
+
+__all__ = [
+    "ToolCallCache",
+    "cache_enabled",
+    "canonical_key",
+    "drop_run_cache",
+    "get_run_cache",
+    "is_read_only",
+]
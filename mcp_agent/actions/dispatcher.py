@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Any, Dict
 
 from mcp_agent.core.exceptions import ToolNotFoundError
 from mcp_agent.types import ToolInvocationResult
+from .call_cache import get_run_cache, is_read_only
 from .provider_loader import discover_providers, load_action_map
 
 if TYPE_CHECKING:
@@ -69,5 +70,15 @@ def dispatch_tool(
             details={"available_tools": available_tools},
         )
     
-    # Call wrapper with context and payload
-    return wrapper_func(context, **payload)
+    # Read-only tools are memoized per run; any other tool invalidates the
+    # provider's cached reads before and after it runs.
+    cache = get_run_cache(getattr(context, "request_id", None))
+    if cache is None:
+        return wrapper_func(context, **payload)
+    if is_read_only(wrapper_func):
+        return cache.call(provider, tool, payload, lambda: wrapper_func(context, **payload))
+    cache.invalidate_provider(provider)
+    try:
+        return wrapper_func(context, **payload)
+    finally:
+        cache.invalidate_provider(provider)
@@ -70,6 +70,7 @@ def airtable_list_records(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+airtable_list_records.__tb_read_only__ = True
 airtable_list_records.__tb_output_schema__ = {
   "properties": {
     "data": {
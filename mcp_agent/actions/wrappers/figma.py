@@ -53,3 +53,6 @@ def figma_get_file_json(
         }
     )
     return _invoke_mcp_tool(context, provider, tool_name, payload)
+
+
+figma_get_file_json.__tb_read_only__ = True
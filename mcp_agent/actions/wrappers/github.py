@@ -39,6 +39,7 @@ def github_get_branch_protection(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+github_get_branch_protection.__tb_read_only__ = True
 github_get_branch_protection.__tb_output_schema__ = {
     "properties": {
         "composio_execution_message": {
@@ -104,6 +105,7 @@ def github_get_all_status_check_contexts(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+github_get_all_status_check_contexts.__tb_read_only__ = True
 github_get_all_status_check_contexts.__tb_output_schema__ = {
     "properties": {
         "data": {
@@ -159,6 +161,7 @@ def github_get_a_repository_ruleset(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+github_get_a_repository_ruleset.__tb_read_only__ = True
 github_get_a_repository_ruleset.__tb_output_schema__ = {
     "properties": {
         "data": {
@@ -215,6 +218,7 @@ def github_get_repository_content(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+github_get_repository_content.__tb_read_only__ = True
 github_get_repository_content.__tb_output_schema__ = {
     "properties": {
         "data": {
@@ -277,6 +281,7 @@ def github_search_issues_and_pull_requests(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+github_search_issues_and_pull_requests.__tb_read_only__ = True
 github_search_issues_and_pull_requests.__tb_output_schema__ = {
     "properties": {
         "data": {
@@ -348,6 +353,7 @@ def github_list_pull_requests(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+github_list_pull_requests.__tb_read_only__ = True
 github_list_pull_requests.__tb_output_schema__ = {
     "properties": {
         "data": {
@@ -401,6 +407,7 @@ def github_get_a_pull_request(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+github_get_a_pull_request.__tb_read_only__ = True
 github_get_a_pull_request.__tb_output_schema__ = {
     "properties": {
         "data": {
@@ -459,6 +466,7 @@ def github_list_reviews_for_a_pull_request(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+github_list_reviews_for_a_pull_request.__tb_read_only__ = True
 github_list_reviews_for_a_pull_request.__tb_output_schema__ = {
     "properties": {
         "data": {
@@ -526,6 +534,7 @@ def github_list_review_comments_on_a_pull_request(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+github_list_review_comments_on_a_pull_request.__tb_read_only__ = True
 github_list_review_comments_on_a_pull_request.__tb_output_schema__ = {
     "properties": {
         "data": {
@@ -596,6 +605,7 @@ def github_list_check_runs_for_a_ref(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+github_list_check_runs_for_a_ref.__tb_read_only__ = True
 github_list_check_runs_for_a_ref.__tb_output_schema__ = {
     "properties": {
         "data": {
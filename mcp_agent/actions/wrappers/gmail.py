@@ -271,6 +271,16 @@ def gmail_search(
     return _invoke_mcp_tool(context, "gmail", tool_name, payload)
 
 
+gmail_search.__tb_read_only__ = True
+
+
+# Cursor pagination metadata; the sandbox toolbox exposes gmail_search_pages/_items iterators.
+gmail_search.__tb_pagination__ = {
+    "cursor_param": "page_token",
+    "next_cursor_path": "nextPageToken",
+    "items_path": "messages",
+}
+
 # Attach structured output schema for gmail_search so downstream search can surface output_fields
 gmail_search.__tb_output_schema__ = {
     "properties": {
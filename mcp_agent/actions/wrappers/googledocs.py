@@ -29,6 +29,7 @@ def googledocs_get_document_by_id(context: "AgentContext", doc_id: str) -> ToolI
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+googledocs_get_document_by_id.__tb_read_only__ = True
 googledocs_get_document_by_id.__tb_output_schema__ = google_docs_get_document_by_id_output_schema
 
 
@@ -78,4 +79,5 @@ def googledocs_search_documents(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+googledocs_search_documents.__tb_read_only__ = True
 googledocs_search_documents.__tb_output_schema__ = google_docs_search_documents_output_schema
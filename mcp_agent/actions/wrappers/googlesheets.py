@@ -39,6 +39,9 @@ def googlesheets_batch_get(
     )
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
+
+googlesheets_batch_get.__tb_read_only__ = True
+
 googlesheets_batch_get.__tb_output_schema__ = {
   "properties": {
     "data": {
@@ -348,6 +351,7 @@ def googlesheets_find_worksheet_by_title(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+googlesheets_find_worksheet_by_title.__tb_read_only__ = True
 googlesheets_find_worksheet_by_title.__tb_output_schema__ = {
   "properties": {
     "data": {
@@ -854,6 +854,13 @@ def hubspot_search_deals(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+hubspot_search_deals.__tb_read_only__ = True
+hubspot_search_deals.__tb_pagination__ = {
+    "cursor_param": "after",
+    "next_cursor_path": "paging.next.after",
+    "items_path": "results",
+}
+
 hubspot_search_deals.__tb_output_schema__ = {
     "properties": {
         "data": {
@@ -1133,6 +1140,13 @@ def hubspot_search_contacts_by_criteria(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+hubspot_search_contacts_by_criteria.__tb_read_only__ = True
+hubspot_search_contacts_by_criteria.__tb_pagination__ = {
+    "cursor_param": "after",
+    "next_cursor_path": "paging.next.after",
+    "items_path": "results",
+}
+
 hubspot_search_contacts_by_criteria.__tb_output_schema__ = {
     "properties": {
         "data": {
@@ -1366,6 +1380,13 @@ def hubspot_list_deals(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+hubspot_list_deals.__tb_read_only__ = True
+hubspot_list_deals.__tb_pagination__ = {
+    "cursor_param": "after",
+    "next_cursor_path": "paging.next.after",
+    "items_path": "results",
+}
+
 hubspot_list_deals.__tb_output_schema__ = {
     "properties": {
         "data": {
@@ -1659,6 +1680,13 @@ def hubspot_list_contacts(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+hubspot_list_contacts.__tb_read_only__ = True
+hubspot_list_contacts.__tb_pagination__ = {
+    "cursor_param": "after",
+    "next_cursor_path": "paging.next.after",
+    "items_path": "results",
+}
+
 hubspot_list_contacts.__tb_output_schema__ = {
     "properties": {
         "data": {
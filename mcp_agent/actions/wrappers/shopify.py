@@ -69,6 +69,7 @@ def shopify_get_ordersby_id(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+shopify_get_ordersby_id.__tb_read_only__ = True
 shopify_get_ordersby_id.__tb_output_schema__ = shopify_get_ordersby_id_output_schema
 
 
@@ -86,6 +87,7 @@ def shopify_get_customer(context: "AgentContext", customer_id: str) -> ToolInvoc
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+shopify_get_customer.__tb_read_only__ = True
 shopify_get_customer.__tb_output_schema__ = shopify_get_customer_output_schema
 
 
@@ -195,6 +197,7 @@ def shopify_get_order_list(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+shopify_get_order_list.__tb_read_only__ = True
 shopify_get_order_list.__tb_output_schema__ = shopify_get_order_list_output_schema
 
 
@@ -297,6 +300,9 @@ def shopify_get_orders_with_filters(
     )
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
+
+shopify_get_orders_with_filters.__tb_read_only__ = True
+
 shopify_get_orders_with_filters.__tb_output_schema__ = shopify_get_orders_with_filters_output_schema
 
 
@@ -177,5 +177,6 @@ def slack_search_messages(
     return _invoke_mcp_tool(context, "slack", tool_name, payload)
 
 
+slack_search_messages.__tb_read_only__ = True
 slack_search_messages.__tb_output_schema__ = slack_search_messages_output_schema
 slack_post_message.__tb_output_schema__ = slack_post_message_output_schema
@@ -115,6 +115,7 @@ def stripe_list_payment_intents(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+stripe_list_payment_intents.__tb_read_only__ = True
 stripe_list_payment_intents.__tb_output_schema__ = {
   "properties": {
     "data": {
@@ -163,6 +164,7 @@ def stripe_retrieve_refund(context: "AgentContext", refund_id: str) -> ToolInvoc
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+stripe_retrieve_refund.__tb_read_only__ = True
 stripe_retrieve_refund.__tb_output_schema__ = {
   "properties": {
     "data": {
@@ -332,6 +334,7 @@ def stripe_retrieve_payment_intent(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+stripe_retrieve_payment_intent.__tb_read_only__ = True
 stripe_retrieve_payment_intent.__tb_output_schema__ = {
   "properties": {
     "data": {
@@ -456,6 +459,7 @@ def stripe_list_refunds(
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+stripe_list_refunds.__tb_read_only__ = True
 stripe_list_refunds.__tb_output_schema__ = {
   "properties": {
     "data": {
@@ -610,6 +614,7 @@ def stripe_retrieve_charge(context: "AgentContext", charge_id: str) -> ToolInvoc
     return _invoke_mcp_tool(context, provider, tool_name, payload)
 
 
+stripe_retrieve_charge.__tb_read_only__ = True
 stripe_retrieve_charge.__tb_output_schema__ = {
   "properties": {
     "data": {
@@ -12,6 +12,7 @@ from mcp_agent.execution.runner import run_python_plan
 from mcp_agent.knowledge.search import search_tools
 from mcp_agent.knowledge.introspection import get_index
 from mcp_agent.actions.dispatcher import dispatch_tool
+from mcp_agent.actions.call_cache import get_run_cache
 from mcp_agent.utils.token_counter import count_json_tokens
 from mcp_agent.agent.observation_processor import summarize_observation
 from shared import agent_signal
@@ -161,9 +162,9 @@ class ActionExecutor:
         if action_type == "search":
             return self._execute_search(command)
         if action_type == "tool":
-            return self._execute_tool(command)
+            return self._with_cache_hits(self._execute_tool, command)
         if action_type == "sandbox":
-            return self._execute_sandbox(command)
+            return self._with_cache_hits(self._execute_sandbox, command)
         if action_type == "inspect_tool_output":
             return self._execute_inspect_tool_output(command)
         if action_type == "finish":
@@ -178,6 +179,27 @@ class ActionExecutor:
             error="unknown_command",
         )
 
+    def _with_cache_hits(self, handler, command: Dict[str, Any]) -> StepResult:
+        """Run a tool/sandbox handler and attribute run-cache hits to the step."""
+        cache = get_run_cache(getattr(self.agent_context, "request_id", None))
+        hits_before = cache.stats()["hits"] if cache is not None else 0
+        result = handler(command)
+        if cache is None:
+            return result
+        stats = cache.stats()
+        result.cache_hits = stats["hits"] - hits_before
+        if result.cache_hits:
+            self.agent_state.record_event(
+                "mcp.tool_cache.hit",
+                {
+                    "step_type": result.type,
+                    "hits": result.cache_hits,
+                    "coalesced": stats["coalesced"],
+                    "entries": stats["entries"],
+                },
+            )
+        return result
+
     # --- Search execution ---
 
     def _execute_search(self, command: Dict[str, Any]) -> StepResult:
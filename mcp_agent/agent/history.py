@@ -12,6 +12,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List, Literal, Optional
 
+from .state_encoder import FrozenStep, freeze_step
+
 StepType = Literal["tool", "sandbox", "search", "inspect_tool_output", "finish", "fail"]
 
 
@@ -64,6 +66,8 @@ class ExecutionHistory:
     def __init__(self) -> None:
         """Initialize empty history."""
         self._history: List[AgentStep] = []
+        # Compact planner encodings, parallel to _history (steps are immutable once recorded).
+        self._frozen: List[FrozenStep] = []
 
     @property
     def history(self) -> List[AgentStep]:
@@ -119,8 +123,16 @@ class ExecutionHistory:
 
     def build_trajectory(self) -> List[Dict[str, Any]]:
         """Build a structured trajectory from canonical AgentSteps (no formatted text)."""
-        trajectory: List[Dict[str, Any]] = []
+        return [self._trajectory_entry(step) for step in self._history]
+
+    def frozen_trajectory(self) -> List[FrozenStep]:
+        """Compact encodings of every step for the planner, computed once per step."""
+        for step in self._history[len(self._frozen) :]:
+            self._frozen.append(freeze_step(self._trajectory_entry(step)))
+        return list(self._frozen)
 
+    @staticmethod
+    def _trajectory_entry(step: AgentStep) -> Dict[str, Any]:
         def _fmt(obj: Any) -> Any:
             if obj is None:
                 return None
@@ -128,23 +140,18 @@ class ExecutionHistory:
                 return dict(obj)
             return obj
 
-        for step in self._history:
-            trajectory.append(
-                {
-                    "step": step.action_step,
-                    "type": step.action_type,
-                    "action_reasoning": step.action_reasoning,
-                    "action_input": _fmt(step.action_input),
-                    "action_outcome": _fmt(step.action_outcome),
-                    "success": step.success,
-                    "error": step.error,
-                    "is_smart_summary": step.is_smart_summary,
-                    "observation": _fmt(step.observation),
-                    "observation_metadata": step.observation_metadata,
-                }
-            )
-
-        return trajectory
+        return {
+            "step": step.action_step,
+            "type": step.action_type,
+            "action_reasoning": step.action_reasoning,
+            "action_input": _fmt(step.action_input),
+            "action_outcome": _fmt(step.action_outcome),
+            "success": step.success,
+            "error": step.error,
+            "is_smart_summary": step.is_smart_summary,
+            "observation": _fmt(step.observation),
+            "observation_metadata": step.observation_metadata,
+        }
 
     @staticmethod
     def summarize_tool_observation(observation: Dict[str, Any]) -> str:
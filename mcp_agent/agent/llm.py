@@ -3,12 +3,24 @@
 from __future__ import annotations
 
 import os
-import json
 import sys
 from typing import Any, Dict, List, TYPE_CHECKING
 
+from shared.json_stream import StreamedJSONCall, repair_json_object
 from shared.llm_client import LLMClient, extract_assistant_text
+from .parser import parse_partial_planner_command
 from .prompts import PLANNER_PROMPT
+from .transcript import PlannerTranscript
+
+# Trajectory tokens the planner state may use before old steps are collapsed.
+DEFAULT_STATE_TOKEN_BUDGET = 24_000
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
 
 if TYPE_CHECKING:
     from .budget import BudgetSnapshot
@@ -24,14 +36,38 @@ class PlannerLLM:
         client: LLMClient | None = None,
         model: str = "o4-mini",
         enabled: bool | None = None,
+        chain_responses: bool | None = None,
+        state_token_budget: int | None = None,
+        streaming: bool | None = None,
     ) -> None:
         self._client = client
         self.model = model
         self._enabled_override = enabled
+        self._chain_override = chain_responses
+        self._streaming_override = streaming
+        if state_token_budget is None:
+            state_token_budget = _env_int("MCP_PLANNER_STATE_TOKEN_BUDGET", DEFAULT_STATE_TOKEN_BUDGET)
+        self._transcript = PlannerTranscript(token_budget=state_token_budget)
+        # (response id, number of transcript messages that response has seen)
+        self._chain_anchor: tuple[str, int] | None = None
+        # Streamed plan handed out before its response finished (see `settle_plan`).
+        self._pending: Dict[str, Any] | None = None
 
     def generate_plan(self, context: "AgentState") -> Dict[str, Any]:
+        """
+        Ask the planner LLM for the next command.
+
+        Returns `messages`, the response `text` and `response`. With streaming
+        on, an action command whose fields before `reasoning` have arrived is
+        returned right away as `command` (`response` is None) while the rest
+        streams in the background; `settle_plan` completes it.
+        """
+        self.settle_plan(context)
         snapshot = context.budget_tracker.snapshot()
+        generation = self._transcript.generation
         messages = self._build_messages(context, snapshot)
+        if self._transcript.generation != generation:
+            self._chain_anchor = None
 
         if not self.is_enabled():
             context.record_event(
@@ -41,15 +77,21 @@ class PlannerLLM:
             return {"messages": messages, "text": "", "response": None}
 
         client = self._get_client()
+        request_messages, previous_response_id = self._chained_request(client, messages)
         json_mode_text = {"format": {"type": "json_object"}}
         json_mode_kwargs = {
             "model": self.model,
-            "messages": messages,
+            "messages": request_messages,
             "reasoning_effort": "medium",
             "max_output_tokens": 10000,
             "text": json_mode_text,
-            
         }
+        if previous_response_id:
+            json_mode_kwargs["previous_response_id"] = previous_response_id
+        if self.streaming_enabled() and callable(getattr(client, "stream_response", None)):
+            streamed = self._stream_plan(context, client, messages, json_mode_kwargs, previous_response_id)
+            if streamed is not None:
+                return streamed
         try:
             response = client.create_response(**json_mode_kwargs)
         except TypeError as exc:
@@ -60,25 +102,177 @@ class PlannerLLM:
             )
             json_mode_kwargs.pop("text", None)
             response = client.create_response(**json_mode_kwargs)
+        except Exception as exc:
+            if not previous_response_id:
+                raise
+            # Stored responses can expire or be unavailable; resend the full transcript.
+            context.record_event(
+                "mcp.llm.chain.failed",
+                {"model": self.model, "error": str(exc)},
+            )
+            self._chain_anchor = None
+            previous_response_id = None
+            json_mode_kwargs.pop("previous_response_id", None)
+            json_mode_kwargs["messages"] = messages
+            response = client.create_response(**json_mode_kwargs)
+        text = self._record_response(context, client, response, messages, json_mode_kwargs, previous_response_id)
+        return {
+            "messages": messages,
+            "text": text,
+            "response": response,
+        }
+
+    def settle_plan(self, context: "AgentState") -> Dict[str, Any] | None:
+        """
+        Finish the streamed plan handed out early, if any: wait for the stream,
+        record its usage and fill the command's `reasoning`. Returns the command.
+        """
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return None
+        call: StreamedJSONCall = pending["call"]
+        command: Dict[str, Any] = pending["command"]
+        try:
+            response = call.finish()
+        except Exception as exc:
+            context.record_event("mcp.llm.stream.failed", {"model": self.model, "error": str(exc), "settled": True})
+            response = None
+        if response is not None:
+            text = self._record_response(
+                context, pending["client"], response, pending["messages"], pending["kwargs"], pending["previous_response_id"]
+            )
+        else:
+            text = call.parser.text
+        final = call.parser.value
+        if final is None:
+            repaired = repair_json_object(text, truncatable=("reasoning",))
+            final = repaired.value if repaired is not None else {}
+        reasoning = final.get("reasoning")
+        if isinstance(reasoning, str) and reasoning.strip():
+            command["reasoning"] = reasoning.strip()
+        changed = sorted(
+            key for key, value in final.items() if key != "reasoning" and key in command and command[key] != value
+        )
+        context.record_event(
+            "mcp.llm.stream.settled",
+            {
+                "ready_ms": call.ready_ms,
+                "total_ms": call.total_ms,
+                "first_token_ms": call.first_token_ms,
+                "changed_fields": changed,
+            },
+        )
+        return command
+
+    def _stream_plan(
+        self,
+        context: "AgentState",
+        client: Any,
+        messages: List[Dict[str, Any]],
+        kwargs: Dict[str, Any],
+        previous_response_id: str | None,
+    ) -> Dict[str, Any] | None:
+        """Stream the planner call; None when streaming failed (the caller falls back to a plain call)."""
+        call = StreamedJSONCall(lambda handler: client.stream_response(event_handler=handler, **kwargs))
+        if call.wait_ready(lambda parser: parse_partial_planner_command(parser) is not None):
+            command = parse_partial_planner_command(call.parser)
+            self._pending = {
+                "call": call,
+                "command": command,
+                "client": client,
+                "messages": messages,
+                "kwargs": kwargs,
+                "previous_response_id": previous_response_id,
+            }
+            context.record_event(
+                "mcp.llm.stream.early",
+                {"type": command["type"], "ready_ms": call.ready_ms, "first_token_ms": call.first_token_ms},
+            )
+            return {"messages": messages, "text": call.parser.text, "response": None, "command": command}
+        try:
+            response = call.finish()
+        except Exception as exc:
+            context.record_event("mcp.llm.stream.failed", {"model": self.model, "error": str(exc)})
+            return None
+        text = self._record_response(context, client, response, messages, kwargs, previous_response_id)
+        return {"messages": messages, "text": text, "response": response}
+
+    def _record_response(
+        self,
+        context: "AgentState",
+        client: Any,
+        response: Any,
+        messages: List[Dict[str, Any]],
+        kwargs: Dict[str, Any],
+        previous_response_id: str | None,
+    ) -> str:
+        """Book a finished planner response (chain anchor, usage, cost, event); returns its text."""
+        response_id = getattr(response, "id", None)
+        if self._chaining_enabled(client) and isinstance(response_id, str) and response_id:
+            self._chain_anchor = (response_id, len(messages))
         model_name = getattr(response, "model", None) or self.model
-        context.token_tracker.record_response(model_name, "planner.llm", response)
+        usage = context.token_tracker.record_response(model_name, "planner.llm", response)
         total_cost = getattr(context.token_tracker, "total_cost_usd", None)
         if isinstance(total_cost, (int, float)):
             context.budget_tracker.update_llm_cost(float(total_cost))
         text = extract_assistant_text(response) or ""
         context.record_event(
             "mcp.llm.completed",
-            { "raw_output": text},
+            {
+                "raw_output": text,
+                "usage": usage,
+                "messages_total": len(messages),
+                "messages_sent": len(kwargs["messages"]),
+                "chained": bool(previous_response_id),
+                "transcript": self._transcript.stats(),
+            },
         )
-        return {
-            "messages": messages,
-            "text": text,
-            "response": response,
-        }
+        return text
 
     def is_enabled(self) -> bool:
         return self._llm_enabled()
 
+    def streaming_enabled(self) -> bool:
+        if self._streaming_override is not None:
+            return self._streaming_override
+        flag = os.getenv("MCP_PLANNER_STREAMING", "")
+        return flag.lower() in {"1", "true", "yes", "on"}
+
+    def chaining_enabled(self) -> bool:
+        if self._chain_override is not None:
+            return self._chain_override
+        flag = os.getenv("MCP_PLANNER_CHAIN_RESPONSES", "")
+        return flag.lower() in {"1", "true", "yes", "on"}
+
+    def _chaining_enabled(self, client: Any) -> bool:
+        if not self.chaining_enabled():
+            return False
+        # previous_response_id is an OpenAI Responses API feature; other
+        # providers would be rerouted to a fallback for it.
+        resolve = getattr(client, "resolve_request_model", None)
+        if resolve is None:
+            return True
+        try:
+            provider, _model = resolve(model=self.model)
+        except Exception:
+            return False
+        return provider == "openai"
+
+    def _chained_request(
+        self,
+        client: Any,
+        messages: List[Dict[str, Any]],
+    ) -> tuple[List[Dict[str, Any]], str | None]:
+        """Only the messages appended since the anchored response, plus its id."""
+        anchor = self._chain_anchor
+        if anchor is None or not self._chaining_enabled(client):
+            return messages, None
+        response_id, seen = anchor
+        # Nothing new (e.g. a parse retry): don't build on the rejected reply.
+        if seen >= len(messages):
+            return messages, None
+        return messages[seen:], response_id
+
     def _llm_enabled(self) -> bool:
         if self._enabled_override is not None:
             return self._enabled_override
@@ -100,42 +294,24 @@ class PlannerLLM:
         snapshot: BudgetSnapshot,
     ) -> List[Dict[str, Any]]:
         """
-        Build the 3-message conversation:
+        Build the append-only planner conversation (see `PlannerTranscript`):
           - system: planner prompt
-          - developer: PLANNER_STATE_JSON
-          - user: task + extra_context JSON payload
+          - developer: PLANNER_CONTEXT_JSON (provider_tree)
+          - user: task JSON payload
+          - developer: TRAJECTORY_COLLAPSED_JSON (oldest steps, once over budget)
+          - developer: AVAILABLE_TOOLS_JSON / TRAJECTORY_STEP_JSON, appended per turn
         """
-        developer_content = self._developer_message(context, snapshot)
-        user_payload = json.dumps(
-            {"task": context.task},
-            ensure_ascii=False,
-            sort_keys=True,
-        )
+        state = context.build_planner_state(snapshot, include_trajectory=False)
         system_prompt = getattr(context, "planner_prompt", PLANNER_PROMPT)
-        return [
-            {"role": "system", "content": system_prompt},
-            {"role": "developer", "content": developer_content},
-            {"role": "user", "content": user_payload},
-        ]
+        sent, generation = len(self._transcript.messages), self._transcript.generation
+        messages = self._transcript.sync(system_prompt, state, context.frozen_trajectory())
 
-    def _developer_message(
-        self,
-        context: "AgentState",
-        snapshot: BudgetSnapshot,
-    ) -> str:
-        state = context.build_planner_state(snapshot)
-
-        # Do not leak identifiers to the LLM
-        state_filtered = dict(state)
-        state_filtered.pop("run_id", None)
-        state_filtered.pop("user_id", None)
-
-        state_json = json.dumps(state_filtered, ensure_ascii=False, sort_keys=True, indent=2)
-        
-        # DEBUG: optionally dump PLANNER_STATE_JSON to stderr
+        # DEBUG: optionally dump the messages appended this turn to stderr
         if os.getenv("MCP_PLANNER_DUMP_STATE_JSON") == "1":
-            print("\n================ PLANNER_STATE_JSON DUMP ================", file=sys.stderr)
-            print(state_json, file=sys.stderr)
-            print("=========================================================\n", file=sys.stderr)
-        
-        return f"PLANNER_STATE_JSON\n{state_json}"
+            appended = messages if self._transcript.generation != generation else messages[sent:]
+            print("\n================ PLANNER MESSAGES (appended) ================", file=sys.stderr)
+            for message in appended:
+                print(f"[{message['role']}] {message['content']}", file=sys.stderr)
+            print("=============================================================\n", file=sys.stderr)
+
+        return messages
@@ -3,10 +3,19 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
+from shared.json_stream import JSONObjectStream, repair_json_object
 
-def parse_planner_command(text: str) -> Dict[str, Any]:
+COMMAND_TYPES = {"tool", "sandbox", "inspect_tool_output", "finish", "search", "fail"}
+# Commands that can be dispatched before their trailing `reasoning` has streamed;
+# finish/fail end the run, so there is nothing to overlap them with.
+EARLY_COMMAND_TYPES = {"tool", "sandbox", "inspect_tool_output", "search"}
+# Only free text may be cut off and still repaired; a truncated argument or code string is retried.
+_TRUNCATABLE_FIELDS = ("reasoning",)
+
+
+def parse_planner_command(text: str, *, repairs: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Parse planner LLM output into a structured command dict.
 
@@ -16,6 +25,11 @@ def parse_planner_command(text: str) -> Dict[str, Any]:
             "reasoning": "...",
             ...
         }
+
+    Output that is not valid JSON is repaired when the breakage is cheap to
+    fix and cannot change the command (text around the object, trailing
+    commas, truncation inside `reasoning` after every other field closed);
+    the fixes applied are appended to `repairs`.
     """
     text = (text or "").strip()
     if not text:
@@ -23,18 +37,48 @@ def parse_planner_command(text: str) -> Dict[str, Any]:
     try:
         command = json.loads(text)
     except json.JSONDecodeError as exc:
-        raise ValueError("Planner response must be valid JSON.") from exc
+        repaired = repair_json_object(text, truncatable=_TRUNCATABLE_FIELDS)
+        if repaired is None:
+            raise ValueError("Planner response must be valid JSON.") from exc
+        command = repaired.value
+        if repairs is not None:
+            repairs.extend(repaired.fixes)
 
     if not isinstance(command, dict):
         raise ValueError("Planner response must be a JSON object.")
+    return _validate_command(command, require_reasoning=True)
+
+
+def parse_partial_planner_command(stream: JSONObjectStream) -> Optional[Dict[str, Any]]:
+    """
+    The command from a partially streamed planner response, once decisive.
+
+    Decisive means an action command (`EARLY_COMMAND_TYPES`) whose fields
+    before `reasoning` are all complete and valid: `reasoning` is streaming
+    (the prompt puts it last) or the object is closed. Returns None until
+    then, or when a field failed to parse or the partial command does not
+    validate (the full response is then parsed, and repaired, as usual).
+    """
+    fields = stream.fields
+    if stream.error or fields.get("type") not in EARLY_COMMAND_TYPES:
+        return None
+    if not (stream.closed or stream.current_key == "reasoning"):
+        return None
+    try:
+        return _validate_command(dict(fields), require_reasoning=False)
+    except ValueError:
+        return None
+
 
+def _validate_command(command: Dict[str, Any], *, require_reasoning: bool) -> Dict[str, Any]:
     cmd_type = command.get("type")
-    if cmd_type not in {"tool", "sandbox", "inspect_tool_output", "finish", "search", "fail"}:
+    if cmd_type not in COMMAND_TYPES:
         raise ValueError("Planner response missing 'type' or unsupported command.")
     reasoning = command.get("reasoning")
-    if not isinstance(reasoning, str) or not reasoning.strip():
+    if isinstance(reasoning, str) and reasoning.strip():
+        command["reasoning"] = reasoning.strip()
+    elif require_reasoning:
         raise ValueError("Planner command must include non-empty 'reasoning' string.")
-    command["reasoning"] = reasoning.strip()
     _VALIDATORS[cmd_type](command)
     return command
 
@@ -7,6 +7,7 @@ from typing import Any, Dict, Optional
 
 from mcp_agent.core.context import AgentContext
 from mcp_agent.actions import SUPPORTED_PROVIDERS
+from mcp_agent.actions.call_cache import drop_run_cache
 from mcp_agent.env_sync import ensure_env_for_provider
 from mcp_agent.registry.crud import get_available_providers
 from mcp_agent.user_identity import normalize_user_id
@@ -121,6 +122,9 @@ class AgentOrchestrator:
         while attempt <= max_parse_retries:
             attempt += 1
             llm_result = self.llm.generate_plan(self.agent_state)
+            if llm_result.get("command") is not None:
+                # Streamed: decisive fields arrived; the rest settles after dispatch.
+                return llm_result["command"], None
             text = llm_result.get("text") or ""
             if not text:
                 self.agent_state.record_event(
@@ -129,8 +133,19 @@ class AgentOrchestrator:
                 )
                 llm_result = self.llm.generate_plan(self.agent_state)
                 text = llm_result.get("text") or ""
+            repairs: list[str] = []
             try:
-                return parse_planner_command(text), None
+                command = parse_planner_command(text, repairs=repairs)
+                if repairs:
+                    self.agent_state.record_event(
+                        "mcp.planner.repaired",
+                        {
+                            "fixes": repairs,
+                            "attempt": attempt,
+                            "raw_preview": self._clean_llm_preview(text, limit=200),
+                        },
+                    )
+                return command, None
             except ValueError as exc:
                 last_error = exc
                 last_text = text
@@ -162,6 +177,11 @@ class AgentOrchestrator:
         )
         return None, result
 
+    def _settle_plan(self) -> None:
+        settle = getattr(self.llm, "settle_plan", None)
+        if callable(settle):
+            settle(self.agent_state)
+
     @staticmethod
     def _clean_llm_preview(text: str, limit: int = 400) -> str:
         if not text:
@@ -186,6 +206,8 @@ class AgentOrchestrator:
         cmd_type = command["type"]
         if cmd_type in {"search", "tool", "sandbox", "inspect_tool_output"}:
             result = self._executor.execute_step(command)
+            # A streamed command ran while its reasoning was still arriving.
+            self._settle_plan()
             return self._handle_action_result(command, result)
 
         if cmd_type == "finish":
@@ -408,9 +430,7 @@ class AgentOrchestrator:
                     "success": True,
                 },
                 observation=result.observation,
-                observation_metadata={
-                    "is_smart_summary": result.is_smart_summary,
-                },
+                observation_metadata=self._step_metadata(result),
                 error=None,
             )
             return None
@@ -484,15 +504,20 @@ class AgentOrchestrator:
                     "all_tools_successfully_returned": all_tools_succeeded,
                 },
                 observation=result.observation,
-                observation_metadata={
-                    "is_smart_summary": result.is_smart_summary,
-                },
+                observation_metadata=self._step_metadata(result),
                 error=None,
             )
             return None
 
         return None
 
+    @staticmethod
+    def _step_metadata(result: StepResult) -> Dict[str, Any]:
+        metadata: Dict[str, Any] = {"is_smart_summary": result.is_smart_summary}
+        if result.cache_hits:
+            metadata["cache_hits"] = result.cache_hits
+        return metadata
+
     def _check_budget(self) -> MCPTaskResult | None:
         snapshot = self.agent_state.budget_tracker.snapshot()
         if snapshot.steps_taken >= snapshot.max_steps:
@@ -751,7 +776,10 @@ def execute_mcp_task(
                 },
             )
             runtime = AgentOrchestrator(agent_context, state, llm=llm)
-            result = runtime.run()
+            try:
+                result = runtime.run()
+            finally:
+                drop_run_cache(agent_context.request_id)
 
             # Emit SSE event: task completed
             completed_payload = {
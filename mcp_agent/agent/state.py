@@ -29,6 +29,7 @@ from mcp_agent.utils.event_logger import log_mcp_event
 from .budget import Budget, BudgetTracker, BudgetSnapshot
 from .prompts import PLANNER_PROMPT
 from .history import ExecutionHistory, AgentStep, StepType
+from .state_encoder import FrozenStep
 from .tool_cache import ToolCache
 from .summary_manager import SummaryManager
 
@@ -390,15 +391,21 @@ class AgentState:
 
     # --- Planner state building ---
 
-    def build_planner_state(self, _snapshot: BudgetSnapshot | None = None) -> Dict[str, Any]:
+    def build_planner_state(
+        self,
+        _snapshot: BudgetSnapshot | None = None,
+        *,
+        include_trajectory: bool = True,
+    ) -> Dict[str, Any]:
         """Build the planner_state JSON consumed by PlannerLLM.
 
         This is the ONLY place where tool specifications appear in full.
         Trajectory entries contain only summaries to minimize context usage.
-        Delegates trajectory building to ExecutionHistory.
+        Delegates trajectory building to ExecutionHistory. PlannerLLM passes
+        include_trajectory=False and reads `frozen_trajectory()` instead.
         """
         # Build trajectory (delegates to ExecutionHistory)
-        trajectory = self._execution_history.build_trajectory()
+        trajectory = self._execution_history.build_trajectory() if include_trajectory else []
 
         # available_tools is the SINGLE SOURCE OF TRUTH for tool specs
         # Compact descriptors are already minimal, just pass through.
@@ -416,6 +423,10 @@ class AgentState:
             "trajectory": trajectory,
         }
 
+    def frozen_trajectory(self) -> List[FrozenStep]:
+        """Compact per-step planner encodings (delegates to ExecutionHistory)."""
+        return self._execution_history.frozen_trajectory()
+
     # --- Markdown trajectory generation for orchestrator ---
 
     def build_markdown_trajectory(self) -> str:
@@ -0,0 +1,134 @@
+"""Compact, frozen encodings of planner trajectory steps.
+
+Each recorded step is encoded once, when the planner first sees it, in two
+forms:
+
+  - `full`: minified canonical JSON of the step with empty/default fields and
+    repeated values dropped (`reasoning` duplicated into `action_input`,
+    `success` duplicated into `action_outcome`, null errors, ...);
+  - `collapsed`: a short digest for old steps — what was done, whether it
+    worked, the error if any, and a bounded preview of the observation.
+
+Steps never change after they are recorded, so the encodings are frozen and
+later turns reuse the same strings instead of re-formatting the history.
+`PlannerTranscript` switches the oldest steps to `collapsed` when the
+trajectory outgrows its token budget.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict
+
+# Rough o200k-style ratio for JSON-heavy text; used only for budgeting.
+CHARS_PER_TOKEN = 4
+
+_COLLAPSED_TEXT_CHARS = 160
+_COLLAPSED_OBSERVATION_CHARS = 240
+# action_input fields that identify what a step did; everything else is dropped when collapsed.
+_IDENTIFYING_INPUT_KEYS = ("tool_id", "search_query", "provider", "label", "field_path", "summary", "reason")
+
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[: limit - 1]}…"
+
+
+def compact_step(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """`entry` (a `build_trajectory` item) without empty, default or repeated fields."""
+    reasoning = entry.get("action_reasoning")
+    success = entry.get("success")
+    compact: Dict[str, Any] = {}
+    for key, value in entry.items():
+        if value is None or value == {} or value == [] or value == "":
+            continue
+        if key == "is_smart_summary" and value is False:
+            continue
+        if key == "action_input" and isinstance(value, dict):
+            value = {k: v for k, v in value.items() if v is not None and not (k == "reasoning" and v == reasoning)}
+        elif key == "action_outcome" and isinstance(value, dict):
+            value = {k: v for k, v in value.items() if v is not None and not (k == "success" and v == success)}
+        elif key == "observation_metadata" and isinstance(value, dict):
+            value = {k: v for k, v in value.items() if v is not None and v is not False}
+        if value == {}:
+            continue
+        compact[key] = value
+    return compact
+
+
+def collapse_step(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Digest of an old step: identity, outcome and a bounded observation preview."""
+    digest: Dict[str, Any] = {
+        "step": entry.get("step"),
+        "type": entry.get("type"),
+        "success": entry.get("success"),
+        "collapsed": True,
+    }
+    reasoning = entry.get("action_reasoning")
+    if reasoning:
+        digest["action_reasoning"] = _truncate(str(reasoning), _COLLAPSED_TEXT_CHARS)
+    action_input = entry.get("action_input") or {}
+    if isinstance(action_input, dict):
+        kept = {
+            key: _truncate(str(action_input[key]), _COLLAPSED_TEXT_CHARS)
+            for key in _IDENTIFYING_INPUT_KEYS
+            if action_input.get(key)
+        }
+        if "args" in action_input:
+            kept["args"] = _truncate(canonical_json(action_input["args"]), _COLLAPSED_TEXT_CHARS)
+        if kept:
+            digest["action_input"] = kept
+    outcome = entry.get("action_outcome") or {}
+    if isinstance(outcome, dict):
+        kept_outcome = {
+            key: value if isinstance(value, (bool, int, float)) else _truncate(canonical_json(value), _COLLAPSED_TEXT_CHARS)
+            for key, value in outcome.items()
+            if value is not None and key != "success"
+        }
+        if kept_outcome:
+            digest["action_outcome"] = kept_outcome
+    if entry.get("error"):
+        digest["error"] = _truncate(str(entry["error"]), _COLLAPSED_TEXT_CHARS)
+    observation = entry.get("observation")
+    if observation is not None:
+        text = observation if isinstance(observation, str) else canonical_json(observation)
+        digest["observation_preview"] = _truncate(text, _COLLAPSED_OBSERVATION_CHARS)
+        if len(text) > _COLLAPSED_OBSERVATION_CHARS:
+            digest["observation_chars"] = len(text)
+    return digest
+
+
+@dataclass(frozen=True)
+class FrozenStep:
+    full: str
+    collapsed: str
+    full_tokens: int
+    collapsed_tokens: int
+
+
+def freeze_step(entry: Dict[str, Any]) -> FrozenStep:
+    full = canonical_json(compact_step(entry))
+    collapsed = canonical_json(collapse_step(entry))
+    if len(collapsed) >= len(full):
+        collapsed = full
+    return FrozenStep(full, collapsed, estimate_tokens(full), estimate_tokens(collapsed))
+
+
+__all__ = [
+    "FrozenStep",
+    "canonical_json",
+    "collapse_step",
+    "compact_step",
+    "estimate_tokens",
+    "freeze_step",
+]
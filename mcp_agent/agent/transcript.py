@@ -0,0 +1,177 @@
+"""Append-only planner conversation layout.
+
+The planner used to rebuild one `PLANNER_STATE_JSON` blob every turn, so any
+new step or tool changed the prompt near its start and the provider-side
+prompt cache never matched past the system prompt. `PlannerTranscript` keeps
+the conversation strictly append-only instead:
+
+  - system: planner prompt
+  - developer: `PLANNER_CONTEXT_JSON` (provider_tree, canonical JSON)
+  - user: task payload
+  - developer: `AVAILABLE_TOOLS_JSON` for each batch of newly discovered or
+    updated tool specs (sorted by tool id)
+  - developer: `TRAJECTORY_STEP_JSON` for each recorded step, in the compact
+    frozen encoding from `state_encoder`
+
+Every turn's messages start with the previous turn's messages, byte for byte.
+If something already sent changes (a different task or provider tree, a tool
+dropped from `available_tools`, an edited step), the transcript is rebuilt
+from scratch and `resets` is incremented.
+
+With a `token_budget`, once the trajectory outgrows it the oldest steps are
+collapsed in one batch — down to `collapse_to` of the budget, always keeping
+the last `keep_recent` steps in full — into a single
+`TRAJECTORY_COLLAPSED_JSON` message after the prefix, and the transcript is
+rebuilt (`compactions`). Collapsing in batches rather than one step per turn
+keeps the prefix stable, and cacheable, between compactions.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .state_encoder import FrozenStep, canonical_json, freeze_step
+
+
+def _tool_key(entry: Dict[str, Any]) -> str:
+    for field in ("tool_id", "qualified_name"):
+        value = entry.get(field)
+        if value:
+            return str(value)
+    provider = (entry.get("provider") or "").strip().lower()
+    tool = (entry.get("tool") or "").strip().lower()
+    return f"{provider}.{tool}"
+
+
+class PlannerTranscript:
+    def __init__(
+        self,
+        *,
+        token_budget: Optional[int] = None,
+        collapse_to: float = 0.6,
+        keep_recent: int = 2,
+    ) -> None:
+        self.token_budget = token_budget if token_budget and token_budget > 0 else None
+        self.collapse_to = min(max(collapse_to, 0.0), 1.0)
+        self.keep_recent = max(0, int(keep_recent))
+        self.messages: List[Dict[str, Any]] = []
+        self.resets = 0
+        self.compactions = 0
+        # Bumped on every rebuild; callers chaining on earlier messages must start over.
+        self.generation = 0
+        self._prefix: Optional[Tuple[str, str, str, str]] = None
+        self._tools_sent: Dict[str, str] = {}
+        self._steps_sent: List[FrozenStep] = []
+        self._collapsed = 0
+
+    def sync(
+        self,
+        system_prompt: str,
+        state: Dict[str, Any],
+        steps: Optional[Sequence[FrozenStep]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Append whatever `state` adds since the last sync and return all messages.
+
+        `steps` are the frozen step encodings (`AgentState.frozen_trajectory()`);
+        when omitted, `state["trajectory"]` entries are encoded here.
+        """
+        if steps is None:
+            steps = [freeze_step(entry) for entry in state.get("trajectory") or []]
+        prefix = (
+            system_prompt,
+            str(state.get("run_id") or ""),
+            canonical_json({"provider_tree": state.get("provider_tree") or []}),
+            canonical_json({"task": state.get("task")}),
+        )
+        tools = {_tool_key(entry): canonical_json(entry) for entry in state.get("available_tools") or []}
+
+        if not self._extends(prefix, tools, steps):
+            if self._prefix is not None:
+                self.resets += 1
+            self._collapsed = 0
+            self._rebuild(prefix, tools, steps)
+        elif self._over_budget(steps):
+            collapse_to = self._collapse_point(steps)
+            if collapse_to > self._collapsed:
+                self._collapsed = collapse_to
+                self.compactions += 1
+                self._rebuild(prefix, tools, steps)
+
+        fresh_tools = sorted(key for key, spec in tools.items() if self._tools_sent.get(key) != spec)
+        new_steps = steps[len(self._steps_sent) :]
+        for step in new_steps:
+            self._append("TRAJECTORY_STEP_JSON", step.full)
+            self._steps_sent.append(step)
+        # Tools found by a search step follow that step.
+        if fresh_tools:
+            self._append_tools(fresh_tools, tools)
+        return list(self.messages)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "messages": len(self.messages),
+            "resets": self.resets,
+            "compactions": self.compactions,
+            "collapsed_steps": self._collapsed,
+            "trajectory_tokens": self._trajectory_tokens(self._steps_sent),
+        }
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _extends(self, prefix: Tuple[str, str, str, str], tools: Dict[str, str], steps: Sequence[FrozenStep]) -> bool:
+        if prefix != self._prefix:
+            return False
+        if any(key not in tools for key in self._tools_sent):
+            return False
+        return list(steps[: len(self._steps_sent)]) == self._steps_sent
+
+    def _trajectory_tokens(self, steps: Sequence[FrozenStep]) -> int:
+        collapsed = steps[: self._collapsed]
+        return sum(step.collapsed_tokens for step in collapsed) + sum(
+            step.full_tokens for step in steps[self._collapsed :]
+        )
+
+    def _over_budget(self, steps: Sequence[FrozenStep]) -> bool:
+        return self.token_budget is not None and self._trajectory_tokens(steps) > self.token_budget
+
+    def _collapse_point(self, steps: Sequence[FrozenStep]) -> int:
+        target = self.token_budget * self.collapse_to
+        total = self._trajectory_tokens(steps)
+        index = self._collapsed
+        limit = max(self._collapsed, len(steps) - self.keep_recent)
+        while index < limit and total > target:
+            total -= steps[index].full_tokens - steps[index].collapsed_tokens
+            index += 1
+        return index
+
+    def _rebuild(self, prefix: Tuple[str, str, str, str], tools: Dict[str, str], steps: Sequence[FrozenStep]) -> None:
+        system_prompt, _run_id, context_json, task_json = prefix
+        self.generation += 1
+        self._prefix = prefix
+        self._tools_sent = {}
+        self._steps_sent = list(steps[: self._collapsed])
+        self.messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "developer", "content": f"PLANNER_CONTEXT_JSON\n{context_json}"},
+            {"role": "user", "content": task_json},
+        ]
+        if self._collapsed:
+            collapsed = ",".join(step.collapsed for step in self._steps_sent)
+            self._append("TRAJECTORY_COLLAPSED_JSON", f"[{collapsed}]")
+        if tools:
+            self._append_tools(sorted(tools), tools)
+
+    def _append_tools(self, keys: List[str], tools: Dict[str, str]) -> None:
+        specs = ",".join(tools[key] for key in keys)
+        self._append("AVAILABLE_TOOLS_JSON", f"[{specs}]")
+        for key in keys:
+            self._tools_sent[key] = tools[key]
+
+    def _append(self, label: str, payload: str) -> None:
+        self.messages.append({"role": "developer", "content": f"{label}\n{payload}"})
+
+
+__all__ = ["PlannerTranscript"]
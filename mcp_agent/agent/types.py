@@ -28,6 +28,8 @@ class StepResult:
     server: Optional[str] = None
     tool_name: Optional[str] = None
     args: Optional[Dict[str, Any]] = None
+    # Read-only tool calls served from the run-scoped cache during this step
+    cache_hits: int = 0
 
 
 class MCPTaskResult(TypedDict, total=False):
@@ -93,7 +93,16 @@ def run_python_plan(
         env["PYTHONPATH"] = os.pathsep.join(value for value in path_entries if value)
         env["TB_USER_ID"] = context.user_id
         env["TB_REQUEST_ID"] = context.request_id
-        
+
+        # Hand the run-scoped tool cache to the subprocess and merge it back afterwards.
+        from mcp_agent.actions.call_cache import get_run_cache
+
+        tool_cache = get_run_cache(context.request_id)
+        tool_cache_path = tmp_path / "tool_cache.json"
+        if tool_cache is not None:
+            tool_cache.dump_to_file(str(tool_cache_path), entries_only=True)
+            env["TB_TOOL_CACHE_PATH"] = str(tool_cache_path)
+
         try:
             completed = subprocess.run(
                 [python_cmd, str(plan_path)],
@@ -112,6 +121,9 @@ def run_python_plan(
                 error=f"sandbox timed out after {timeout_sec}s",
                 timed_out=True,
             )
+        finally:
+            if tool_cache is not None:
+                tool_cache.load_from_file(str(tool_cache_path), merge_stats=True)
     
     stdout = completed.stdout or ""
     stderr = completed.stderr or ""
@@ -167,7 +179,7 @@ sys.stdout = _SandboxNullWriter()
 sys.stderr = _SandboxNullWriter()
 from sandbox_py.helpers import safe_error_text, safe_timestamp_sort_key
 from mcp_agent.sandbox.runtime import call_tool  # noqa: F401
-from mcp_agent.sandbox.glue import register_default_tool_caller
+from mcp_agent.sandbox.glue import export_tool_cache, register_default_tool_caller
 from mcp_agent.core.context import AgentContext
 
 SENTINEL = "{sentinel}"
@@ -187,6 +199,10 @@ async def main():
 
 
 def _emit_result(payload):
+    try:
+        export_tool_cache()
+    except Exception:
+        pass
     sys.stdout = _ORIGINAL_STDOUT
     sys.stderr = _ORIGINAL_STDERR
     sys.stdout.write(SENTINEL + json.dumps(payload or {{}}, default=str))
@@ -26,6 +26,7 @@ from mcp_agent.core.context import AgentContext
 from mcp_agent.user_identity import normalize_user_id
 from mcp_agent.knowledge.types import ParameterSpec, ProviderSpec, ToolSpec, ToolboxManifest, IoToolSpec
 from mcp_agent.knowledge.index import ToolboxIndex
+from mcp_agent.tool_schemas import get_pagination_spec
 from mcp_agent.knowledge.utils import (
     action_signature,
     extract_call_tool_metadata,
@@ -265,6 +266,11 @@ class ToolboxBuilder:
         if primary_candidates:
             primary_param = sorted(primary_candidates)[0]
 
+        metadata: Dict[str, Any] = {}
+        pagination = get_pagination_spec(func)
+        if pagination:
+            metadata["pagination"] = dict(pagination)
+
         raw_schema = getattr(func, "__tb_output_schema__", None)
         raw_schema_pretty = getattr(func, "__tb_output_schema_pretty__", None)
         pretty_lines = None
@@ -291,6 +297,7 @@ class ToolboxBuilder:
             structured_params=structured_params,
             list_params=list_params,
             primary_param=primary_param,
+            metadata=metadata,
             output_schema=raw_schema or None,
             output_schema_pretty=pretty_lines,
         )
@@ -64,10 +64,11 @@ class CompactToolDescriptor:
     input_params: Dict[str, str]        # {"query": "str (required)", "max_results": "int (optional, default=20)"}
     output_fields: List[str]            # ["messages[].id", "messages[].subject", ...]
     has_hidden_fields: bool = False     # True when output_fields is a summarized/folded view
+    pagination: Optional[Dict[str, Any]] = None  # cursor param + sandbox iterator helpers, if paginated
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return {
+        data: Dict[str, Any] = {
             "tool_id": self.tool_id,
             "server": self.server,
             "description": self.description,
@@ -76,6 +77,9 @@ class CompactToolDescriptor:
             "output_fields": self.output_fields,
             "has_hidden_fields": self.has_hidden_fields,
         }
+        if self.pagination:
+            data["pagination"] = self.pagination
+        return data
 
 
 @dataclass
@@ -225,6 +229,14 @@ class ToolSpec:
                 max_fields=30,
             )
 
+        pagination: Optional[Dict[str, Any]] = None
+        spec = self.metadata.get("pagination") if isinstance(self.metadata, dict) else None
+        if isinstance(spec, dict):
+            helpers = [f"{self.server}.{self.py_name}_pages"]
+            if spec.get("items_path"):
+                helpers.append(f"{self.server}.{self.py_name}_items")
+            pagination = {"cursor_param": spec.get("cursor_param"), "iterators": helpers}
+
         return CompactToolDescriptor(
             tool_id=self.tool_id,
             server=self.server,
@@ -233,6 +245,7 @@ class ToolSpec:
             input_params=input_params,
             output_fields=output_fields,
             has_hidden_fields=has_hidden_fields,
+            pagination=pagination,
         )
 
     def to_llm_descriptor(self, *, score: float = 0.0) -> LLMToolDescriptor:
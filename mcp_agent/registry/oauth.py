@@ -6,10 +6,11 @@ Uses DB as source of truth - no in-memory state.
 
 from __future__ import annotations
 
+import logging
 import os
 import time
 import threading
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 from sqlalchemy import select, update
 from mcp_agent.registry.db_models import ConnectedAccount, MCPConnection
@@ -30,6 +31,37 @@ _PROVIDER_STATUS_CACHE: Dict[str, Dict[str, tuple[Dict[str, Any], float, float]]
 _CACHE_LOCK = threading.Lock()
 _DEFAULT_TTL = float(os.getenv("PROVIDER_STATUS_CACHE_TTL", "30"))  # Default TTL in seconds (configurable via env var)
 
+logger = logging.getLogger(__name__)
+
+# Callbacks run after a user connects or disconnects a provider: fn(user_id, provider).
+# Lets caches outside the registry (e.g. orchestrator capabilities) drop stale inventories.
+_CONNECTION_LISTENERS: List[Callable[[str, str], None]] = []
+
+
+def add_connection_listener(callback: Callable[[str, str], None]) -> None:
+    """Register ``callback(user_id, provider)`` for provider connect/disconnect."""
+    with _CACHE_LOCK:
+        if callback not in _CONNECTION_LISTENERS:
+            _CONNECTION_LISTENERS.append(callback)
+
+
+def notify_connection_changed(user_id: str, provider: str) -> None:
+    """Invalidate the provider status and composed plan caches, then notify listeners."""
+    normalized_user = normalize_user_id(user_id)
+    OAuthManager._invalidate_cache(normalized_user, provider)
+    # Composed plans are cached in the shared DB, so drop them here, in
+    # whichever process handled the OAuth change, not via a listener.
+    from shared.db import composed_plans
+
+    composed_plans.invalidate_quietly(user_id=normalized_user)
+    with _CACHE_LOCK:
+        listeners = list(_CONNECTION_LISTENERS)
+    for callback in listeners:
+        try:
+            callback(normalized_user, provider)
+        except Exception as exc:  # pragma: no cover - listeners must not break OAuth flows
+            logger.warning("Connection listener failed for user=%s provider=%s: %s", normalized_user, provider, exc)
+
 # Composio API configuration
 COMPOSIO_HOST = os.getenv(
     "COMPOSIO_API_BASE",
@@ -593,8 +625,8 @@ class OAuthManager:
             )
             crud.upsert_mcp_connection(db, ca_row.id, mcp_url, mcp_headers, last_error=None)
         
-        # Invalidate cache when a provider is connected
-        cls._invalidate_cache(user_id, provider)
+        # Invalidate caches when a provider is connected
+        notify_connection_changed(user_id, provider)
         
         return {
             "provider": provider,
@@ -615,8 +647,8 @@ class OAuthManager:
         with context.get_db() as db:
             crud.disconnect_provider(db, user_id, provider)
         
-        # Invalidate cache when a provider is disconnected
-        cls._invalidate_cache(user_id, provider)
+        # Invalidate caches when a provider is disconnected
+        notify_connection_changed(user_id, provider)
     
     @classmethod
     def is_authorized(cls, context: AgentContext, provider: str) -> bool:
@@ -17,6 +17,7 @@ from mcp_agent.actions import get_provider_action_map
 from mcp_agent.core.context import AgentContext
 from mcp_agent.knowledge.utils import extract_call_tool_metadata
 from mcp_agent.registry import get_available_providers, check_availability
+from mcp_agent.tool_schemas import get_pagination_spec
 
 
 def generate_ephemeral_toolbox(context: AgentContext, destination_dir: Path) -> None:
@@ -173,7 +174,7 @@ def safe_timestamp_sort_key(value):
 
 
 def _write_client_module(path: Path) -> None:
-    content = """from __future__ import annotations\n\nfrom mcp_agent.sandbox.runtime import (\n    ToolCallResult,\n    ToolCaller,\n    call_tool,\n    normalize_string_list,\n    redact_payload,\n    register_tool_caller,\n    sanitize_payload,\n)\n\n\n__all__ = [\n    \"ToolCallResult\",\n    \"ToolCaller\",\n    \"call_tool\",\n    \"register_tool_caller\",\n    \"sanitize_payload\",\n    \"normalize_string_list\",\n    \"redact_payload\",\n]\n"""
+    content = """from __future__ import annotations\n\nfrom mcp_agent.sandbox.runtime import (\n    ToolCallResult,\n    ToolCaller,\n    call_tool,\n    iterate_items,\n    normalize_string_list,\n    paginate,\n    redact_payload,\n    register_tool_caller,\n    sanitize_payload,\n)\n\n\n__all__ = [\n    \"ToolCallResult\",\n    \"ToolCaller\",\n    \"call_tool\",\n    \"iterate_items\",\n    \"paginate\",\n    \"register_tool_caller\",\n    \"sanitize_payload\",\n    \"normalize_string_list\",\n    \"redact_payload\",\n]\n"""
     path.write_text(content, encoding="utf-8")
 
 
@@ -183,7 +184,13 @@ def _write_provider_module(path: Path, provider: str, funcs: Iterable[Callable[.
         "",
         "from typing import Any",
         "",
-        "from mcp_agent.sandbox.runtime import ToolCallResult, call_tool, sanitize_payload",
+        "from mcp_agent.sandbox.runtime import (",
+        "    ToolCallResult,",
+        "    call_tool,",
+        "    iterate_items,",
+        "    paginate,",
+        "    sanitize_payload,",
+        ")",
         "",
         f"# Ephemeral stubs for provider '{provider}'.",
         "",
@@ -195,15 +202,21 @@ def _write_provider_module(path: Path, provider: str, funcs: Iterable[Callable[.
         if alias:
             lines.append(f"{alias} = {func.__name__}")
             lines.append("")
+        pagination = get_pagination_spec(func)
+        if pagination:
+            lines.extend(_render_pagination_functions(provider, func, pagination))
 
     path.write_text("\n".join(lines).rstrip() + "\n", encoding="utf-8")
 
 
-def _render_tool_function(provider: str, func: Callable[..., Any]) -> list[str]:
-    signature = inspect.signature(func)
-    params = list(signature.parameters.values())
+def _stub_params(func: Callable[..., Any]) -> list[inspect.Parameter]:
+    params = list(inspect.signature(func).parameters.values())
     # Drop the AgentContext parameter when present.
-    body_params = params[1:] if params and params[0].name == "context" else params
+    return params[1:] if params and params[0].name == "context" else params
+
+
+def _render_tool_function(provider: str, func: Callable[..., Any]) -> list[str]:
+    body_params = _stub_params(func)
     stub_signature = inspect.Signature(parameters=body_params)
     params_source = str(stub_signature)[1:-1].strip()
     param_text = params_source if params_source else ""
@@ -227,6 +240,70 @@ def _render_tool_function(provider: str, func: Callable[..., Any]) -> list[str]:
     return lines
 
 
+_PAGINATION_CONTROLS = {
+    "max_items": "int | None",
+    "max_pages": "int | None",
+    "time_budget_s": "float | None",
+}
+
+
+def _render_pagination_functions(
+    provider: str,
+    func: Callable[..., Any],
+    spec: dict[str, str],
+) -> list[str]:
+    """Render ``<tool>_pages`` / ``<tool>_items`` async iterators for a paginated wrapper."""
+    body_params = _stub_params(func)
+    names = {param.name for param in body_params}
+    if any(control in names for control in _PAGINATION_CONTROLS):
+        return []
+
+    controls = [
+        inspect.Parameter(control, inspect.Parameter.KEYWORD_ONLY, default=None, annotation=annotation)
+        for control, annotation in _PAGINATION_CONTROLS.items()
+    ]
+    var_keyword = [p for p in body_params if p.kind is inspect.Parameter.VAR_KEYWORD]
+    regular = [p for p in body_params if p.kind is not inspect.Parameter.VAR_KEYWORD]
+    params_source = str(inspect.Signature(parameters=regular + controls + var_keyword))[1:-1].strip()
+
+    payload_lines = ["    payload: dict[str, Any] = {}"]
+    for param in body_params:
+        assignment = _payload_assignment(param)
+        if assignment:
+            payload_lines.extend(assignment)
+    payload_lines.append("    payload = sanitize_payload(payload)")
+
+    cursor_args = (
+        f"cursor_param={spec['cursor_param']!r}, "
+        f"next_cursor_path={spec['next_cursor_path']!r}, "
+        "max_items=max_items, max_pages=max_pages, time_budget_s=time_budget_s"
+    )
+    items_path = spec.get("items_path")
+
+    lines = [
+        f"async def {func.__name__}_pages({params_source}):",
+        f"    # Yields {func.__name__} result pages; the next page is fetched while you process the current one.",
+        *payload_lines,
+        f"    async for page in paginate({provider!r}, {func.__name__!r}, payload, "
+        f"items_path={items_path!r}, {cursor_args}):",
+        "        yield page",
+        "",
+    ]
+    if items_path:
+        lines.extend(
+            [
+                f"async def {func.__name__}_items({params_source}):",
+                f"    # Yields individual entries of data[{items_path!r}] across pages.",
+                *payload_lines,
+                f"    async for item in iterate_items({provider!r}, {func.__name__!r}, payload, "
+                f"items_path={items_path!r}, {cursor_args}):",
+                "        yield item",
+                "",
+            ]
+        )
+    return lines
+
+
 def _payload_assignment(param: inspect.Parameter) -> list[str] | None:
     name = param.name
     kind = param.kind
@@ -20,6 +20,20 @@ def _resolve_user_id() -> str:
     return normalize_user_id(env_user) if env_user else DEV_DEFAULT_USER_ID
 
 
+def _run_cache():
+    from mcp_agent.actions.call_cache import get_run_cache
+
+    return get_run_cache(os.getenv("TB_REQUEST_ID"))
+
+
+def export_tool_cache() -> None:
+    """Write the run's tool call cache back for the parent process to pick up."""
+    path = os.getenv("TB_TOOL_CACHE_PATH")
+    cache = _run_cache() if path else None
+    if cache is not None:
+        cache.dump_to_file(path)
+
+
 def register_default_tool_caller() -> None:
     """Bind sandbox-generated wrappers to the dispatch_tool architecture."""
     from mcp_agent.sandbox.runtime import register_tool_caller
@@ -35,6 +49,12 @@ def register_default_tool_caller() -> None:
         for provider in SUPPORTED_PROVIDERS:
             ensure_env_for_provider(eager_user, provider)
 
+    # Seed the run-scoped read cache with results the planner process already holds.
+    cache_path = os.getenv("TB_TOOL_CACHE_PATH")
+    cache = _run_cache() if cache_path else None
+    if cache is not None:
+        cache.load_from_file(cache_path)
+
     async def _caller(provider: str, tool: str, payload: Dict[str, Any]) -> "ToolCallResult":
         """
         Bridge sandbox helpers to dispatch_tool architecture.
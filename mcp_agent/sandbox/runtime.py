@@ -8,7 +8,18 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Protocol, Sequence, TypedDict
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Protocol,
+    Sequence,
+    TypedDict,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -112,6 +123,151 @@ async def call_tool(
     }
 
 
+def get_path(data: Any, path: str | None) -> Any:
+    """Read a dotted path (e.g. 'paging.next.after') from nested dicts/lists; None when absent."""
+    if not path:
+        return None
+    node = data
+    for part in path.split("."):
+        if isinstance(node, dict):
+            node = node.get(part)
+        elif isinstance(node, list) and part.lstrip("-").isdigit():
+            index = int(part)
+            node = node[index] if -len(node) <= index < len(node) else None
+        else:
+            return None
+        if node is None:
+            return None
+    return node
+
+
+async def paginate(
+    provider: str,
+    tool: str,
+    payload: Dict[str, Any],
+    *,
+    cursor_param: str,
+    next_cursor_path: str,
+    items_path: str | None = None,
+    max_items: int | None = None,
+    max_pages: int | None = None,
+    time_budget_s: float | None = None,
+    prefetch: bool = True,
+) -> AsyncIterator[ToolCallResult]:
+    """Yield successive result pages of a cursor-paginated tool.
+
+    While the caller processes page N, the request for page N+1 is already in
+    flight (``prefetch=True``). Iteration stops when the provider returns no
+    next cursor, a page fails (the failed envelope is yielded last), or any of
+    ``max_pages`` / ``max_items`` / ``time_budget_s`` is reached. No new page
+    is requested after the time budget expires, and an in-flight prefetch is
+    cancelled when the caller stops early.
+
+    Args:
+        provider: Provider name (e.g., 'hubspot')
+        tool: Tool/action name (e.g., 'hubspot_list_deals')
+        payload: Tool parameters for the first page
+        cursor_param: Request parameter carrying the page cursor (e.g., 'after')
+        next_cursor_path: Dotted path of the next cursor inside ``data``
+        items_path: Dotted path of the item list inside ``data`` (for max_items)
+        max_items: Stop once this many items have been received
+        max_pages: Stop after this many pages
+        time_budget_s: Do not request new pages after this many seconds
+        prefetch: Request the next page before yielding the current one
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + time_budget_s if time_budget_s is not None else None
+    base_payload = dict(payload)
+    seen_cursors: set[Any] = set()
+
+    def _fetch(cursor: Any) -> "asyncio.Future[ToolCallResult]":
+        page_payload = dict(base_payload)
+        if cursor:
+            page_payload[cursor_param] = cursor
+        return asyncio.ensure_future(call_tool(provider, tool, page_payload))
+
+    def _within_budget(pages: int, items: int) -> bool:
+        if max_pages is not None and pages >= max_pages:
+            return False
+        if max_items is not None and items_path and items >= max_items:
+            return False
+        if deadline is not None and loop.time() >= deadline:
+            return False
+        return True
+
+    pages = 0
+    items = 0
+    pending: Optional["asyncio.Future[ToolCallResult]"] = _fetch(base_payload.get(cursor_param))
+    try:
+        while pending is not None:
+            result = await pending
+            pending = None
+            pages += 1
+
+            if not result.get("successful"):
+                yield result
+                return
+
+            data = result.get("data")
+            page_items = get_path(data, items_path)
+            if isinstance(page_items, list):
+                items += len(page_items)
+
+            next_cursor = get_path(data, next_cursor_path)
+            has_next = bool(next_cursor) and next_cursor not in seen_cursors and _within_budget(pages, items)
+            if has_next:
+                seen_cursors.add(next_cursor)
+                if prefetch:
+                    pending = _fetch(next_cursor)
+
+            yield result
+
+            if not has_next:
+                return
+            if deadline is not None and loop.time() >= deadline:
+                return
+            if pending is None:
+                pending = _fetch(next_cursor)
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+
+
+async def iterate_items(
+    provider: str,
+    tool: str,
+    payload: Dict[str, Any],
+    *,
+    items_path: str,
+    max_items: int | None = None,
+    **paginate_kwargs: Any,
+) -> AsyncIterator[Any]:
+    """Yield individual items across pages (see :func:`paginate`).
+
+    Raises:
+        RuntimeError: If a page fails; items from earlier pages were already yielded.
+    """
+    emitted = 0
+    async for page in paginate(
+        provider,
+        tool,
+        payload,
+        items_path=items_path,
+        max_items=max_items,
+        **paginate_kwargs,
+    ):
+        if not page.get("successful"):
+            raise RuntimeError(
+                f"{provider}.{tool} pagination failed after {emitted} items: {page.get('error')}"
+            )
+        page_items = get_path(page.get("data"), items_path)
+        for item in page_items if isinstance(page_items, list) else []:
+            if max_items is not None and emitted >= max_items:
+                return
+            emitted += 1
+            yield item
+
+
 def sanitize_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Remove None values and normalize types for MCP transmission.
 
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_agent.agent.budget import Budget
+from mcp_agent.agent.llm import PlannerLLM
+from mcp_agent.agent.parser import parse_partial_planner_command, parse_planner_command
+from mcp_agent.agent.state import AgentState
+from orchestrator_agent.runtime import OrchestratorRuntime
+from shared.json_stream import JSONObjectStream
+
+FIXTURE = Path(__file__).parent / "fixtures" / "planner_streams.jsonl"
+RECORDS = {r["name"]: r for r in map(json.loads, FIXTURE.read_text(encoding="utf-8").splitlines())}
+TIME_SCALE = 0.1  # replay recorded chunk timings at 10x speed
+
+
+def _text(record):
+    return "".join(chunk for _, chunk in record["chunks"])
+
+
+class ReplayClient:
+    """Streams a recorded planner response, chunk by chunk, with its recorded timing."""
+
+    default_model = "o4-mini"
+
+    def __init__(self, record):
+        self.record = record
+        self.sent = 0
+        self.finished = False
+
+    def resolve_request_model(self, **kwargs):
+        return "openai", "o4-mini"
+
+    def stream_response(self, *, event_handler=None, **kwargs):
+        started = time.perf_counter()
+        for offset_ms, chunk in self.record["chunks"]:
+            delay = started + offset_ms * TIME_SCALE / 1000 - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            event_handler(SimpleNamespace(type="response.output_text.delta", delta=chunk))
+            self.sent += 1
+        self.finished = True
+        return SimpleNamespace(
+            id="resp-1",
+            model="o4-mini",
+            output_text=_text(self.record),
+            usage={"input_tokens": 1200, "output_tokens": 80},
+        )
+
+
+@pytest.mark.parametrize("name", sorted(RECORDS))
+def test_recorded_responses_parse_or_repair(name):
+    record = RECORDS[name]
+    repairs = []
+    if record["expect"]["type"] is None:
+        with pytest.raises(ValueError):
+            parse_planner_command(_text(record), repairs=repairs)
+        return
+    command = parse_planner_command(_text(record), repairs=repairs)
+    assert command["type"] == record["expect"]["type"]
+    assert repairs == (record["expect"]["repair"] or [])
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"type": "tool", "reasoning": "Report the numbers.", "provider": "gmail", "tool": "gmail_send_email", '
+        '"args": {"to": "boss@x.com", "body": "Q3 revenue was 12',
+        '{"type": "sandbox", "code": "rows = fetch()\\nfor row in rows:\\n    delete(row',
+        '{"type": "tool", "provider": "gmail", "tool": "gmail_search", "args": {"query": "x"}, "ar',
+    ],
+)
+def test_truncated_action_fields_are_not_repaired(text):
+    with pytest.raises(ValueError, match="valid JSON"):
+        parse_planner_command(text)
+
+
+@pytest.mark.parametrize("name", sorted(RECORDS))
+def test_decisive_fields_fire_before_the_reasoning_ends(name):
+    record = RECORDS[name]
+    stream = JSONObjectStream()
+    fired_at = None
+    for index, (_, chunk) in enumerate(record["chunks"]):
+        stream.feed(chunk)
+        early = parse_partial_planner_command(stream)
+        if early is not None:
+            fired_at = index
+            break
+
+    assert (fired_at is not None) == record["expect"]["early"]
+    if fired_at is not None:
+        assert fired_at < len(record["chunks"]) - 3
+        full = parse_planner_command(_text(record))
+        assert early == {key: value for key, value in full.items() if key != "reasoning"}
+
+
+def test_streamed_plan_is_returned_early_and_settled_after_dispatch():
+    state = AgentState(task="billing digest", user_id="user-1", request_id="req-1", budget=Budget())
+    client = ReplayClient(RECORDS["tool_call"])
+    llm = PlannerLLM(client=client, enabled=True, streaming=True)
+
+    result = llm.generate_plan(state)
+    command = result["command"]
+    assert command["tool_id"] == "gmail.gmail_search" and command["args"]["max_results"] == 20
+    assert "reasoning" not in command
+    assert not client.finished and client.sent < len(client.record["chunks"])
+
+    assert llm.settle_plan(state) is command
+    assert command["reasoning"].startswith("The inventory already lists gmail_search")
+    events = {log["event"]: log for log in state.logs}
+    assert events["mcp.llm.completed"]["usage"]["input_new"] == 1200
+    settled = events["mcp.llm.stream.settled"]
+    assert settled["changed_fields"] == [] and settled["ready_ms"] < settled["total_ms"]
+    assert llm.settle_plan(state) is None
+
+
+def test_terminal_commands_wait_for_the_whole_stream():
+    state = AgentState(task="deals", user_id="user-1", request_id="req-1", budget=Budget())
+    client = ReplayClient(RECORDS["finish_with_data"])
+    result = PlannerLLM(client=client, enabled=True, streaming=True).generate_plan(state)
+    assert client.finished and "command" not in result
+    assert parse_planner_command(result["text"])["data"]["deals"][0]["name"] == "Acme"
+
+
+def test_orchestrator_planner_stream_aborts_on_an_invalid_decision_type():
+    record = {"chunks": [[i * 20, chunk] for i, chunk in enumerate(['{"type": "ne', 'xt_action", ', '"task": "x"', ', "reasoning": "y"}'])]}
+    client = ReplayClient(record)
+    runtime = OrchestratorRuntime(agent_states_provider=lambda run_id: {})
+    with pytest.raises(ValueError, match="next_action"):
+        runtime._stream_planner_response(client, {"model": "o4-mini", "messages": []})
+    assert client.sent == 1 and not client.finished  # stopped while handling the second chunk
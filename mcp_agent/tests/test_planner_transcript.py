@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from mcp_agent.agent.budget import Budget
+from mcp_agent.agent.llm import PlannerLLM
+from mcp_agent.agent.state import AgentState
+from mcp_agent.agent.state_encoder import compact_step, freeze_step
+from mcp_agent.agent.transcript import PlannerTranscript
+from shared.token_cost_tracker import TokenCostTracker
+
+
+def _tool(name, score=0.9):
+    return {"tool_id": f"gmail.{name}", "server": "gmail", "signature": f"gmail.{name}()", "score": score}
+
+
+def _step(index, kind="tool"):
+    return {"step": index, "type": kind, "observation": {"value": index}}
+
+
+def _state(tools=(), steps=(), task="triage inbox"):
+    return {
+        "task": task,
+        "run_id": "run-1",
+        "user_id": "user-1",
+        "provider_tree": [{"provider": "gmail", "tools": ["gmail_search", "gmail_send"]}],
+        "available_tools": list(tools),
+        "trajectory": list(steps),
+    }
+
+
+def test_transcript_is_append_only_across_turns():
+    transcript = PlannerTranscript()
+    first = transcript.sync("PROMPT", _state())
+    assert [m["role"] for m in first] == ["system", "developer", "user"]
+    assert "user-1" not in str(first) and "run-1" not in str(first)
+
+    second = transcript.sync("PROMPT", _state([_tool("b"), _tool("a")], [_step(0, "search")]))
+    third = transcript.sync("PROMPT", _state([_tool("b"), _tool("a")], [_step(0, "search"), _step(1)]))
+
+    assert second[: len(first)] == first
+    assert third[: len(second)] == second
+    assert second[3]["content"].startswith("TRAJECTORY_STEP_JSON")
+    # Tools found by the search follow its step, in canonical order.
+    tools_message = second[4]["content"]
+    assert tools_message.startswith("AVAILABLE_TOOLS_JSON")
+    assert tools_message.index("gmail.a") < tools_message.index("gmail.b")
+    assert len(third) == len(second) + 1
+    assert transcript.resets == 0
+
+
+def test_updated_tool_is_appended_and_dropped_tool_resets():
+    transcript = PlannerTranscript()
+    before = transcript.sync("PROMPT", _state([_tool("a")], [_step(0)]))
+    after = transcript.sync("PROMPT", _state([_tool("a", score=0.99)], [_step(0)]))
+    assert after[: len(before)] == before
+    assert '"score":0.99' in after[-1]["content"]
+
+    rebuilt = transcript.sync("PROMPT", _state([_tool("c")], [_step(0)]))
+    assert transcript.resets == 1
+    assert sum("gmail.a" in m["content"] for m in rebuilt) == 0
+
+    transcript.sync("PROMPT", _state([_tool("c")], [_step(0)], task="another task"))
+    assert transcript.resets == 2
+
+
+def _response(response_id, cached, total):
+    return SimpleNamespace(
+        id=response_id,
+        model="o4-mini",
+        output=[],
+        usage={"input_tokens": total, "output_tokens": 5, "input_tokens_details": {"cached_tokens": cached}},
+    )
+
+
+class _FakeClient:
+    default_model = "o4-mini"
+
+    def __init__(self):
+        self.calls = []
+
+    def resolve_request_model(self, **kwargs):
+        return "openai", "o4-mini"
+
+    def create_response(self, **kwargs):
+        self.calls.append(kwargs)
+        return _response(f"resp-{len(self.calls)}", cached=1024 if len(self.calls) > 1 else 0, total=2000)
+
+
+def _agent_state():
+    return AgentState(task="triage inbox", user_id="user-1", request_id="req-1", budget=Budget())
+
+
+def test_chained_requests_send_only_new_messages():
+    state = _agent_state()
+    client = _FakeClient()
+    llm = PlannerLLM(client=client, enabled=True, chain_responses=True)
+
+    llm.generate_plan(state)
+    state.record_step(action_type="tool", success=True, action_reasoning="r", action_input={}, action_outcome={})
+    result = llm.generate_plan(state)
+    # Parse retry: nothing new was appended, so don't build on the rejected reply.
+    llm.generate_plan(state)
+
+    first, second, retry = client.calls
+    assert "previous_response_id" not in first
+    assert second["previous_response_id"] == "resp-1"
+    assert len(second["messages"]) == 1 and second["messages"][0]["content"].startswith("TRAJECTORY_STEP_JSON")
+    assert "previous_response_id" not in retry
+    assert retry["messages"] == result["messages"]
+
+    completed = [log for log in state.logs if log["event"] == "mcp.llm.completed"]
+    assert completed[1]["chained"] is True
+    assert completed[1]["usage"]["input_cached"] == 1024
+
+
+def test_chaining_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("MCP_PLANNER_CHAIN_RESPONSES", raising=False)
+    state = _agent_state()
+    client = _FakeClient()
+    llm = PlannerLLM(client=client, enabled=True)
+    llm.generate_plan(state)
+    state.record_step(action_type="tool", success=True, action_reasoning="r", action_input={}, action_outcome={})
+    llm.generate_plan(state)
+    assert all("previous_response_id" not in call for call in client.calls)
+    assert client.calls[1]["messages"][: len(client.calls[0]["messages"])] == client.calls[0]["messages"]
+
+
+def test_tracker_reports_cached_input_from_responses_usage():
+    tracker = TokenCostTracker()
+    usage = tracker.record_response("o4-mini", "planner.llm", _response("r", cached=1536, total=2048))
+    assert usage["input_cached"] == 1536 and usage["input_new"] == 512
+    tracker.record_response("o4-mini", "planner.llm", _response("r", cached=0, total=2048))
+    report = tracker.cache_report()
+    assert report["input_cached"] == 1536 and report["input_new"] == 2560
+    assert report["by_source"]["planner.llm"]["calls"] == 2
+    assert report["cached_input_ratio"] == round(1536 / 4096, 4)
+
+
+def _big_step(index, size=2000):
+    return {
+        "step": index,
+        "type": "tool",
+        "action_reasoning": f"fetch page {index}",
+        "action_input": {"tool_id": "gmail.a", "reasoning": f"fetch page {index}", "args": {"page": index}},
+        "action_outcome": {"success": True, "total": 3},
+        "success": True,
+        "error": None,
+        "is_smart_summary": False,
+        "observation": {"text": "x" * size},
+        "observation_metadata": {"truncated": False},
+    }
+
+
+def test_compact_step_drops_defaults_and_repeats():
+    compact = compact_step(_big_step(3, size=10))
+    assert "error" not in compact and "is_smart_summary" not in compact
+    assert "observation_metadata" not in compact
+    assert "reasoning" not in compact["action_input"]
+    assert compact["action_outcome"] == {"total": 3}
+
+    frozen = freeze_step(_big_step(3))
+    assert frozen.collapsed_tokens < frozen.full_tokens
+    assert '"collapsed":true' in frozen.collapsed and '"tool_id":"gmail.a"' in frozen.collapsed
+
+
+def test_agent_state_freezes_each_step_once():
+    state = _agent_state()
+    state.record_step(action_type="tool", success=True, action_reasoning="r", action_input={}, action_outcome={})
+    first = state.frozen_trajectory()
+    state.record_step(action_type="tool", success=False, action_reasoning="r", action_input={}, action_outcome={})
+    second = state.frozen_trajectory()
+    assert len(second) == 2 and second[0] is first[0]
+
+
+def test_budget_collapses_oldest_steps_in_one_batch():
+    transcript = PlannerTranscript(token_budget=3000, keep_recent=2)
+    steps = []
+    previous = transcript.sync("PROMPT", _state())
+    for index in range(5):
+        steps.append(_big_step(index))
+        current = transcript.sync("PROMPT", _state(steps=steps))
+        assert current[: len(previous)] == previous
+        previous = current
+    assert transcript.compactions == 0 and transcript.generation == 1
+
+    steps.append(_big_step(5))
+    compacted = transcript.sync("PROMPT", _state(steps=steps))
+    assert transcript.compactions == 1 and transcript.generation == 2 and transcript.resets == 0
+    collapsed = [m for m in compacted if m["content"].startswith("TRAJECTORY_COLLAPSED_JSON")]
+    assert len(collapsed) == 1
+    full_steps = [m for m in compacted if m["content"].startswith("TRAJECTORY_STEP_JSON")]
+    assert len(full_steps) >= 2 and '"step":5' in full_steps[-1]["content"]
+    assert transcript.stats()["trajectory_tokens"] <= 3000 * 0.6
+
+    steps.append(_big_step(6, size=10))
+    after = transcript.sync("PROMPT", _state(steps=steps))
+    assert after[: len(compacted)] == compacted
+
+
+def test_chain_restarts_after_compaction():
+    state = _agent_state()
+    client = _FakeClient()
+    llm = PlannerLLM(client=client, enabled=True, chain_responses=True, state_token_budget=1500)
+    llm.generate_plan(state)
+    for index in range(4):
+        state.record_step(
+            action_type="tool",
+            success=True,
+            action_reasoning="r",
+            action_input={"tool_id": "gmail.a"},
+            action_outcome={},
+            observation={"text": "x" * 2000},
+        )
+        llm.generate_plan(state)
+    assert any("previous_response_id" in call for call in client.calls[1:])
+    compacted = [log for log in state.logs if log["event"] == "mcp.llm.completed" and log["transcript"]["compactions"]]
+    assert compacted and compacted[0]["chained"] is False
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from mcp_agent.sandbox import runtime
+
+
+def _register_pages(monkeypatch, pages, *, delay=0.0, calls=None):
+    async def _caller(provider, tool, payload):
+        if calls is not None:
+            calls.append(payload.get("after"))
+        await asyncio.sleep(delay)
+        return pages[payload.get("after") or "start"]
+
+    monkeypatch.setattr(runtime, "_REGISTERED_CALLER", _caller)
+
+
+def _hubspot_pages(count):
+    pages = {}
+    for i in range(count):
+        key = "start" if i == 0 else f"c{i}"
+        next_cursor = {"next": {"after": f"c{i + 1}"}} if i + 1 < count else None
+        pages[key] = {
+            "successful": True,
+            "data": {"results": [f"item-{i}-a", f"item-{i}-b"], "paging": next_cursor},
+        }
+    return pages
+
+
+def _collect(agen):
+    async def _run():
+        return [item async for item in agen]
+
+    return asyncio.run(_run())
+
+
+def test_paginate_follows_cursor_until_exhausted(monkeypatch):
+    calls = []
+    _register_pages(monkeypatch, _hubspot_pages(3), calls=calls)
+    pages = _collect(
+        runtime.paginate(
+            "hubspot",
+            "hubspot_list_deals",
+            {"limit": 2},
+            cursor_param="after",
+            next_cursor_path="paging.next.after",
+            items_path="results",
+        )
+    )
+    assert len(pages) == 3
+    assert calls == [None, "c1", "c2"]
+
+
+def test_iterate_items_honours_max_items(monkeypatch):
+    calls = []
+    _register_pages(monkeypatch, _hubspot_pages(5), calls=calls)
+    items = _collect(
+        runtime.iterate_items(
+            "hubspot",
+            "hubspot_list_deals",
+            {},
+            items_path="results",
+            max_items=3,
+            cursor_param="after",
+            next_cursor_path="paging.next.after",
+        )
+    )
+    assert items == ["item-0-a", "item-0-b", "item-1-a"]
+    assert calls == [None, "c1"]
+
+
+def test_paginate_prefetches_next_page_while_caller_works(monkeypatch):
+    _register_pages(monkeypatch, _hubspot_pages(4), delay=0.05)
+
+    async def _run():
+        started = time.perf_counter()
+        async for _page in runtime.paginate(
+            "hubspot",
+            "hubspot_list_deals",
+            {},
+            cursor_param="after",
+            next_cursor_path="paging.next.after",
+        ):
+            await asyncio.sleep(0.05)  # simulated per-page processing
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(_run())
+    # Sequential fetch+process would take ~0.4s; overlapped it is ~0.25s.
+    assert elapsed < 0.35
+
+
+def test_paginate_stops_on_failed_page(monkeypatch):
+    pages = _hubspot_pages(3)
+    pages["c1"] = {"successful": False, "error": "rate limited", "data": None}
+    _register_pages(monkeypatch, pages)
+    collected = _collect(
+        runtime.paginate(
+            "hubspot",
+            "hubspot_list_deals",
+            {},
+            cursor_param="after",
+            next_cursor_path="paging.next.after",
+            max_pages=10,
+        )
+    )
+    assert [page["successful"] for page in collected] == [True, False]
+
+    with pytest.raises(RuntimeError):
+        _collect(
+            runtime.iterate_items(
+                "hubspot",
+                "hubspot_list_deals",
+                {},
+                items_path="results",
+                cursor_param="after",
+                next_cursor_path="paging.next.after",
+            )
+        )
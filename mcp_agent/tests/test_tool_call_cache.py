@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mcp_agent.actions import call_cache, dispatcher
+from mcp_agent.actions.call_cache import ToolCallCache
+from mcp_agent.core.context import AgentContext
+
+
+def _ok(value):
+    return {"successful": True, "data": {"value": value}, "error": None}
+
+
+def test_cache_hits_identical_args_regardless_of_key_order():
+    cache = ToolCallCache(ttl_s=60, max_entries=8)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return _ok(len(calls))
+
+    first = cache.call("gmail", "gmail_search", {"query": "x", "max_results": 5}, fn)
+    second = cache.call("gmail", "gmail_search", {"max_results": 5, "query": "x"}, fn)
+
+    assert first == second == _ok(1)
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    # Callers get copies; mutating one must not poison the cache.
+    second["data"]["value"] = "mutated"
+    assert cache.call("gmail", "gmail_search", {"query": "x", "max_results": 5}, fn) == _ok(1)
+
+
+def test_cache_respects_ttl_size_bound_and_skips_failures():
+    cache = ToolCallCache(ttl_s=0.05, max_entries=2)
+    cache.call("slack", "a", {}, lambda: _ok("a"))
+    cache.call("slack", "b", {}, lambda: _ok("b"))
+    cache.call("slack", "c", {}, lambda: _ok("c"))
+    assert len(cache) == 2  # "a" evicted
+
+    cache.call("slack", "fail", {}, lambda: {"successful": False, "error": "boom"})
+    assert cache.call("slack", "fail", {}, lambda: _ok("retry")) == _ok("retry")
+
+    time.sleep(0.06)
+    assert cache.call("slack", "b", {}, lambda: _ok("fresh")) == _ok("fresh")
+
+
+def test_concurrent_identical_calls_are_coalesced():
+    cache = ToolCallCache(ttl_s=60, max_entries=8)
+    started = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return _ok("shared")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(cache.call, "hubspot", "hubspot_list_deals", {}, slow)
+        started.wait()
+        followers = [pool.submit(cache.call, "hubspot", "hubspot_list_deals", {}, slow) for _ in range(3)]
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert len(calls) == 1
+    assert all(result == _ok("shared") for result in results)
+    assert cache.stats()["coalesced"] == 3
+
+
+def test_dispatch_invalidates_reads_after_write_on_same_provider(monkeypatch):
+    calls = []
+
+    def fake_search(context, query):
+        calls.append(("search", query))
+        return _ok(len(calls))
+
+    fake_search.__tb_read_only__ = True
+
+    def fake_send(context, to):
+        calls.append(("send", to))
+        return _ok("sent")
+
+    monkeypatch.setattr(
+        dispatcher,
+        "get_provider_action_map",
+        lambda: {"gmail": (fake_search, fake_send)},
+    )
+    monkeypatch.setattr(call_cache, "_RUN_CACHES", call_cache.OrderedDict())
+    fake_search.__name__ = "gmail_search"
+    fake_send.__name__ = "gmail_send_email"
+    context = AgentContext.create(user_id="u1", request_id="run-1")
+
+    dispatcher.dispatch_tool(context, "gmail", "gmail_search", {"query": "q"})
+    dispatcher.dispatch_tool(context, "gmail", "gmail_search", {"query": "q"})
+    dispatcher.dispatch_tool(context, "gmail", "gmail_send_email", {"to": "a@b.c"})
+    dispatcher.dispatch_tool(context, "gmail", "gmail_search", {"query": "q"})
+
+    assert [name for name, _ in calls] == ["search", "send", "search"]
+    assert call_cache.get_run_cache("run-1").stats()["hits"] == 1
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import inspect
 from typing import Any, Callable, Dict, Optional
 
 
@@ -27,3 +28,15 @@ def tool_output_schema(
 
     return decorator
 
+
+def get_pagination_spec(func: Callable[..., Any]) -> Optional[Dict[str, str]]:
+    """Return the wrapper's ``__tb_pagination__`` metadata when it is well-formed."""
+    spec = getattr(func, "__tb_pagination__", None)
+    if not isinstance(spec, dict):
+        return None
+    if not spec.get("cursor_param") or not spec.get("next_cursor_path"):
+        return None
+    params = inspect.signature(func).parameters
+    if spec["cursor_param"] not in params:
+        return None
+    return spec
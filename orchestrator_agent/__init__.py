@@ -28,6 +28,7 @@ from orchestrator_agent.bridges import (
 )
 from orchestrator_agent.runtime import OrchestratorRuntime
 from orchestrator_agent.system_prompt import (
+    SystemPromptBuilder,
     get_system_prompt,
     build_system_prompt,
 )
@@ -37,6 +38,8 @@ from orchestrator_agent.translator import (
 )
 from orchestrator_agent.capabilities import (
     build_capability_context,
+    build_capability_context_async,
+    capability_cache_stats,
     fetch_mcp_capabilities,
     fetch_computer_capabilities,
     invalidate_cache,
@@ -64,9 +67,12 @@ __all__ = [
     "run_mcp_agent",
     "TRANSLATOR_SYSTEM_PROMPT",
     "translate_step_output",
+    "SystemPromptBuilder",
     "get_system_prompt",
     "build_system_prompt",
     "build_capability_context",
+    "build_capability_context_async",
+    "capability_cache_stats",
     "fetch_mcp_capabilities",
     "fetch_computer_capabilities",
     "invalidate_cache",
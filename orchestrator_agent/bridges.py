@@ -174,11 +174,16 @@ def run_mcp_agent(
     request: OrchestratorRequest,
     step: PlannedStep,
     orchestrator_state: Optional[Dict[str, Any]] = None,
+    structured_out: Optional[Dict[str, Any]] = None,
 ) -> str:
     """Execute MCP agent and return self-contained trajectory.
 
     IMPORTANT: Returns ONLY trajectory string, not raw_result.
     The trajectory contains all necessary data.
+
+    When `structured_out` is given, the structured result (success, summary,
+    errors and steps; no state snapshot) is stored under `"mcp_result"` for
+    the structured translator.
     """
     # Bind step_id to context for hierarchical logging
     set_step_id(step.step_id)
@@ -243,6 +248,11 @@ def run_mcp_agent(
         }
 
     trajectory = _extract_mcp_trajectory(raw_dict)
+    if structured_out is not None:
+        structured_out["mcp_result"] = {
+            key: raw_dict.get(key)
+            for key in ("success", "final_summary", "error", "error_code", "error_message", "steps")
+        }
     logger.info(
         "bridge.mcp.done success=%s steps=%s trajectory_length=%s",
         raw_dict.get("success"),
@@ -393,6 +403,7 @@ def run_agent_bridge(
     request: OrchestratorRequest,
     step: PlannedStep,
     orchestrator_state: Optional[Dict[str, Any]] = None,
+    structured_out: Optional[Dict[str, Any]] = None,
 ) -> str:
     """Execute agent bridge and return self-contained trajectory.
 
@@ -404,9 +415,12 @@ def run_agent_bridge(
         request: The orchestrator request
         step: The planned step to execute
         orchestrator_state: Optional serialized orchestrator RunState for handback snapshots
+        structured_out: Optional dict that receives the MCP agent's structured result
     """
     if target == "mcp":
-        return run_mcp_agent(request, step, orchestrator_state=orchestrator_state)
+        return run_mcp_agent(
+            request, step, orchestrator_state=orchestrator_state, structured_out=structured_out
+        )
     if target == "computer_use":
         return run_computer_use_agent(request, step, orchestrator_state=orchestrator_state)
     raise ValueError(f"Unsupported agent target: {target}")
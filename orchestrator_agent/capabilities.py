@@ -4,23 +4,319 @@ Capability fetching infrastructure for the orchestrator agent.
 This module provides functions to fetch and cache real-time capability information
 from both the MCP agent (provider tree) and the computer-use agent (desktop environment).
 
-Capabilities are cached with a 5-minute TTL to balance freshness vs performance.
+Capabilities live in a process-wide `CapabilityCache`:
+
+- single-flight: concurrent callers for the same (kind, user) share one fetch,
+  from threads or from asyncio tasks (`build_capability_context_async`);
+- stale-while-revalidate: an entry past its TTL but inside its stale window
+  is served immediately while one background refresh replaces it;
+- bounded: LRU eviction by entry count and approximate JSON size.
+
+MCP inventories (TTL 5 min) change only when a provider is connected or
+disconnected, which invalidates them explicitly; desktop state (TTL 1 min)
+goes stale on its own.
 """
 
 from __future__ import annotations
 
-from typing import Dict, Any, Optional, TYPE_CHECKING, List
-from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, Optional, TYPE_CHECKING, List, Tuple
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+import asyncio
+import json
 import logging
+import os
+import threading
+import time
+
+from mcp_agent.user_identity import normalize_user_id
+from shared.latency_logger import LATENCY_LOGGER
 
 if TYPE_CHECKING:
     from orchestrator_agent.data_types import OrchestratorRequest
 
 logger = logging.getLogger(__name__)
 
-# Global cache with TTL
-_capability_cache: Dict[str, tuple[Dict[str, Any], datetime]] = {}
-CACHE_TTL = timedelta(minutes=5)  # 5-minute TTL
+CacheKey = Tuple[str, str]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+MCP_TTL_S = _env_float("ORCH_CAPABILITY_MCP_TTL_S", 300.0)
+MCP_STALE_S = _env_float("ORCH_CAPABILITY_MCP_STALE_S", 600.0)
+COMPUTER_TTL_S = _env_float("ORCH_CAPABILITY_COMPUTER_TTL_S", 60.0)
+COMPUTER_STALE_S = _env_float("ORCH_CAPABILITY_COMPUTER_STALE_S", 120.0)
+CACHE_TTL = timedelta(seconds=MCP_TTL_S)  # kept for callers of the old single TTL
+
+
+def _approx_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str))
+    except (TypeError, ValueError):
+        return len(str(value))
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fetched_at: float
+    size: int
+
+
+@dataclass
+class _InFlight:
+    future: Future = field(default_factory=Future)
+    # Set by invalidate() so a fetch that started before it is not stored.
+    invalidated: bool = False
+
+
+class CapabilityCache:
+    """Bounded LRU of capability snapshots with single-flight, stale-while-revalidate fetches."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        refresh_workers: int = 2,
+    ) -> None:
+        self.max_entries = max(1, max_entries if max_entries is not None else _env_int("ORCH_CAPABILITY_CACHE_MAX_ENTRIES", 512))
+        self.max_bytes = max(1, max_bytes if max_bytes is not None else _env_int("ORCH_CAPABILITY_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+        self._refresh_workers = max(1, refresh_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._in_flight: Dict[CacheKey, _InFlight] = {}
+        self._bytes = 0
+        self._refresh_ms: Dict[str, deque] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------ #
+    # Lookup
+    # ------------------------------------------------------------------ #
+
+    def get(
+        self,
+        key: CacheKey,
+        loader: Callable[[], Any],
+        *,
+        ttl_s: float,
+        stale_s: float = 0.0,
+        force_refresh: bool = False,
+    ) -> Any:
+        """Return the cached value for ``key``, running ``loader`` once for all concurrent misses."""
+        state, payload = self._begin(key, loader, ttl_s, stale_s, force_refresh)
+        if state == "hit":
+            return payload
+        if state == "wait":
+            return payload.future.result()
+        return self._fill(key, loader, payload)
+
+    async def aget(
+        self,
+        key: CacheKey,
+        loader: Callable[[], Any],
+        *,
+        ttl_s: float,
+        stale_s: float = 0.0,
+        force_refresh: bool = False,
+    ) -> Any:
+        """Async `get`: the fetch runs in the default executor and waiters never block the loop."""
+        state, payload = self._begin(key, loader, ttl_s, stale_s, force_refresh)
+        if state == "hit":
+            return payload
+        if state == "wait":
+            return await asyncio.wrap_future(payload.future)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._fill, key, loader, payload)
+
+    def _begin(
+        self,
+        key: CacheKey,
+        loader: Callable[[], Any],
+        ttl_s: float,
+        stale_s: float,
+        force_refresh: bool,
+    ) -> Tuple[str, Any]:
+        """Classify a lookup as ("hit", value), ("wait", flight) or ("lead", flight)."""
+        with self._lock:
+            entry = None if force_refresh else self._entries.get(key)
+            age = time.monotonic() - entry.fetched_at if entry is not None else None
+            if age is not None and age < ttl_s + stale_s:
+                self._entries.move_to_end(key)
+                if age < ttl_s:
+                    self.hits += 1
+                    return "hit", entry.value
+                self.stale_hits += 1
+                if key in self._in_flight:
+                    return "hit", entry.value
+                refresh = self._in_flight[key] = _InFlight()
+                self.refreshes += 1
+            else:
+                flight = self._in_flight.get(key)
+                if flight is not None:
+                    self.coalesced += 1
+                    return "wait", flight
+                flight = self._in_flight[key] = _InFlight()
+                self.misses += 1
+                return "lead", flight
+        self._submit_refresh(key, loader, refresh)
+        return "hit", entry.value
+
+    # ------------------------------------------------------------------ #
+    # Fetch
+    # ------------------------------------------------------------------ #
+
+    def _submit_refresh(self, key: CacheKey, loader: Callable[[], Any], flight: _InFlight) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._refresh_workers, thread_name_prefix="capability-refresh"
+                )
+            executor = self._executor
+        executor.submit(self._fill, key, loader, flight, True)
+
+    def _fill(self, key: CacheKey, loader: Callable[[], Any], flight: _InFlight, background: bool = False) -> Any:
+        started = time.perf_counter()
+        try:
+            value = loader()
+        except BaseException as exc:
+            with self._lock:
+                self.refresh_failures += 1
+                self._release_locked(key, flight)
+                entry = self._entries.get(key)
+            if entry is not None:
+                # Keep serving the last good snapshot until a refresh succeeds.
+                logger.warning("Capability refresh failed for %s; serving cached value: %s", key, exc)
+                flight.future.set_result(entry.value)
+                return entry.value
+            flight.future.set_exception(exc)
+            if background:
+                logger.warning("Background capability refresh failed for %s: %s", key, exc)
+                return None
+            raise
+        duration_ms = (time.perf_counter() - started) * 1000.0
+        with self._lock:
+            self._refresh_ms.setdefault(key[0], deque(maxlen=256)).append(duration_ms)
+            if not flight.invalidated:
+                self._store_locked(key, value)
+            self._release_locked(key, flight)
+        flight.future.set_result(value)
+        LATENCY_LOGGER.log_event(
+            "orchestrator.capabilities",
+            f"refresh.{key[0]}",
+            duration_ms,
+            {"background": background},
+        )
+        return value
+
+    def _release_locked(self, key: CacheKey, flight: _InFlight) -> None:
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+
+    def _store_locked(self, key: CacheKey, value: Any) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        entry = _Entry(value=value, fetched_at=time.monotonic(), size=_approx_size(value))
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    # ------------------------------------------------------------------ #
+    # Invalidation and metrics
+    # ------------------------------------------------------------------ #
+
+    def invalidate(self, key: CacheKey) -> bool:
+        """Drop ``key`` and discard any fetch for it that is already in flight."""
+        with self._lock:
+            flight = self._in_flight.pop(key, None)
+            if flight is not None:
+                flight.invalidated = True
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+        return entry is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            for flight in self._in_flight.values():
+                flight.invalidated = True
+            self._in_flight.clear()
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            refresh_ms = {}
+            for kind, samples in self._refresh_ms.items():
+                ordered = sorted(samples)
+                refresh_ms[kind] = {
+                    "count": len(ordered),
+                    "p50": round(ordered[len(ordered) // 2], 3),
+                    "max": round(ordered[-1], 3),
+                }
+            lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "refresh_ms": refresh_ms,
+            }
+
+
+_CAPABILITY_CACHE = CapabilityCache()
+_listener_registered = False
+
+
+def _ensure_connection_listener() -> None:
+    """Invalidate a user's MCP inventory when they connect or disconnect a provider."""
+    global _listener_registered
+    if _listener_registered:
+        return
+    _listener_registered = True
+    try:
+        from mcp_agent.registry.oauth import add_connection_listener  # Late import to avoid hard dependency
+    except Exception as exc:  # pragma: no cover - optional dependency
+        logger.debug("Provider connection events unavailable: %s", exc)
+        return
+    add_connection_listener(_on_connection_changed)
+
+
+def _on_connection_changed(user_id: str, provider: str) -> None:
+    invalidate_mcp_capabilities(user_id)
 
 
 def _resolve_controller(metadata: Dict[str, Any]):
@@ -58,6 +354,44 @@ def _resolve_controller(metadata: Dict[str, Any]):
     return None
 
 
+def _fetch_desktop_state(controller: Any) -> tuple:
+    """
+    Fetch (platform, apps, windows) from the controller, concurrently when possible.
+
+    Each slot holds the result or the exception raised for that call.
+    """
+    try:
+        from server.api.controller_client import AsyncVMControllerClient, VMControllerClient
+        from server.api.controller_pool import run_controller_coroutine
+    except Exception:  # pragma: no cover - optional dependency
+        VMControllerClient = None  # type: ignore
+
+    if VMControllerClient is not None and isinstance(controller, VMControllerClient):
+        client = AsyncVMControllerClient.from_client(controller)
+
+        async def _gather() -> list:
+            return await asyncio.gather(
+                client.get_platform(),
+                client.get_apps(exclude_system=True),
+                client.get_active_windows(exclude_system=True),
+                return_exceptions=True,
+            )
+
+        return tuple(run_controller_coroutine(_gather()))
+
+    results: List[Any] = []
+    for call in (
+        lambda: controller.get_platform(),
+        lambda: controller.get_apps(exclude_system=True),
+        lambda: controller.get_active_windows(exclude_system=True),
+    ):
+        try:
+            results.append(call())
+        except Exception as exc:
+            results.append(exc)
+    return tuple(results)
+
+
 def _normalize_platform(raw: Optional[str]) -> str:
     """
     Normalize platform strings to the values expected by the computer-use agent.
@@ -74,12 +408,24 @@ def _normalize_platform(raw: Optional[str]) -> str:
     return val
 
 
+def _load_mcp_inventory(user_id: str) -> Dict[str, Any]:
+    from mcp_agent.knowledge.search import get_inventory_view
+    from mcp_agent.core.context import AgentContext
+
+    context = AgentContext(user_id=user_id)
+    inventory = get_inventory_view(context)
+    logger.debug(f"Fetched MCP capabilities for user {user_id}")
+    return inventory
+
+
 def fetch_mcp_capabilities(user_id: str, force_refresh: bool = False) -> Dict[str, Any]:
     """
     Fetch available MCP providers and tools for a user.
     Uses mcp_agent.knowledge.search.get_inventory_view()
 
-    Cached for 5 minutes per user to reduce latency and API load.
+    Cached per user for MCP_TTL_S (then served stale for up to MCP_STALE_S
+    while it refreshes in the background); invalidated when the user
+    connects or disconnects a provider.
 
     Args:
         user_id: The user ID to fetch capabilities for
@@ -94,124 +440,93 @@ def fetch_mcp_capabilities(user_id: str, force_refresh: bool = False) -> Dict[st
             ]
         }
     """
+    _ensure_connection_listener()
     user_id_str = str(user_id)
-    cache_key = f"mcp:{user_id_str}"
-
-    # Check cache
-    if not force_refresh and cache_key in _capability_cache:
-        cached_data, cached_at = _capability_cache[cache_key]
-        if datetime.utcnow() - cached_at < CACHE_TTL:
-            logger.debug(f"Using cached MCP capabilities for user {user_id_str}")
-            return cached_data
-
-    # Fetch fresh data
     try:
-        from mcp_agent.knowledge.search import get_inventory_view
-        from mcp_agent.core.context import AgentContext
-
-        context = AgentContext(user_id=user_id_str)
-        inventory = get_inventory_view(context)
+        return _CAPABILITY_CACHE.get(
+            ("mcp", normalize_user_id(user_id)),
+            lambda: _load_mcp_inventory(user_id_str),
+            ttl_s=MCP_TTL_S,
+            stale_s=MCP_STALE_S,
+            force_refresh=force_refresh,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to fetch MCP capabilities: {e}", exc_info=True)
+        return {"providers": []}
 
-        # Cache the result
-        _capability_cache[cache_key] = (inventory, datetime.utcnow())
-        logger.debug(f"Fetched and cached MCP capabilities for user {user_id_str}")
-        return inventory
 
+async def fetch_mcp_capabilities_async(user_id: str, force_refresh: bool = False) -> Dict[str, Any]:
+    """Async `fetch_mcp_capabilities`; concurrent tasks share one inventory fetch."""
+    _ensure_connection_listener()
+    user_id_str = str(user_id)
+    try:
+        return await _CAPABILITY_CACHE.aget(
+            ("mcp", normalize_user_id(user_id)),
+            lambda: _load_mcp_inventory(user_id_str),
+            ttl_s=MCP_TTL_S,
+            stale_s=MCP_STALE_S,
+            force_refresh=force_refresh,
+        )
     except Exception as e:
         logger.warning(f"Failed to fetch MCP capabilities: {e}", exc_info=True)
         return {"providers": []}
 
 
-def fetch_computer_capabilities(
-    request: "OrchestratorRequest", force_refresh: bool = False
-) -> Dict[str, Any]:
-    """
-    Fetch desktop environment state from controller API.
+def _list_actions() -> List[str]:
+    try:
+        from computer_use_agent.grounding.grounding_agent import (
+            list_osworld_agent_actions,
+        )
 
-    Cached for 5 minutes to reduce VM controller API load.
+        return list_osworld_agent_actions()
+    except Exception as exc:  # pragma: no cover - defensive guard
+        logger.debug("Unable to load OSWorld agent actions: %s", exc)
+        return []
 
-    Args:
-        request: Orchestration request containing controller in metadata
-        force_refresh: If True, bypass cache and fetch fresh data
 
-    Returns:
-        Dict containing desktop environment state:
-        {
-            "platform": "macos",
-            "available_apps": ["Chrome", "Slack", "Excel", ...],
-            "active_windows": [
-                {"app_name": "Chrome", "title": "Dashboard"},
-                {"app_name": "Excel", "title": "Revenue.xlsx"}
-            ]
-        }
-    """
-    # Use controller from request metadata
-    def _list_actions() -> List[str]:
-        try:
-            from computer_use_agent.grounding.grounding_agent import (
-                list_osworld_agent_actions,
-            )
+def _fallback_computer_caps(request: "OrchestratorRequest") -> Dict[str, Any]:
+    """Stubbed capabilities when controller is unavailable or fails."""
+    platform_hint = _normalize_platform(
+        getattr(request, "platform", None)
+        or request.metadata.get("platform")
+        or "darwin"
+    )
+    return {
+        "platform": platform_hint or "unknown",
+        "available_apps": [
+            "Google Chrome",
+            "VS Code",
+            "Terminal",
+            "Files",
+            "TextEdit",
+            "Finder",
+            "LibreOffice",
+        ],
+        "active_windows": [],
+        "actions": _list_actions(),
+    }
 
-            return list_osworld_agent_actions()
-        except Exception as exc:  # pragma: no cover - defensive guard
-            logger.debug("Unable to load OSWorld agent actions: %s", exc)
-            return []
-
-    def _fallback_caps() -> Dict[str, Any]:
-        """Stubbed capabilities when controller is unavailable or fails."""
-        platform_hint = _normalize_platform(
-            getattr(request, "platform", None)
-            or request.metadata.get("platform")
-            or "darwin"
-        )
-        return {
-            "platform": platform_hint or "unknown",
-            "available_apps": [
-                "Google Chrome",
-                "VS Code",
-                "Terminal",
-                "Files",
-                "TextEdit",
-                "Finder",
-                "LibreOffice",
-            ],
-            "active_windows": [],
-            "actions": _list_actions(),
-        }
 
+def _load_computer_capabilities(request: "OrchestratorRequest") -> Dict[str, Any]:
+    """
+    Read desktop state from the controller. Falls back to stubbed capabilities
+    (which are cached too, so a dead controller is not re-polled every step).
+    """
+    # Use controller from request metadata
     controller = _resolve_controller(request.metadata)
     if not controller:
         logger.warning("No controller available from metadata or environment")
-        result = _fallback_caps()
-        _capability_cache[f"computer:{request.user_id or 'default'}"] = (
-            result,
-            datetime.utcnow(),
-        )
-        return result
-
-    cache_key = f"computer:{request.user_id or 'default'}"
+        return _fallback_computer_caps(request)
 
-    # Check cache
-    if not force_refresh and cache_key in _capability_cache:
-        cached_data, cached_at = _capability_cache[cache_key]
-        if datetime.utcnow() - cached_at < CACHE_TTL:
-            logger.debug("Using cached computer capabilities")
-            return cached_data
-
-    # Fetch fresh data
     try:
+        platform_raw, apps_data, windows_data = _fetch_desktop_state(controller)
         # Platform should come from the VM, not CLI flags.
-        try:
-            platform_raw = controller.get_platform()
-        except Exception:
+        if isinstance(platform_raw, BaseException):
             platform_raw = None
         platform = _normalize_platform(platform_raw)
-
-        apps_data = controller.get_apps(exclude_system=True)
-        windows_data = controller.get_active_windows(exclude_system=True)
-
-        # Surface available OSWorld agent actions (click, type, scroll, etc.)
-        actions: List[str] = _list_actions()
+        for data in (apps_data, windows_data):
+            if isinstance(data, BaseException):
+                raise data
 
         # Persist the resolved platform back into request metadata for downstream use
         try:
@@ -219,7 +534,8 @@ def fetch_computer_capabilities(
         except Exception:
             pass
 
-        result = {
+        logger.debug("Fetched computer capabilities")
+        return {
             "platform": platform or "unknown",
             "available_apps": (
                 apps_data.get("apps", []) if isinstance(apps_data, dict) else []
@@ -229,22 +545,59 @@ def fetch_computer_capabilities(
                 if isinstance(windows_data, dict)
                 else []
             ),
-            "actions": actions,
+            # Surface available OSWorld agent actions (click, type, scroll, etc.)
+            "actions": _list_actions(),
         }
 
-        # Cache the result
-        _capability_cache[cache_key] = (result, datetime.utcnow())
-        logger.debug("Fetched and cached computer capabilities")
-        return result
-
     except Exception as e:
         logger.warning(f"Failed to fetch computer capabilities: {e}", exc_info=True)
-        result = _fallback_caps()
-        _capability_cache[f"computer:{request.user_id or 'default'}"] = (
-            result,
-            datetime.utcnow(),
-        )
-        return result
+        return _fallback_computer_caps(request)
+
+
+def fetch_computer_capabilities(
+    request: "OrchestratorRequest", force_refresh: bool = False
+) -> Dict[str, Any]:
+    """
+    Fetch desktop environment state from controller API.
+
+    Cached per user for COMPUTER_TTL_S (then served stale for up to
+    COMPUTER_STALE_S while it refreshes in the background).
+
+    Args:
+        request: Orchestration request containing controller in metadata
+        force_refresh: If True, bypass cache and fetch fresh data
+
+    Returns:
+        Dict containing desktop environment state:
+        {
+            "platform": "macos",
+            "available_apps": ["Chrome", "Slack", "Excel", ...],
+            "active_windows": [
+                {"app_name": "Chrome", "title": "Dashboard"},
+                {"app_name": "Excel", "title": "Revenue.xlsx"}
+            ]
+        }
+    """
+    return _CAPABILITY_CACHE.get(
+        ("computer", normalize_user_id(request.user_id)),
+        lambda: _load_computer_capabilities(request),
+        ttl_s=COMPUTER_TTL_S,
+        stale_s=COMPUTER_STALE_S,
+        force_refresh=force_refresh,
+    )
+
+
+async def fetch_computer_capabilities_async(
+    request: "OrchestratorRequest", force_refresh: bool = False
+) -> Dict[str, Any]:
+    """Async `fetch_computer_capabilities`; the controller calls run off the event loop."""
+    return await _CAPABILITY_CACHE.aget(
+        ("computer", normalize_user_id(request.user_id)),
+        lambda: _load_computer_capabilities(request),
+        ttl_s=COMPUTER_TTL_S,
+        stale_s=COMPUTER_STALE_S,
+        force_refresh=force_refresh,
+    )
 
 
 def build_capability_context(
@@ -273,6 +626,26 @@ def build_capability_context(
     }
 
 
+async def build_capability_context_async(
+    request: "OrchestratorRequest", force_refresh: bool = False
+) -> Dict[str, Any]:
+    """Async `build_capability_context`; both halves are fetched concurrently."""
+    mcp_caps, computer_caps = await asyncio.gather(
+        fetch_mcp_capabilities_async(request.user_id or "default", force_refresh),
+        fetch_computer_capabilities_async(request, force_refresh),
+    )
+    return {
+        "mcp": mcp_caps,
+        "computer": computer_caps,
+    }
+
+
+def invalidate_mcp_capabilities(user_id: str) -> None:
+    """Drop a user's cached MCP inventory (e.g. after a provider connect/disconnect)."""
+    if _CAPABILITY_CACHE.invalidate(("mcp", normalize_user_id(user_id))):
+        logger.debug(f"Invalidated MCP cache for user {user_id}")
+
+
 def invalidate_cache(user_id: str) -> None:
     """
     Invalidate cached capabilities for a user.
@@ -285,22 +658,26 @@ def invalidate_cache(user_id: str) -> None:
     Args:
         user_id: The user ID whose cache should be invalidated
     """
-    mcp_key = f"mcp:{user_id}"
-    computer_key = f"computer:{user_id}"
+    invalidate_mcp_capabilities(user_id)
+    if _CAPABILITY_CACHE.invalidate(("computer", normalize_user_id(user_id))):
+        logger.debug(f"Invalidated computer cache for user {user_id}")
 
-    if mcp_key in _capability_cache:
-        del _capability_cache[mcp_key]
-        logger.debug(f"Invalidated MCP cache for user {user_id}")
 
-    if computer_key in _capability_cache:
-        del _capability_cache[computer_key]
-        logger.debug(f"Invalidated computer cache for user {user_id}")
+def capability_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters, size and refresh latency of the capability cache."""
+    return _CAPABILITY_CACHE.stats()
 
 
 __all__ = [
+    "CapabilityCache",
     "fetch_mcp_capabilities",
+    "fetch_mcp_capabilities_async",
     "fetch_computer_capabilities",
+    "fetch_computer_capabilities_async",
     "build_capability_context",
+    "build_capability_context_async",
+    "capability_cache_stats",
     "invalidate_cache",
+    "invalidate_mcp_capabilities",
     "CACHE_TTL",
 ]
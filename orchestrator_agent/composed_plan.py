@@ -42,6 +42,8 @@ class ComposedStep:
     prompt: Optional[str] = None
     # High-level result for this step (data to retrieve or success criteria for actions).
     expected_outcome: Optional[str] = None
+    # Ids of earlier steps whose results this step needs; steps with none may run concurrently.
+    depends_on: List[str] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -6,20 +6,34 @@ Task Compose Agent for the orchestrator.
 Given a raw task string and current capabilities (MCP + desktop),
 this module asks an LLM to produce a structured ComposedPlan and
 performs lightweight validation/normalization.
+
+Plans composed for a user are cached in the local DB (composed_plan_cache)
+keyed by the normalized task, tool constraints, a fingerprint of the
+capabilities the prompt describes and the schema version, so recurring
+workflows with an unchanged prompt skip the LLM. Hits are re-validated
+through `_normalize_plan_dict` against the current capabilities.
+A user's entries are dropped by mcp_agent.registry.oauth whenever they
+connect or disconnect a provider.
 """
 
+import hashlib
 import json
 import logging
+import os
 import re
+import unicodedata
 from typing import Any, Dict, List, Optional, Tuple
 
+from mcp_agent.user_identity import normalize_user_id
 from orchestrator_agent.composed_plan import ComposedPlan, ComposedStep
+from orchestrator_agent.step_graph import infer_dependencies
 from shared.llm_client import respond_once, extract_assistant_text
 
 logger = logging.getLogger(__name__)
 
-COMPOSE_SCHEMA_VERSION = 2
-
+COMPOSE_SCHEMA_VERSION = 3
+# Seconds a cached composed plan stays valid (COMPOSE_PLAN_CACHE=0 disables the cache).
+COMPOSE_CACHE_TTL = float(os.getenv("COMPOSE_PLAN_CACHE_TTL", str(24 * 3600)))
 
 def _summarize_capabilities(capabilities: Dict[str, Any]) -> Tuple[str, str]:
     """Build compact textual summaries of MCP providers and desktop apps."""
@@ -102,7 +116,10 @@ Respond with a single JSON object matching this schema:
       "prompt": "The actual natural language instruction sent to the sub-agent. Be descriptive.",
       
       // The Outcome
-      "expected_outcome": "Description of the data returned OR the action completed."
+      "expected_outcome": "Description of the data returned OR the action completed.",
+
+      // Ordering
+      "depends_on": ["step-1"]             // Ids of earlier steps whose results this step needs; [] if none
     }}
   ]
 }}
@@ -118,6 +135,7 @@ Respond with a single JSON object matching this schema:
 - The `prompt` field should be self-contained. 
 - If a step needs data from a previous step, reference it naturally (e.g., "Using the email summary retrieved in the previous step..."). 
 - DO NOT use template variables like `{{step1.result}}`. Use English.
+- Set `depends_on` to exactly the earlier steps a step needs. Independent steps (e.g., fetching from two different providers before merging) should have `[]` so they can run at the same time.
 - Keep prompts and `expected_outcome` high-level and resilient: avoid invented decision rules, keyword lists, thresholds, or example phrases unless the user explicitly provided them.
 - Use the user's categories and requirements as-is; do not add new labels or criteria.
 
@@ -229,7 +247,9 @@ def _normalize_plan_dict(
     steps_in: List[Dict[str, Any]] = raw.get("steps") or []
     llm_original_task = raw.get("original_task") or original_task
     llm_task_description = raw.get("task_description")
+    dependencies = infer_dependencies([s for s in steps_in if isinstance(s, dict)])
     parsed_steps: List[ComposedStep] = []
+    kept_ids: set = set()
     for s in steps_in:
         sid = str(s.get("id") or "").strip()
         stype = s.get("type") or "meta"
@@ -254,6 +274,7 @@ def _normalize_plan_dict(
             action_kind=s.get("action_kind"),
             prompt=cleaned_prompt,
             expected_outcome=outcome,
+            depends_on=[d for d in dependencies.get(sid, []) if d in kept_ids],
         )
 
         # Light normalization
@@ -268,6 +289,7 @@ def _normalize_plan_dict(
                     step.app_name = app_map[key]
 
         parsed_steps.append(step)
+        kept_ids.add(sid)
 
     # Build combined prompt by concatenating step prompts/descriptions
     pieces: List[str] = []
@@ -286,17 +308,119 @@ def _normalize_plan_dict(
     )
 
 
+def _compose_cache_enabled() -> bool:
+    return os.getenv("COMPOSE_PLAN_CACHE", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def normalize_task_text(task: str) -> str:
+    """Canonical task text for cache keys: NFC, whitespace runs collapsed."""
+    return " ".join(unicodedata.normalize("NFC", task or "").split())
+
+
+def compose_capability_fingerprint(capabilities: Dict[str, Any]) -> str:
+    """Hash of the capability fields the compose prompt and normalization depend on."""
+    mcp_caps = capabilities.get("mcp", {}) or {}
+    computer_caps = capabilities.get("computer", {}) or {}
+    canonical = {
+        "providers": sorted(
+            [str(p.get("provider") or "unknown"), sorted(str(t) for t in p.get("tools") or [])]
+            for p in mcp_caps.get("providers", []) or []
+        ),
+        "platform": computer_caps.get("platform", "unknown"),
+        "apps": sorted(str(a) for a in computer_caps.get("available_apps", []) or []),
+        "actions": sorted(str(a) for a in computer_caps.get("actions", []) or []),
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def compose_cache_key(
+    user_id: str,
+    task: str,
+    tool_constraints: Optional[Dict[str, Any]],
+    fingerprint: str,
+) -> str:
+    """Canonical hash of everything that determines a composed plan."""
+    payload = {
+        "user_id": normalize_user_id(user_id),
+        "task": normalize_task_text(task),
+        "tool_constraints": tool_constraints or None,
+        "capabilities": fingerprint,
+        "schema_version": COMPOSE_SCHEMA_VERSION,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _cached_plan(cache_key: str, capabilities: Dict[str, Any], task: str) -> Optional[ComposedPlan]:
+    try:
+        from shared.db import composed_plans
+
+        raw = composed_plans.get_fresh(cache_key)
+    except Exception as exc:
+        logger.warning("Composed plan cache lookup failed: %s", exc)
+        return None
+    if raw is None:
+        return None
+    try:
+        plan = _normalize_plan_dict(raw, capabilities, original_task=task)
+    except Exception as exc:
+        logger.warning("Cached composed plan failed validation, recomposing: %s", exc)
+        return None
+    return plan if plan.steps else None
+
+
+def _store_plan(
+    cache_key: str,
+    plan_dict: Dict[str, Any],
+    *,
+    user_id: str,
+    workflow_id: Optional[str],
+    fingerprint: str,
+) -> None:
+    try:
+        from shared.db import composed_plans
+
+        composed_plans.put(
+            cache_key,
+            user_id=normalize_user_id(user_id),
+            workflow_id=workflow_id,
+            plan=plan_dict,
+            schema_version=COMPOSE_SCHEMA_VERSION,
+            capability_fingerprint=fingerprint,
+            ttl_seconds=COMPOSE_CACHE_TTL,
+        )
+    except Exception as exc:
+        logger.warning("Failed to cache composed plan: %s", exc)
+
+
 def compose_plan(
     task: str,
     capabilities: Dict[str, Any],
     *,
     tool_constraints: Optional[Dict[str, Any]] = None,
+    user_id: Optional[str] = None,
+    workflow_id: Optional[str] = None,
+    use_cache: Optional[bool] = None,
 ) -> Dict[str, Any]:
     """High-level entry point to build a composed plan for a task.
 
+    When `user_id` is given (and the cache is enabled) a cached plan for the
+    same task, tool constraints and capabilities is reused instead of calling
+    the LLM; `workflow_id` ties the entry to a workflow for invalidation.
+
     Returns:
         Dict[str, Any]: JSON-serializable composed plan.
     """
+    cache_key: Optional[str] = None
+    fingerprint = ""
+    if user_id and (_compose_cache_enabled() if use_cache is None else use_cache):
+        fingerprint = compose_capability_fingerprint(capabilities)
+        cache_key = compose_cache_key(user_id, task, tool_constraints, fingerprint)
+        cached = _cached_plan(cache_key, capabilities, task)
+        if cached is not None:
+            logger.info("compose_plan cache hit - key=%s task: %s", cache_key[:12], task[:100])
+            return cached.to_dict()
+
     system_prompt = _build_compose_prompt(task, capabilities)
 
     # User message: keep it simple, original_task is echoed so the model
@@ -357,6 +481,8 @@ def compose_plan(
 
     try:
         normalized = _normalize_plan_dict(plan_dict, capabilities, original_task=task)
+        if cache_key is not None and normalized.steps:
+            _store_plan(cache_key, plan_dict, user_id=user_id, workflow_id=workflow_id, fingerprint=fingerprint)
         return normalized.to_dict()
     except Exception as exc:  # pragma: no cover - final safety net
         logger.exception("Failed to normalize composed plan, falling back. Error: %s", exc)
@@ -364,4 +490,10 @@ def compose_plan(
         return plan.to_dict()
 
 
-__all__ = ["compose_plan", "COMPOSE_SCHEMA_VERSION"]
+__all__ = [
+    "compose_plan",
+    "compose_cache_key",
+    "compose_capability_fingerprint",
+    "COMPOSE_CACHE_TTL",
+    "COMPOSE_SCHEMA_VERSION",
+]
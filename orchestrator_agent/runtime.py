@@ -11,10 +11,14 @@ multiple tenants can be served in parallel without mixing state.
 
 import asyncio
 import contextvars
+import functools
 import json
 import logging
+import os
+import time
+import weakref
 from datetime import datetime
-from typing import Iterable, List, Optional, Tuple, Dict, Any, Callable
+from typing import Iterable, List, Optional, Dict, Any, Callable
 
 from orchestrator_agent.data_types import (
     AgentTarget,
@@ -27,11 +31,32 @@ from orchestrator_agent.data_types import (
 )
 from orchestrator_agent.bridges import run_agent_bridge
 from orchestrator_agent.exceptions import HandbackRequested
-from orchestrator_agent.translator import translate_step_output
-from orchestrator_agent.capabilities import build_capability_context
-from orchestrator_agent.system_prompt import build_system_prompt
+from orchestrator_agent.translator import draft_step_output, translate_step_output
+from orchestrator_agent.capabilities import (
+    build_capability_context,
+    build_capability_context_async,
+    capability_cache_stats,
+)
+from orchestrator_agent.system_prompt import SystemPromptBuilder
+from orchestrator_agent.step_graph import (
+    PARALLEL_STEPS_PER_RUN,
+    PARALLEL_STEPS_PER_USER,
+    StepGate,
+    independent_mcp_prefix,
+    run_step_graph,
+)
+from orchestrator_agent.speculation import (
+    PendingSpeculation,
+    SpeculationStats,
+    divergence_fields,
+    response_token_usage,
+    speculative_planning_enabled,
+    translation_divergence,
+)
+from shared.json_stream import JSONObjectStream, StreamedJSONCall, repair_json_object
+from shared.latency_logger import LATENCY_LOGGER
 from shared.logger import StructuredLogger
-from shared.token_cost_tracker import TOKEN_TRACKER
+from shared.token_cost_tracker import TOKEN_TRACKER, UsageScope, token_usage_scope
 from shared import agent_signal
 from shared.streaming import emit_event
 from shared.hierarchical_logger import (
@@ -44,6 +69,31 @@ from shared.db.workflow_runs import get_agent_states
 
 logger = logging.getLogger(__name__)
 
+_EMPTY_CAPABILITIES: Dict[str, Any] = {
+    "mcp": {"providers": []},
+    "computer": {
+        "platform": "unknown",
+        "available_apps": [],
+        "active_windows": [],
+    },
+}
+
+_DECISION_TYPES = ("next_step", "parallel_steps", "task_complete", "task_impossible")
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _invalid_planner_decision(parser: JSONObjectStream) -> Optional[str]:
+    """Why a partially streamed planner decision cannot be valid (None while it still can)."""
+    fields = parser.fields
+    if "type" in fields and fields["type"] not in _DECISION_TYPES:
+        return f"Invalid response type: {fields['type']}"
+    if fields.get("target") not in (None, "mcp", "computer_use"):
+        return f"Invalid step target: {fields['target']}"
+    return None
+
 
 class OrchestratorRuntime:
     """Entry point for coordinating work between agents."""
@@ -53,10 +103,27 @@ class OrchestratorRuntime:
         *,
         max_concurrency: int = 4,
         agent_states_provider: Optional[Callable[[str], Dict[str, Any]]] = None,
+        max_parallel_steps: Optional[int] = None,
+        max_parallel_steps_per_user: Optional[int] = None,
+        speculative_planning: Optional[bool] = None,
+        planner_streaming: Optional[bool] = None,
     ) -> None:
         self.logger = StructuredLogger("orchestrator")
         self.cost_tracker = TOKEN_TRACKER
         self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Independent steps run concurrently up to these bounds (per run / per user across runs).
+        self.max_parallel_steps = max(1, max_parallel_steps or PARALLEL_STEPS_PER_RUN)
+        self.max_parallel_steps_per_user = max(1, max_parallel_steps_per_user or PARALLEL_STEPS_PER_USER)
+        self._user_step_slots: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = weakref.WeakValueDictionary()
+        # Plan the next step from a draft of the last output while it is translated (opt-in).
+        self.speculative_planning = (
+            speculative_planning_enabled() if speculative_planning is None else speculative_planning
+        )
+        self.speculation_fields = divergence_fields()
+        # Stream planner responses and validate them as they arrive (opt-in).
+        self.planner_streaming = (
+            _env_flag("ORCH_PLANNER_STREAMING") if planner_streaming is None else planner_streaming
+        )
         self.hierarchical_logger: Optional[HierarchicalLogger] = None
         self._agent_states_provider = agent_states_provider or get_agent_states
         # Pending handback inference context to inject into computer-use agent
@@ -130,6 +197,15 @@ class OrchestratorRuntime:
             "tool_constraints": request.tool_constraints.to_dict() if request.tool_constraints else None,
         })
 
+        # Reuses prompt segments (capabilities, completed step blocks) across steps.
+        prompt_builder = SystemPromptBuilder(request.user_id)
+        # Admits this run's steps; computer-use steps get the VM to themselves.
+        gate = StepGate(self.max_parallel_steps, self._user_slots(request))
+        # A fresh run starts with the composed plan's independent leading MCP steps, concurrently.
+        prefetch = self._composed_prefetch(request, state)
+        speculation_stats = SpeculationStats()
+        speculation: Optional[PendingSpeculation] = None
+
         # Main planning loop - get next step, execute, repeat
         while state.within_limits(self.cost_tracker.total_cost_usd):
             agent_signal.raise_if_exit_requested()
@@ -140,8 +216,24 @@ class OrchestratorRuntime:
                 len(state.results) > 0 and state.results[-1].status == "failed"
             )
 
+            # Fetch capabilities off the event loop; concurrent runs share one fetch.
+            capabilities = await self._get_capabilities_async(request)
+
             # Ask orchestrator: what's the next step?
-            decision = self._get_next_step(request, state, last_failed)
+            decision: Optional[Dict[str, Any]] = None
+            if prefetch:
+                decision, prefetch = prefetch, None
+            elif speculation is not None:
+                decision = await self._resolve_speculation(speculation, state, speculation_stats)
+                speculation = None
+            if decision is None:
+                decision = self._get_next_step(
+                    request,
+                    state,
+                    last_failed,
+                    prompt_builder=prompt_builder,
+                    capabilities=capabilities,
+                )
 
             # Emit SSE event: planning completed
             emit_event("orchestrator.planning.completed", {
@@ -168,39 +260,34 @@ class OrchestratorRuntime:
                 state.record_intermediate("impossible_reason", decision.get("reasoning"))
                 break
 
-            elif decision["type"] == "next_step":
-                # Create and execute the step
-                step = PlannedStep(
-                    step_id=self._build_step_id(f"step-{len(state.results)}"),
-                    next_task=decision["task"],
-                    max_steps=request.max_steps,
-                    verification="Step completed",
-                    target=decision["target"],
-                    description=decision["task"][:100],
-                )
-                state.plan.append(step)  # Add to history
+            elif decision["type"] in ("next_step", "parallel_steps"):
+                # Create and execute the step(s)
+                steps = self._planned_steps(decision, state, request)
+                if not steps:
+                    logger.error(f"Planner returned no executable steps: {decision}")
+                    break
+                for step in steps:
+                    state.plan.append(step)  # Add to history
+
+                    self.logger.info(
+                        f"Next step: {step.target} - {step.next_task[:80]}"
+                    )
 
-                self.logger.info(
-                    f"Next step: {decision['target']} - {decision['task'][:80]}"
-                )
+                    # Emit SSE event: step dispatching
+                    emit_event("orchestrator.step.dispatching", {
+                        "step_id": step.step_id,
+                        "target": step.target,
+                        "task": step.next_task[:100],
+                    })
 
-                # Emit SSE event: step dispatching
-                emit_event("orchestrator.step.dispatching", {
-                    "step_id": step.step_id,
-                    "target": step.target,
-                    "task": step.next_task[:100],
-                })
+                on_draft = None
+                if self.speculative_planning and len(steps) == 1:
+                    def on_draft(step: PlannedStep, draft: Dict[str, Any], capabilities=capabilities) -> None:
+                        nonlocal speculation
+                        speculation = self._start_speculation(step, draft, state, capabilities, speculation_stats)
 
                 try:
-                    result = await self._dispatch_step(step, state)
-                    state.record_result(result)
-
-                    # Emit SSE event: step completed
-                    emit_event("orchestrator.step.completed", {
-                        "step_id": step.step_id,
-                        "status": result.status,
-                        "success": result.success,
-                    })
+                    await self._run_steps(steps, state, gate, on_draft=on_draft)
                 except HandbackRequested as hb:
                     # Handback to human requested - stop the orchestrator loop
                     logger.info(
@@ -236,6 +323,10 @@ class OrchestratorRuntime:
                 )
                 break
 
+        if speculation is not None:
+            speculation_stats.discarded += 1
+            speculation.waste(speculation_stats)
+
         # Emit SSE event: task completed
         emit_event("orchestrator.task.completed", {
             "total_steps": len(state.results),
@@ -243,16 +334,182 @@ class OrchestratorRuntime:
         })
 
         # Log to hierarchical logger
-        orch_logger.log_event("task.completed", {
+        completed = {
             "total_steps": len(state.results),
             "successful_steps": sum(1 for r in state.results if r.success),
             "failed_steps": sum(1 for r in state.results if not r.success),
-        })
+            "capability_cache": capability_cache_stats(),
+        }
+        if self.speculative_planning:
+            completed["speculation"] = speculation_stats.to_dict()
+        orch_logger.log_event("task.completed", completed)
 
         if run_token:
             RUN_LOG_ID.reset(run_token)
         return state
 
+    def _planned_steps(
+        self, decision: Dict[str, Any], state: RunState, request: OrchestratorRequest
+    ) -> List[PlannedStep]:
+        """Steps for a `next_step` or `parallel_steps` decision, capped at the remaining step budget."""
+        entries = decision.get("steps") if decision["type"] == "parallel_steps" else [decision]
+        entries = [entry for entry in entries or [] if isinstance(entry, dict) and entry.get("task")]
+        remaining = max(1, request.budget.max_steps - len(state.results))
+        step_ids: Dict[str, str] = {}
+        steps: List[PlannedStep] = []
+        for offset, entry in enumerate(entries[:remaining]):
+            step = PlannedStep(
+                step_id=self._build_step_id(f"step-{len(state.results) + offset}"),
+                next_task=entry["task"],
+                max_steps=request.max_steps,
+                verification="Step completed",
+                target=entry.get("target") or "mcp",
+                description=entry["task"][:100],
+                depends_on=[step_ids[str(d)] for d in entry.get("depends_on") or [] if str(d) in step_ids],
+            )
+            if entry.get("id") is not None:
+                step_ids[str(entry["id"])] = step.step_id
+            steps.append(step)
+        return steps
+
+    async def _run_steps(
+        self,
+        steps: List[PlannedStep],
+        state: RunState,
+        gate: StepGate,
+        on_draft: Optional[Callable[[PlannedStep, Dict[str, Any]], None]] = None,
+    ) -> None:
+        """Dispatch `steps` (independent ones concurrently) and record their results in step order."""
+        outcomes = await run_step_graph(
+            steps, lambda step: self._dispatch_step(step, state, on_draft=on_draft), gate=gate
+        )
+        error: Optional[BaseException] = None
+        for step, outcome in zip(steps, outcomes):
+            if isinstance(outcome, StepResult):
+                state.record_result(outcome)
+
+                # Emit SSE event: step completed
+                emit_event("orchestrator.step.completed", {
+                    "step_id": outcome.step_id,
+                    "status": outcome.status,
+                    "success": outcome.success,
+                })
+            elif outcome is None:
+                state.plan.remove(step)
+                self.logger.info(f"Skipped step_id={step.step_id}: a step it depends on did not succeed")
+            elif error is None:
+                error = outcome
+        if error is not None:
+            raise error
+
+    def _start_speculation(
+        self,
+        step: PlannedStep,
+        draft: Dict[str, Any],
+        state: RunState,
+        capabilities: Dict[str, Any],
+        stats: SpeculationStats,
+    ) -> PendingSpeculation:
+        """Start planning the step after `step` from `draft` while its real translation runs."""
+        success = bool(draft.get("overall_success"))
+        provisional = StepResult(
+            step_id=step.step_id,
+            target=step.target,
+            next_task=step.next_task,
+            max_steps=step.max_steps,
+            verification=step.verification,
+            status="completed" if success else "failed",
+            success=success,
+            depends_on=list(step.depends_on),
+            output={"target": step.target, "translated": draft},
+            error=draft.get("error"),
+        )
+        view = RunState(
+            request=state.request,
+            plan=list(state.plan),
+            results=[*state.results, provisional],
+            intermediate=dict(state.intermediate),
+            cost_baseline=state.cost_baseline,
+        )
+        pending = PendingSpeculation(step.step_id, draft)
+        plan = functools.partial(
+            self._get_next_step,
+            state.request,
+            view,
+            not success,
+            # Own builder: the run's builder may be in use if this speculation is rejected.
+            prompt_builder=SystemPromptBuilder(state.request.user_id),
+            capabilities=capabilities,
+            usage_out=pending.usage,
+        )
+        pending.future = asyncio.get_running_loop().run_in_executor(
+            None, contextvars.copy_context().run, pending.timed(plan)
+        )
+        stats.attempts += 1
+        return pending
+
+    async def _resolve_speculation(
+        self, pending: PendingSpeculation, state: RunState, stats: SpeculationStats
+    ) -> Optional[Dict[str, Any]]:
+        """The speculative decision if the translated output agrees with its draft, else None (re-plan)."""
+        last = state.results[-1] if state.results else None
+        translated = (last.output or {}).get("translated") if last and last.step_id == pending.step_id else None
+        if isinstance(translated, dict):
+            diverged = translation_divergence(pending.draft, translated, self.speculation_fields)
+        else:
+            diverged = ["translated"]
+        if diverged:
+            stats.record_miss(diverged)
+            pending.waste(stats)
+            LATENCY_LOGGER.log_event(
+                "orchestrator", "speculation", 0.0, extra={"step_id": pending.step_id, "hit": False, "diverged": diverged}
+            )
+            return None
+
+        resolved_at = time.perf_counter()
+        try:
+            decision = await pending.future
+        except Exception as exc:
+            logger.warning("Speculative planning failed (%s); re-planning", exc)
+            stats.record_miss(["planner_error"])
+            return None
+        finished = pending.finished or time.perf_counter()
+        waited_ms = max(0.0, (finished - resolved_at) * 1000)
+        saved_ms = (finished - pending.started) * 1000 - waited_ms
+        stats.record_hit(saved_ms)
+        LATENCY_LOGGER.log_event(
+            "orchestrator",
+            "speculation",
+            waited_ms,
+            extra={"step_id": pending.step_id, "hit": True, "saved_ms": round(saved_ms, 1)},
+        )
+        return decision
+
+    def _composed_prefetch(self, request: OrchestratorRequest, state: RunState) -> Optional[Dict[str, Any]]:
+        """`parallel_steps` decision for a composed plan's independent leading MCP steps (fresh runs only)."""
+        if state.results or self.max_parallel_steps < 2:
+            return None
+        prefix = independent_mcp_prefix(getattr(request, "composed_plan", None))
+        if len(prefix) < 2:
+            return None
+        return {
+            "type": "parallel_steps",
+            "steps": [
+                {"id": step["id"], "target": "mcp", "task": step.get("prompt") or step.get("description")}
+                for step in prefix
+            ],
+            "reasoning": "Independent leading steps of the composed plan",
+        }
+
+    def _user_slots(self, request: OrchestratorRequest) -> asyncio.Semaphore:
+        user_id = request.user_id or (request.tenant.user_id if request.tenant else None)
+        key = str(user_id or "anonymous")
+        slots = self._user_step_slots.get(key)
+        if slots is None:
+            slots = asyncio.Semaphore(self.max_parallel_steps_per_user)
+            self._user_step_slots[key] = slots
+        return slots
+
     async def run_many(self, requests: Iterable[OrchestratorRequest]) -> List[RunState]:
         """Run many requests concurrently while honoring the semaphore."""
         tasks = [asyncio.create_task(self._guarded_run(request)) for request in requests]
@@ -447,29 +704,31 @@ class OrchestratorRuntime:
         self._rehydrated_state = rehydrated
         return rehydrated
     def _get_next_step(
-        self, request: OrchestratorRequest, state: RunState, last_failed: bool
+        self,
+        request: OrchestratorRequest,
+        state: RunState,
+        last_failed: bool,
+        prompt_builder: Optional[SystemPromptBuilder] = None,
+        capabilities: Optional[Dict[str, Any]] = None,
+        usage_out: Optional[Dict[str, int]] = None,
     ) -> Dict[str, Any]:
         """
         Ask the orchestrator LLM what the next step should be.
 
+        `usage_out`, when given, accumulates the planner call's input/output tokens.
+
         Returns a decision dict with:
         - {"type": "next_step", "target": "mcp"|"computer_use", "task": "...", "reasoning": "..."}
         - {"type": "task_complete", "reasoning": "..."}
         - {"type": "task_impossible", "reasoning": "..."}
         """
         # Fetch capabilities
-        try:
-            capabilities = self._get_cached_capabilities(request)
-        except Exception as e:
-            logger.warning(f"Failed to fetch capabilities: {e}")
-            capabilities = {
-                "mcp": {"providers": []},
-                "computer": {
-                    "platform": "unknown",
-                    "available_apps": [],
-                    "active_windows": [],
-                },
-            }
+        if capabilities is None:
+            try:
+                capabilities = self._get_cached_capabilities(request)
+            except Exception as e:
+                logger.warning(f"Failed to fetch capabilities: {e}")
+                capabilities = _EMPTY_CAPABILITIES
 
         # Build failure info if last step failed
         failed_step_info = None
@@ -482,18 +741,22 @@ class OrchestratorRuntime:
             }
 
         # Build dynamic system prompt
-        system_prompt = build_system_prompt(
-            request,
-            capabilities,
-            state=state,
-            last_step_failed=last_failed,
-            failed_step_info=failed_step_info,
-            continuation_context=self._orchestrator_continuation_context,
-        )
+        builder = prompt_builder or SystemPromptBuilder(request.user_id)
+        prompt_stats: Dict[str, Any] = {"step": len(state.results)}
+        with LATENCY_LOGGER.measure("orchestrator", "system_prompt", extra=prompt_stats):
+            system_prompt = builder.build(
+                request,
+                capabilities,
+                state=state,
+                last_step_failed=last_failed,
+                failed_step_info=failed_step_info,
+                continuation_context=self._orchestrator_continuation_context,
+            )
+            prompt_stats.update(builder.last_stats)
 
         # Call LLM
         try:
-            return self._call_planner_llm(system_prompt, request)
+            return self._call_planner_llm(system_prompt, request, usage_out=usage_out)
         except Exception as e:
             # Fallback: if planning fails completely, mark as impossible
             logger.error(f"Orchestrator LLM failed: {e}")
@@ -502,12 +765,19 @@ class OrchestratorRuntime:
                 "reasoning": f"Orchestrator planning failed: {str(e)}",
             }
 
-    async def _dispatch_step(self, step: PlannedStep, state: RunState) -> StepResult:
+    async def _dispatch_step(
+        self,
+        step: PlannedStep,
+        state: RunState,
+        on_draft: Optional[Callable[[PlannedStep, Dict[str, Any]], None]] = None,
+    ) -> StepResult:
         """
         Dispatch a step to the requested agent.
 
         This now calls the downstream agent bridge, runs the translator, and
-        records structured outputs plus usage deltas.
+        records structured outputs plus usage deltas. `on_draft` receives an
+        LLM-free draft of the output before translation starts (speculative
+        planning).
         """
         agent_signal.raise_if_exit_requested()
         agent_signal.wait_for_resume()
@@ -521,61 +791,79 @@ class OrchestratorRuntime:
         state.record_intermediate("last_target", step.target)
         state.record_intermediate("last_step_id", step.step_id)
 
-        cost_snapshot = self._snapshot_costs()
-        try:
-            trajectory = await self._call_agent(step, state.request, state)
-            logger.info(
-                "runtime.translate.start target=%s step=%s trajectory_len=%s",
-                step.target,
-                step.step_id,
-                len(trajectory),
-            )
-            translated = translate_step_output(
-                task=step.next_task,
-                target=step.target,
-                trajectory=trajectory,
-                debug_step_id=step.step_id,
-            )
-            overall_success = bool(
-                translated.get("overall_success", translated.get("success", True))
-            )
-            logger.info(
-                "runtime.translate.done target=%s step=%s success=%s artifacts_keys=%s",
-                step.target,
-                step.step_id,
-                overall_success,
-                list((translated.get("artifacts") or {}).keys()),
-            )
-            usage = self._compute_usage(cost_snapshot)
-            payload = {
-                "target": step.target,
-                "run": {
-                    "tenant_id": state.request.tenant.tenant_id if state.request.tenant else None,
-                    "request_id": state.request.request_id,
-                    "user_id": state.request.user_id
-                    or (state.request.tenant.user_id if state.request.tenant else None),
-                },
-                "translated": translated,
-                "raw_ref": translated.get("raw_ref") or f"{step.step_id}:raw",
-                "usage": usage,
-            }
-            status: StepStatus = "completed" if overall_success else "failed"
-            success = overall_success
-            error: Optional[str] = translated.get("error")
-        except HandbackRequested:
-            # Re-raise HandbackRequested to propagate to the main loop
-            # This must come before the generic Exception handler
-            raise
-        except Exception as exc:
-            payload = {
-                "target": step.target,
-                "error": str(exc),
-                "usage": self._compute_usage(cost_snapshot),
-                "raw_ref": f"{step.step_id}:raw",
-            }
-            status = "failed"
-            success = False
-            error = str(exc)
+        # Scoped to this step's task: concurrent steps do not see each other's tokens.
+        with token_usage_scope() as step_usage:
+            try:
+                structured: Dict[str, Any] = {}
+                trajectory = await self._call_agent(step, state.request, state, structured_out=structured)
+                logger.info(
+                    "runtime.translate.start target=%s step=%s trajectory_len=%s",
+                    step.target,
+                    step.step_id,
+                    len(trajectory),
+                )
+                if on_draft is not None:
+                    on_draft(
+                        step,
+                        draft_step_output(
+                            task=step.next_task,
+                            target=step.target,
+                            trajectory=trajectory,
+                            structured_result=structured.get("mcp_result"),
+                        ),
+                    )
+                # Off the event loop, so concurrently running steps translate in parallel.
+                translate = functools.partial(
+                    translate_step_output,
+                    task=step.next_task,
+                    target=step.target,
+                    trajectory=trajectory,
+                    debug_step_id=step.step_id,
+                    structured_result=structured.get("mcp_result"),
+                )
+                translated = await asyncio.get_running_loop().run_in_executor(
+                    None, contextvars.copy_context().run, translate
+                )
+                overall_success = bool(
+                    translated.get("overall_success", translated.get("success", True))
+                )
+                logger.info(
+                    "runtime.translate.done target=%s step=%s success=%s artifacts_keys=%s",
+                    step.target,
+                    step.step_id,
+                    overall_success,
+                    list((translated.get("artifacts") or {}).keys()),
+                )
+                usage = self._compute_usage(step_usage)
+                payload = {
+                    "target": step.target,
+                    "run": {
+                        "tenant_id": state.request.tenant.tenant_id if state.request.tenant else None,
+                        "request_id": state.request.request_id,
+                        "user_id": state.request.user_id
+                        or (state.request.tenant.user_id if state.request.tenant else None),
+                    },
+                    "translated": translated,
+                    "raw_ref": translated.get("raw_ref") or f"{step.step_id}:raw",
+                    "usage": usage,
+                }
+                status: StepStatus = "completed" if overall_success else "failed"
+                success = overall_success
+                error: Optional[str] = translated.get("error")
+            except HandbackRequested:
+                # Re-raise HandbackRequested to propagate to the main loop
+                # This must come before the generic Exception handler
+                raise
+            except Exception as exc:
+                payload = {
+                    "target": step.target,
+                    "error": str(exc),
+                    "usage": self._compute_usage(step_usage),
+                    "raw_ref": f"{step.step_id}:raw",
+                }
+                status = "failed"
+                success = False
+                error = str(exc)
 
         finished_at = datetime.utcnow()
         return StepResult(
@@ -586,6 +874,7 @@ class OrchestratorRuntime:
             verification=step.verification,
             status=status,
             success=success,
+            depends_on=list(step.depends_on),
             output=payload,
             error=error,
             started_at=started_at,
@@ -593,7 +882,10 @@ class OrchestratorRuntime:
         )
 
     def _call_planner_llm(
-        self, system_prompt: str, request: OrchestratorRequest
+        self,
+        system_prompt: str,
+        request: OrchestratorRequest,
+        usage_out: Optional[Dict[str, int]] = None,
     ) -> Dict:
         """
         Call LLM to decide the next step using the shared LLM client.
@@ -643,19 +935,34 @@ class OrchestratorRuntime:
                         {"role": "system", "content": retry_note},
                         {"role": "user", "content": user_message},
                     ]
-                response = client.create_response(
+                planner_kwargs = dict(
                     model="o4-mini",
                     messages=attempt_messages,
                     text={"format": {"type": "json_object"}},
                     reasoning_effort="high",
                 )
+                if self.planner_streaming:
+                    response = self._stream_planner_response(client, planner_kwargs)
+                else:
+                    response = client.create_response(**planner_kwargs)
+                if usage_out is not None:
+                    for kind, tokens in response_token_usage(response).items():
+                        usage_out[kind] = usage_out.get(kind, 0) + tokens
 
                 # Extract assistant text from Responses API output
                 text = extract_assistant_text(response)
-                result = json.loads(text)
+                try:
+                    result = json.loads(text)
+                except json.JSONDecodeError:
+                    # Cheap fixes (surrounding text, trailing commas, truncated reasoning) beat another LLM call.
+                    repaired = repair_json_object(text, truncatable=("reasoning",))
+                    if repaired is None:
+                        raise
+                    logger.info("Repaired orchestrator planner JSON: %s", ", ".join(repaired.fixes))
+                    result = repaired.value
 
                 # Validate response type
-                if result.get("type") not in ["next_step", "task_complete", "task_impossible"]:
+                if result.get("type") not in _DECISION_TYPES:
                     logger.info(f"Retryying Orchestrator LLM with invalid response type: {result.get('type')}")
                     raise ValueError(f"Invalid response type: {result.get('type')}")
 
@@ -681,6 +988,23 @@ class OrchestratorRuntime:
                     logger.critical(f"Orchestrator LLM retry failed: {e}")
                     raise
 
+    def _stream_planner_response(self, client: Any, planner_kwargs: Dict[str, Any]) -> Any:
+        """Stream a planner call, giving up as soon as the partial decision is invalid."""
+        call = StreamedJSONCall(
+            lambda handler: client.stream_response(event_handler=handler, **planner_kwargs),
+            abort_if=_invalid_planner_decision,
+        )
+        response = call.finish()
+        LATENCY_LOGGER.log_event(
+            "orchestrator",
+            "planner_stream",
+            call.total_ms or 0.0,
+            extra={"first_token_ms": call.first_token_ms, "aborted": call.abort_reason},
+        )
+        if call.abort_reason:
+            raise ValueError(call.abort_reason)
+        return response
+
     def _get_cached_capabilities(
         self, request: OrchestratorRequest
     ) -> Dict[str, Any]:
@@ -697,43 +1021,31 @@ class OrchestratorRuntime:
             return build_capability_context(request, force_refresh=False)
         except Exception as e:
             logger.warning(f"Failed to get cached capabilities: {e}")
-            return {
-                "mcp": {"providers": []},
-                "computer": {
-                    "platform": "unknown",
-                    "available_apps": [],
-                    "active_windows": [],
-                },
-            }
+            return _EMPTY_CAPABILITIES
+
+    async def _get_capabilities_async(
+        self, request: OrchestratorRequest
+    ) -> Dict[str, Any]:
+        """Async `_get_cached_capabilities`."""
+        try:
+            return await build_capability_context_async(request, force_refresh=False)
+        except Exception as e:
+            logger.warning(f"Failed to get cached capabilities: {e}")
+            return _EMPTY_CAPABILITIES
 
     def _build_step_id(self, label: str) -> str:
         return generate_step_id(label)
 
-    def _snapshot_costs(self) -> Tuple[int, int, int, float]:
-        tracker = self.cost_tracker
-        return (
-            getattr(tracker, "total_input_cached", 0),
-            getattr(tracker, "total_input_new", 0),
-            getattr(tracker, "total_output", 0),
-            getattr(tracker, "total_cost_usd", 0.0),
-        )
-
-    def _compute_usage(self, baseline: Tuple[int, int, int, float]) -> Dict[str, Any]:
-        tracker = self.cost_tracker
-        cached_b, new_b, out_b, cost_b = baseline
-        cached = getattr(tracker, "total_input_cached", 0) - cached_b
-        new = getattr(tracker, "total_input_new", 0) - new_b
-        out = getattr(tracker, "total_output", 0) - out_b
-        cost_delta = getattr(tracker, "total_cost_usd", 0.0) - cost_b
+    def _compute_usage(self, scope: UsageScope) -> Dict[str, Any]:
         return {
             "tokens": {
-                "input_cached": max(int(cached), 0),
-                "input_new": max(int(new), 0),
-                "output": max(int(out), 0),
+                "input_cached": scope.input_cached,
+                "input_new": scope.input_new,
+                "output": scope.output,
             },
             "cost_usd": {
-                "delta": float(cost_delta),
-                "run_total": float(getattr(tracker, "total_cost_usd", 0.0)),
+                "delta": float(scope.cost_usd),
+                "run_total": float(getattr(self.cost_tracker, "total_cost_usd", 0.0)),
             },
         }
 
@@ -771,12 +1083,17 @@ class OrchestratorRuntime:
             logger.warning("Failed to load continuation context for run_id=%s: %s", run_id, e)
 
     async def _call_agent(
-        self, step: PlannedStep, request: OrchestratorRequest, state: "RunState"
+        self,
+        step: PlannedStep,
+        request: OrchestratorRequest,
+        state: "RunState",
+        structured_out: Optional[Dict[str, Any]] = None,
     ) -> str:
         """Call agent bridge and return self-contained trajectory.
 
         IMPORTANT: Returns ONLY trajectory string, not raw_result.
-        The trajectory contains all necessary data.
+        The trajectory contains all necessary data. MCP steps also fill
+        `structured_out` for the structured translator.
         """
         loop = asyncio.get_running_loop()
         ctx = contextvars.copy_context()
@@ -801,14 +1118,18 @@ class OrchestratorRuntime:
             request.metadata = updated_metadata
             try:
                 return await loop.run_in_executor(
-                    None, lambda: ctx.run(run_agent_bridge, step.target, request, step, orchestrator_state)
+                    None, lambda: ctx.run(
+                        run_agent_bridge, step.target, request, step, orchestrator_state, structured_out
+                    )
                 )
             finally:
                 # Restore original metadata
                 request.metadata = original_metadata
         
         return await loop.run_in_executor(
-            None, lambda: ctx.run(run_agent_bridge, step.target, request, step, orchestrator_state)
+            None, lambda: ctx.run(
+                run_agent_bridge, step.target, request, step, orchestrator_state, structured_out
+            )
         )
 
 
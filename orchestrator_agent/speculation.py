@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+"""
+Speculative next-step planning.
+
+Translating a step's output is an LLM call, and so is planning the next
+step; normally they run back to back. With speculation on, the runtime
+starts planning the next step from a *draft* translation of the untranslated
+result as soon as the agent returns, while the real translation runs. Once
+the translation lands, `translation_divergence` decides whether the draft was
+close enough for the speculative decision to stand; if not, the runtime
+re-plans from the translated output and the speculative call is wasted.
+
+The draft (`translator.draft_step_output`) is the structured MCP translation
+when the bridge provided one, otherwise the deterministic markdown parse,
+plus the untranslated trajectory itself (bounded) so the planner sees the
+raw result.
+
+Divergence is checked field by field (`ORCH_SPECULATION_FIELDS`):
+`data` must be covered by the draft (every scalar the translator kept
+appears verbatim in the draft), any other field must be equal.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+DEFAULT_FIELDS = ("overall_success", "last_step_failed", "data")
+
+
+def speculative_planning_enabled() -> bool:
+    return os.getenv("ORCH_SPECULATIVE_PLANNING", "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def divergence_fields() -> Sequence[str]:
+    raw = os.getenv("ORCH_SPECULATION_FIELDS")
+    if not raw:
+        return DEFAULT_FIELDS
+    return tuple(name.strip() for name in raw.split(",") if name.strip())
+
+
+def _scalars(value: Any) -> Iterable[str]:
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _scalars(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _scalars(item)
+    elif isinstance(value, str):
+        if value.strip():
+            # Escaped like the JSON-encoded draft it is looked up in.
+            yield json.dumps(value, ensure_ascii=False)[1:-1]
+    elif value is not None and not isinstance(value, bool):
+        yield json.dumps(value, default=str)
+
+
+def translation_divergence(
+    draft: Dict[str, Any],
+    translated: Dict[str, Any],
+    fields: Sequence[str] = DEFAULT_FIELDS,
+) -> List[str]:
+    """Fields on which `translated` materially differs from `draft` (empty: the speculation stands)."""
+    diverged: List[str] = []
+    haystack: Optional[str] = None
+    for name in fields:
+        if name == "data":
+            if haystack is None:
+                haystack = json.dumps(draft, ensure_ascii=False, default=str)
+            if any(value not in haystack for value in _scalars(translated.get("data"))):
+                diverged.append(name)
+        else:
+            ours, theirs = draft.get(name), translated.get(name)
+            if isinstance(ours, bool) or isinstance(theirs, bool):
+                ours, theirs = bool(ours), bool(theirs)
+            if ours != theirs:
+                diverged.append(name)
+    return diverged
+
+
+def response_token_usage(response: Any) -> Dict[str, int]:
+    """Input/output tokens reported on an LLM response (zeros when absent)."""
+    usage = getattr(response, "usage", None)
+    if isinstance(usage, dict):
+        get = usage.get
+    else:
+        get = lambda name, default=0: getattr(usage, name, default)  # noqa: E731
+    return {
+        "input": int(get("input_tokens", 0) or get("prompt_tokens", 0) or 0),
+        "output": int(get("output_tokens", 0) or get("completion_tokens", 0) or 0),
+    }
+
+
+@dataclass
+class SpeculationStats:
+    """Per-run speculation telemetry."""
+
+    attempts: int = 0
+    hits: int = 0
+    misses: int = 0
+    discarded: int = 0
+    saved_ms: float = 0.0
+    wasted_input_tokens: int = 0
+    wasted_output_tokens: int = 0
+    miss_fields: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_hit(self, saved_ms: float) -> None:
+        with self._lock:
+            self.hits += 1
+            self.saved_ms += max(saved_ms, 0.0)
+
+    def record_miss(self, fields: Sequence[str]) -> None:
+        with self._lock:
+            self.misses += 1
+            for name in fields:
+                self.miss_fields[name] = self.miss_fields.get(name, 0) + 1
+
+    def record_waste(self, usage: Dict[str, int]) -> None:
+        with self._lock:
+            self.wasted_input_tokens += usage.get("input", 0)
+            self.wasted_output_tokens += usage.get("output", 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            resolved = self.hits + self.misses
+            return {
+                "attempts": self.attempts,
+                "hits": self.hits,
+                "misses": self.misses,
+                "discarded": self.discarded,
+                "hit_rate": round(self.hits / resolved, 4) if resolved else 0.0,
+                "saved_ms": round(self.saved_ms, 1),
+                "wasted_tokens": {"input": self.wasted_input_tokens, "output": self.wasted_output_tokens},
+                "miss_fields": dict(self.miss_fields),
+            }
+
+
+class PendingSpeculation:
+    """A speculative planner call for the step after `step_id`, planned from `draft`."""
+
+    def __init__(self, step_id: str, draft: Dict[str, Any]) -> None:
+        self.step_id = step_id
+        self.draft = draft
+        self.usage: Dict[str, int] = {}
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.future: Optional["asyncio.Future[Dict[str, Any]]"] = None
+        self._wasted_into: Optional[SpeculationStats] = None
+        self._lock = threading.Lock()
+
+    def timed(self, plan: Callable[[], Dict[str, Any]]) -> Callable[[], Dict[str, Any]]:
+        """Wrap the planner call (run in a worker thread) to stamp `finished` and settle waste."""
+
+        def run() -> Dict[str, Any]:
+            try:
+                return plan()
+            finally:
+                with self._lock:
+                    self.finished = time.perf_counter()
+                    stats = self._wasted_into
+                if stats is not None:
+                    stats.record_waste(self.usage)
+
+        return run
+
+    def waste(self, stats: SpeculationStats) -> None:
+        """Count the planner tokens as wasted, now or as soon as the call finishes."""
+        with self._lock:
+            self._wasted_into = stats
+            finished = self.finished is not None
+        if finished:
+            stats.record_waste(self.usage)
+
+
+__all__ = [
+    "DEFAULT_FIELDS",
+    "PendingSpeculation",
+    "SpeculationStats",
+    "divergence_fields",
+    "response_token_usage",
+    "speculative_planning_enabled",
+    "translation_divergence",
+]
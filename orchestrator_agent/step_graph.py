@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+"""
+Dependency-aware execution of independent orchestrator steps.
+
+The runtime normally runs one step at a time: plan, dispatch, translate,
+plan again. When a batch of steps is known up front — the leading
+independent MCP steps of a composed plan, or a `parallel_steps` planner
+decision — `run_step_graph` dispatches them concurrently:
+
+- a step starts once every step it `depends_on` (earlier in the batch) has
+  finished successfully; dependents of a failed step are skipped;
+- `StepGate` bounds concurrent steps per run, and an optional shared
+  semaphore bounds them per user across runs;
+- a computer-use step has the VM to itself: it waits for running steps to
+  drain and nothing else in the run starts until it finishes;
+- outcomes come back in batch order, whatever order the steps finished in,
+  so results merge into the trajectory deterministically.
+
+`infer_dependencies` fills in `depends_on` for composed plan steps that do
+not declare it.
+"""
+
+import asyncio
+import os
+import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+from orchestrator_agent.data_types import AgentTarget, PlannedStep, StepResult
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+PARALLEL_STEPS_PER_RUN = max(1, _env_int("ORCH_PARALLEL_STEPS_PER_RUN", 3))
+PARALLEL_STEPS_PER_USER = max(1, _env_int("ORCH_PARALLEL_STEPS_PER_USER", 4))
+
+# Composer prompts refer to earlier results in plain English
+# ("Using the emails retrieved in the previous step ...").
+_REFERENCES_EARLIER = re.compile(
+    r"\b(previous|prior|earlier|preceding|above)\b"
+    r"|\bstep[- ]?\d+\b"
+    r"|\b(retrieved|fetched|collected|gathered|found|created|generated)\s+(in|by|from|during|earlier|above)\b",
+    re.IGNORECASE,
+)
+
+StepOutcome = Union[StepResult, BaseException, None]
+
+
+def infer_dependencies(steps: Sequence[Mapping[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Map each composed step id to the ids of earlier steps it depends on.
+
+    Explicit `depends_on` entries naming earlier steps are kept. Otherwise a
+    computer-use step, or a step whose prompt refers to earlier results,
+    depends on every earlier step; anything else is independent.
+    """
+    seen: List[str] = []
+    deps: Dict[str, List[str]] = {}
+    for step in steps:
+        sid = str(step.get("id") or "")
+        explicit = step.get("depends_on")
+        if isinstance(explicit, list):
+            deps[sid] = [str(d) for d in explicit if str(d) in seen]
+        elif step.get("type") == "cua" or _REFERENCES_EARLIER.search(
+            f"{step.get('prompt') or ''} {step.get('description') or ''}"
+        ):
+            deps[sid] = list(seen)
+        else:
+            deps[sid] = []
+        seen.append(sid)
+    return deps
+
+
+def independent_mcp_prefix(composed_plan: Optional[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """Leading composed MCP steps that depend on nothing (the first wave of the plan)."""
+    steps = [s for s in (composed_plan or {}).get("steps") or [] if isinstance(s, dict) and s.get("id")]
+    deps = infer_dependencies(steps)
+    prefix: List[Dict[str, Any]] = []
+    for step in steps:
+        if step.get("type") != "mcp" or deps.get(str(step["id"])):
+            break
+        prefix.append(step)
+    return prefix
+
+
+class StepGate:
+    """Admission for one run's concurrent steps; computer-use steps run alone."""
+
+    def __init__(self, max_parallel: int = PARALLEL_STEPS_PER_RUN, user_slots: Optional[asyncio.Semaphore] = None) -> None:
+        self.max_parallel = max(1, max_parallel)
+        self._user_slots = user_slots
+        self._changed = asyncio.Condition()
+        self._running = 0
+        self._exclusive = False
+        self._exclusive_waiting = 0
+
+    @asynccontextmanager
+    async def hold(self, target: AgentTarget) -> AsyncIterator[None]:
+        exclusive = target == "computer_use"
+        async with self._changed:
+            if exclusive:
+                self._exclusive_waiting += 1
+                try:
+                    await self._changed.wait_for(lambda: self._running == 0)
+                finally:
+                    self._exclusive_waiting -= 1
+                self._exclusive = True
+            else:
+                await self._changed.wait_for(
+                    lambda: not self._exclusive
+                    and not self._exclusive_waiting
+                    and self._running < self.max_parallel
+                )
+            self._running += 1
+        try:
+            if self._user_slots is None:
+                yield
+            else:
+                async with self._user_slots:
+                    yield
+        finally:
+            async with self._changed:
+                self._running -= 1
+                if exclusive:
+                    self._exclusive = False
+                self._changed.notify_all()
+
+
+async def run_step_graph(
+    steps: Sequence[PlannedStep],
+    dispatch: Callable[[PlannedStep], Awaitable[StepResult]],
+    *,
+    gate: Optional[StepGate] = None,
+) -> List[StepOutcome]:
+    """
+    Dispatch `steps` concurrently, honouring `depends_on` and the gate.
+
+    `depends_on` may only name earlier steps of the batch; other ids are
+    treated as already satisfied. Returns one outcome per step, in batch
+    order: its `StepResult`, `None` if skipped because a dependency did not
+    succeed, or the exception its dispatch raised.
+    """
+    gate = gate or StepGate()
+    tasks: Dict[str, "asyncio.Task[StepOutcome]"] = {}
+
+    async def run(step: PlannedStep, deps: List["asyncio.Task[StepOutcome]"]) -> StepOutcome:
+        for dep in deps:
+            outcome = await dep
+            if not isinstance(outcome, StepResult) or not outcome.success:
+                return None
+        async with gate.hold(step.target):
+            try:
+                return await dispatch(step)
+            except Exception as exc:  # handed back to the caller in batch order
+                return exc
+
+    ordered: List["asyncio.Task[StepOutcome]"] = []
+    for step in steps:
+        deps = [tasks[d] for d in step.depends_on if d in tasks]
+        task = asyncio.ensure_future(run(step, deps))
+        tasks[step.step_id] = task
+        ordered.append(task)
+    return list(await asyncio.gather(*ordered))
+
+
+__all__ = [
+    "PARALLEL_STEPS_PER_RUN",
+    "PARALLEL_STEPS_PER_USER",
+    "StepGate",
+    "independent_mcp_prefix",
+    "infer_dependencies",
+    "run_step_graph",
+]
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+"""
+Structured (LLM-free) translation of MCP agent results into the canonical
+step output.
+
+The MCP agent already returns its execution history as structured steps
+(`MCPTaskResult.steps`, i.e. `AgentStep.to_dict()`), so most of the canonical
+shape — success flags, failing step, step counts, tool calls, searches and
+sandbox runs — can be built directly instead of asking an LLM to re-read the
+markdown trajectory. `translate_mcp_result` does that and scores how safe
+the result is; `translate_step_output` escalates to the LLM translator only
+when the confidence falls below `MIN_CONFIDENCE`, e.g. when tool responses are
+too large to pass through without task-aware trimming.
+
+`field_agreement` compares two canonical outputs on the fields the orchestrator
+decides on; the parity suite and `scripts/bench_translation_parity.py` use it
+against recorded LLM translations.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# A single tool/sandbox payload above this many characters (or all of them
+# together above TOTAL_PAYLOAD_CHARS) needs task-aware trimming -> LLM.
+MAX_PAYLOAD_CHARS = 8000
+TOTAL_PAYLOAD_CHARS = 24000
+_PREVIEW_CHARS = 160
+
+# Multiplicative penalties; a translation below MIN_CONFIDENCE escalates to the LLM.
+_PENALTIES: Dict[str, float] = {
+    "no_steps": 0.0,
+    "unknown_step_type": 0.3,
+    "large_payload": 0.4,
+    "no_final_summary": 0.5,
+    "success_mismatch": 0.5,
+    "unfinished": 0.6,
+}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+MIN_CONFIDENCE = _env_float("ORCH_STRUCTURED_TRANSLATION_MIN_CONFIDENCE", 0.75)
+
+
+def structured_translation_enabled() -> bool:
+    return os.getenv("ORCH_STRUCTURED_TRANSLATION", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+@dataclass
+class StructuredTranslation:
+    translated: Dict[str, Any]
+    confidence: float
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def escalate(self) -> bool:
+        return self.confidence < MIN_CONFIDENCE
+
+
+def _compact(value: Any) -> str:
+    try:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def _preview(value: Any, limit: int = _PREVIEW_CHARS) -> str:
+    text = value if isinstance(value, str) else _compact(value)
+    return text if len(text) <= limit else f"{text[: limit - 3]}..."
+
+
+def _sandbox_output(observation: Any) -> Any:
+    # Mirrors AgentState.build_markdown_trajectory.
+    if isinstance(observation, dict):
+        return observation.get("result") or observation.get("data") or observation
+    return observation
+
+
+def _completion(step: Dict[str, Any]) -> Tuple[str, Any]:
+    outcome = step.get("action_outcome") or {}
+    action_input = step.get("action_input") or {}
+    summary = (
+        outcome.get("final_summary")
+        or action_input.get("summary")
+        or action_input.get("reason")
+        or outcome.get("error")
+        or ""
+    )
+    data = outcome.get("data")
+    if data is None:
+        data = action_input.get("data")
+    return str(summary), data
+
+
+def _step_summary(index: int, step: Dict[str, Any]) -> str:
+    kind = step.get("action_type")
+    action_input = step.get("action_input") or {}
+    outcome = step.get("action_outcome") or {}
+    error = outcome.get("error") or step.get("error")
+    failed = not step.get("success")
+
+    if kind == "search":
+        names = [n for n in outcome.get("found_tool_names") or [] if isinstance(n, str)]
+        count = outcome.get("total_found") or len(names)
+        provider = action_input.get("provider") or "all providers"
+        text = f"Step {index}: Searched {provider} for '{action_input.get('search_query', '')}', found {count} tool(s)"
+        if names:
+            text += f": {', '.join(names[:5])}"
+    elif kind == "tool":
+        text = f"Step {index}: Called {action_input.get('tool_id', 'unknown')} with {_preview(action_input.get('args') or {})}"
+        if not failed and step.get("observation") is not None:
+            text += f". Response: {_preview(step.get('observation'))}"
+    elif kind == "inspect_tool_output":
+        text = (
+            f"Step {index}: Inspected {action_input.get('tool_id', 'unknown')} output at "
+            f"{action_input.get('field_path') or '(root)'}"
+        )
+    elif kind == "sandbox":
+        text = f"Step {index}: Ran sandbox code"
+        if not failed and step.get("observation"):
+            text += f". Output: {_preview(_sandbox_output(step.get('observation')))}"
+    elif kind in ("finish", "fail"):
+        summary, _ = _completion(step)
+        label = "Completion" if kind == "finish" and not failed else "Failure"
+        text = f"Step {index}: {label} - {summary}".rstrip(" -.")
+        error = step.get("error")
+    else:
+        text = f"Step {index}: {kind}"
+    if failed and kind not in ("finish", "fail"):
+        text += f". Failed: {error or 'Unknown error'}"
+    elif failed and error and str(error).rstrip(".") not in text:
+        text += f". Error: {error}"
+    return text
+
+
+def translate_mcp_result(task: str, result: Dict[str, Any]) -> StructuredTranslation:
+    """Build the canonical translation of an `MCPTaskResult` and score its confidence."""
+    steps = [s for s in result.get("steps") or [] if isinstance(s, dict)]
+    reasons: List[str] = []
+    if not steps:
+        reasons.append("no_steps")
+
+    tool_calls: List[Dict[str, Any]] = []
+    code_executions: List[Dict[str, Any]] = []
+    search_results: List[Dict[str, Any]] = []
+    steps_summary: List[str] = []
+    payload_chars: List[int] = []
+    first_failed: Optional[int] = None
+    final_summary = ""
+    data: Any = None
+
+    for index, step in enumerate(steps, 1):
+        kind = step.get("action_type")
+        action_input = step.get("action_input") or {}
+        outcome = step.get("action_outcome") or {}
+        success = bool(step.get("success"))
+        if not success and first_failed is None:
+            first_failed = index
+        steps_summary.append(_step_summary(index, step))
+
+        if kind == "search":
+            names = [n for n in outcome.get("found_tool_names") or [] if isinstance(n, str)]
+            search_results.append(
+                {
+                    "query": action_input.get("search_query", ""),
+                    "tools_found": outcome.get("total_found") or len(names),
+                    "tool_names": names,
+                }
+            )
+        elif kind == "tool":
+            response = step.get("observation") if success else {"error": outcome.get("error") or step.get("error")}
+            payload_chars.append(len(_compact(response)))
+            tool_calls.append(
+                {
+                    "tool_id": action_input.get("tool_id", "unknown"),
+                    "arguments": action_input.get("args") or {},
+                    "response": response,
+                    "success": success,
+                }
+            )
+        elif kind == "sandbox":
+            output = _sandbox_output(step.get("observation")) if success else step.get("observation")
+            payload_chars.append(len(_compact(output)))
+            code_executions.append(
+                {"code": action_input.get("sandbox_code", ""), "output": output, "success": success}
+            )
+        elif kind == "inspect_tool_output":
+            payload_chars.append(len(_compact(step.get("observation"))))
+        elif kind in ("finish", "fail"):
+            final_summary, data = _completion(step)
+        else:
+            reasons.append("unknown_step_type")
+
+    overall_success = bool(result.get("success"))
+    last_failed = bool(steps) and not steps[-1].get("success")
+    if steps and steps[-1].get("action_type") not in ("finish", "fail"):
+        reasons.append("unfinished")
+    if steps and not (final_summary or result.get("final_summary")):
+        reasons.append("no_final_summary")
+    if overall_success and last_failed:
+        reasons.append("success_mismatch")
+    if payload_chars and (max(payload_chars) > MAX_PAYLOAD_CHARS or sum(payload_chars) > TOTAL_PAYLOAD_CHARS):
+        reasons.append("large_payload")
+
+    error = None
+    error_code = None
+    if not overall_success:
+        error = result.get("error_message") or result.get("error") or (steps[-1].get("error") if steps else None)
+        error_code = result.get("error_code") or result.get("error") or "execution_failed"
+
+    summary = (final_summary or result.get("final_summary") or "").strip() or f"Executed {len(steps)} step(s)."
+    if not overall_success and error and error not in summary:
+        summary = f"{summary} Failed at step {first_failed or len(steps)}: {error}."
+
+    translated: Dict[str, Any] = {
+        "task": task,
+        "overall_success": overall_success,
+        "summary": summary,
+        "error": error,
+        "error_code": error_code,
+        "last_step_failed": last_failed,
+        "failed_step_index": None if overall_success else (first_failed or len(steps) or None),
+        "total_steps": len(steps),
+        "steps_summary": steps_summary,
+        "artifacts": {
+            "tool_calls": tool_calls,
+            "ui_observations": [],
+            "code_executions": code_executions,
+            "search_results": search_results,
+        },
+    }
+    if data is not None:
+        translated["data"] = data
+
+    confidence = 1.0
+    for reason in dict.fromkeys(reasons):
+        confidence *= _PENALTIES[reason]
+    return StructuredTranslation(translated, round(confidence, 4), list(dict.fromkeys(reasons)))
+
+
+# --------------------------------------------------------------------------- #
+# Parity
+# --------------------------------------------------------------------------- #
+
+
+def _decision_fields(translated: Dict[str, Any]) -> Dict[str, Any]:
+    artifacts = translated.get("artifacts") or {}
+    return {
+        "overall_success": bool(translated.get("overall_success")),
+        "last_step_failed": bool(translated.get("last_step_failed")),
+        "failed_step_index": translated.get("failed_step_index"),
+        "total_steps": translated.get("total_steps"),
+        "has_error": bool(translated.get("error")),
+        "steps_summary_len": len(translated.get("steps_summary") or []),
+        "tool_calls": [
+            (c.get("tool_id"), bool(c.get("success"))) for c in artifacts.get("tool_calls") or []
+        ],
+        "search_results": [
+            (s.get("query"), s.get("tools_found")) for s in artifacts.get("search_results") or []
+        ],
+        "code_executions": [bool(c.get("success")) for c in artifacts.get("code_executions") or []],
+    }
+
+
+def field_agreement(candidate: Dict[str, Any], reference: Dict[str, Any]) -> Dict[str, bool]:
+    """Per-field agreement of two canonical outputs on the fields the orchestrator acts on."""
+    ours, theirs = _decision_fields(candidate), _decision_fields(reference)
+    return {name: ours[name] == theirs[name] for name in ours}
+
+
+__all__ = [
+    "MIN_CONFIDENCE",
+    "StructuredTranslation",
+    "field_agreement",
+    "structured_translation_enabled",
+    "translate_mcp_result",
+]
@@ -6,16 +6,30 @@ This module provides a dynamic system prompt builder that incorporates:
 2. Dynamic capabilities (MCP providers, desktop environment)
 3. Multi-step context (previous results, budget status)
 
+The prompt is assembled from cached segments, in this order, so everything
+before the per-step suffix stays byte-identical across steps and provider
+prompt caching can hit:
+
+- static foundation: compiled once per process (per Pacific date);
+- capability section: cached per (user, capability fingerprint);
+- continuation + context: per run, with one cached block per completed step
+  (see `SystemPromptBuilder`);
+- failure reminder: the only per-step dynamic suffix.
+
 Keeping this as Python makes it easy to import and attach to downstream
 planner/agent calls without reading from disk.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo
-from typing import Dict, Any, List, Optional, TYPE_CHECKING
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from orchestrator_agent.data_types import OrchestratorRequest, RunState, StepResult
@@ -27,8 +41,13 @@ def _current_pacific_date() -> str:
     return datetime.now(_PACIFIC_TIMEZONE).strftime("%Y-%m-%d")
 
 
+@lru_cache(maxsize=4)
+def _compiled_foundation(pacific_date: str) -> str:
+    return STATIC_FOUNDATION.replace("[[PACIFIC_DATE]]", pacific_date)
+
+
 def _render_static_foundation() -> str:
-    return STATIC_FOUNDATION.replace("[[PACIFIC_DATE]]", _current_pacific_date())
+    return _compiled_foundation(_current_pacific_date())
 
 
 STATIC_FOUNDATION = """\
@@ -175,7 +194,7 @@ When reviewing previous step results, interpret them based on the agent used:
 
 ## Your Output Format
 
-Respond with JSON in **ONE** of these three formats:
+Respond with JSON in **ONE** of these four formats:
 
 ### 1. Next Step 
 {
@@ -195,20 +214,34 @@ CRITICAL DATA RULE: Downstream agents are amnesiacs. They only see the task stri
 - If required data is missing, choose an MCP step to fetch it first, then pass the results in the next step's task string.
 - The save_to_knowledge data is not persisted across Computer-Use steps; always include the full data required in the current task string.
 
-### 2. Task Complete
+### 2. Parallel Steps (independent MCP work)
+{
+  "type": "parallel_steps",
+  "steps": [
+    {"id": "a", "target": "mcp", "task": "Fully self-contained task, same rules as next_step"},
+    {"id": "b", "target": "mcp", "task": "Fully self-contained task, same rules as next_step", "depends_on": []}
+  ],
+  "reasoning": "Why these steps do not need each other's results"
+}
+
+- Use this only when two or more MCP tasks need nothing from each other (e.g., fetch from Gmail and fetch from HubSpot before merging them). They run at the same time and their results are listed in the order given.
+- `depends_on` names earlier entries that must succeed first. A task still never sees another entry's output, so anything that needs a result belongs in a later `next_step`.
+- Computer-use tasks always run alone; use `next_step` for them.
+
+### 3. Task Complete
 {
   "type": "task_complete",
   "reasoning": "Explanation of how the user's original goal has been fully accomplished"
 }
 
-### 3. Task Impossible
+### 4. Task Impossible
 {
   "type": "task_impossible",
   "reasoning": "Clear explanation of why the task cannot be completed (missing capabilities, stuck in loop, fundamental blocker)"
 }
 
 **Important Guidelines:**
-- Output exactly ONE of the three response types above
+- Output exactly ONE of the four response types above
 - Use `task_impossible` if you detect a loop (same action failing repeatedly)
 - Use `task_impossible` if required capabilities are not available
 - Use `task_complete` only when the original user goal is fully satisfied
@@ -416,6 +449,29 @@ def _prune_empty(obj: Any) -> Any:
     return obj
 
 
+def _format_result_block(index: int, result: "StepResult") -> str:
+    """Numbered block for one completed step (translated payload as pruned JSON)."""
+    output = result.output or {}
+    translated = output.get("translated", {})
+    cleaned = _prune_empty(translated)
+
+    header = f"{index}. {result.target.upper()} step – Task: {result.next_task}"
+    step_lines = [header]
+
+    if cleaned:
+        try:
+            json_block = json.dumps(cleaned, indent=2, ensure_ascii=False)
+        except Exception:
+            json_block = str(cleaned)
+        step_lines.append("```json")
+        step_lines.append(json_block)
+        step_lines.append("```")
+    else:
+        step_lines.append(f"No translated payload available for this step with task: {result.next_task}, you should retry the step.")
+
+    return "\n".join(step_lines)
+
+
 def format_previous_results(
     results: List["StepResult"], task: Optional[str] = None
 ) -> str:
@@ -437,29 +493,165 @@ def format_previous_results(
             else "None - this is the first step."
         )
 
-    lines = []
-    for i, r in enumerate(results, 1):  # Show all steps with numbering
-        output = r.output or {}
-        translated = output.get("translated", {})
-        cleaned = _prune_empty(translated)
-
-        header = f"{i}. {r.target.upper()} step – Task: {r.next_task}"
-        step_lines = [header]
-
-        if cleaned:
-            try:
-                json_block = json.dumps(cleaned, indent=2, ensure_ascii=False)
-            except Exception:
-                json_block = str(cleaned)
-            step_lines.append("```json")
-            step_lines.append(json_block)
-            step_lines.append("```")
-        else:
-            step_lines.append(f"No translated payload available for this step with task: {r.next_task}, you should retry the step.")
+    # Show all steps with numbering
+    return "\n\n".join(_format_result_block(i, r) for i, r in enumerate(results, 1))
+
+
+_CAPABILITY_SECTION_CACHE_SIZE = 64
+_capability_sections: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_capability_sections_lock = threading.Lock()
+
+_CONTEXT_HEAD, _CONTEXT_TAIL = CONTEXT_TEMPLATE.split("{previous_results}")
+
+
+@lru_cache(maxsize=1)
+def _available_actions() -> str:
+    from computer_use_agent.grounding.grounding_agent import (
+        list_osworld_agent_actions,
+    )
+
+    return str(list_osworld_agent_actions())
+
+
+def _sorted_providers(mcp_caps: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return sorted(mcp_caps.get("providers", []), key=lambda p: str(p.get("provider", "")))
+
+
+def capability_fingerprint(capabilities: Dict[str, Any]) -> str:
+    """Stable hash of the capability fields rendered into the prompt."""
+    mcp_caps = capabilities.get("mcp", {})
+    computer_caps = capabilities.get("computer", {})
+    payload = {
+        "providers": _sorted_providers(mcp_caps),
+        "platform": computer_caps.get("platform", "unknown"),
+        "available_apps": computer_caps.get("available_apps", []),
+        "active_windows": computer_caps.get("active_windows", []),
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def render_capability_section(capabilities: Dict[str, Any], user_id: Optional[str] = None) -> str:
+    """
+    Render the capability section, cached per (user, capability fingerprint).
+
+    Providers are rendered in name order so an inventory that comes back in a
+    different order still produces the same bytes.
+    """
+    key = (str(user_id or "default"), capability_fingerprint(capabilities))
+    with _capability_sections_lock:
+        cached = _capability_sections.get(key)
+        if cached is not None:
+            _capability_sections.move_to_end(key)
+            return cached
+
+    mcp_caps = capabilities.get("mcp", {})
+    computer_caps = capabilities.get("computer", {})
+    apps_str, windows_str = format_desktop_environment(
+        computer_caps.get("available_apps", []),
+        computer_caps.get("active_windows", []),
+    )
+    section = CAPABILITY_TEMPLATE.format(
+        mcp_providers=format_mcp_providers(_sorted_providers(mcp_caps)),
+        platform=computer_caps.get("platform", "unknown"),
+        available_apps=apps_str,
+        active_windows=windows_str,
+        available_actions=_available_actions(),
+    )
+    with _capability_sections_lock:
+        _capability_sections[key] = section
+        while len(_capability_sections) > _CAPABILITY_SECTION_CACHE_SIZE:
+            _capability_sections.popitem(last=False)
+    return section
+
+
+class SystemPromptBuilder:
+    """
+    Per-run system prompt assembly that reuses unchanged segments.
 
-        lines.append("\n".join(step_lines))
+    Completed steps never change, so each step's formatted block is rendered
+    once and reused on later steps; the capability section is looked up again
+    only when the capability dicts are replaced (e.g. after a cache refresh).
+    `last_stats` reports the size of the latest prompt and how much of it
+    came from cached segments.
+    """
+
+    def __init__(self, user_id: Optional[str] = None) -> None:
+        self.user_id = user_id
+        self._capabilities_ref: Optional[Tuple[Any, Any]] = None
+        self._capability_section = ""
+        self._step_blocks: List[Tuple["StepResult", str]] = []
+        self._context_head: Tuple[Optional[str], str] = (None, "")
+        self.last_stats: Dict[str, Any] = {}
+
+    def build(
+        self,
+        request: "OrchestratorRequest",
+        capabilities: Dict[str, Any],
+        state: Optional["RunState"] = None,
+        last_step_failed: bool = False,
+        failed_step_info: Optional[Dict[str, Any]] = None,
+        continuation_context: Optional[str] = None,
+    ) -> str:
+        """Assemble the prompt; same arguments as `build_system_prompt`."""
+        prompt_parts = [_render_static_foundation(), self._capabilities(capabilities)]
+
+        # Add continuation reminder if resuming from handback
+        if continuation_context:
+            prompt_parts.append(
+                CONTINUATION_REMINDER.format(continuation_context=continuation_context)
+            )
+
+        # Add execution context
+        if state and state.results:
+            previous_results_str = self._previous_results(state.results)
+        elif continuation_context:
+            # If resuming, note that previous work is shown in continuation section
+            previous_results_str = "See continuation context above for work done before handback."
+        else:
+            previous_results_str = "None - this is the first step."
+        prompt_parts.append(self._context(request.task) + previous_results_str + _CONTEXT_TAIL)
+        stable_chars = len("\n".join(prompt_parts))
+
+        # Add failure reminder if last step failed
+        if last_step_failed and failed_step_info:
+            prompt_parts.append(
+                FAILURE_REMINDER.format(
+                    failed_task=failed_step_info.get("task", "unknown"),
+                    failed_target=failed_step_info.get("target", "unknown"),
+                    failed_error=failed_step_info.get("error", "unknown"),
+                )
+            )
 
-    return "\n\n".join(lines)
+        prompt = "\n".join(prompt_parts)
+        self.last_stats = {
+            "prompt_chars": len(prompt),
+            "stable_prefix_chars": stable_chars,
+            "cached_step_blocks": len(self._step_blocks),
+        }
+        return prompt
+
+    def _capabilities(self, capabilities: Dict[str, Any]) -> str:
+        ref = (capabilities.get("mcp"), capabilities.get("computer"))
+        if self._capabilities_ref is None or any(a is not b for a, b in zip(ref, self._capabilities_ref)):
+            self._capability_section = render_capability_section(capabilities, self.user_id)
+            self._capabilities_ref = ref
+        return self._capability_section
+
+    def _context(self, task: str) -> str:
+        if self._context_head[0] != task:
+            self._context_head = (task, _CONTEXT_HEAD.format(task=task))
+        return self._context_head[1]
+
+    def _previous_results(self, results: List["StepResult"]) -> str:
+        blocks = self._step_blocks
+        keep = 0
+        while keep < min(len(blocks), len(results)) and blocks[keep][0] is results[keep]:
+            keep += 1
+        del blocks[keep:]
+        for index in range(keep, len(results)):
+            blocks.append((results[index], _format_result_block(index + 1, results[index])))
+        return "\n\n".join(block for _, block in blocks)
 
 
 def build_system_prompt(
@@ -484,66 +676,18 @@ def build_system_prompt(
 
     Returns:
         Complete system prompt string
-    """
-    # Start with static foundation
-    prompt_parts = [_render_static_foundation()]
-    from computer_use_agent.grounding.grounding_agent import (
-                list_osworld_agent_actions,
-            )
-
-    available_actions = list_osworld_agent_actions()
 
-    # Add capability context
-    mcp_caps = capabilities.get("mcp", {})
-    computer_caps = capabilities.get("computer", {})
-
-    mcp_providers_str = format_mcp_providers(mcp_caps.get("providers", []))
-    apps_str, windows_str = format_desktop_environment(
-        computer_caps.get("available_apps", []),
-        computer_caps.get("active_windows", []),
-    )
-
-    capability_section = CAPABILITY_TEMPLATE.format(
-        mcp_providers=mcp_providers_str,
-        platform=computer_caps.get("platform", "unknown"),
-        available_apps=apps_str,
-        active_windows=windows_str,
-        available_actions=available_actions,
-    )
-    prompt_parts.append(capability_section)
-
-    # Add continuation reminder if resuming from handback
-    if continuation_context:
-        continuation_section = CONTINUATION_REMINDER.format(
-            continuation_context=continuation_context,
-        )
-        prompt_parts.append(continuation_section)
-
-    # Add execution context
-    if state and state.results:
-        previous_results_str = format_previous_results(state.results)
-    elif continuation_context:
-        # If resuming, note that previous work is shown in continuation section
-        previous_results_str = "See continuation context above for work done before handback."
-    else:
-        previous_results_str = "None - this is the first step."
-
-    context_section = CONTEXT_TEMPLATE.format(
-        task=request.task,
-        previous_results=previous_results_str,
+    Runs that build a prompt every step should keep a `SystemPromptBuilder`
+    instead, so completed step blocks are reused.
+    """
+    return SystemPromptBuilder(request.user_id).build(
+        request,
+        capabilities,
+        state=state,
+        last_step_failed=last_step_failed,
+        failed_step_info=failed_step_info,
+        continuation_context=continuation_context,
     )
-    prompt_parts.append(context_section)
-
-    # Add failure reminder if last step failed
-    if last_step_failed and failed_step_info:
-        failure_section = FAILURE_REMINDER.format(
-            failed_task=failed_step_info.get("task", "unknown"),
-            failed_target=failed_step_info.get("target", "unknown"),
-            failed_error=failed_step_info.get("error", "unknown"),
-        )
-        prompt_parts.append(failure_section)
-
-    return "\n".join(prompt_parts)
 
 
 def get_system_prompt() -> str:
@@ -558,8 +702,11 @@ def get_system_prompt() -> str:
 
 __all__ = [
     "STATIC_FOUNDATION",
+    "SystemPromptBuilder",
     "build_system_prompt",
+    "capability_fingerprint",
     "get_system_prompt",
+    "render_capability_section",
     "format_mcp_providers",
     "format_desktop_environment",
     "format_previous_results",
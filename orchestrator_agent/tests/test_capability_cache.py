@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from orchestrator_agent import capabilities
+from orchestrator_agent.capabilities import CapabilityCache
+
+
+def _slow_loader(calls, value="v", delay=0.05):
+    def load():
+        calls.append(1)
+        time.sleep(delay)
+        return {"value": value, "call": len(calls)}
+
+    return load
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = CapabilityCache()
+    calls = []
+    loader = _slow_loader(calls)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: cache.get(("mcp", "u1"), loader, ttl_s=60), range(8)))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["coalesced"] == 7
+    assert stats["refresh_ms"]["mcp"]["count"] == 1
+
+
+def test_async_callers_share_one_fetch():
+    cache = CapabilityCache()
+    calls = []
+    loader = _slow_loader(calls)
+
+    async def run():
+        return await asyncio.gather(*(cache.aget(("computer", "u1"), loader, ttl_s=60) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1 and all(result is results[0] for result in results)
+
+
+def test_stale_entry_is_served_while_one_background_refresh_runs():
+    cache = CapabilityCache()
+    calls = []
+    gate = threading.Event()
+
+    def loader():
+        calls.append(1)
+        if len(calls) > 1:
+            gate.wait(1)
+        return {"call": len(calls)}
+
+    first = cache.get(("mcp", "u1"), loader, ttl_s=0.01, stale_s=60)
+    time.sleep(0.02)
+    assert cache.get(("mcp", "u1"), loader, ttl_s=0.01, stale_s=60) is first
+    assert cache.get(("mcp", "u1"), loader, ttl_s=0.01, stale_s=60) is first
+    gate.set()
+    deadline = time.time() + 1
+    while cache.get(("mcp", "u1"), loader, ttl_s=60) is first and time.time() < deadline:
+        time.sleep(0.005)
+    assert cache.get(("mcp", "u1"), loader, ttl_s=60) == {"call": 2}
+    stats = cache.stats()
+    assert len(calls) == 2 and stats["stale_hits"] == 2 and stats["refreshes"] == 1
+
+
+def test_failed_refresh_keeps_last_good_value_and_first_failure_raises():
+    cache = CapabilityCache()
+    with pytest.raises(RuntimeError):
+        cache.get(("mcp", "u1"), lambda: (_ for _ in ()).throw(RuntimeError("down")), ttl_s=60)
+    good = cache.get(("mcp", "u1"), lambda: {"ok": True}, ttl_s=0)
+    again = cache.get(("mcp", "u1"), lambda: (_ for _ in ()).throw(RuntimeError("down")), ttl_s=0)
+    assert again is good
+    assert cache.stats()["refresh_failures"] == 2
+
+
+def test_lru_is_bounded_by_entries_and_bytes():
+    cache = CapabilityCache(max_entries=3, max_bytes=10_000)
+    for index in range(5):
+        cache.get(("mcp", f"u{index}"), lambda: {"providers": []}, ttl_s=60)
+    assert cache.stats()["entries"] == 3 and cache.stats()["evictions"] == 2
+
+    small = CapabilityCache(max_bytes=1_000)
+    for index in range(4):
+        small.get(("mcp", f"u{index}"), lambda: {"blob": "x" * 400}, ttl_s=60)
+    stats = small.stats()
+    assert stats["bytes"] <= 1_000 and stats["entries"] == 2
+
+
+def test_invalidation_discards_in_flight_fetch():
+    cache = CapabilityCache()
+    started, release = threading.Event(), threading.Event()
+
+    def loader():
+        started.set()
+        release.wait(1)
+        return {"providers": ["old"]}
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(cache.get, ("mcp", "u1"), loader, ttl_s=60)
+        started.wait(1)
+        cache.invalidate(("mcp", "u1"))
+        release.set()
+        assert pending.result() == {"providers": ["old"]}
+    fresh = cache.get(("mcp", "u1"), lambda: {"providers": ["new"]}, ttl_s=60)
+    assert fresh == {"providers": ["new"]}
+
+
+def test_provider_connection_change_invalidates_user_inventory(monkeypatch):
+    cache = CapabilityCache()
+    monkeypatch.setattr(capabilities, "_CAPABILITY_CACHE", cache)
+    inventories = iter([{"providers": [{"provider": "gmail", "tools": []}]}, {"providers": []}])
+    monkeypatch.setattr(capabilities, "_load_mcp_inventory", lambda user_id: next(inventories))
+
+    assert capabilities.fetch_mcp_capabilities("User-1")["providers"]
+    assert capabilities.fetch_mcp_capabilities("user-1")["providers"]
+
+    from mcp_agent.registry import oauth
+
+    monkeypatch.setattr(oauth.OAuthManager, "_invalidate_cache", classmethod(lambda cls, *args: None))
+    from shared.db import composed_plans
+
+    monkeypatch.setattr(composed_plans, "invalidate_quietly", lambda **kwargs: 0)
+    oauth.notify_connection_changed("user-1", "gmail")
+    assert capabilities.fetch_mcp_capabilities("user-1") == {"providers": []}
+    assert cache.stats()["misses"] == 2
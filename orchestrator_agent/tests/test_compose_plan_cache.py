@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from mcp_agent.registry import oauth
+from orchestrator_agent import composer
+from shared.db import composed_plans
+from shared.db.models import ComposedPlanCacheEntry
+
+CAPABILITIES = {
+    "mcp": {"providers": [{"provider": "gmail", "tools": ["gmail_search", "gmail_send_email"]}]},
+    "computer": {"platform": "windows", "available_apps": ["edge", "notepad"], "actions": ["click"]},
+}
+PLAN = {
+    "original_task": "Daily digest",
+    "steps": [
+        {"id": "step-1", "type": "mcp", "description": "Search", "provider_id": "gmail", "prompt": "Find unread"},
+        {"id": "step-2", "type": "cua", "description": "Write", "app_name": "NOTEPAD", "prompt": "Write it up"},
+    ],
+}
+
+
+@pytest.fixture
+def Session(monkeypatch):
+    engine = create_engine(
+        "sqlite://", future=True, connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    ComposedPlanCacheEntry.__table__.create(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, future=True)
+    monkeypatch.setattr(composed_plans, "SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def llm(Session, monkeypatch):
+    monkeypatch.delenv("COMPOSE_PLAN_CACHE", raising=False)
+
+    calls = []
+
+    def respond_once(messages):
+        calls.append(messages)
+        return json.dumps(PLAN)
+
+    monkeypatch.setattr(composer, "respond_once", respond_once)
+    monkeypatch.setattr(composer, "extract_assistant_text", lambda resp: resp)
+    return calls
+
+
+def _compose(task="Send me a daily digest", **kwargs):
+    kwargs.setdefault("user_id", "User-1")
+    return composer.compose_plan(task, CAPABILITIES, tool_constraints={"mode": "auto"}, **kwargs)
+
+
+def test_recurring_task_reuses_the_plan_without_an_llm_call(llm, Session):
+    first = _compose(workflow_id="wf-1")
+    again = _compose("  Send me a   daily digest ")
+
+    assert len(llm) == 1
+    assert again == first
+    assert again["steps"][1]["app_name"] == "notepad"  # hit re-normalized against capabilities
+    with Session() as session:
+        assert session.get(ComposedPlanCacheEntry, _key()).hits == 1
+
+
+def _key(task="Send me a daily digest", capabilities=CAPABILITIES, constraints=None):
+    return composer.compose_cache_key(
+        "user-1", task, constraints or {"mode": "auto"}, composer.compose_capability_fingerprint(capabilities)
+    )
+
+
+def test_key_changes_with_constraints_capabilities_and_schema(llm, monkeypatch):
+    base = _key()
+    assert _key(constraints={"mode": "manual"}) != base
+    assert _key(capabilities={**CAPABILITIES, "mcp": {"providers": []}}) != base
+    reordered = {
+        **CAPABILITIES,
+        "computer": {**CAPABILITIES["computer"], "available_apps": ["notepad", "edge"], "active_windows": ["x"]},
+    }
+    assert _key(capabilities=reordered) == base
+    monkeypatch.setattr(composer, "COMPOSE_SCHEMA_VERSION", composer.COMPOSE_SCHEMA_VERSION + 1)
+    assert _key() != base
+
+
+def test_expired_entries_are_recomposed(llm, Session):
+    _compose()
+    with Session() as session:
+        session.execute(
+            update(ComposedPlanCacheEntry).values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+        )
+        session.commit()
+    _compose()
+    assert len(llm) == 2
+    assert composed_plans.purge_expired() == 0
+
+
+def test_invalidation_by_workflow_and_provider_change(llm):
+    _compose(workflow_id="wf-1")
+    assert composed_plans.invalidate_quietly(workflow_id="wf-1") == 1
+    _compose()
+    assert len(llm) == 2
+
+    oauth.notify_connection_changed(" User-1 ", "gmail")
+    _compose()
+    assert len(llm) == 3
+
+
+def test_cache_is_skipped_without_a_user_or_when_disabled(llm, monkeypatch):
+    _compose(user_id=None)
+    _compose(user_id=None)
+    monkeypatch.setenv("COMPOSE_PLAN_CACHE", "0")
+    _compose()
+    _compose()
+    assert len(llm) == 4
+
+
+def test_fallback_plans_are_not_cached(llm, Session, monkeypatch):
+    monkeypatch.setattr(composer, "respond_once", lambda messages: llm.append(messages) or "not json")
+    assert _compose()["notes"].startswith("Fallback minimal plan")
+    with Session() as session:
+        assert session.query(ComposedPlanCacheEntry).count() == 0
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from orchestrator_agent import runtime as runtime_module
+from orchestrator_agent.data_types import OrchestratorRequest
+from orchestrator_agent.runtime import OrchestratorRuntime
+from orchestrator_agent.speculation import SpeculationStats, response_token_usage, translation_divergence
+from orchestrator_agent.translator import draft_step_output
+from shared.hierarchical_logger import AgentLogger
+
+AGENT_S = 0.05
+TRANSLATE_S = 0.2
+PLAN_S = 0.2
+
+
+def test_divergence_checks_outcome_fields_and_data_coverage():
+    draft = draft_step_output(
+        task="List open deals",
+        target="mcp",
+        trajectory='Found 2 deals: "Acme" ($1,200) and "Globex".',
+    )
+    draft["overall_success"] = True
+    agreeing = {"overall_success": True, "last_step_failed": False, "data": {"deals": ["Acme", "Globex"]}}
+    assert translation_divergence(draft, agreeing) == []
+
+    invented = {"overall_success": True, "data": {"deals": ["Initech"]}}
+    assert translation_divergence(draft, invented) == ["data"]
+    assert translation_divergence(draft, {"overall_success": False}) == ["overall_success"]
+    assert translation_divergence(draft, invented, fields=("overall_success",)) == []
+
+
+def test_token_usage_and_stats():
+    assert response_token_usage(SimpleNamespace(usage=SimpleNamespace(input_tokens=10, output_tokens=3))) == {
+        "input": 10,
+        "output": 3,
+    }
+    assert response_token_usage(SimpleNamespace(usage={"prompt_tokens": 4, "completion_tokens": 1})) == {
+        "input": 4,
+        "output": 1,
+    }
+    assert response_token_usage(object()) == {"input": 0, "output": 0}
+
+    stats = SpeculationStats(attempts=3)
+    stats.record_hit(120.0)
+    stats.record_miss(["data"])
+    stats.record_waste({"input": 50, "output": 5})
+    assert stats.to_dict() == {
+        "attempts": 3,
+        "hits": 1,
+        "misses": 1,
+        "discarded": 0,
+        "hit_rate": 0.5,
+        "saved_ms": 120.0,
+        "wasted_tokens": {"input": 50, "output": 5},
+        "miss_fields": {"data": 1},
+    }
+
+
+class Planner:
+    """Stands in for the planner LLM: two steps, then done; records what it was shown."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request, state, last_failed, *args, usage_out=None, **kwargs):
+        with self._lock:
+            self.calls.append([(r.output or {}).get("translated", {}).get("summary") for r in state.results])
+        time.sleep(PLAN_S)
+        if usage_out is not None:
+            usage_out["input"] = usage_out.get("input", 0) + 100
+            usage_out["output"] = usage_out.get("output", 0) + 10
+        if len(state.results) < 2:
+            return {"type": "next_step", "target": "mcp", "task": f"step {len(state.results) + 1}"}
+        return {"type": "task_complete", "reasoning": "done"}
+
+
+def _run(monkeypatch, tmp_path, translated_data):
+    def bridge(target, request, step, orchestrator_state=None, structured_out=None):
+        time.sleep(AGENT_S)
+        return f"## Step 1\nCounted 42 rows for {step.next_task}.\n\n**Status**: completed\n"
+
+    def translate(*, task, target, trajectory, **kwargs):
+        time.sleep(TRANSLATE_S)
+        return {"task": task, "overall_success": True, "summary": "translated", "data": translated_data}
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(runtime_module.agent_signal, "register_signal_handlers", lambda: None)
+    monkeypatch.setattr(runtime_module, "run_agent_bridge", bridge)
+    monkeypatch.setattr(runtime_module, "translate_step_output", translate)
+    events = []
+    monkeypatch.setattr(AgentLogger, "log_event", lambda self, name, data=None, **kwargs: events.append((name, data)))
+
+    runtime = OrchestratorRuntime(speculative_planning=True, agent_states_provider=lambda run_id: {})
+    planner = Planner()
+
+    async def capabilities(request):
+        return runtime_module._EMPTY_CAPABILITIES
+
+    monkeypatch.setattr(runtime, "_get_capabilities_async", capabilities)
+    monkeypatch.setattr(runtime, "_get_next_step", planner)
+
+    request = OrchestratorRequest.from_task("t1", "Count the rows", max_steps=10)
+    started = time.perf_counter()
+    state = asyncio.run(runtime.run_task(request))
+    elapsed = time.perf_counter() - started
+    stats = next(data["speculation"] for name, data in events if name == "task.completed")
+    return state, planner, stats, elapsed
+
+
+def test_matching_translation_keeps_the_speculative_decision(monkeypatch, tmp_path):
+    state, planner, stats, elapsed = _run(monkeypatch, tmp_path, {"rows": 42})
+
+    assert [r.next_task for r in state.results] == ["step 1", "step 2"]
+    # Initial plan + one speculative call per step; nothing re-planned.
+    assert len(planner.calls) == 3
+    assert planner.calls[1][0] != "translated"  # planned from the draft
+    assert stats["attempts"] == 2 and stats["hits"] == 2 and stats["misses"] == 0
+    assert stats["wasted_tokens"] == {"input": 0, "output": 0}
+    assert stats["saved_ms"] > 0
+    sequential = PLAN_S + 2 * (AGENT_S + TRANSLATE_S + PLAN_S)
+    assert elapsed < sequential - TRANSLATE_S
+
+
+def test_diverging_translation_replans_and_counts_wasted_tokens(monkeypatch, tmp_path):
+    state, planner, stats, _ = _run(monkeypatch, tmp_path, {"rows": 41})
+
+    assert [r.next_task for r in state.results] == ["step 1", "step 2"]
+    assert len(planner.calls) == 5
+    assert planner.calls[2] == ["translated"]  # re-planned from the real translation
+    assert stats["hits"] == 0 and stats["misses"] == 2
+    assert stats["miss_fields"] == {"data": 2}
+    assert stats["wasted_tokens"] == {"input": 200, "output": 20}
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from orchestrator_agent import runtime as runtime_module
+from orchestrator_agent.composer import _normalize_plan_dict
+from orchestrator_agent.data_types import OrchestratorRequest, PlannedStep, RunState, StepResult
+from orchestrator_agent.runtime import OrchestratorRuntime
+from orchestrator_agent.step_graph import StepGate, independent_mcp_prefix, infer_dependencies, run_step_graph
+
+DELAY = 0.2
+
+
+class FakeBridges:
+    """Stands in for `run_agent_bridge`: sleeps per task and records start/end times."""
+
+    def __init__(self, delays=None, failing=()):
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.spans = {}
+        self._lock = threading.Lock()
+        self._running = 0
+        self.peak = 0
+
+    def __call__(self, target, request, step, orchestrator_state=None, structured_out=None):
+        with self._lock:
+            self._running += 1
+            self.peak = max(self.peak, self._running)
+        started = time.perf_counter()
+        time.sleep(self.delays.get(step.next_task, DELAY))
+        with self._lock:
+            self._running -= 1
+            self.spans[step.next_task] = (target, started, time.perf_counter())
+        return f"failed: {step.next_task}" if step.next_task in self.failing else f"done: {step.next_task}"
+
+
+def _translate(*, task, target, trajectory, **kwargs):
+    ok = not trajectory.startswith("failed")
+    return {"task": task, "overall_success": ok, "summary": trajectory, "error": None if ok else "boom"}
+
+
+@pytest.fixture
+def bridges(monkeypatch):
+    fake = FakeBridges()
+    monkeypatch.setattr(runtime_module, "run_agent_bridge", fake)
+    monkeypatch.setattr(runtime_module, "translate_step_output", _translate)
+    return fake
+
+
+def _request(max_steps=10):
+    request = OrchestratorRequest.from_task("t1", "Merge Gmail and HubSpot data", max_steps=max_steps)
+    request.user_id = "user-1"
+    return request
+
+
+def _step(task, target="mcp", depends_on=()):
+    return PlannedStep(
+        step_id=f"id-{task}", next_task=task, max_steps=5, verification="ok", target=target, depends_on=list(depends_on)
+    )
+
+
+def _overlaps(a, b):
+    return a[1] < b[2] and b[1] < a[2]
+
+
+def test_independent_steps_run_concurrently_and_merge_in_plan_order(bridges):
+    bridges.delays = {"gmail": 2 * DELAY, "hubspot": DELAY, "slack": DELAY}
+    runtime = OrchestratorRuntime(max_parallel_steps=3, agent_states_provider=lambda run_id: {})
+    state = RunState(request=_request())
+    steps = [_step("gmail"), _step("hubspot"), _step("slack")]
+
+    started = time.perf_counter()
+    asyncio.run(runtime._run_steps(steps, state, StepGate(3)))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 3 * DELAY  # sequential would take 4 * DELAY
+    assert bridges.peak == 3
+    assert [r.next_task for r in state.results] == ["gmail", "hubspot", "slack"]
+    assert bridges.spans["hubspot"][2] < bridges.spans["gmail"][2]  # finished first, still merged second
+
+
+def test_dependencies_order_steps_and_failures_skip_dependents(bridges):
+    bridges.failing = {"fetch-b"}
+    runtime = OrchestratorRuntime(agent_states_provider=lambda run_id: {})
+    state = RunState(request=_request())
+    steps = [
+        _step("fetch-a"),
+        _step("fetch-b"),
+        _step("merge", depends_on=["id-fetch-a"]),
+        _step("post", depends_on=["id-fetch-b"]),
+    ]
+    state.plan.extend(steps)
+    asyncio.run(runtime._run_steps(steps, state, StepGate(4)))
+
+    assert bridges.spans["merge"][1] >= bridges.spans["fetch-a"][2]
+    assert "post" not in bridges.spans
+    assert [r.next_task for r in state.results] == ["fetch-a", "fetch-b", "merge"]
+    assert [s.next_task for s in state.plan] == ["fetch-a", "fetch-b", "merge"]
+
+
+def test_concurrent_steps_report_only_their_own_token_usage(bridges, monkeypatch):
+    from types import SimpleNamespace
+
+    from shared.token_cost_tracker import TokenCostTracker
+
+    monkeypatch.setenv("TOKEN_COST_DB_ENABLED", "0")
+    tracker = TokenCostTracker()
+    tokens = {"gmail": 100, "hubspot": 7}
+
+    def bridge(target, request, step, orchestrator_state=None, structured_out=None):
+        for _ in range(3):  # interleave with the other step's calls
+            response = SimpleNamespace(usage={"input_tokens": tokens[step.next_task], "output_tokens": 1})
+            tracker.record_response("o4-mini", "test", response)
+            time.sleep(DELAY / 4)
+        return f"done: {step.next_task}"
+
+    monkeypatch.setattr(runtime_module, "run_agent_bridge", bridge)
+    runtime = OrchestratorRuntime(max_parallel_steps=2, agent_states_provider=lambda run_id: {})
+    runtime.cost_tracker = tracker
+    state = RunState(request=_request())
+    asyncio.run(runtime._run_steps([_step("gmail"), _step("hubspot")], state, StepGate(2)))
+
+    usage = {r.next_task: r.output["usage"]["tokens"] for r in state.results}
+    assert usage["gmail"] == {"input_cached": 0, "input_new": 300, "output": 3}
+    assert usage["hubspot"] == {"input_cached": 0, "input_new": 21, "output": 3}
+    assert tracker.total_input_new == 321
+
+
+def test_computer_use_step_has_exclusive_access(bridges):
+    runtime = OrchestratorRuntime(agent_states_provider=lambda run_id: {})
+    state = RunState(request=_request())
+    steps = [_step("mcp-1"), _step("desktop", target="computer_use"), _step("mcp-2"), _step("mcp-3")]
+    asyncio.run(runtime._run_steps(steps, state, StepGate(4)))
+
+    desktop = bridges.spans["desktop"]
+    assert desktop[0] == "computer_use"
+    assert not any(_overlaps(desktop, bridges.spans[name]) for name in ("mcp-1", "mcp-2", "mcp-3"))
+    assert [r.next_task for r in state.results] == ["mcp-1", "desktop", "mcp-2", "mcp-3"]
+
+
+def test_parallelism_is_bounded_per_run_and_per_user():
+    peak = {"run": 0, "user": 0}
+    running = {"run-a": 0, "all": 0}
+
+    def make_dispatch(run):
+        async def dispatch(step):
+            running["all"] += 1
+            running[run] = running.get(run, 0) + 1
+            peak["user"] = max(peak["user"], running["all"])
+            if run == "run-a":
+                peak["run"] = max(peak["run"], running[run])
+            await asyncio.sleep(0.02)
+            running["all"] -= 1
+            running[run] -= 1
+            return StepResult(step_id=step.step_id, target="mcp", next_task=step.next_task, verification="ok", status="completed")
+
+        return dispatch
+
+    async def main():
+        user_slots = asyncio.Semaphore(3)
+        batch = [_step(f"s{i}") for i in range(6)]
+        await asyncio.gather(
+            run_step_graph(batch, make_dispatch("run-a"), gate=StepGate(2, user_slots)),
+            run_step_graph(batch, make_dispatch("run-b"), gate=StepGate(2, user_slots)),
+        )
+
+    asyncio.run(main())
+    assert peak == {"run": 2, "user": 3}
+
+
+def test_parallel_steps_decision_runs_through_the_planning_loop(bridges, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(runtime_module.agent_signal, "register_signal_handlers", lambda: None)
+    runtime = OrchestratorRuntime(agent_states_provider=lambda run_id: {})
+
+    async def capabilities(request):
+        return runtime_module._EMPTY_CAPABILITIES
+
+    decisions = iter(
+        [
+            {
+                "type": "parallel_steps",
+                "steps": [
+                    {"id": "a", "target": "mcp", "task": "gmail"},
+                    {"id": "b", "target": "mcp", "task": "hubspot"},
+                    {"id": "c", "target": "mcp", "task": "merge", "depends_on": ["a", "b"]},
+                ],
+            },
+            {"type": "task_complete", "reasoning": "done"},
+        ]
+    )
+    monkeypatch.setattr(runtime, "_get_capabilities_async", capabilities)
+    monkeypatch.setattr(runtime, "_get_next_step", lambda *args, **kwargs: next(decisions))
+
+    state = asyncio.run(runtime.run_task(_request()))
+    assert [r.next_task for r in state.results] == ["gmail", "hubspot", "merge"]
+    assert state.results[2].depends_on == [state.results[0].step_id, state.results[1].step_id]
+    assert bridges.spans["merge"][1] >= max(bridges.spans["gmail"][2], bridges.spans["hubspot"][2])
+    assert _overlaps(bridges.spans["gmail"], bridges.spans["hubspot"])
+
+
+def test_composed_plan_dependencies_are_inferred_and_prefetched(bridges, monkeypatch, tmp_path):
+    raw = {
+        "steps": [
+            {"id": "step-1", "type": "mcp", "description": "d", "prompt": "Use gmail_search to fetch this week's emails."},
+            {"id": "step-2", "type": "mcp", "description": "d", "prompt": "Use hubspot_list_deals to fetch open deals."},
+            {"id": "step-3", "type": "mcp", "description": "d", "prompt": "Using the emails retrieved in the previous step, draft replies."},
+            {"id": "step-4", "type": "cua", "description": "d", "app_name": "Excel", "prompt": "Open Excel."},
+        ]
+    }
+    plan = _normalize_plan_dict(raw, {"mcp": {"providers": []}}, original_task="t").to_dict()
+    assert [s["depends_on"] for s in plan["steps"]] == [[], [], ["step-1", "step-2"], ["step-1", "step-2", "step-3"]]
+    assert infer_dependencies([{"id": "x", "depends_on": []}, {"id": "y", "depends_on": ["x", "nope"]}]) == {
+        "x": [],
+        "y": ["x"],
+    }
+    assert [s["id"] for s in independent_mcp_prefix(plan)] == ["step-1", "step-2"]
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(runtime_module.agent_signal, "register_signal_handlers", lambda: None)
+    runtime = OrchestratorRuntime(agent_states_provider=lambda run_id: {})
+
+    async def capabilities(request):
+        return runtime_module._EMPTY_CAPABILITIES
+
+    seen_results = []
+
+    def next_step(request, state, *args, **kwargs):
+        seen_results.append(len(state.results))
+        return {"type": "task_complete", "reasoning": "done"}
+
+    monkeypatch.setattr(runtime, "_get_capabilities_async", capabilities)
+    monkeypatch.setattr(runtime, "_get_next_step", next_step)
+    request = _request()
+    request.composed_plan = plan
+    state = asyncio.run(runtime.run_task(request))
+
+    assert seen_results == [2]  # the planner is first consulted after the prefetched wave
+    assert [r.next_task for r in state.results] == [raw["steps"][0]["prompt"], raw["steps"][1]["prompt"]]
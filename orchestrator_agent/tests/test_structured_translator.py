@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from orchestrator_agent.structured_translator import field_agreement, translate_mcp_result
+from orchestrator_agent.translator import translate_step_output
+
+FIXTURES = Path(__file__).parent / "fixtures" / "translation_parity.jsonl"
+CASES = [json.loads(line) for line in FIXTURES.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+class _RecordingClient:
+    def __init__(self, translated):
+        self.translated = translated
+        self.calls = 0
+
+    def create_response(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(output_text=json.dumps(self.translated))
+
+
+def _tool_step(index, observation, success=True):
+    return {
+        "action_step": index,
+        "action_type": "tool",
+        "success": success,
+        "action_input": {"tool_id": "gmail.gmail_search", "args": {"query": "q"}},
+        "action_outcome": {"success": success},
+        "observation": observation,
+    }
+
+
+def _finish_step(index, summary="Done."):
+    return {
+        "action_step": index,
+        "action_type": "finish",
+        "success": True,
+        "action_input": {"summary": summary},
+        "action_outcome": {"success": True, "final_summary": summary},
+    }
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case["name"] for case in CASES])
+def test_structured_translation_matches_recorded_llm_translation(case):
+    result = translate_mcp_result(case["task"], case["mcp_result"])
+    assert not result.escalate, result.reasons
+    disagreements = [name for name, same in field_agreement(result.translated, case["llm_translation"]).items() if not same]
+    assert disagreements == []
+    assert len(result.translated["steps_summary"]) == result.translated["total_steps"]
+
+
+def test_mcp_step_with_structured_result_skips_the_llm():
+    case = CASES[0]
+    client = _RecordingClient(case["llm_translation"])
+    translated = translate_step_output(
+        task=case["task"],
+        target="mcp",
+        trajectory="(markdown)",
+        llm_client=client,
+        structured_result=case["mcp_result"],
+    )
+    assert client.calls == 0
+    assert translated["overall_success"] is True and translated["total_steps"] == 3
+
+
+@pytest.mark.parametrize(
+    "result, reason",
+    [
+        ({"success": True, "final_summary": "MCP agent stubbed output.", "steps": []}, "no_steps"),
+        (
+            {"success": True, "final_summary": "Done.", "steps": [_tool_step(0, {"blob": "x" * 20_000}), _finish_step(1)]},
+            "large_payload",
+        ),
+        ({"success": True, "final_summary": "", "steps": [_tool_step(0, {"ok": True})]}, "unfinished"),
+    ],
+)
+def test_ambiguous_results_escalate_to_the_llm(result, reason):
+    structured = translate_mcp_result("task", result)
+    assert structured.escalate and reason in structured.reasons
+
+    client = _RecordingClient(CASES[0]["llm_translation"])
+    translated = translate_step_output(
+        task="task", target="mcp", trajectory="(markdown)", llm_client=client, structured_result=result
+    )
+    assert client.calls == 1
+    assert translated == CASES[0]["llm_translation"]
+
+
+def test_structured_path_can_be_disabled_and_is_mcp_only(monkeypatch):
+    case = CASES[0]
+    client = _RecordingClient(case["llm_translation"])
+    translate_step_output(
+        task=case["task"], target="computer_use", trajectory="(md)", llm_client=client, structured_result=case["mcp_result"]
+    )
+    monkeypatch.setenv("ORCH_STRUCTURED_TRANSLATION", "0")
+    translate_step_output(
+        task=case["task"], target="mcp", trajectory="(md)", llm_client=client, structured_result=case["mcp_result"]
+    )
+    assert client.calls == 2
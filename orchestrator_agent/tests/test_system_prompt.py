@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import pytest
+
+from orchestrator_agent import system_prompt
+from orchestrator_agent.data_types import OrchestratorRequest, RunState, StepResult
+from orchestrator_agent.system_prompt import SystemPromptBuilder, build_system_prompt, render_capability_section
+
+CAPABILITIES = {
+    # Providers already in name order: the builder sorts them, the old code did not.
+    "mcp": {"providers": [{"provider": "gmail", "tools": ["gmail_search"]}, {"provider": "slack", "tools": ["slack_post"]}]},
+    "computer": {
+        "platform": "darwin",
+        "available_apps": ["Google Chrome", "Finder"],
+        "active_windows": [{"app_name": "Google Chrome", "title": "Inbox"}],
+    },
+}
+FAILURE = {"task": "retry search", "target": "mcp", "error": "rate limited"}
+
+
+def _old_build_system_prompt(
+    request, capabilities, state=None, last_step_failed=False, failed_step_info=None, continuation_context=None
+):
+    """build_system_prompt as it was before segment caching: every part rendered from scratch."""
+    from computer_use_agent.grounding.grounding_agent import list_osworld_agent_actions
+
+    mcp_caps = capabilities.get("mcp", {})
+    computer_caps = capabilities.get("computer", {})
+    apps_str, windows_str = system_prompt.format_desktop_environment(
+        computer_caps.get("available_apps", []),
+        computer_caps.get("active_windows", []),
+    )
+    prompt_parts = [
+        system_prompt._render_static_foundation(),
+        system_prompt.CAPABILITY_TEMPLATE.format(
+            mcp_providers=system_prompt.format_mcp_providers(mcp_caps.get("providers", [])),
+            platform=computer_caps.get("platform", "unknown"),
+            available_apps=apps_str,
+            active_windows=windows_str,
+            available_actions=list_osworld_agent_actions(),
+        ),
+    ]
+    if continuation_context:
+        prompt_parts.append(system_prompt.CONTINUATION_REMINDER.format(continuation_context=continuation_context))
+    if state and state.results:
+        previous_results_str = system_prompt.format_previous_results(state.results)
+    elif continuation_context:
+        previous_results_str = "See continuation context above for work done before handback."
+    else:
+        previous_results_str = "None - this is the first step."
+    prompt_parts.append(system_prompt.CONTEXT_TEMPLATE.format(task=request.task, previous_results=previous_results_str))
+    if last_step_failed and failed_step_info:
+        prompt_parts.append(
+            system_prompt.FAILURE_REMINDER.format(
+                failed_task=failed_step_info.get("task", "unknown"),
+                failed_target=failed_step_info.get("target", "unknown"),
+                failed_error=failed_step_info.get("error", "unknown"),
+            )
+        )
+    return "\n".join(prompt_parts)
+
+
+def _request():
+    return OrchestratorRequest.from_task("tenant", "Triage this week's emails", user_id="user-1")
+
+
+def _result(index, summary="ok"):
+    return StepResult(
+        step_id=f"step-{index}",
+        target="mcp",
+        next_task=f"Search batch {index}",
+        verification="done",
+        status="completed",
+        success=True,
+        output={"translated": {"summary": f"{summary} {index}", "data": {"ids": [index], "empty": None}}},
+    )
+
+
+@pytest.mark.parametrize("with_results", [False, True])
+@pytest.mark.parametrize("continuation", [None, "Human signed in to the CRM."])
+@pytest.mark.parametrize("failed", [False, True])
+def test_matches_the_previous_builder_byte_for_byte(with_results, continuation, failed):
+    request = _request()
+    state = RunState(request=request)
+    if with_results:
+        state.record_result(_result(1))
+        state.record_result(_result(2))
+    kwargs = dict(
+        state=state,
+        last_step_failed=failed,
+        failed_step_info=FAILURE if failed else None,
+        continuation_context=continuation,
+    )
+
+    expected = _old_build_system_prompt(request, CAPABILITIES, **kwargs)
+    assert build_system_prompt(request, CAPABILITIES, **kwargs) == expected
+    # A long-lived builder produces the same bytes as the throwaway one.
+    builder = SystemPromptBuilder(request.user_id)
+    builder.build(request, CAPABILITIES)
+    assert builder.build(request, CAPABILITIES, **kwargs) == expected
+
+
+def test_step_blocks_are_reused_and_rerendered_when_a_result_is_replaced():
+    request = _request()
+    builder = SystemPromptBuilder(request.user_id)
+    first = _result(1)
+    provisional = _result(2, summary="draft")
+
+    speculative = builder.build(request, CAPABILITIES, state=RunState(request=request, results=[first, provisional]))
+    first_block = builder._step_blocks[0][1]
+    assert "draft 2" in speculative
+
+    final = _result(2, summary="final")
+    prompt = builder.build(request, CAPABILITIES, state=RunState(request=request, results=[first, final]))
+
+    assert builder._step_blocks[0][1] is first_block
+    assert "final 2" in prompt and "draft 2" not in prompt
+    assert builder.last_stats["cached_step_blocks"] == 2
+    assert prompt == _old_build_system_prompt(request, CAPABILITIES, state=RunState(request=request, results=[first, final]))
+
+
+def test_capability_section_rerenders_when_capabilities_change(monkeypatch):
+    monkeypatch.setattr(system_prompt, "_capability_sections", system_prompt.OrderedDict())
+    request = _request()
+    builder = SystemPromptBuilder(request.user_id)
+    before = builder.build(request, CAPABILITIES)
+    assert builder.build(request, dict(CAPABILITIES)) == before
+
+    changed = {**CAPABILITIES, "computer": {**CAPABILITIES["computer"], "available_apps": ["Finder", "Zettelkasten"]}}
+    after = builder.build(request, changed)
+
+    assert "Zettelkasten" in after and "Zettelkasten" not in before
+    assert after == _old_build_system_prompt(request, changed)
+    # Reordered providers hash and render the same.
+    reordered = {**CAPABILITIES, "mcp": {"providers": list(reversed(CAPABILITIES["mcp"]["providers"]))}}
+    assert system_prompt.capability_fingerprint(reordered) == system_prompt.capability_fingerprint(CAPABILITIES)
+    assert render_capability_section(reordered, "user-1") == render_capability_section(CAPABILITIES, "user-1")
@@ -16,6 +16,10 @@ import re
 from typing import Any, Dict, Optional
 
 from orchestrator_agent.data_types import AgentTarget
+from orchestrator_agent.structured_translator import (
+    structured_translation_enabled,
+    translate_mcp_result,
+)
 
 try:  # Optional dependency
     from shared.llm_client import LLMClient, extract_assistant_text
@@ -441,6 +445,30 @@ def _deterministic_fallback(task: str, target: AgentTarget, trajectory: str) ->
     }
 
 
+# Untranslated trajectory kept in a draft, from the end (where the outcome is).
+DRAFT_TRAJECTORY_CHARS = 12000
+
+
+def draft_step_output(
+    *,
+    task: str,
+    target: AgentTarget,
+    trajectory: str,
+    structured_result: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Canonical-shaped stand-in built without an LLM call, for speculative planning.
+
+    The structured MCP translation when available, else the deterministic
+    markdown parse, plus the (bounded) untranslated trajectory.
+    """
+    if target == "mcp" and structured_result is not None:
+        draft = translate_mcp_result(task, structured_result).translated
+    else:
+        draft = _deterministic_fallback(task, target, trajectory)
+    return {**draft, "untranslated_trajectory": trajectory[-DRAFT_TRAJECTORY_CHARS:]}
+
+
 def translate_step_output(
     *,
     task: str,
@@ -450,6 +478,7 @@ def translate_step_output(
     llm_client: Optional[Any] = None,
     llm_model: str = "o4-mini",
     max_output_tokens: int = 16000,
+    structured_result: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Translate self-contained markdown trajectory into canonical format.
@@ -457,6 +486,10 @@ def translate_step_output(
     IMPORTANT: Only trajectory is provided. NO raw_result or raw_outputs.
     The trajectory contains all necessary data.
 
+    For MCP steps, a `structured_result` (the agent's structured steps) is
+    translated directly without an LLM call unless the structured translator
+    is not confident enough; then the trajectory goes to the LLM as before.
+
     Args:
         task: The task description
         target: Agent type (mcp or computer_use)
@@ -465,6 +498,7 @@ def translate_step_output(
         llm_client: Optional LLM client
         llm_model: Model to use for translation
         max_output_tokens: Max tokens for LLM response
+        structured_result: Optional structured MCP result from the bridge
 
     Returns:
         Canonical dictionary with decisive format
@@ -476,6 +510,24 @@ def translate_step_output(
         len(trajectory),
     )
 
+    if target == "mcp" and structured_result is not None and structured_translation_enabled():
+        structured = translate_mcp_result(task, structured_result)
+        if not structured.escalate:
+            logger.info(
+                "translator.structured target=%s step_id=%s confidence=%s",
+                target,
+                debug_step_id,
+                structured.confidence,
+            )
+            return structured.translated
+        logger.info(
+            "translator.escalate target=%s step_id=%s confidence=%s reasons=%s",
+            target,
+            debug_step_id,
+            structured.confidence,
+            ",".join(structured.reasons),
+        )
+
     client = llm_client
     if client is None and LLMClient is not None:
         try:
@@ -543,4 +595,4 @@ def translate_step_output(
     return _deterministic_fallback(task, target, trajectory)
 
 
-__all__ = ["translate_step_output", "TRANSLATOR_SYSTEM_PROMPT"]
+__all__ = ["draft_step_output", "translate_step_output", "TRANSLATOR_SYSTEM_PROMPT"]
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Benchmark drive staging/commit against a fake VM controller and in-memory S3.
+
+Runs runtime.api.run_drive.stage_drive_files_for_run and
+commit_drive_changes_for_run for 1, 50 and 500 files, once sequentially
+(concurrency=1) and once with the configured pool size. Controller and storage
+calls sleep for a fixed latency so the numbers reflect round-trip overlap,
+not local CPU.
+
+Usage:
+    python scripts/bench_drive_staging.py [--latency-ms 20] [--concurrency 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from runtime.api import run_drive  # noqa: E402
+from server.api import drive_pipeline  # noqa: E402
+
+
+class InMemoryS3:
+    """Minimal AttachmentStorage stand-in backed by a dict."""
+
+    def __init__(self, latency_s: float) -> None:
+        self.latency_s = latency_s
+        self.objects: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def put(self, key: str, body: bytes) -> None:
+        with self._lock:
+            self.objects[key] = body
+
+    def generate_presigned_get(self, key: str, *, expires_in: Optional[int] = None) -> str:
+        return f"mem://get/{key}"
+
+    def generate_presigned_put(self, key: str, *, content_type: Optional[str] = None, expires_in: Optional[int] = None) -> str:
+        return f"mem://put/{key}"
+
+    def head_object(self, key: str) -> Dict[str, Any]:
+        time.sleep(self.latency_s)
+        body = self.objects[key]
+        return {"ETag": f'"{hashlib.md5(body).hexdigest()}"', "ContentLength": len(body), "ContentType": "text/plain"}
+
+
+class _Stream:
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    def iter_content(self, chunk_size: int = 1):
+        for start in range(0, len(self._body), chunk_size):
+            yield self._body[start : start + chunk_size]
+
+    def __enter__(self) -> "_Stream":
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+
+class FakeController:
+    """VM controller stand-in: a dict filesystem with per-request latency."""
+
+    def __init__(self, storage: InMemoryS3, latency_s: float) -> None:
+        self.storage = storage
+        self.latency_s = latency_s
+        self.files: Dict[str, bytes] = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _hit(self) -> None:
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.latency_s)
+
+    def wait_for_health(self) -> None:
+        return None
+
+    def execute(self, command: Any, *, shell: bool = False, setup: bool = False, timeout: Optional[float] = None):
+        self._hit()
+        return {"status": "success"}
+
+    def download_file(self, url: str, dest_path: str, *, timeout: Optional[float] = None) -> str:
+        self._hit()
+        key = url.split("mem://get/", 1)[1]
+        with self._lock:
+            self.files[dest_path] = self.storage.objects[key]
+        return dest_path
+
+    def stream_file(self, path: str, *, timeout: Optional[float] = None) -> _Stream:
+        self._hit()
+        return _Stream(self.files[path])
+
+    def upload_file(self, path: str, fileobj: Any, *, timeout: Optional[float] = None) -> None:
+        self._hit()
+        self.files[path] = fileobj.read()
+
+    def upload_file_to_url(self, path: str, url: str, *, content_type: Optional[str] = None, timeout: Optional[float] = None) -> None:
+        self._hit()
+        key = url.split("mem://put/", 1)[1]
+        self.storage.put(key, self.files[path])
+
+
+class FakeControlPlane:
+    def __init__(self, rows: List[Dict[str, Any]], changes: List[Dict[str, Any]]) -> None:
+        self.rows = rows
+        self.changes = changes
+        self.status_updates = 0
+
+    def get_drive_files(self, run_id: str, *, ensure_full: bool) -> Dict[str, Any]:
+        return {"files": self.rows}
+
+    def update_drive_file_status(self, run_id: str, payload: Dict[str, Any]) -> None:
+        self.status_updates += 1
+
+    def list_drive_changes(self, run_id: str) -> Dict[str, Any]:
+        return {"user_id": "bench-user", "changes": self.changes, "drive_files": []}
+
+    def update_drive_change_status(self, run_id: str, *, path: str, status: str, error: Optional[str] = None) -> None:
+        self.status_updates += 1
+
+
+@contextmanager
+def _patched(storage: InMemoryS3, controller: FakeController, plane: FakeControlPlane, concurrency: int):
+    saved = (
+        run_drive.get_attachment_storage,
+        run_drive.VMControllerClient,
+        run_drive.ControlPlaneClient,
+        drive_pipeline.DRIVE_TRANSFER_CONCURRENCY,
+    )
+    run_drive.get_attachment_storage = lambda: storage
+    run_drive.VMControllerClient = lambda base_url=None: controller
+    run_drive.ControlPlaneClient = lambda: plane
+    drive_pipeline.DRIVE_TRANSFER_CONCURRENCY = concurrency
+    try:
+        yield
+    finally:
+        (
+            run_drive.get_attachment_storage,
+            run_drive.VMControllerClient,
+            run_drive.ControlPlaneClient,
+            drive_pipeline.DRIVE_TRANSFER_CONCURRENCY,
+        ) = saved
+
+
+def _bench(file_count: int, latency_s: float, concurrency: int) -> Dict[str, float]:
+    storage = InMemoryS3(latency_s)
+    rows: List[Dict[str, Any]] = []
+    changes: List[Dict[str, Any]] = []
+    for idx in range(file_count):
+        drive_path = f"folder-{idx % 10}/file-{idx}.txt"
+        key = f"bench-user/drive/{drive_path}"
+        storage.put(key, f"payload {idx}".encode() * 64)
+        rows.append({"id": f"f{idx}", "drive_path": drive_path, "r2_key": key, "status": "pending"})
+        changes.append({"path": drive_path, "r2_key": f"bench-user/drive_changes/run/{drive_path}", "baseline_hash": "x"})
+
+    controller = FakeController(storage, latency_s)
+    plane = FakeControlPlane(rows, changes)
+    workspace = {"controller_base_url": "http://fake-controller"}
+    with _patched(storage, controller, plane, concurrency):
+        started = time.perf_counter()
+        manifest = run_drive.stage_drive_files_for_run("bench-run", workspace)
+        staged = time.perf_counter()
+        committed = run_drive.commit_drive_changes_for_run("bench-run", workspace)
+        finished = time.perf_counter()
+    assert len(manifest) == file_count and len(committed) == file_count
+    return {
+        "stage_s": staged - started,
+        "commit_s": finished - staged,
+        "controller_requests": controller.requests,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=drive_pipeline.DRIVE_TRANSFER_CONCURRENCY)
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1, 50, 500])
+    args = parser.parse_args()
+    latency_s = args.latency_ms / 1000.0
+
+    print(f"latency={args.latency_ms:.0f}ms pool={args.concurrency}")
+    print(f"{'files':>6} {'mode':>10} {'stage_s':>9} {'commit_s':>9} {'requests':>9}")
+    for count in args.sizes:
+        for label, concurrency in (("sequential", 1), ("pooled", args.concurrency)):
+            result = _bench(count, latency_s, concurrency)
+            print(
+                f"{count:>6} {label:>10} {result['stage_s']:>9.3f} "
+                f"{result['commit_s']:>9.3f} {result['controller_requests']:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
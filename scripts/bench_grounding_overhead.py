@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Benchmark client-side grounding overhead, excluding model latency.
+
+A local HTTP server answers /call_llm immediately, so the timings cover only
+what the agent does around the model call: screenshot decoding, WEBP/base64
+encoding and HTTP connection setup. Compares the legacy per-call path (PIL
+re-open, re-encode, new httpx.Client per attempt) against the cached
+Screenshot + pooled GroundingServiceClient path.
+
+Usage:
+    python scripts/bench_grounding_overhead.py [--steps 20] [--calls-per-step 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, List
+
+import cv2
+import httpx
+import numpy as np
+from PIL import Image
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from computer_use_agent.grounding.grounding_client import GroundingServiceClient  # noqa: E402
+from computer_use_agent.utils import screenshot as screenshot_mod  # noqa: E402
+from computer_use_agent.utils.common_utils import compress_image  # noqa: E402
+from computer_use_agent.utils.screenshot import Screenshot  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        return None
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        body = json.dumps({"response": "click(512, 384)"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _screens(count: int) -> List[str]:
+    """Base64 PNG screenshots (1920x1080) with UI-like blocks and text."""
+    rng = np.random.default_rng(0)
+    frames = []
+    for idx in range(count):
+        img = np.full((1080, 1920, 3), 245, dtype=np.uint8)
+        for _ in range(40):
+            x, y = int(rng.integers(0, 1800)), int(rng.integers(0, 1000))
+            color = tuple(int(c) for c in rng.integers(0, 255, 3))
+            cv2.rectangle(img, (x, y), (x + int(rng.integers(40, 400)), y + int(rng.integers(20, 200))), color, -1)
+        for line in range(30):
+            cv2.putText(img, f"Step {idx} row {line} lorem ipsum", (40, 40 + line * 34), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (20, 20, 20), 2)
+        ok, buf = cv2.imencode(".png", img)
+        assert ok
+        frames.append(base64.b64encode(buf.tobytes()).decode())
+    return frames
+
+
+def _payload(image_b64: str) -> dict:
+    return {"messages": [{"role": "user", "content": [{"type": "image", "image": f"data:image/webp;base64,{image_b64}"}]}]}
+
+
+def _legacy(url: str) -> Callable[[str], None]:
+    def call(screenshot_b64: str) -> None:
+        image_bytes = base64.b64decode(screenshot_b64)
+        with Image.open(BytesIO(image_bytes)) as img:
+            _ = img.size
+        compressed = compress_image(image_bytes=image_bytes)
+        image_base64 = base64.b64encode(compressed).decode("utf-8")
+        with httpx.Client(timeout=10.0) as client:
+            client.post(f"{url}/call_llm", json=_payload(image_base64)).raise_for_status()
+
+    return call
+
+
+def _pooled(url: str) -> Callable[[str], None]:
+    client = GroundingServiceClient(url)
+
+    def call(screenshot_b64: str) -> None:
+        shot = Screenshot.from_data(screenshot_b64)
+        _ = shot.size
+        client.post_json("/call_llm", _payload(shot.webp_base64), timeout_s=10.0, max_attempts=1)
+
+    return call
+
+
+def _run(call: Callable[[str], None], screens: List[str], calls_per_step: int) -> float:
+    screenshot_mod._RECENT.clear()
+    started = time.perf_counter()
+    for screen in screens:
+        for _ in range(calls_per_step):
+            call(screen)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--calls-per-step", type=int, default=2)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    screens = _screens(args.steps)
+    total_calls = args.steps * args.calls_per_step
+
+    print(f"steps={args.steps} calls/step={args.calls_per_step} (1920x1080 PNG)")
+    print(f"{'path':>8} {'total_s':>9} {'ms/call':>9}")
+    for label, factory in (("legacy", _legacy), ("pooled", _pooled)):
+        elapsed = _run(factory(url), screens, args.calls_per_step)
+        print(f"{label:>8} {elapsed:>9.3f} {elapsed / total_calls * 1000:>9.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
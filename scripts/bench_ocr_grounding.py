@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark OCR cost and text-table prompt size for text-span grounding.
+
+Renders fixture 1920x1080 "document" screenshots (an initial page, the same
+page with one edited line, and a repeat of that frame, as happens across a
+highlight_text_span step) and compares:
+
+  legacy   full-screen pytesseract on every call + concatenated table
+  cached   OcrCache (digest cache + changed-tile re-reads) + build_ocr_table
+  region   cached path restricted to a region of interest
+
+CPU time includes the Tesseract subprocesses. Requires the `tesseract` binary.
+
+Usage:
+    python scripts/bench_ocr_grounding.py [--rounds 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+import pytesseract
+from pytesseract import Output
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from computer_use_agent.grounding.ocr_cache import OcrCache, build_ocr_table  # noqa: E402
+from computer_use_agent.utils.screenshot import Screenshot  # noqa: E402
+
+REGION = (0, 0, 1920, 360)
+
+
+def _page(edited: bool) -> bytes:
+    img = np.full((1080, 1920, 3), 255, dtype=np.uint8)
+    cv2.rectangle(img, (0, 0), (1920, 40), (235, 235, 235), -1)
+    for i, label in enumerate(("File", "Edit", "View", "Insert", "Format", "Tools", "Help")):
+        cv2.putText(img, label, (20 + i * 110, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+    for line in range(24):
+        text = f"Paragraph {line} quarterly revenue grew across every region this year"
+        if edited and line == 12:
+            text = "Paragraph 12 was rewritten by the agent during this step"
+        cv2.putText(img, text, (120, 100 + line * 40), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (20, 20, 20), 2)
+    ok, buf = cv2.imencode(".png", img)
+    assert ok
+    return buf.tobytes()
+
+
+def _legacy_table(image_bytes: bytes) -> str:
+    data = pytesseract.image_to_data(Screenshot(image_bytes).pil(), output_type=Output.DICT)
+    table = "Text Table:\nWord id\tText\n"
+    ocr_id = 0
+    for word in data["text"]:
+        word = re.sub(r"^[^a-zA-Z\s.,!?;:\-\+]+|[^a-zA-Z\s.,!?;:\-\+]+$", "", word)
+        if word:
+            table += f"{ocr_id}\t{word}\n"
+            ocr_id += 1
+    return table
+
+
+def _cached_table(cache: OcrCache, image_bytes: bytes, region=None) -> str:
+    words = cache.words(Screenshot.from_data(image_bytes), region=region)
+    return build_ocr_table([{"id": i, "text": w["text"]} for i, w in enumerate(words)])
+
+
+def _cpu() -> float:
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _measure(fn, frames: List[bytes]) -> Tuple[float, float, int]:
+    cpu0, wall0 = _cpu(), time.perf_counter()
+    chars = 0
+    for frame in frames:
+        chars = len(fn(frame))
+    return _cpu() - cpu0, time.perf_counter() - wall0, chars
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    if shutil.which("tesseract") is None:
+        sys.exit("tesseract binary not found on PATH")
+
+    original, edited = _page(False), _page(True)
+    frames = [original, original, edited, edited] * args.rounds
+
+    rows = [
+        ("legacy", _legacy_table),
+        ("cached", lambda frame, cache=OcrCache(): _cached_table(cache, frame)),
+        ("region", lambda frame, cache=OcrCache(): _cached_table(cache, frame, REGION)),
+    ]
+    print(f"{len(frames)} OCR calls over 1920x1080 fixtures")
+    print(f"{'path':>8} {'cpu_s':>8} {'wall_s':>8} {'prompt_chars':>13}")
+    for label, fn in rows:
+        cpu, wall, chars = _measure(fn, frames)
+        print(f"{label:>8} {cpu:>8.2f} {wall:>8.2f} {chars:>13}")
+
+
+if __name__ == "__main__":
+    main()
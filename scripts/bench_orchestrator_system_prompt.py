@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Measure per-step orchestrator system prompt assembly, rebuilt vs cached.
+
+Replays a synthetic orchestrator run (capabilities for a user with several
+MCP providers, and N completed steps with translated payloads of a few KB)
+and builds the system prompt before every step two ways:
+
+  - rebuilt: every segment rendered from scratch each step (the previous
+    behaviour; the segment caches are cleared and a fresh builder is used);
+  - cached: one `SystemPromptBuilder` per run, with the process-wide
+    foundation and capability-section caches.
+
+Reports CPU time per step, prompt bytes, and the bytes shared with the
+previous step's prompt (the prefix a provider-side prompt cache can reuse).
+Every cached prompt is checked to be identical to the rebuilt one.
+
+Usage:
+    python scripts/bench_orchestrator_system_prompt.py [--steps 20] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from orchestrator_agent import system_prompt  # noqa: E402
+from orchestrator_agent.data_types import OrchestratorRequest, RunState, StepResult  # noqa: E402
+
+PROVIDERS = ["gmail", "slack", "hubspot", "googledocs", "googlesheets", "notion", "linear", "github"]
+
+
+def _capabilities(rng: random.Random) -> Dict[str, Any]:
+    providers = [
+        {"provider": name, "tools": [f"{name}_action_{i}" for i in range(rng.randint(4, 30))]}
+        for name in PROVIDERS
+    ]
+    return {
+        "mcp": {"providers": providers},
+        "computer": {
+            "platform": "darwin",
+            "available_apps": ["Google Chrome", "Excel", "Slack", "Finder", "TextEdit"],
+            "active_windows": [{"app_name": "Google Chrome", "title": f"Tab {i}"} for i in range(6)],
+        },
+    }
+
+
+def _result(index: int, rng: random.Random) -> StepResult:
+    records = [
+        {"id": f"{index}-{k}", "subject": f"Record {k}", "body": "lorem ipsum " * rng.randint(5, 25), "empty": None}
+        for k in range(rng.randint(3, 10))
+    ]
+    translated = {
+        "task": f"Step {index} task",
+        "overall_success": True,
+        "summary": f"Retrieved {len(records)} records for step {index}.",
+        "total_steps": 3,
+        "steps_summary": [f"call {k} ok" for k in range(3)],
+        "data": {"records": records},
+        "artifacts": {"tool_calls": [{"tool": "gmail_search", "success": True}], "ui_observations": []},
+    }
+    return StepResult(
+        step_id=f"step-{index}",
+        target="mcp" if index % 3 else "computer_use",
+        next_task=f"Use Gmail provider's gmail_search tool for batch {index}",
+        verification="Step completed",
+        status="completed",
+        success=True,
+        output={"translated": translated},
+    )
+
+
+def _clear_caches() -> None:
+    system_prompt._compiled_foundation.cache_clear()
+    system_prompt._available_actions.cache_clear()
+    system_prompt._capability_sections.clear()
+
+
+def _shared_prefix(a: str, b: str) -> int:
+    limit = min(len(a), len(b))
+    index = 0
+    while index < limit and a[index] == b[index]:
+        index += 1
+    return index
+
+
+def _run(steps: int, cached: bool, seed: int) -> Dict[str, List[Any]]:
+    rng = random.Random(seed)
+    request = OrchestratorRequest.from_task("bench", "Triage this week's customer emails and log follow-ups.", max_steps=steps)
+    request.user_id = "bench-user"
+    capabilities = _capabilities(rng)
+    state = RunState(request=request)
+    builder = system_prompt.SystemPromptBuilder(request.user_id)
+    _clear_caches()
+    out: Dict[str, List[Any]] = {"ms": [], "bytes": [], "shared": [], "prompts": []}
+    previous = ""
+    for index in range(steps):
+        failed = index > 0 and index % 7 == 0
+        info = {"task": "retry", "target": "mcp", "error": "rate limited"} if failed else None
+        if not cached:
+            _clear_caches()
+            builder = system_prompt.SystemPromptBuilder(request.user_id)
+        started = time.perf_counter()
+        prompt = builder.build(request, capabilities, state=state, last_step_failed=failed, failed_step_info=info)
+        out["ms"].append((time.perf_counter() - started) * 1000)
+        out["bytes"].append(len(prompt.encode("utf-8")))
+        out["shared"].append(len(previous[: _shared_prefix(previous, prompt)].encode("utf-8")))
+        out["prompts"].append(prompt)
+        previous = prompt
+        state.record_result(_result(index, rng))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    system_prompt._available_actions()  # import the grounding module outside the timings
+    report: Dict[str, Any] = {"steps": args.steps, "repeat": args.repeat}
+    runs = {label: [_run(args.steps, label == "cached", seed) for seed in range(args.repeat)] for label in ("rebuilt", "cached")}
+    for rebuilt, cached in zip(runs["rebuilt"], runs["cached"]):
+        assert rebuilt["prompts"] == cached["prompts"], "cached prompt differs from rebuilt prompt"
+    for label, results in runs.items():
+        ms = [v for r in results for v in r["ms"]]
+        size = [v for r in results for v in r["bytes"]]
+        shared = [v for r in results for v in r["shared"]]
+        report[label] = {
+            "cpu_ms_per_step_mean": round(statistics.mean(ms), 4),
+            "cpu_ms_per_step_p95": round(sorted(ms)[int(len(ms) * 0.95) - 1], 4),
+            "cpu_ms_last_step_mean": round(statistics.mean(r["ms"][-1] for r in results), 4),
+            "prompt_bytes_mean": round(statistics.mean(size)),
+            "shared_prefix_ratio": round(sum(shared) / sum(size), 4),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Compare prompt-cache reuse of the legacy and append-only planner layouts.
+
+Replays a synthetic 30-step MCP planner run (searches that discover tools,
+tool calls and sandbox steps with realistic observation sizes) and builds the
+planner request for every turn in both layouts:
+
+  - legacy: system prompt + one `PLANNER_STATE_JSON` developer blob + task;
+  - append-only: `PlannerTranscript` (stable prefix, one message per step).
+
+Offline (default), each request is tokenized with tiktoken (or, when its
+encoding files cannot be fetched, an approximate word/punctuation split) and the cached
+input is modeled as the longest token prefix shared with the previous request,
+rounded down to 128-token blocks above the 1024-token minimum (OpenAI prompt
+caching). Cost uses TokenCostTracker's o4-mini rates.
+
+With --live (requires OPENAI_API_KEY and network), the turns are streamed to
+the Responses API instead, and the script reports measured time to first token
+and the cost from reported usage, with and without `previous_response_id`
+chaining.
+
+Usage:
+    python scripts/bench_planner_prompt_cache.py [--steps 30]
+    python scripts/bench_planner_prompt_cache.py --live [--model o4-mini]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from mcp_agent.agent.prompts import PLANNER_PROMPT  # noqa: E402
+from mcp_agent.agent.transcript import PlannerTranscript  # noqa: E402
+from shared.token_cost_tracker import TokenCostTracker  # noqa: E402
+
+CACHE_MIN_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+PROVIDERS = ["gmail", "slack", "hubspot", "googledocs", "googlesheets", "notion", "linear", "github"]
+
+
+def _tool(provider: str, index: int, rng: random.Random) -> Dict[str, Any]:
+    name = f"{provider}_action_{index}"
+    return {
+        "tool_id": f"{provider}.{name}",
+        "server": provider,
+        "signature": f"{provider}.{name}(query, max_results=20, page_token=None)",
+        "description": f"Performs {provider} action {index} and returns matching records.",
+        "input_params": {
+            "query": "str (required)",
+            "max_results": "int (optional, default=20)",
+            "page_token": "str (optional)",
+        },
+        "output_fields": [f"items[].field_{k}: string" for k in range(rng.randint(6, 14))],
+        "has_hidden_fields": rng.random() < 0.3,
+        "score": round(rng.uniform(0.5, 0.99), 3),
+    }
+
+
+def _replay(steps: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Planner state before each turn of a synthetic run."""
+    rng = random.Random(seed)
+    provider_tree = [
+        {"provider": p, "tools": [f"{p}_action_{i}" for i in range(12)]} for p in PROVIDERS
+    ]
+    tools: List[Dict[str, Any]] = []
+    trajectory: List[Dict[str, Any]] = []
+    states = []
+    for step in range(steps):
+        states.append(
+            {
+                "task": "Summarize unread customer emails from this week and post action items to #support.",
+                "run_id": "bench",
+                "provider_tree": provider_tree,
+                "available_tools": list(tools),
+                "trajectory": list(trajectory),
+            }
+        )
+        kind = "search" if step % 5 == 0 else ("sandbox" if step % 3 == 0 else "tool")
+        if kind == "search":
+            provider = PROVIDERS[(step // 5) % len(PROVIDERS)]
+            found = [_tool(provider, i, rng) for i in range(3)]
+            tools.extend(found)
+            outcome = {"total_found": 3, "found_tool_names": [t["tool_id"] for t in found]}
+            observation: Any = None
+        else:
+            outcome = {"summary": f"step {step} ok"}
+            observation = {
+                "successful": True,
+                "data": {"items": [{"id": f"{step}-{i}", "text": "x" * rng.randint(40, 160)} for i in range(8)]},
+            }
+        trajectory.append(
+            {
+                "step": step,
+                "type": kind,
+                "action_reasoning": f"Step {step}: continue toward the task.",
+                "action_input": {"query": f"q{step}"} if kind == "search" else {"tool_id": "gmail.gmail_action_0"},
+                "action_outcome": outcome,
+                "success": True,
+                "error": None,
+                "is_smart_summary": False,
+                "observation": observation,
+                "observation_metadata": None,
+            }
+        )
+    return states
+
+
+def _legacy_messages(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    filtered = {k: v for k, v in state.items() if k not in {"run_id", "user_id"}}
+    blob = json.dumps(filtered, ensure_ascii=False, sort_keys=True, indent=2)
+    return [
+        {"role": "system", "content": PLANNER_PROMPT},
+        {"role": "developer", "content": f"PLANNER_STATE_JSON\n{blob}"},
+        {"role": "user", "content": json.dumps({"task": state["task"]}, ensure_ascii=False, sort_keys=True)},
+    ]
+
+
+_APPROX_TOKEN_RE = re.compile(r"\w{1,4}|[^\w\s]|\s+")
+
+
+class _ApproxEncoding:
+    name = "approx"
+
+    def encode(self, text: str) -> List[str]:
+        return _APPROX_TOKEN_RE.findall(text)
+
+
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return _ApproxEncoding()
+
+
+def _tokens(messages: List[Dict[str, Any]], encoding) -> List[Any]:
+    ids: List[Any] = []
+    for message in messages:
+        ids.extend(encoding.encode(f"<|{message['role']}|>"))
+        ids.extend(encoding.encode(message["content"]))
+    return ids
+
+
+def _cached(previous: List[Any], current: List[Any]) -> int:
+    shared = 0
+    for a, b in zip(previous, current):
+        if a != b:
+            break
+        shared += 1
+    if shared < CACHE_MIN_TOKENS:
+        return 0
+    return shared - (shared % CACHE_BLOCK_TOKENS)
+
+
+def _offline(turns: List[List[Dict[str, Any]]], label: str) -> Dict[str, Any]:
+    encoding = _encoding()
+    rates = TokenCostTracker.RATES_PER_TOKEN["o4-mini"]
+    previous: List[Any] = []
+    total = cached = 0
+    cost = 0.0
+    for messages in turns:
+        ids = _tokens(messages, encoding)
+        hit = _cached(previous, ids)
+        total += len(ids)
+        cached += hit
+        cost += hit * rates["input_cached"] + (len(ids) - hit) * rates["input_new"]
+        previous = ids
+    return {
+        "layout": label,
+        "tokenizer": getattr(encoding, "name", "approx"),
+        "input_tokens": total,
+        "cached_tokens": cached,
+        "cached_ratio": round(cached / total, 4) if total else 0.0,
+        "input_cost_usd": round(cost, 6),
+    }
+
+
+def _live(states: List[Dict[str, Any]], model: str, layout: str) -> Dict[str, Any]:
+    from shared.oai_client import OAIClient
+
+    client = OAIClient(default_model=model)
+    tracker = TokenCostTracker()
+    transcript = PlannerTranscript()
+    ttfts: List[float] = []
+    previous_id = None
+    seen = 0
+    for state in states:
+        if layout == "legacy":
+            messages, request, chain_id = _legacy_messages(state), None, None
+        else:
+            messages = transcript.sync(PLANNER_PROMPT, state)
+            chain_id = previous_id if layout == "chained" and seen < len(messages) else None
+            request = messages[seen:] if chain_id else None
+        first: List[float] = []
+        started = time.perf_counter()
+
+        def on_event(event: Any) -> None:
+            kind = getattr(event, "type", None) or (event.get("type") if isinstance(event, dict) else "")
+            if not first and str(kind).endswith(".delta"):
+                first.append(time.perf_counter() - started)
+
+        response = client.stream_response(
+            event_handler=on_event,
+            model=model,
+            messages=request or messages,
+            previous_response_id=chain_id,
+            reasoning_effort="low",
+            max_output_tokens=256,
+        )
+        ttfts.append(first[0] if first else time.perf_counter() - started)
+        tracker.record_response(model, f"bench.{layout}", response)
+        previous_id, seen = getattr(response, "id", None), len(messages)
+    report = tracker.cache_report()
+    ttfts.sort()
+    return {
+        "layout": layout,
+        "ttft_p50_s": round(ttfts[len(ttfts) // 2], 3),
+        "ttft_mean_s": round(sum(ttfts) / len(ttfts), 3),
+        "input_cached": report["input_cached"],
+        "input_new": report["input_new"],
+        "cached_ratio": report["cached_input_ratio"],
+        "cost_usd": report["cost_usd"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=30)
+    parser.add_argument("--live", action="store_true", help="call the Responses API (needs OPENAI_API_KEY)")
+    parser.add_argument("--model", default="o4-mini")
+    args = parser.parse_args()
+
+    states = _replay(args.steps)
+    if args.live:
+        results = [_live(states, args.model, layout) for layout in ("legacy", "append_only", "chained")]
+    else:
+        transcript = PlannerTranscript()
+        append_only = [transcript.sync(PLANNER_PROMPT, state) for state in states]
+        results = [
+            _offline([_legacy_messages(state) for state in states], "legacy"),
+            _offline(append_only, "append_only"),
+        ]
+    print(json.dumps({"steps": args.steps, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
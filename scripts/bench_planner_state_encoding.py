@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Compare the legacy and compact planner-state encodings turn by turn.
+
+Replays MCP agent trajectories through a real `AgentState` and, before every
+step, builds the planner input two ways:
+
+  - legacy: `build_planner_state()` pretty-printed with indent=2 into one
+    `PLANNER_STATE_JSON` developer message (the pre-transcript format);
+  - compact: `PlannerLLM._build_messages` (append-only transcript, frozen
+    minified steps, oldest steps collapsed within --budget tokens).
+
+It reports input tokens per turn (chars/4, the same estimate the transcript
+budgets with), serialization CPU time per turn, and decision agreement: a
+deterministic replay stand-in for the LLM reads each input and picks the next
+action (retry a failed step, follow a pagination token, call an unused
+discovered tool, search an unsearched provider, or finish); agreement is the
+share of turns where both encodings lead to the same action.
+
+Trajectories come from `AgentState.to_dict()` JSON dumps (--state-json) or,
+by default, synthetic runs with searches, failures, paginated tool calls and
+multi-kilobyte observations.
+
+Usage:
+    python scripts/bench_planner_state_encoding.py [--runs 5] [--steps 40] [--budget 24000]
+    python scripts/bench_planner_state_encoding.py --state-json run1.json run2.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from mcp_agent.agent.budget import Budget  # noqa: E402
+from mcp_agent.agent.llm import PlannerLLM  # noqa: E402
+from mcp_agent.agent.state import AgentState  # noqa: E402
+from mcp_agent.agent.state_encoder import estimate_tokens  # noqa: E402
+
+Decision = Tuple[str, str]
+PROVIDERS = ["gmail", "slack", "hubspot", "googledocs", "googlesheets", "notion", "linear", "github"]
+
+
+# --------------------------------------------------------------------------- #
+# Trajectories
+# --------------------------------------------------------------------------- #
+
+
+def _synthetic_run(seed: int, steps: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    providers = rng.sample(PROVIDERS, 5)
+    tools: List[Dict[str, Any]] = []
+    history: List[Dict[str, Any]] = []
+    searched: List[str] = []
+    for index in range(steps):
+        if index % 6 == 0 and len(searched) < len(providers):
+            provider = providers[len(searched)]
+            searched.append(provider)
+            found = [
+                {
+                    "tool_id": f"{provider}.{provider}_op_{k}",
+                    "server": provider,
+                    "signature": f"{provider}.{provider}_op_{k}(query, page_token=None)",
+                    "description": f"{provider} operation {k}",
+                    "input_params": {"query": "str (required)", "page_token": "str (optional)"},
+                    "output_fields": [f"items[].f{j}: string" for j in range(8)],
+                    "score": round(rng.uniform(0.5, 0.99), 3),
+                }
+                for k in range(2)
+            ]
+            tools.extend(found)
+            history.append(
+                {
+                    "action_type": "search",
+                    "success": True,
+                    "action_reasoning": f"Discover {provider} tools.",
+                    "action_input": {"search_query": f"{provider} data", "provider": provider, "max_limit": 5},
+                    "action_outcome": {"success": True, "total_found": 2, "found_tool_names": [t["tool_id"] for t in found]},
+                    "observation": f"Search succeeded; found 2 tools: {', '.join(t['tool_id'] for t in found)}.",
+                    "observation_metadata": {"total_found": 2, "merged_into_cache": True},
+                    "found_tools": found,
+                }
+            )
+            continue
+        tool = rng.choice(tools)["tool_id"]
+        failed = rng.random() < 0.15
+        paginated = not failed and rng.random() < 0.3
+        items = [{"id": f"{index}-{k}", "text": "lorem ipsum " * rng.randint(5, 30)} for k in range(rng.randint(5, 25))]
+        data: Dict[str, Any] = {"items": items}
+        if paginated:
+            data["next_page_token"] = f"tok-{index}"
+        history.append(
+            {
+                "action_type": "tool",
+                "success": not failed,
+                "action_reasoning": f"Fetch records with {tool}.",
+                "action_input": {"tool_id": tool, "provider": tool.split(".")[0], "tool": tool.split(".")[1], "args": {"query": f"q{index}"}},
+                "action_outcome": {"success": not failed, **({"error": "rate limited"} if failed else {})},
+                "observation": {"error": "rate limited"} if failed else {"successful": True, "data": data},
+                "observation_metadata": {"is_smart_summary": False},
+                "error": "tool_execution_failed" if failed else None,
+            }
+        )
+    return {
+        "task": "Collect this week's customer records across tools and post a digest.",
+        "provider_tree": [{"provider": p, "tools": [f"{p}_op_{k}" for k in range(6)]} for p in providers],
+        "history": history,
+    }
+
+
+def _load_dump(path: Path) -> Dict[str, Any]:
+    dump = json.loads(path.read_text(encoding="utf-8"))
+    by_id = {entry.get("tool_id"): entry for entry in dump.get("search_results") or []}
+    history = []
+    for step in dump.get("history") or []:
+        step = dict(step)
+        names = (step.get("action_outcome") or {}).get("found_tool_names") or []
+        if step.get("action_type") == "search":
+            step["found_tools"] = [by_id[name] for name in names if name in by_id]
+        history.append(step)
+    return {"task": dump.get("task", ""), "provider_tree": dump.get("provider_tree") or [], "history": history}
+
+
+# --------------------------------------------------------------------------- #
+# Replay stand-in for the planner LLM
+# --------------------------------------------------------------------------- #
+
+
+def _visible_state(messages: List[Dict[str, Any]]) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+    """(providers, tool ids, steps) as a reader of `messages` would see them."""
+    providers: List[str] = []
+    tools: Dict[str, None] = {}
+    steps: List[Dict[str, Any]] = []
+    for message in messages:
+        label, _, body = str(message["content"]).partition("\n")
+        if label == "PLANNER_STATE_JSON":
+            state = json.loads(body)
+            providers = [p.get("provider") for p in state.get("provider_tree") or []]
+            tools.update((t.get("tool_id"), None) for t in state.get("available_tools") or [])
+            steps.extend(state.get("trajectory") or [])
+        elif label == "PLANNER_CONTEXT_JSON":
+            providers = [p.get("provider") for p in json.loads(body).get("provider_tree") or []]
+        elif label == "AVAILABLE_TOOLS_JSON":
+            tools.update((t.get("tool_id"), None) for t in json.loads(body))
+        elif label == "TRAJECTORY_COLLAPSED_JSON":
+            steps.extend(json.loads(body))
+        elif label == "TRAJECTORY_STEP_JSON":
+            steps.append(json.loads(body))
+    return providers, list(tools), steps
+
+
+def _observation_text(step: Dict[str, Any]) -> str:
+    if "observation_preview" in step:
+        return str(step["observation_preview"])
+    observation = step.get("observation")
+    return observation if isinstance(observation, str) else json.dumps(observation)
+
+
+def stand_in_planner(messages: List[Dict[str, Any]]) -> Decision:
+    providers, tools, steps = _visible_state(messages)
+    used = {
+        (step.get("action_input") or {}).get("tool_id")
+        for step in steps
+        if step.get("type") == "tool" and step.get("success")
+    }
+    searched = {(step.get("action_input") or {}).get("provider") for step in steps if step.get("type") == "search"}
+    if steps:
+        last = steps[-1]
+        target = (last.get("action_input") or {}).get("tool_id") or ""
+        if last.get("success") is False:
+            return ("retry", target)
+        if "next_page_token" in _observation_text(last):
+            return ("next_page", target)
+    for tool_id in sorted(tools):
+        if tool_id not in used:
+            return ("tool", tool_id)
+    for provider in providers:
+        if provider not in searched:
+            return ("search", provider)
+    return ("finish", "")
+
+
+# --------------------------------------------------------------------------- #
+# Replay
+# --------------------------------------------------------------------------- #
+
+
+def _legacy_messages(state: AgentState) -> List[Dict[str, Any]]:
+    planner_state = dict(state.build_planner_state())
+    planner_state.pop("run_id", None)
+    planner_state.pop("user_id", None)
+    blob = json.dumps(planner_state, ensure_ascii=False, sort_keys=True, indent=2)
+    return [
+        {"role": "system", "content": state.planner_prompt},
+        {"role": "developer", "content": f"PLANNER_STATE_JSON\n{blob}"},
+        {"role": "user", "content": json.dumps({"task": state.task}, ensure_ascii=False, sort_keys=True)},
+    ]
+
+
+def _tokens(messages: List[Dict[str, Any]]) -> int:
+    return sum(estimate_tokens(str(message["content"])) for message in messages)
+
+
+def replay(run: Dict[str, Any], budget: Optional[int]) -> Dict[str, List[Any]]:
+    state = AgentState(task=run["task"], user_id="bench", request_id="bench", budget=Budget(max_steps=10_000))
+    state.provider_tree = run["provider_tree"]
+    llm = PlannerLLM(enabled=False, state_token_budget=budget or 0)
+    out: Dict[str, List[Any]] = {k: [] for k in ("legacy_tokens", "compact_tokens", "legacy_ms", "compact_ms", "agree")}
+    for step in run["history"]:
+        snapshot = state.budget_tracker.snapshot()
+        started = time.perf_counter()
+        legacy = _legacy_messages(state)
+        out["legacy_ms"].append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        compact = llm._build_messages(state, snapshot)
+        out["compact_ms"].append((time.perf_counter() - started) * 1000)
+        out["legacy_tokens"].append(_tokens(legacy))
+        out["compact_tokens"].append(_tokens(compact))
+        out["agree"].append(stand_in_planner(legacy) == stand_in_planner(compact))
+
+        if step.get("found_tools"):
+            state.merge_search_results(step["found_tools"])
+        state.record_step(
+            action_type=step["action_type"],
+            success=bool(step.get("success")),
+            action_reasoning=step.get("action_reasoning") or "",
+            action_input=step.get("action_input") or {},
+            action_outcome=step.get("action_outcome") or {},
+            error=step.get("error"),
+            is_smart_summary=bool(step.get("is_smart_summary")),
+            observation=step.get("observation"),
+            observation_metadata=step.get("observation_metadata"),
+        )
+    out["stats"] = [llm._transcript.stats()]
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--state-json", nargs="*", type=Path, default=[], help="AgentState.to_dict() dumps")
+    parser.add_argument("--runs", type=int, default=5, help="synthetic runs when no dumps are given")
+    parser.add_argument("--steps", type=int, default=40)
+    parser.add_argument("--budget", type=int, default=24_000, help="compact trajectory token budget (0 = none)")
+    args = parser.parse_args()
+
+    runs = [_load_dump(path) for path in args.state_json] or [
+        _synthetic_run(seed, args.steps) for seed in range(args.runs)
+    ]
+    merged: Dict[str, List[Any]] = {}
+    for run in runs:
+        for key, values in replay(run, args.budget).items():
+            merged.setdefault(key, []).extend(values)
+
+    def summary(tokens: List[int], ms: List[float]) -> Dict[str, Any]:
+        return {
+            "tokens_per_turn_mean": round(statistics.mean(tokens)),
+            "tokens_per_turn_max": max(tokens),
+            "tokens_last_turns_mean": round(statistics.mean(tokens[-5:])),
+            "serialize_ms_mean": round(statistics.mean(ms), 3),
+            "serialize_ms_max": round(max(ms), 3),
+        }
+
+    report = {
+        "runs": len(runs),
+        "turns": len(merged["agree"]),
+        "budget": args.budget,
+        "legacy": summary(merged["legacy_tokens"], merged["legacy_ms"]),
+        "compact": summary(merged["compact_tokens"], merged["compact_ms"]),
+        "token_reduction": round(1 - sum(merged["compact_tokens"]) / sum(merged["legacy_tokens"]), 4),
+        "decision_agreement": round(sum(merged["agree"]) / len(merged["agree"]), 4),
+        "transcripts": merged["stats"],
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
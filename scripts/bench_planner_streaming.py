@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Replay recorded planner streams through the incremental parser.
+
+Reads JSONL records of `{"name", "chunks": [[offset_ms, text], ...]}`, each a
+planner response as it was streamed (offset from request start). For every
+record it reports:
+
+  - decision_ms: when the MCP run loop can dispatch the command. That is the
+    offset of the chunk that made `parse_partial_planner_command` fire,
+    otherwise the end of the stream;
+  - full_ms: end of the stream, i.e. when a non-streaming call returns;
+  - repair: fixes `parse_planner_command` applied, or "retry" when the
+    response is unusable and would cost another LLM round trip;
+  - parse_us: parser CPU time for the whole stream (the streaming overhead).
+
+Timings come from the recorded offsets, so replays are deterministic.
+
+Usage:
+    python scripts/bench_planner_streaming.py [streams.jsonl ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from mcp_agent.agent.parser import parse_partial_planner_command, parse_planner_command  # noqa: E402
+from shared.json_stream import JSONObjectStream  # noqa: E402
+
+DEFAULT_RECORDS = REPO_ROOT / "mcp_agent" / "tests" / "fixtures" / "planner_streams.jsonl"
+
+
+def _load(paths: List[Path]) -> List[Dict[str, Any]]:
+    records = []
+    for path in paths:
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                records.append(json.loads(line))
+    return records
+
+
+def _replay(record: Dict[str, Any]) -> Dict[str, Any]:
+    chunks = record["chunks"]
+    full_ms = chunks[-1][0] if chunks else 0
+    stream = JSONObjectStream()
+    decision_ms = None
+    parse_s = 0.0
+    for offset_ms, chunk in chunks:
+        started = time.perf_counter()
+        stream.feed(chunk)
+        early = decision_ms is None and parse_partial_planner_command(stream) is not None
+        parse_s += time.perf_counter() - started
+        if early:
+            decision_ms = offset_ms
+
+    repairs: List[str] = []
+    try:
+        command_type = parse_planner_command(stream.text, repairs=repairs)["type"]
+        repair: Any = repairs or None
+    except ValueError:
+        command_type, repair = None, "retry"
+    return {
+        "name": record.get("name"),
+        "type": command_type,
+        "early": decision_ms is not None,
+        "decision_ms": decision_ms if decision_ms is not None else full_ms,
+        "full_ms": full_ms,
+        "repair": repair,
+        "parse_us": round(parse_s * 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("records", nargs="*", type=Path, default=[DEFAULT_RECORDS])
+    args = parser.parse_args()
+
+    rows = [_replay(record) for record in _load(args.records)]
+    if not rows:
+        print(json.dumps({"records": 0}))
+        return
+    early = [row for row in rows if row["early"]]
+    repaired = [row for row in rows if isinstance(row["repair"], list)]
+    report = {
+        "records": len(rows),
+        "early_rate": round(len(early) / len(rows), 4),
+        "decision_ms_mean": round(statistics.mean(row["decision_ms"] for row in rows), 1),
+        "full_ms_mean": round(statistics.mean(row["full_ms"] for row in rows), 1),
+        "saved_ms_mean_when_early": (
+            round(statistics.mean(row["full_ms"] - row["decision_ms"] for row in early), 1) if early else None
+        ),
+        "repaired": len(repaired),
+        "retries_needed": sum(row["repair"] == "retry" for row in rows),
+        "parse_us_mean": round(statistics.mean(row["parse_us"] for row in rows), 1),
+        "rows": rows,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Report storage and serialization savings of the per-run screenshot store.
+
+Feeds a recorded run's screenshots through ScreenshotStore and compares:
+
+  - bytes written by the store vs. the raw frames;
+  - HTML log size with inline data URIs vs. store references;
+  - handback snapshot JSON size with per-message data URLs vs. the shared
+    image table (generator + reflection histories).
+
+Frames come from a recorded HTML log (inline images are extracted in order),
+a directory of screenshots, or, by default, a synthetic run with waits,
+typing, short scrolls and window switches.
+
+Usage:
+    python scripts/bench_screenshot_store.py [--html logs/computer_use_logs/computer-use-<run>.html]
+    python scripts/bench_screenshot_store.py [--frames-dir recorded/] [--steps 60]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from computer_use_agent.core.mllm import LMMAgent  # noqa: E402
+from computer_use_agent.orchestrator.runner import _build_trajectory_till_now  # noqa: E402
+from computer_use_agent.utils.screenshot_store import ScreenshotStore  # noqa: E402
+
+_DATA_URI_RE = re.compile(r'src="data:image/[a-z]+;base64,([A-Za-z0-9+/=]+)"')
+
+
+class _NoEngine:
+    def generate(self, messages, **kwargs):  # pragma: no cover - never called
+        return ""
+
+
+def _synthetic_run(steps: int) -> List[bytes]:
+    rng = np.random.default_rng(0)
+    page = np.full((1080, 1920, 3), 250, dtype=np.uint8)
+    for line in range(60):
+        cv2.putText(page, f"Line {line}: the quick brown fox jumps over the lazy dog", (80, 60 + line * 40),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.9, (30, 30, 30), 2)
+    offset, typed, frames = 0, "", []
+    for step in range(steps):
+        kind = step % 6
+        if kind in (0, 1):
+            typed += "abc "
+        elif kind == 3:
+            offset += 40
+        elif kind == 5 and rng.random() < 0.3:
+            page = 255 - page  # switch to a different window
+        frame = np.roll(page, -offset, axis=0).copy()
+        cv2.rectangle(frame, (0, 1000), (1920, 1080), (235, 235, 235), -1)
+        cv2.putText(frame, typed[-80:], (40, 1050), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+        ok, buf = cv2.imencode(".png", frame)
+        frames.append(buf.tobytes())
+        frames.append(buf.tobytes())  # before/after pairs share frames across steps
+    return frames
+
+
+def _load_frames(args: argparse.Namespace) -> List[bytes]:
+    if args.html:
+        return [base64.b64decode(m) for m in _DATA_URI_RE.findall(Path(args.html).read_text())]
+    if args.frames_dir:
+        return [p.read_bytes() for p in sorted(Path(args.frames_dir).iterdir()) if p.is_file()]
+    return _synthetic_run(args.steps)
+
+
+def _inline_snapshot_size(frames: List[bytes], keep: int) -> int:
+    """Size of the snapshot as previously serialized: a data URL in every message."""
+    messages = [
+        {"role": "user", "content": [{"type": "text", "text": "obs"}, {"type": "image_url", "image_url": {
+            "url": "data:image/png;base64," + base64.b64encode(f).decode(), "detail": "high"}}]}
+        for f in frames[-keep:]
+    ]
+    return len(json.dumps({"generator_messages": messages, "reflection_messages": messages}))
+
+
+def _store_snapshot_size(frames: List[bytes], keep: int) -> int:
+    generator, reflection = LMMAgent(engine=_NoEngine()), LMMAgent(engine=_NoEngine())
+    for frame in frames[-keep:]:
+        generator.add_message("obs", image_content=frame, role="user")
+        reflection.add_message("obs", image_content=frame, role="user")
+    return len(json.dumps(_build_trajectory_till_now([], generator.messages, reflection.messages)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--html", help="recorded computer-use HTML log with inline screenshots")
+    parser.add_argument("--frames-dir", help="directory of recorded screenshots, in capture order")
+    parser.add_argument("--steps", type=int, default=60, help="steps for the synthetic run")
+    parser.add_argument("--keep", type=int, default=8, help="image turns carried in the snapshot")
+    args = parser.parse_args()
+
+    frames = _load_frames(args)
+    if not frames:
+        sys.exit("no frames found")
+    raw = sum(len(f) for f in frames)
+    inline_html = sum(len(base64.b64encode(f)) for f in frames)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ScreenshotStore(Path(tmp) / "frames")
+        refs = [store.put(f) for f in frames]
+        stats = store.stats()
+    ref_html = sum(60 + 120 * len(ref.tiles) for ref in refs)  # approx. <img> markup per reference
+
+    print(f"frames={len(frames)} unique={stats['unique_frames']} keyframes={stats['keyframes']} "
+          f"same={stats['same']} deltas={stats['deltas']}")
+    print(f"{'':>22} {'before_MB':>10} {'after_MB':>10} {'saved':>7}")
+    for label, before, after in (
+        ("stored screenshots", raw, stats["stored_bytes"]),
+        ("html image payload", inline_html, ref_html),
+        ("handback snapshot", _inline_snapshot_size(frames, args.keep), _store_snapshot_size(frames, args.keep)),
+    ):
+        saved = 1 - after / before if before else 0.0
+        print(f"{label:>22} {before / 1e6:>10.2f} {after / 1e6:>10.2f} {saved:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Replay orchestrator runs with simulated latencies, with and without speculative planning.
+
+Each simulated run executes --steps MCP steps through the real orchestrator
+loop. The agent bridge, translator and planner LLM are stand-ins that sleep
+for the configured latencies (with +-20% jitter); the planner reports a
+fixed token usage per call. With probability --paraphrase-rate the
+translator reports data the draft does not contain, so the speculative
+decision is rejected and the step is re-planned.
+
+Both modes replay from the same seed per run. The report gives the mean wall
+time per step for each mode, the reduction, and the speculation telemetry
+(hit rate, saved time, wasted planner tokens) logged with task.completed.
+
+Usage:
+    python scripts/bench_speculative_planning.py
+    python scripts/bench_speculative_planning.py --runs 10 --steps 6 --translate-ms 1500 --plan-ms 2500
+    python scripts/bench_speculative_planning.py --paraphrase-rate 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from orchestrator_agent import runtime as runtime_module  # noqa: E402
+from orchestrator_agent.data_types import OrchestratorRequest  # noqa: E402
+from orchestrator_agent.runtime import OrchestratorRuntime  # noqa: E402
+from shared.hierarchical_logger import AgentLogger  # noqa: E402
+
+PLANNER_USAGE = {"input": 6000, "output": 400}
+
+
+class Replay:
+    """Seeded stand-ins for the agent bridge, translator and planner."""
+
+    def __init__(self, args: argparse.Namespace, seed: int) -> None:
+        self.args = args
+        self.rng = random.Random(seed)
+
+    def sleep(self, ms: float) -> None:
+        time.sleep(ms * self.rng.uniform(0.8, 1.2) / 1000)
+
+    def bridge(self, target, request, step, orchestrator_state=None, structured_out=None) -> str:
+        self.sleep(self.args.agent_ms)
+        return f"## Step 1\nFetched 12 records for {step.next_task}.\n\n**Status**: completed\n"
+
+    def translate(self, *, task, target, trajectory, **kwargs) -> Dict[str, Any]:
+        self.sleep(self.args.translate_ms)
+        records = 11 if self.rng.random() < self.args.paraphrase_rate else 12
+        return {"task": task, "overall_success": True, "summary": task, "data": {"records": records}}
+
+    def planner(self, request, state, last_failed, *args, usage_out=None, **kwargs) -> Dict[str, Any]:
+        self.sleep(self.args.plan_ms)
+        if usage_out is not None:
+            for kind, tokens in PLANNER_USAGE.items():
+                usage_out[kind] = usage_out.get(kind, 0) + tokens
+        if len(state.results) < self.args.steps:
+            return {"type": "next_step", "target": "mcp", "task": f"fetch batch {len(state.results) + 1}"}
+        return {"type": "task_complete", "reasoning": "all batches fetched"}
+
+
+def _run(args: argparse.Namespace, seed: int, speculative: bool) -> float:
+    replay = Replay(args, seed)
+    runtime_module.run_agent_bridge = replay.bridge
+    runtime_module.translate_step_output = replay.translate
+    runtime = OrchestratorRuntime(speculative_planning=speculative, agent_states_provider=lambda run_id: {})
+
+    async def capabilities(request):
+        return runtime_module._EMPTY_CAPABILITIES
+
+    runtime._get_capabilities_async = capabilities
+    runtime._get_next_step = replay.planner
+    request = OrchestratorRequest.from_task(f"bench-{seed}", "Fetch all batches", max_steps=args.steps + 1)
+    started = time.perf_counter()
+    asyncio.run(runtime.run_task(request))
+    return (time.perf_counter() - started) * 1000 / args.steps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=4)
+    parser.add_argument("--agent-ms", type=float, default=300)
+    parser.add_argument("--translate-ms", type=float, default=800)
+    parser.add_argument("--plan-ms", type=float, default=1200)
+    parser.add_argument("--paraphrase-rate", type=float, default=0.2, help="share of translations the draft misses")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    runtime_module.agent_signal.register_signal_handlers = lambda: None
+    completed: List[Dict[str, Any]] = []
+    AgentLogger.log_event = lambda self, name, data=None, **kwargs: (
+        completed.append(data) if name == "task.completed" else None
+    )
+
+    per_step: Dict[str, List[float]] = {"off": [], "on": []}
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # run logs land here
+        for run in range(args.runs):
+            per_step["off"].append(_run(args, args.seed + run, False))
+            per_step["on"].append(_run(args, args.seed + run, True))
+
+    speculation = [c["speculation"] for c in completed if c and "speculation" in c]
+    hits = sum(s["hits"] for s in speculation)
+    resolved = hits + sum(s["misses"] for s in speculation)
+    off, on = statistics.mean(per_step["off"]), statistics.mean(per_step["on"])
+    report = {
+        "runs": args.runs,
+        "steps_per_run": args.steps,
+        "latencies_ms": {"agent": args.agent_ms, "translate": args.translate_ms, "plan": args.plan_ms},
+        "paraphrase_rate": args.paraphrase_rate,
+        "step_ms_mean": {"sequential": round(off, 1), "speculative": round(on, 1)},
+        "step_time_reduction": round(1 - on / off, 4) if off else None,
+        "hit_rate": round(hits / resolved, 4) if resolved else 0.0,
+        "saved_ms_total": round(sum(s["saved_ms"] for s in speculation), 1),
+        "wasted_tokens": {
+            kind: sum(s["wasted_tokens"][kind] for s in speculation) for kind in ("input", "output")
+        },
+        "planner_tokens_per_call": PLANNER_USAGE,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
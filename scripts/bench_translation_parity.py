@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Check structured (LLM-free) MCP step translation against LLM translations.
+
+Reads JSONL records of `{"name", "task", "mcp_result", "llm_translation"}`,
+where `mcp_result` is an MCP agent result (`MCPTaskResult`: success, errors
+and `steps`) and `llm_translation` is what the LLM translator produced for
+the same step. For every record it runs `translate_mcp_result` and reports:
+
+  - escalation rate (and reasons): records the runtime would still send to
+    the LLM translator;
+  - per-field agreement with the LLM translation on the fields the
+    orchestrator decides on (success, failing step, step count, tool calls,
+    searches, sandbox runs), over the non-escalated records;
+  - structured translation time, next to the recorded LLM latency when the
+    record has `llm_ms`.
+
+With --record, records without `llm_translation` are translated by the LLM
+translator from `mcp_result["trajectory_md"]` (needs LLM credentials), and
+all records are written to --out so they can be replayed later.
+
+Usage:
+    python scripts/bench_translation_parity.py [records.jsonl ...]
+    python scripts/bench_translation_parity.py --record --out recorded.jsonl dumps.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from orchestrator_agent.structured_translator import field_agreement, translate_mcp_result  # noqa: E402
+from orchestrator_agent.translator import translate_step_output  # noqa: E402
+
+DEFAULT_RECORDS = REPO_ROOT / "orchestrator_agent" / "tests" / "fixtures" / "translation_parity.jsonl"
+
+
+def _load(paths: List[Path]) -> List[Dict[str, Any]]:
+    records = []
+    for path in paths:
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                records.append(json.loads(line))
+    return records
+
+
+def _record(record: Dict[str, Any]) -> None:
+    started = time.perf_counter()
+    record["llm_translation"] = translate_step_output(
+        task=record["task"],
+        target="mcp",
+        trajectory=record["mcp_result"].get("trajectory_md") or "",
+        debug_step_id=record.get("name"),
+    )
+    record["llm_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("records", nargs="*", type=Path, default=[DEFAULT_RECORDS])
+    parser.add_argument("--record", action="store_true", help="fill missing llm_translation with the LLM translator")
+    parser.add_argument("--out", type=Path, help="write (recorded) records here")
+    args = parser.parse_args()
+
+    records = _load(args.records)
+    if args.record:
+        for record in records:
+            if "llm_translation" not in record:
+                _record(record)
+    if args.out:
+        args.out.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records), encoding="utf-8")
+
+    agreement: Dict[str, List[bool]] = {}
+    reasons: Counter = Counter()
+    structured_ms: List[float] = []
+    escalated = 0
+    mismatches = []
+    for record in records:
+        started = time.perf_counter()
+        result = translate_mcp_result(record["task"], record["mcp_result"])
+        structured_ms.append((time.perf_counter() - started) * 1000)
+        reasons.update(result.reasons)
+        if result.escalate:
+            escalated += 1
+            continue
+        if "llm_translation" not in record:
+            continue
+        fields = field_agreement(result.translated, record["llm_translation"])
+        for name, same in fields.items():
+            agreement.setdefault(name, []).append(same)
+        if not all(fields.values()):
+            mismatches.append({"name": record.get("name"), "fields": [k for k, v in fields.items() if not v]})
+
+    compared = len(next(iter(agreement.values()), []))
+    report: Dict[str, Any] = {
+        "records": len(records),
+        "escalated": escalated,
+        "escalation_rate": round(escalated / len(records), 4) if records else 0.0,
+        "escalation_reasons": dict(reasons),
+        "compared": compared,
+        "field_agreement": {name: round(sum(v) / len(v), 4) for name, v in agreement.items()},
+        "full_agreement": round(sum(all(r) for r in zip(*agreement.values())) / compared, 4) if compared else None,
+        "mismatches": mismatches,
+        "structured_ms_mean": round(statistics.mean(structured_ms), 4) if structured_ms else None,
+    }
+    llm_ms = [r["llm_ms"] for r in records if "llm_ms" in r]
+    if llm_ms:
+        report["llm_ms_mean"] = round(statistics.mean(llm_ms), 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
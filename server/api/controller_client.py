@@ -4,12 +4,15 @@ Client-side helper for interacting with the VM controller service.
 The VM service exposes a Flask API (see server implementation in vm source).
 This module provides a lightweight wrapper that:
   * Discovers the controller host/port from `.env` at the repo root.
-  * Reuses a `requests.Session` for efficiency.
-  * Exposes higher-level methods for the common VM endpoints.
+  * Shares one keep-alive connection pool per VM across every client
+    (see `controller_pool`) and records per-endpoint latency histograms.
+  * Exposes higher-level methods for the common VM endpoints, plus an
+    `AsyncVMControllerClient` so independent reads can run concurrently.
 """
 
 from __future__ import annotations
 
+import asyncio
 import os
 import io
 import time
@@ -21,6 +24,12 @@ from urllib.parse import urlparse, urlunparse
 
 import requests
 
+from server.api.controller_pool import (
+    LatencyTimer,
+    get_async_controller_client,
+    get_controller_session,
+)
+
 try:
     # Optional dependency used to load `.env` files if present.
     from dotenv import load_dotenv  # type: ignore
@@ -125,7 +134,8 @@ class VMControllerClient:
         port: Overrides env-derived port when provided.
         timeout: Default request timeout (seconds) applied to each call.
         dotenv_path: Optional path to the `.env` file that provides host/port.
-        session: Optional existing `requests.Session` to reuse.
+        session: Optional existing `requests.Session` to reuse. When omitted the
+            client borrows the shared keep-alive pool for its base URL.
     """
 
     base_url: Optional[str] = None
@@ -157,7 +167,8 @@ class VMControllerClient:
             else:
                 self.base_url = _normalize_base_url(resolved_host, resolved_port)
 
-        self._session = self.session or requests.Session()
+        self._owns_session = self.session is not None
+        self._session = self.session or get_controller_session(self.base_url)
 
     def health(
         self,
@@ -247,16 +258,18 @@ class VMControllerClient:
             )
         except Exception:
             logger.debug("VMControllerClient request %s %s (failed to log payload)", method, url)
-        response = self._session.request(
-            method,
-            url,
-            params=params,
-            json=json,
-            data=data,
-            files=files,
-            timeout=timeout or self.timeout,
-            stream=stream,
-        )
+        with LatencyTimer(method, path) as timer:
+            response = self._session.request(
+                method,
+                url,
+                params=params,
+                json=json,
+                data=data,
+                files=files,
+                timeout=timeout or self.timeout,
+                stream=stream,
+            )
+            timer.error = response.status_code not in expected_status
         logger.debug(
             "VMControllerClient response %s %s status=%s",
             method,
@@ -777,8 +790,12 @@ class VMControllerClient:
     # ------------------------------------------------------------------ #
 
     def close(self) -> None:
-        """Close the underlying session."""
-        self._session.close()
+        """
+        Close a caller-supplied session. Shared per-VM pools stay open for the
+        other clients of the same VM; see `controller_pool.close_controller_connections`.
+        """
+        if self._owns_session:
+            self._session.close()
 
     def __enter__(self) -> "VMControllerClient":
         return self
@@ -787,6 +804,154 @@ class VMControllerClient:
         self.close()
 
 
+
+class AsyncVMControllerClient:
+    """
+    Async counterpart of `VMControllerClient` for the read-heavy endpoints.
+
+    Independent calls can be awaited together, e.g.::
+
+        client = AsyncVMControllerClient.from_client(controller)
+        apps, windows, shot = await asyncio.gather(
+            client.get_apps(), client.get_active_windows(), client.capture_screenshot()
+        )
+
+    Connections come from the per-VM async pool in `controller_pool`, keyed by
+    the running event loop; latency lands in the same histograms as sync calls.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        *,
+        host: Optional[str] = None,
+        port: Optional[Union[str, int]] = None,
+        timeout: Optional[float] = 30.0,
+        dotenv_path: Optional[Union[str, Path]] = None,
+    ) -> None:
+        # Reuse the sync client's env/.env resolution of the controller address.
+        resolved = VMControllerClient(base_url=base_url, host=host, port=port, dotenv_path=dotenv_path)
+        self.base_url: str = resolved.base_url or ""
+        self.timeout = timeout or 30.0
+
+    @classmethod
+    def from_client(cls, client: VMControllerClient) -> "AsyncVMControllerClient":
+        return cls(base_url=client.base_url, timeout=client.timeout)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[JsonDict] = None,
+        json: Optional[JsonDict] = None,
+        expected_status: Iterable[int] = (200, 201),
+        timeout: Optional[float] = None,
+    ) -> Any:
+        client = get_async_controller_client(self.base_url)
+        url = f"{self.base_url}{path}"
+        logger.info("AsyncVMControllerClient request %s %s params=%s", method, url, params)
+        with LatencyTimer(method, path) as timer:
+            response = await client.request(method, url, params=params, json=json, timeout=timeout or self.timeout)
+            timer.error = response.status_code not in expected_status
+        if response.status_code not in expected_status:
+            try:
+                payload = response.json()
+            except ValueError:
+                payload = response.text
+            logger.warning(
+                "AsyncVMControllerClient unexpected status %s for %s %s payload=%s",
+                response.status_code,
+                method,
+                path,
+                payload,
+            )
+            raise VMControllerError(
+                f"Controller request to {path} failed with HTTP {response.status_code}",
+                status_code=response.status_code,
+                payload=payload,
+            )
+        return response
+
+    async def health(self, *, timeout: Optional[float] = None, path: Optional[str] = None) -> int:
+        """
+        Perform a /health request and return the HTTP status code.
+        """
+        health_path = path or os.getenv(_HEALTH_PATH_ENV_VAR, "/health")
+        if health_path and not health_path.startswith("/"):
+            health_path = f"/{health_path}"
+        response = await self._request(
+            "GET", health_path, expected_status=range(100, 600), timeout=timeout or 5.0
+        )
+        return response.status_code
+
+    async def execute(self, command: Command, *, shell: bool = False, timeout: Optional[float] = None) -> JsonDict:
+        """
+        Execute a command on the VM (`/execute`).
+        """
+        response = await self._request("POST", "/execute", json={"command": command, "shell": shell}, timeout=timeout)
+        return response.json()
+
+    async def capture_screenshot(self, *, timeout: Optional[float] = None) -> bytes:
+        """
+        Retrieve a screenshot with cursor overlay (`/screenshot`), retrying transient failures.
+        """
+        for attempt in range(_SCREENSHOT_RETRY_ATTEMPTS):
+            try:
+                response = await self._request("GET", "/screenshot", timeout=timeout)
+                return response.content
+            except VMControllerError as exc:
+                if exc.status_code not in _SCREENSHOT_RETRY_STATUS or attempt >= _SCREENSHOT_RETRY_ATTEMPTS - 1:
+                    raise
+                backoff = _exp_backoff_seconds(attempt, _SCREENSHOT_RETRY_BASE_DELAY_S)
+                logger.warning(
+                    "Transient /screenshot failure (status=%s), retrying in %.2fs (attempt %s/%s)",
+                    exc.status_code,
+                    backoff,
+                    attempt + 1,
+                    _SCREENSHOT_RETRY_ATTEMPTS,
+                )
+                await asyncio.sleep(backoff)
+        raise VMControllerError("Controller /screenshot retry failed")
+
+    async def get_platform(self, timeout: Optional[float] = None) -> str:
+        """
+        Retrieve the VM platform string (`/platform`).
+        """
+        return (await self._request("GET", "/platform", timeout=timeout)).text
+
+    async def cursor_position(self, timeout: Optional[float] = None) -> Any:
+        """
+        Retrieve cursor position tuple (`/cursor_position`).
+        """
+        return (await self._request("GET", "/cursor_position", timeout=timeout)).json()
+
+    async def screen_size(self, timeout: Optional[float] = None) -> JsonDict:
+        """
+        Retrieve the screen dimensions in pixels (`/screen_size`).
+        """
+        return (await self._request("POST", "/screen_size", json={}, timeout=timeout)).json()
+
+    async def get_apps(self, *, exclude_system: bool = True, timeout: Optional[float] = None) -> JsonDict:
+        """
+        Retrieve the list of available applications (`/apps`).
+        """
+        params = {"exclude_system": "true"} if exclude_system else None
+        return (await self._request("GET", "/apps", params=params, timeout=timeout)).json()
+
+    async def get_active_windows(self, *, exclude_system: bool = True, timeout: Optional[float] = None) -> JsonDict:
+        """
+        Retrieve information about currently active windows (`/active_windows`).
+        """
+        params = {"exclude_system": "true"} if exclude_system else None
+        return (await self._request("GET", "/active_windows", params=params, timeout=timeout)).json()
+
+    async def accessibility_tree(self, timeout: Optional[float] = None) -> JsonDict:
+        """
+        Retrieve the platform accessibility tree (`/accessibility`).
+        """
+        return (await self._request("GET", "/accessibility", timeout=timeout)).json()
+
 def _safe_json(response: requests.Response) -> Optional[Any]:
     try:
         return response.json()
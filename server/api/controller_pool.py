@@ -0,0 +1,313 @@
+"""
+Per-VM connection pools and latency histograms for VM controller traffic.
+
+Every ``VMControllerClient`` used to open its own ``requests.Session``, so the
+run_drive helpers, capability discovery and the computer-use runner each paid
+fresh TCP handshakes against the same VM. This module keeps one tuned
+keep-alive session per controller base URL (shared by every client that talks
+to that VM) plus, for async callers, one ``httpx.AsyncClient`` per base URL and
+event loop, negotiating HTTP/2 when ``h2`` is installed and the controller
+offers it.
+
+Request latency is recorded per ``METHOD /path`` into fixed-bucket histograms;
+``latency_snapshot()`` exports them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except Exception:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except Exception:
+        return default
+
+
+# Concurrent connections kept alive per VM (drive transfers run 8 wide).
+CONTROLLER_POOL_MAXSIZE = max(1, _env_int("VM_CONTROLLER_POOL_MAXSIZE", 16))
+# Distinct VMs with live pools before the least recently used one is closed.
+CONTROLLER_POOL_MAX_HOSTS = max(1, _env_int("VM_CONTROLLER_POOL_MAX_HOSTS", 32))
+CONTROLLER_KEEPALIVE_EXPIRY_S = max(1.0, _env_float("VM_CONTROLLER_KEEPALIVE_EXPIRY_SECONDS", 60.0))
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is +Inf.
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+def _pool_key(base_url: str) -> str:
+    return (base_url or "").rstrip("/").lower()
+
+
+# ---------------------------------------------------------------------- #
+# Sync sessions
+# ---------------------------------------------------------------------- #
+
+_sessions: "OrderedDict[str, requests.Session]" = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    # Retries stay with the callers (screenshot retry loop, drive backoff).
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=CONTROLLER_POOL_MAXSIZE, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def get_controller_session(base_url: str) -> requests.Session:
+    """Return the shared keep-alive session for the controller at ``base_url``."""
+    key = _pool_key(base_url)
+    evicted: List[requests.Session] = []
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _new_session()
+            _sessions[key] = session
+            while len(_sessions) > CONTROLLER_POOL_MAX_HOSTS:
+                _, old = _sessions.popitem(last=False)
+                evicted.append(old)
+        else:
+            _sessions.move_to_end(key)
+    for old in evicted:
+        old.close()
+    return session
+
+
+# ---------------------------------------------------------------------- #
+# Async clients
+# ---------------------------------------------------------------------- #
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+_async_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # type: ignore  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def get_async_controller_client(base_url: str) -> Any:
+    """
+    Return the ``httpx.AsyncClient`` for ``base_url`` bound to the running loop.
+
+    httpx clients cannot be shared across event loops, so pools are keyed by
+    loop as well as host.
+    """
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    key = _pool_key(base_url)
+    with _async_lock:
+        per_loop = _async_clients.setdefault(loop, {})
+        client = per_loop.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=_http2_available(),
+                limits=httpx.Limits(
+                    max_connections=CONTROLLER_POOL_MAXSIZE,
+                    max_keepalive_connections=CONTROLLER_POOL_MAXSIZE,
+                    keepalive_expiry=CONTROLLER_KEEPALIVE_EXPIRY_S,
+                ),
+            )
+            per_loop[key] = client
+    return client
+
+
+def close_controller_connections(base_url: Optional[str] = None) -> None:
+    """Close pooled sync sessions for ``base_url`` (or every VM when omitted)."""
+    with _sessions_lock:
+        if base_url is None:
+            sessions = list(_sessions.values())
+            _sessions.clear()
+        else:
+            session = _sessions.pop(_pool_key(base_url), None)
+            sessions = [session] if session is not None else []
+    for session in sessions:
+        session.close()
+
+
+async def aclose_controller_connections(base_url: Optional[str] = None) -> None:
+    """Close the running loop's async clients for ``base_url`` (or all of them)."""
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        per_loop = _async_clients.get(loop) or {}
+        if base_url is None:
+            clients = list(per_loop.values())
+            per_loop.clear()
+        else:
+            client = per_loop.pop(_pool_key(base_url), None)
+            clients = [client] if client is not None else []
+    for client in clients:
+        await client.aclose()
+
+
+_bridge_loop: Optional[asyncio.AbstractEventLoop] = None
+_bridge_lock = threading.Lock()
+
+
+def _get_bridge_loop() -> asyncio.AbstractEventLoop:
+    global _bridge_loop
+    with _bridge_lock:
+        if _bridge_loop is None or _bridge_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="controller-async", daemon=True).start()
+            _bridge_loop = loop
+        return _bridge_loop
+
+
+def run_controller_coroutine(coro: Any, *, timeout: Optional[float] = None) -> Any:
+    """
+    Run an async controller coroutine from synchronous code.
+
+    Uses one long-lived background loop so its async clients (and their
+    keep-alive connections) survive between calls, and works even when the
+    caller is itself running inside an event loop.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_bridge_loop())
+    return future.result(timeout)
+
+
+# ---------------------------------------------------------------------- #
+# Latency histograms
+# ---------------------------------------------------------------------- #
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (cumulative export, Prometheus-style)."""
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.errors = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float, *, error: bool = False) -> None:
+        self.counts[bisect.bisect_left(self.buckets_ms, duration_ms)] += 1
+        self.count += 1
+        self.sum_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        if error:
+            self.errors += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound containing the q-quantile (max for the +Inf bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return float(self.buckets_ms[idx]) if idx < len(self.buckets_ms) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets: Dict[str, int] = {}
+        for bound, bucket_count in zip(list(self.buckets_ms) + ["+Inf"], self.counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "sum_ms": round(self.sum_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets_ms": buckets,
+        }
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def record_latency(method: str, path: str, duration_s: float, *, error: bool = False) -> None:
+    endpoint = f"{method.upper()} {path.split('?', 1)[0]}"
+    with _histograms_lock:
+        histogram = _histograms.get(endpoint)
+        if histogram is None:
+            histogram = _histograms[endpoint] = LatencyHistogram()
+        histogram.observe(duration_s * 1000.0, error=error)
+
+
+def latency_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Per-endpoint controller latency histograms recorded by this process."""
+    with _histograms_lock:
+        return {endpoint: hist.snapshot() for endpoint, hist in sorted(_histograms.items())}
+
+
+def reset_latency() -> None:
+    with _histograms_lock:
+        _histograms.clear()
+
+
+class LatencyTimer:
+    """Context manager recording one controller request into the histograms."""
+
+    def __init__(self, method: str, path: str) -> None:
+        self.method = method
+        self.path = path
+        self.error = False
+        self._started = 0.0
+
+    def __enter__(self) -> "LatencyTimer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        record_latency(
+            self.method,
+            self.path,
+            time.perf_counter() - self._started,
+            error=self.error or exc_type is not None,
+        )
+
+
+__all__ = [
+    "CONTROLLER_POOL_MAXSIZE",
+    "LatencyHistogram",
+    "LatencyTimer",
+    "aclose_controller_connections",
+    "close_controller_connections",
+    "get_async_controller_client",
+    "get_controller_session",
+    "latency_snapshot",
+    "record_latency",
+    "reset_latency",
+    "run_controller_coroutine",
+]
@@ -0,0 +1,367 @@
+"""Bounded-concurrency helpers shared by the server and runtime drive staging paths.
+
+Staging and committing a run's drive used to walk files one at a time, so a run
+with dozens of attachments spent minutes in round trips before the agent
+started. These helpers let both ``run_drive`` modules:
+
+  * create every unique parent directory on the VM up front in a few commands,
+  * run per-file transfers on a small thread pool with retry + backoff, and
+  * publish aggregated progress instead of one log line per file.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import ntpath
+import os
+import posixpath
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from pathlib import PurePosixPath, PureWindowsPath
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+from shared.streaming import emit_event
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except Exception:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except Exception:
+        return default
+
+
+DRIVE_TRANSFER_CONCURRENCY = max(1, _env_int("DRIVE_TRANSFER_CONCURRENCY", 8))
+DRIVE_TRANSFER_ATTEMPTS = max(1, _env_int("DRIVE_TRANSFER_ATTEMPTS", 3))
+DRIVE_TRANSFER_BACKOFF_S = max(0.0, _env_float("DRIVE_TRANSFER_BACKOFF_S", 0.5))
+# Keep mkdir command lines well under typical ARG_MAX / cmd.exe limits.
+DRIVE_MKDIR_BATCH = max(1, _env_int("DRIVE_MKDIR_BATCH", 64))
+PROGRESS_INTERVAL_S = 1.0
+
+
+def _parent_dir(path: str, *, windows: bool) -> str:
+    return str(PureWindowsPath(path).parent) if windows else str(PurePosixPath(path).parent)
+
+
+def ensure_vm_dirs(controller: Any, dest_paths: Iterable[str], *, windows: bool) -> int:
+    """Create the parent directory of every destination path with batched commands.
+
+    Returns the number of unique directories requested.
+    """
+    parents = sorted({parent for parent in (_parent_dir(p, windows=windows) for p in dest_paths) if parent})
+    # Creating a leaf creates its ancestors too, so only leaves need a command.
+    leaves = [
+        parent
+        for idx, parent in enumerate(parents)
+        if not any(other != parent and _is_ancestor(parent, other, windows=windows) for other in parents[idx + 1 :])
+    ]
+    for start in range(0, len(leaves), DRIVE_MKDIR_BATCH):
+        batch = leaves[start : start + DRIVE_MKDIR_BATCH]
+        if windows:
+            quoted = ",".join(f'\\"{path}\\"' for path in batch)
+            try:
+                controller.execute(
+                    f'powershell -NoProfile -Command "New-Item -ItemType Directory -Force -Path {quoted}"',
+                    shell=True,
+                    setup=True,
+                )
+            except Exception:
+                for path in batch:
+                    controller.execute(["cmd", "/c", "mkdir", path], setup=True)
+        else:
+            controller.execute(["mkdir", "-p", *batch], setup=True)
+    return len(parents)
+
+
+def _is_ancestor(parent: str, other: str, *, windows: bool) -> bool:
+    base = PureWindowsPath(parent) if windows else PurePosixPath(parent)
+    candidate = PureWindowsPath(other) if windows else PurePosixPath(other)
+    return base in candidate.parents
+
+
+def call_with_retries(
+    fn: Callable[[], R],
+    *,
+    label: str,
+    attempts: Optional[int] = None,
+    backoff_s: Optional[float] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> R:
+    """Call ``fn`` with exponential backoff, re-raising the last error."""
+    total = attempts or DRIVE_TRANSFER_ATTEMPTS
+    base_delay = DRIVE_TRANSFER_BACKOFF_S if backoff_s is None else backoff_s
+    for attempt in range(total):
+        try:
+            return fn()
+        except Exception as exc:
+            if attempt + 1 >= total:
+                raise
+            delay = base_delay * (2 ** attempt)
+            logger.warning(
+                "[drive] %s failed (attempt %s/%s): %s; retrying in %.2fs",
+                label,
+                attempt + 1,
+                total,
+                exc,
+                delay,
+            )
+            if delay:
+                sleep(delay)
+    raise RuntimeError("unreachable")  # pragma: no cover
+
+
+class DriveProgress:
+    """Aggregate per-file completions into throttled progress events."""
+
+    def __init__(
+        self,
+        event: str,
+        *,
+        run_id: str,
+        total: int,
+        callback: Optional[ProgressCallback] = None,
+        interval_s: float = PROGRESS_INTERVAL_S,
+    ) -> None:
+        self.event = event
+        self.run_id = run_id
+        self.total = total
+        self.callback = callback
+        self.interval_s = interval_s
+        self.done = 0
+        self.failed = 0
+        self.bytes = 0
+        self._started = time.monotonic()
+        self._last_emit = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "bytes": self.bytes,
+            "elapsed_s": round(time.monotonic() - self._started, 3),
+        }
+
+    def advance(self, *, ok: bool = True, size: Optional[int] = None) -> None:
+        with self._lock:
+            if ok:
+                self.done += 1
+            else:
+                self.failed += 1
+            self.bytes += size or 0
+            now = time.monotonic()
+            finished = self.done + self.failed >= self.total
+            if not finished and now - self._last_emit < self.interval_s:
+                return
+            self._last_emit = now
+            payload = self.snapshot()
+        self._publish(payload)
+
+    def finish(self) -> Dict[str, Any]:
+        payload = self.snapshot()
+        logger.info(
+            "[drive] %s run=%s done=%s failed=%s total=%s bytes=%s elapsed=%.2fs",
+            self.event,
+            self.run_id,
+            payload["done"],
+            payload["failed"],
+            payload["total"],
+            payload["bytes"],
+            payload["elapsed_s"],
+        )
+        return payload
+
+    def _publish(self, payload: Dict[str, Any]) -> None:
+        emit_event(self.event, payload)
+        if self.callback is not None:
+            try:
+                self.callback(dict(payload, event=self.event))
+            except Exception:
+                logger.debug("[drive] progress callback failed", exc_info=True)
+
+
+_SCAN_SENTINEL = "___TB_DRIVE_SCAN___"
+
+# Executed on the VM through the controller's /run_python endpoint. Walks the
+# drive tree once and hashes only files whose (size, mtime_ns) differ from the
+# baseline recorded at staging time.
+_SCAN_SCRIPT = r"""
+import hashlib
+import json
+import os
+
+PARAMS = json.loads(__PARAMS__)
+root = PARAMS["root"]
+baseline_path = PARAMS.get("baseline_path")
+baseline = {}
+if baseline_path and os.path.exists(baseline_path):
+    try:
+        with open(baseline_path, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+    except Exception:
+        baseline = {}
+
+entries = []
+errors = []
+hashed = 0
+reused = 0
+for dirpath, _dirnames, filenames in os.walk(root):
+    for name in filenames:
+        path = os.path.normpath(os.path.join(dirpath, name))
+        try:
+            st = os.stat(path)
+            prior = baseline.get(path)
+            if prior and prior[0] == st.st_size and prior[1] == st.st_mtime_ns:
+                digest = prior[2]
+                reused += 1
+            else:
+                hasher = hashlib.sha256()
+                with open(path, "rb") as fh:
+                    for chunk in iter(lambda: fh.read(4 * 1024 * 1024), b""):
+                        hasher.update(chunk)
+                digest = hasher.hexdigest()
+                hashed += 1
+        except OSError as exc:
+            errors.append([path, str(exc)])
+            continue
+        entries.append([path, st.st_size, st.st_mtime_ns, digest])
+
+if PARAMS.get("write_baseline") and baseline_path:
+    os.makedirs(os.path.dirname(baseline_path) or ".", exist_ok=True)
+    tmp_path = baseline_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump({e[0]: [e[1], e[2], e[3]] for e in entries}, fh)
+    os.replace(tmp_path, baseline_path)
+
+print(PARAMS["sentinel"] + json.dumps({"entries": entries, "errors": errors, "hashed": hashed, "reused": reused}))
+"""
+
+
+def normalize_vm_path(path: str, *, windows: bool) -> str:
+    return ntpath.normpath(path) if windows else posixpath.normpath(path)
+
+
+def scan_vm_tree(
+    controller: Any,
+    root: str,
+    *,
+    windows: bool,
+    baseline_path: Optional[str] = None,
+    write_baseline: bool = False,
+    timeout_seconds: int = 300,
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Return ``{vm_path: {size, mtime_ns, sha256}}`` for every file under ``root``.
+
+    Runs as one ``run_python`` round trip on the VM instead of streaming each
+    file back. Files whose size and mtime match ``baseline_path`` reuse the
+    recorded digest; ``write_baseline`` refreshes that baseline. Returns None
+    when the controller cannot run the scan so callers can fall back to
+    per-file hashing.
+    """
+    run_python = getattr(controller, "run_python", None)
+    if not callable(run_python):
+        return None
+    params = {
+        "root": root,
+        "baseline_path": baseline_path,
+        "write_baseline": write_baseline,
+        "sentinel": _SCAN_SENTINEL,
+    }
+    code = _SCAN_SCRIPT.replace("__PARAMS__", repr(json.dumps(params)))
+    try:
+        response = run_python(code, timeout_seconds=timeout_seconds, timeout=timeout_seconds + 30)
+    except Exception as exc:
+        logger.warning("[drive] VM scan of %s failed: %s", root, exc)
+        return None
+
+    output = (response or {}).get("output") or ""
+    if (response or {}).get("status") != "success" or _SCAN_SENTINEL not in output:
+        logger.warning(
+            "[drive] VM scan of %s returned no manifest: %s",
+            root,
+            (response or {}).get("error") or (response or {}).get("message"),
+        )
+        return None
+    try:
+        payload = json.loads(output.rsplit(_SCAN_SENTINEL, 1)[1].strip())
+    except ValueError as exc:
+        logger.warning("[drive] VM scan of %s returned malformed manifest: %s", root, exc)
+        return None
+
+    for path, error in payload.get("errors") or []:
+        logger.warning("[drive] VM scan could not hash %s: %s", path, error)
+    logger.info(
+        "[drive] VM scan of %s: %s files (%s hashed, %s reused from baseline)",
+        root,
+        len(payload.get("entries") or []),
+        payload.get("hashed"),
+        payload.get("reused"),
+    )
+    return {
+        normalize_vm_path(path, windows=windows): {"size": size, "mtime_ns": mtime_ns, "sha256": digest}
+        for path, size, mtime_ns, digest in payload.get("entries") or []
+    }
+
+
+def run_bounded(
+    items: Sequence[T],
+    worker: Callable[[T], R],
+    *,
+    concurrency: Optional[int] = None,
+    fail_fast: bool = False,
+) -> List["Future[R]"]:
+    """Run ``worker`` over ``items`` on a bounded pool and return futures in input order.
+
+    With ``fail_fast`` the first failure cancels work that has not started yet;
+    already-running transfers are allowed to finish.
+    """
+    if not items:
+        return []
+    workers = max(1, min(concurrency or DRIVE_TRANSFER_CONCURRENCY, len(items)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="drive") as pool:
+        # Carry the caller's context (stream emitter, run id) into pool threads.
+        futures = [pool.submit(contextvars.copy_context().run, worker, item) for item in items]
+        if fail_fast:
+            wait(futures, return_when=FIRST_EXCEPTION)
+            if any(f.done() and not f.cancelled() and f.exception() is not None for f in futures):
+                for future in futures:
+                    future.cancel()
+    return futures
+
+
+__all__ = [
+    "DRIVE_TRANSFER_ATTEMPTS",
+    "DRIVE_TRANSFER_BACKOFF_S",
+    "DRIVE_TRANSFER_CONCURRENCY",
+    "DriveProgress",
+    "ProgressCallback",
+    "call_with_retries",
+    "ensure_vm_dirs",
+    "normalize_vm_path",
+    "run_bounded",
+    "scan_vm_tree",
+]
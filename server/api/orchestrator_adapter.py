@@ -77,6 +77,8 @@ def orchestrate_to_orchestrator(
             "max_trajectory_length": req.worker.max_trajectory_length,
             "enable_reflection": req.worker.enable_reflection,
             "post_action_worker_delay": req.worker.post_action_worker_delay,
+            "adaptive_settle": req.worker.adaptive_settle,
+            "narration_lag_limit": req.worker.narration_lag_limit,
         },
         "grounding": {
             "engine_params_for_generation": req.grounding.engine_params_for_generation,
@@ -88,6 +90,8 @@ def orchestrate_to_orchestrator(
             "grounding_timeout": req.grounding.grounding_timeout,
             "grounding_max_retries": req.grounding.grounding_max_retries,
             "grounding_api_key": req.grounding.grounding_api_key,
+            "grounding_cache_size": req.grounding.grounding_cache_size,
+            "grounding_cache_max_distance": req.grounding.grounding_cache_max_distance,
         },
         "platform": req.platform,
     }
@@ -43,6 +43,8 @@ async def compose_task(
     Request body:
       - task: str (required) – raw user task description
       - tool_constraints: Optional[dict] – forwarded to compose_plan for context
+      - workflow_id: Optional[str] – workflow the plan is for; its cached plans
+        are dropped when the workflow's prompt changes
       - platform: Optional[str] – platform hint ("darwin", "windows", "linux")
         defaults to "darwin" if not provided
 
@@ -103,7 +105,13 @@ async def compose_task(
 
     tool_constraints = payload.get("tool_constraints")
     logger.info(f"Calling compose_plan for task: {task[:100]}...")
-    plan = compose_plan(task, capabilities, tool_constraints=tool_constraints)
+    plan = compose_plan(
+        task,
+        capabilities,
+        tool_constraints=tool_constraints,
+        user_id=user_id,
+        workflow_id=payload.get("workflow_id"),
+    )
     logger.info(f"compose_plan completed - returned plan with {len(plan.get('steps', []))} steps, schema_version={plan.get('schema_version')}")
     draft_id = str(uuid.uuid4())
     suggested_name = payload.get("name") or task[:80]
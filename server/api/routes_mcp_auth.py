@@ -12,6 +12,7 @@ from mcp_agent.registry import crud
 from mcp_agent.core.context import AgentContext
 from mcp_agent.registry.oauth import (
     OAuthManager,
+    notify_connection_changed,
     COMPOSIO_HOST as _COMPOSIO_API_BASE,
     COMPOSIO_KEY as _COMPOSIO_KEY,
     COMPOSIO_API_V3 as _COMPOSIO_API_V3,
@@ -479,8 +480,8 @@ def disconnect(provider: str, request: Request, connected_account_id: str | None
         else:
             summary = crud.disconnect_provider(db, user_id, provider)
 
-    # Invalidate cache when provider is disconnected
-    OAuthManager._invalidate_cache(user_id, provider)
+    # Invalidate caches when provider is disconnected
+    notify_connection_changed(user_id, provider)
 
     # Re-register actions (removes tools from ACI)
     # Registry is DB-backed, no manual refresh needed
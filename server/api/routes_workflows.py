@@ -30,6 +30,7 @@ from mcp_agent.registry.connected_accounts import (
     resolve_tool_constraint_providers,
 )
 from shared.db import (
+    composed_plans,
     profiles,
     workflow_files,
     workflow_run_drive_changes,
@@ -717,6 +718,7 @@ def delete_workflow(
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="workflow_not_found") from exc
         raise
 
+    composed_plans.invalidate_quietly(workflow_id=workflow_id)
     return {"deleted": True}
 
 
@@ -1067,6 +1069,8 @@ def update_workflow(
 
     if updated is None:
         raise HTTPException(status_code=500, detail="failed_to_update_workflow")
+    if "prompt" in update_fields:
+        composed_plans.invalidate_quietly(workflow_id=workflow_id)
     updated["plan"] = updated.get("definition_json")
     return {"workflow": updated}
 
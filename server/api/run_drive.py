@@ -21,6 +21,15 @@ from shared.db.models import WorkflowRunDriveChange, WorkflowRunFile
 from shared.db import workflow_run_drive_changes, workflow_run_files, workflow_runs
 from shared.storage import get_attachment_storage, AttachmentStorageError
 from server.api.controller_client import VMControllerClient
+from server.api.drive_pipeline import (
+    DriveProgress,
+    ProgressCallback,
+    call_with_retries,
+    ensure_vm_dirs,
+    normalize_vm_path,
+    run_bounded,
+    scan_vm_tree,
+)
 from server.api.drive_utils import build_drive_changes_key, build_drive_key, normalize_drive_path
 
 logger = logging.getLogger(__name__)
@@ -203,8 +212,127 @@ def _drive_path_from_vm_path(vm_path: str, *, base_path: str, windows: bool) ->
         return None
 
 
-def stage_drive_files_for_run(run_id: str, workspace: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Download drive files for a run into its VM workspace."""
+def _baseline_path(*, windows: bool) -> str:
+    manifest_path = _manifest_path(DRIVE_VM_BASE_PATH, windows=windows)
+    if windows:
+        return str(PureWindowsPath(manifest_path).parent / ".drive_baseline.json")
+    return str(PurePosixPath(manifest_path).parent / ".drive_baseline.json")
+
+
+def _scan_drive(controller: VMControllerClient, *, windows: bool, write_baseline: bool = False) -> Optional[Dict[str, Dict[str, Any]]]:
+    return scan_vm_tree(
+        controller,
+        DRIVE_VM_BASE_PATH,
+        windows=windows,
+        baseline_path=_baseline_path(windows=windows),
+        write_baseline=write_baseline,
+        timeout_seconds=DOWNLOAD_TIMEOUT,
+    )
+
+
+def _hash_from_scan(
+    controller: VMControllerClient,
+    scanned: Optional[Dict[str, Dict[str, Any]]],
+    path: str,
+    *,
+    windows: bool,
+) -> Tuple[str, int]:
+    """Look ``path`` up in a VM scan, streaming it back only when the scan missed it."""
+    if scanned is not None:
+        entry = scanned.get(normalize_vm_path(path, windows=windows))
+        if entry is not None:
+            return entry["sha256"], entry["size"]
+    return _hash_vm_file(controller, path)
+
+
+def _download_one_file(controller: VMControllerClient, storage: Any, job: Dict[str, Any]) -> Dict[str, Any]:
+    """Download one drive file onto the VM; runs on a pool thread."""
+    drive_path = job["drive_path"]
+    r2_key = job["r2_key"]
+    download_url = storage.generate_presigned_get(r2_key)
+
+    etag = None
+    content_type = job.get("content_type")
+    try:
+        head = storage.head_object(r2_key)
+        etag = (head.get("ETag") or "").strip('"') or None
+        if not content_type:
+            content_type = head.get("ContentType")
+    except Exception:
+        pass
+    if not content_type:
+        content_type = mimetypes.guess_type(drive_path)[0]
+
+    call_with_retries(
+        lambda: controller.download_file(download_url, job["dest_path"], timeout=DOWNLOAD_TIMEOUT),
+        label=f"download {drive_path}",
+    )
+    return {"etag": etag, "content_type": content_type}
+
+
+def _stage_files(
+    controller: VMControllerClient,
+    storage: Any,
+    jobs: List[Dict[str, Any]],
+    progress: DriveProgress,
+    *,
+    windows: bool,
+) -> List[Any]:
+    """Download ``jobs`` on the transfer pool, then hash them with one VM scan.
+
+    Returns one outcome per job: the staged metadata dict, the exception that
+    failed it, or None when it was cancelled after another file failed.
+    """
+    outcomes: List[Any] = []
+    for future in run_bounded(jobs, lambda job: _download_one_file(controller, storage, job), fail_fast=True):
+        if future.cancelled():
+            outcomes.append(None)
+        elif future.exception() is not None:
+            outcomes.append(future.exception())
+            progress.advance(ok=False)
+        else:
+            outcomes.append(future.result())
+    if any(isinstance(outcome, BaseException) for outcome in outcomes):
+        # Unhashed downloads are left pending and restaged on the next attempt.
+        return [outcome if isinstance(outcome, BaseException) else None for outcome in outcomes]
+
+    scanned = _scan_drive(controller, windows=windows, write_baseline=True)
+
+    def _hash(index: int) -> None:
+        dest_path = jobs[index]["dest_path"]
+        try:
+            checksum, size = call_with_retries(
+                lambda: _hash_from_scan(controller, scanned, dest_path, windows=windows),
+                label=f"hash {jobs[index]['drive_path']}",
+            )
+        except Exception:
+            progress.advance(ok=False)
+            raise
+        outcomes[index].update(checksum=checksum, size=size)
+        progress.advance(size=size)
+
+    indices = list(range(len(jobs)))
+    for index, future in zip(indices, run_bounded(indices, _hash, fail_fast=True)):
+        if future.cancelled():
+            outcomes[index] = None
+        elif future.exception() is not None:
+            outcomes[index] = future.exception()
+    return outcomes
+
+
+def stage_drive_files_for_run(
+    run_id: str,
+    workspace: Dict[str, Any],
+    *,
+    on_progress: Optional[ProgressCallback] = None,
+) -> List[Dict[str, Any]]:
+    """Download drive files for a run into its VM workspace.
+
+    Transfers run on a bounded pool (``DRIVE_TRANSFER_CONCURRENCY``) with
+    per-file retries; ``on_progress`` receives aggregated progress snapshots.
+    Checksums come from a single VM-side scan, which also records the
+    size/mtime baseline that ``detect_drive_changes`` uses to skip rehashing.
+    """
     controller_url = workspace.get("controller_base_url")
     if not controller_url:
         raise DriveStageError("workspace missing controller_base_url")
@@ -247,8 +375,9 @@ def stage_drive_files_for_run(run_id: str, workspace: Dict[str, Any]) -> List[Di
         controller.wait_for_health()
         windows = _is_windows_path(DRIVE_VM_BASE_PATH)
 
-        manifest: List[Dict[str, Any]] = []
         now = datetime.now(timezone.utc)
+        manifest_slots: List[Optional[Dict[str, Any]]] = []
+        jobs: List[Dict[str, Any]] = []
 
         for row in rows:
             drive_path = row.get("drive_path") or row.get("filename")
@@ -258,7 +387,7 @@ def stage_drive_files_for_run(run_id: str, workspace: Dict[str, Any]) -> List[Di
                 continue
 
             if row.get("status") == "ready" and row.get("vm_path"):
-                manifest.append(
+                manifest_slots.append(
                     {
                         "path": drive_path,
                         "r2_key": r2_key,
@@ -273,59 +402,74 @@ def stage_drive_files_for_run(run_id: str, workspace: Dict[str, Any]) -> List[Di
                 base_path=DRIVE_VM_BASE_PATH,
                 windows=windows,
             )
-            download_url = storage.generate_presigned_get(r2_key)
-
-            etag = None
-            content_type = row.get("content_type")
-            try:
-                head = storage.head_object(r2_key)
-                etag = (head.get("ETag") or "").strip('"') or None
-                if not content_type:
-                    content_type = head.get("ContentType")
-            except Exception:
-                pass
-            if not content_type:
-                content_type = mimetypes.guess_type(drive_path)[0]
+            jobs.append(
+                {
+                    "slot": len(manifest_slots),
+                    "id": row.get("id") or "",
+                    "drive_path": drive_path,
+                    "r2_key": r2_key,
+                    "dest_path": dest_path,
+                    "content_type": row.get("content_type"),
+                }
+            )
+            manifest_slots.append(None)
 
+        if jobs:
             try:
-                _ensure_vm_dir(controller, dest_path, windows=windows)
-                controller.download_file(download_url, dest_path, timeout=DOWNLOAD_TIMEOUT)
-                checksum, size = _hash_vm_file(controller, dest_path)
+                call_with_retries(
+                    lambda: ensure_vm_dirs(controller, [job["dest_path"] for job in jobs], windows=windows),
+                    label="mkdir",
+                )
             except Exception as exc:
-                logger.exception("[drive] failed transfer id=%s path=%s", row.get("id"), dest_path)
-                workflow_run_files.mark_failed(
+                raise DriveStageError("failed_to_create_drive_dirs") from exc
+
+            progress = DriveProgress("drive.stage.progress", run_id=run_id, total=len(jobs), callback=on_progress)
+            outcomes = _stage_files(controller, storage, jobs, progress, windows=windows)
+            failure: Optional[Tuple[Dict[str, Any], BaseException]] = None
+            for job, outcome in zip(jobs, outcomes):
+                if outcome is None:
+                    continue
+                if isinstance(outcome, BaseException):
+                    exc = outcome
+                    logger.error(
+                        "[drive] failed transfer id=%s path=%s: %s", job["id"], job["dest_path"], exc
+                    )
+                    workflow_run_files.mark_failed(
+                        db,
+                        run_file_id=job["id"],
+                        error=str(exc),
+                        updated_at=now,
+                    )
+                    failure = failure or (job, exc)
+                    continue
+
+                staged = outcome
+                workflow_run_files.mark_ready_drive(
                     db,
-                    run_file_id=row.get("id") or "",
-                    error=str(exc),
+                    run_file_id=job["id"],
+                    status="ready",
+                    vm_path=job["dest_path"],
+                    size_bytes=staged["size"],
+                    checksum=staged["checksum"],
+                    content_type=staged["content_type"],
                     updated_at=now,
+                    r2_key=job["r2_key"],
+                    drive_path=job["drive_path"],
                 )
-                db.commit()
-                raise DriveStageError(f"failed_to_stage_drive_file:{drive_path}") from exc
-
-            workflow_run_files.mark_ready_drive(
-                db,
-                run_file_id=row.get("id") or "",
-                status="ready",
-                vm_path=dest_path,
-                size_bytes=size,
-                checksum=checksum,
-                content_type=content_type,
-                updated_at=now,
-                r2_key=r2_key,
-                drive_path=drive_path,
-            )
-            db.commit()
-
-            manifest.append(
-                {
-                    "path": drive_path,
-                    "r2_key": r2_key,
-                    "etag": etag,
-                    "size": size,
+                manifest_slots[job["slot"]] = {
+                    "path": job["drive_path"],
+                    "r2_key": job["r2_key"],
+                    "etag": staged["etag"],
+                    "size": staged["size"],
                     "staged_at": now.isoformat(),
                 }
-            )
+            db.commit()
+            progress.finish()
+            if failure is not None:
+                job, exc = failure
+                raise DriveStageError(f"failed_to_stage_drive_file:{job['drive_path']}") from exc
 
+        manifest = [entry for entry in manifest_slots if entry is not None]
         _upload_manifest(controller, manifest, windows=windows)
         return manifest
     finally:
@@ -351,6 +495,8 @@ def detect_drive_changes(run_id: str, workspace: Dict[str, Any]) -> List[Dict[st
         controller = VMControllerClient(base_url=controller_url)
         controller.wait_for_health()
         windows = _is_windows_path(DRIVE_VM_BASE_PATH)
+        # One VM-side pass lists the tree and hashes only files whose size/mtime moved.
+        scanned = _scan_drive(controller, windows=windows)
         now = datetime.now(timezone.utc)
         changes: List[Dict[str, Any]] = []
         known_paths = {
@@ -375,7 +521,7 @@ def detect_drive_changes(run_id: str, workspace: Dict[str, Any]) -> List[Dict[st
                 windows=windows,
             )
             try:
-                new_hash, size = _hash_vm_file(controller, vm_path)
+                new_hash, size = _hash_from_scan(controller, scanned, vm_path, windows=windows)
             except Exception as exc:
                 logger.warning("[drive] failed to hash %s: %s", vm_path, exc)
                 continue
@@ -424,7 +570,10 @@ def detect_drive_changes(run_id: str, workspace: Dict[str, Any]) -> List[Dict[st
             )
 
         if user_id:
-            vm_files = _list_vm_files(controller, DRIVE_VM_BASE_PATH)
+            if scanned is not None:
+                vm_files = list(scanned)
+            else:
+                vm_files = _list_vm_files(controller, DRIVE_VM_BASE_PATH)
             for vm_path in vm_files:
                 drive_path = _drive_path_from_vm_path(
                     vm_path,
@@ -437,7 +586,7 @@ def detect_drive_changes(run_id: str, workspace: Dict[str, Any]) -> List[Dict[st
                 change_key = build_drive_changes_key(user_id, run_id, drive_path)
                 content_type = mimetypes.guess_type(drive_path)[0]
                 try:
-                    new_hash, size = _hash_vm_file(controller, vm_path)
+                    new_hash, size = _hash_from_scan(controller, scanned, vm_path, windows=windows)
                 except Exception as exc:
                     logger.warning("[drive] failed to hash new file %s: %s", vm_path, exc)
                     continue
@@ -503,7 +652,35 @@ def detect_drive_changes(run_id: str, workspace: Dict[str, Any]) -> List[Dict[st
         db.close()
 
 
-def commit_drive_changes_for_run(run_id: str, workspace: Dict[str, Any]) -> List[Dict[str, Any]]:
+def _commit_one_change(
+    controller: VMControllerClient,
+    storage: Any,
+    job: Dict[str, Any],
+    progress: DriveProgress,
+) -> None:
+    """Upload one changed VM file to its presigned R2 key; runs on a pool thread."""
+    presigned_put_url = storage.generate_presigned_put(job["r2_key"], content_type=job["content_type"])
+    try:
+        call_with_retries(
+            lambda: controller.upload_file_to_url(
+                job["vm_path"],
+                presigned_put_url,
+                content_type=job["content_type"],
+            ),
+            label=f"upload {job['path']}",
+        )
+    except Exception:
+        progress.advance(ok=False)
+        raise
+    progress.advance(size=job.get("size"))
+
+
+def commit_drive_changes_for_run(
+    run_id: str,
+    workspace: Dict[str, Any],
+    *,
+    on_progress: Optional[ProgressCallback] = None,
+) -> List[Dict[str, Any]]:
     """Upload detected drive changes to R2 under the run-scoped changes prefix."""
     controller_url = workspace.get("controller_base_url")
     if not controller_url or not run_id:
@@ -534,7 +711,7 @@ def commit_drive_changes_for_run(run_id: str, workspace: Dict[str, Any]) -> List
         }
 
         now = datetime.now(timezone.utc)
-        results: List[Dict[str, Any]] = []
+        jobs: List[Dict[str, Any]] = []
 
         for row in rows:
             if getattr(row, "status", None) == "committed":
@@ -544,46 +721,59 @@ def commit_drive_changes_for_run(run_id: str, workspace: Dict[str, Any]) -> List
             if not drive_path or not r2_key:
                 continue
 
-            change_type = "new" if not row.baseline_hash else "modified"
             content_type = row.content_type or mimetypes.guess_type(drive_path)[0] or DEFAULT_ATTACHMENT_CONTENT_TYPE
-
             drive_row = drive_map.get(drive_path) or {}
-            vm_path = drive_row.get("vm_path") or _build_drive_vm_path(
-                drive_path,
-                base_path=DRIVE_VM_BASE_PATH,
-                windows=windows,
+            jobs.append(
+                {
+                    "path": drive_path,
+                    "r2_key": r2_key,
+                    "change_type": "new" if not row.baseline_hash else "modified",
+                    "content_type": content_type,
+                    "size": getattr(row, "size_bytes", None),
+                    "vm_path": drive_row.get("vm_path")
+                    or _build_drive_vm_path(
+                        drive_path,
+                        base_path=DRIVE_VM_BASE_PATH,
+                        windows=windows,
+                    ),
+                }
             )
-            presigned_put_url = storage.generate_presigned_put(r2_key, content_type=content_type)
-            try:
-                controller.upload_file_to_url(vm_path, presigned_put_url, content_type=content_type)
-            except Exception as exc:
-                logger.warning("[drive] failed to upload %s to R2: %s", vm_path, exc)
+
+        results: List[Dict[str, Any]] = []
+        if not jobs:
+            return results
+
+        progress = DriveProgress("drive.commit.progress", run_id=run_id, total=len(jobs), callback=on_progress)
+        futures = run_bounded(jobs, lambda job: _commit_one_change(controller, storage, job, progress))
+        for job, future in zip(jobs, futures):
+            exc = future.exception()
+            if exc is not None:
+                logger.warning("[drive] failed to upload %s to R2: %s", job["vm_path"], exc)
                 workflow_run_drive_changes.mark_failed(
                     db,
                     run_id=run_id,
-                    path=drive_path,
+                    path=job["path"],
                     error=str(exc),
                     updated_at=now,
                 )
-                db.commit()
                 continue
 
             workflow_run_drive_changes.mark_committed(
                 db,
                 run_id=run_id,
-                path=drive_path,
+                path=job["path"],
                 committed_at=now,
             )
-            db.commit()
-
             results.append(
                 {
-                    "path": drive_path,
-                    "r2_key": r2_key,
-                    "change_type": change_type,
-                    "content_type": content_type,
+                    "path": job["path"],
+                    "r2_key": job["r2_key"],
+                    "change_type": job["change_type"],
+                    "content_type": job["content_type"],
                 }
             )
+        db.commit()
+        progress.finish()
 
         return results
     finally:
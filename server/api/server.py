@@ -43,7 +43,9 @@ from shared.streaming import (
     set_current_emitter,
 )
 from shared.stdio import ensure_utf8_stdio
-from vm_manager.vm_provider import create_agent_instance_for_user, current_provider, provider_spec
+from vm_manager.vm_provider import acquire_agent_instance_for_user, current_provider, provider_spec
+from vm_manager.warm_pool import start_warm_pool, stop_warm_pool
+from server.api.controller_pool import latency_snapshot
 from vm_manager.config import settings
 from orchestrator_agent.data_types import OrchestratorRequest
 from shared.run_context import RUN_LOG_ID
@@ -248,8 +250,15 @@ async def app_lifespan(app: FastAPI):  # pragma: no cover - startup/shutdown uti
         # Never block startup due to warmup issues
         pass
 
+    try:
+        start_warm_pool()
+    except Exception:
+        logger.exception("Failed to start VM warm pool")
+
     yield
 
+    stop_warm_pool(drain=True)
+
 
 app = FastAPI(title="TakeBridge Control Plane API", version="0.1.0", lifespan=app_lifespan)
 try:
@@ -544,7 +553,7 @@ def _normalize_controller_payload(controller_data: Dict[str, Any]) -> Tuple[Dict
 
 
 def _provision_controller_session(user_id: str, run_id: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    instance_id, controller_base_url, vnc_url = create_agent_instance_for_user(user_id)
+    instance_id, controller_base_url, vnc_url = acquire_agent_instance_for_user(user_id)
     parsed = urlparse(controller_base_url)
     host = parsed.hostname if parsed else None
     port = parsed.port or settings.AGENT_CONTROLLER_PORT
@@ -1243,6 +1252,12 @@ async def config_defaults() -> Dict[str, Any]:
     }
 
 
+@app.get("/metrics/controller-latency")
+async def controller_latency_metrics() -> Dict[str, Any]:
+    """Per-endpoint VM controller latency histograms recorded by this process."""
+    return {"endpoints": latency_snapshot()}
+
+
 async def _resume_run_local(run_id: str, current_user: CurrentUser) -> Dict[str, Any]:
     from server.api.controller_client import VMControllerClient
     from server.api.handback_inference import infer_human_action
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from server.api import controller_pool
+from server.api.controller_client import AsyncVMControllerClient, VMControllerClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    delay_s = 0.0
+
+    def log_message(self, *args):
+        return None
+
+    def _reply(self, body: bytes, content_type: str = "application/json"):
+        type(self).connections.add(self.client_address)
+        time.sleep(type(self).delay_s)
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/platform":
+            self._reply(b"Windows", "text/plain")
+        elif path == "/apps":
+            self._reply(json.dumps({"apps": ["Chrome"]}).encode())
+        elif path == "/active_windows":
+            self._reply(json.dumps({"windows": [{"app_name": "Chrome"}]}).encode())
+        else:
+            self._reply(b"{}")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self._reply(json.dumps({"width": 1280, "height": 800}).encode())
+
+
+@pytest.fixture
+def controller_url():
+    _Handler.connections = set()
+    _Handler.delay_s = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    controller_pool.reset_latency()
+    yield url
+    controller_pool.close_controller_connections(url)
+    server.shutdown()
+    server.server_close()
+
+
+def test_clients_for_same_vm_share_one_keepalive_connection(controller_url):
+    first = VMControllerClient(base_url=controller_url)
+    second = VMControllerClient(base_url=controller_url)
+    assert first._session is second._session
+
+    for _ in range(3):
+        first.get_platform()
+        second.screen_size()
+    first.close()
+    second.get_apps()
+
+    assert len(_Handler.connections) == 1
+    snapshot = controller_pool.latency_snapshot()
+    assert snapshot["GET /platform"]["count"] == 3
+    assert snapshot["POST /screen_size"]["count"] == 3
+    assert snapshot["GET /apps"]["buckets_ms"]["+Inf"] == 1
+
+
+def test_async_client_runs_independent_reads_concurrently(controller_url):
+    _Handler.delay_s = 0.2
+    client = AsyncVMControllerClient(base_url=controller_url)
+
+    async def _gather():
+        return await asyncio.gather(client.get_platform(), client.get_apps(), client.get_active_windows())
+
+    started = time.perf_counter()
+    platform, apps, windows = controller_pool.run_controller_coroutine(_gather(), timeout=10)
+    elapsed = time.perf_counter() - started
+
+    assert platform == "Windows"
+    assert apps == {"apps": ["Chrome"]}
+    assert windows["windows"][0]["app_name"] == "Chrome"
+    assert elapsed < 0.5
+    assert controller_pool.latency_snapshot()["GET /active_windows"]["count"] == 1
+
+
+def test_latency_histogram_quantiles():
+    hist = controller_pool.LatencyHistogram(buckets_ms=(10, 100))
+    for value in (1, 2, 50, 500):
+        hist.observe(value)
+    snap = hist.snapshot()
+    assert snap["buckets_ms"] == {"10": 2, "100": 3, "+Inf": 4}
+    assert snap["p50_ms"] == 10.0
+    assert snap["p95_ms"] == 500.0
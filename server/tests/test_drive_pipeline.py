@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from runtime.api import run_drive
+from server.api import drive_pipeline
+
+
+class _RecordingController:
+    def __init__(self, fail_paths=()):
+        self.commands = []
+        self.files = {}
+        self.fail_paths = set(fail_paths)
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def wait_for_health(self):
+        return None
+
+    def execute(self, command, *, shell=False, setup=False, timeout=None):
+        self.commands.append(command)
+        return {}
+
+    def download_file(self, url, dest_path, *, timeout=None):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(0.01)
+            if dest_path in self.fail_paths:
+                raise RuntimeError("boom")
+            self.files[dest_path] = url.encode()
+        finally:
+            with self._lock:
+                self.active -= 1
+        return dest_path
+
+    def stream_file(self, path, *, timeout=None):
+        body = self.files[path]
+
+        class _Resp:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def iter_content(self, chunk_size=1):
+                yield body
+
+        return _Resp()
+
+    def upload_file(self, path, fileobj, *, timeout=None):
+        self.files[path] = fileobj.read()
+
+
+class _Storage:
+    def generate_presigned_get(self, key, *, expires_in=None):
+        return f"https://example.com/get/{key}"
+
+    def head_object(self, key):
+        return {"ETag": '"e"'}
+
+
+class _ControlPlane:
+    def __init__(self, rows):
+        self.rows = rows
+        self.updates = []
+
+    def get_drive_files(self, run_id, *, ensure_full):
+        return {"files": self.rows}
+
+    def update_drive_file_status(self, run_id, payload):
+        self.updates.append(payload)
+
+
+def _install(monkeypatch, controller, rows):
+    plane = _ControlPlane(rows)
+    monkeypatch.setattr(run_drive, "get_attachment_storage", lambda: _Storage())
+    monkeypatch.setattr(run_drive, "VMControllerClient", lambda base_url=None: controller)
+    monkeypatch.setattr(run_drive, "ControlPlaneClient", lambda: plane)
+    monkeypatch.setattr(run_drive, "DRIVE_VM_BASE_PATH", "/drive")
+    monkeypatch.setattr(drive_pipeline, "DRIVE_TRANSFER_CONCURRENCY", 4)
+    monkeypatch.setattr(drive_pipeline, "DRIVE_TRANSFER_BACKOFF_S", 0.0)
+    return plane
+
+
+def _rows(count):
+    return [
+        {"id": f"f{i}", "drive_path": f"dir{i % 3}/sub/file{i}.txt", "r2_key": f"u/drive/file{i}", "status": "pending"}
+        for i in range(count)
+    ]
+
+
+def test_ensure_vm_dirs_batches_unique_leaf_parents():
+    controller = _RecordingController()
+    count = drive_pipeline.ensure_vm_dirs(
+        controller,
+        ["/d/a/x.txt", "/d/a/y.txt", "/d/a/b/z.txt", "/d/c/w.txt"],
+        windows=False,
+    )
+    assert count == 3
+    assert controller.commands == [["mkdir", "-p", "/d/a/b", "/d/c"]]
+
+
+def test_stage_runs_transfers_concurrently_and_keeps_manifest_order(monkeypatch):
+    controller = _RecordingController()
+    rows = _rows(12)
+    plane = _install(monkeypatch, controller, rows)
+    events = []
+
+    manifest = run_drive.stage_drive_files_for_run(
+        "run-1",
+        {"controller_base_url": "http://vm"},
+        on_progress=events.append,
+    )
+
+    assert [entry["path"] for entry in manifest] == [row["drive_path"] for row in rows]
+    assert 1 < controller.peak <= 4
+    mkdirs = [cmd for cmd in controller.commands if cmd[:2] == ["mkdir", "-p"]]
+    # One batched mkdir for the staged files plus one for the manifest directory.
+    assert len(mkdirs) == 2
+    assert {update["status"] for update in plane.updates} == {"ready"}
+    assert events[-1]["done"] == 12
+
+
+def test_stage_retries_then_reports_failure(monkeypatch):
+    controller = _RecordingController(fail_paths={"/drive/dir1/sub/file1.txt"})
+    plane = _install(monkeypatch, controller, _rows(3))
+
+    with pytest.raises(run_drive.DriveStageError, match="dir1/sub/file1.txt"):
+        run_drive.stage_drive_files_for_run("run-1", {"controller_base_url": "http://vm"})
+
+    failed = [update for update in plane.updates if update["status"] == "failed"]
+    assert [update["file_id"] for update in failed] == ["f1"]
+
+
+class _LocalPythonController:
+    """Runs /run_python payloads in a local subprocess, like the VM controller."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def run_python(self, code, *, timeout_seconds=None, timeout=None):
+        self.calls += 1
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+        status = "success" if result.returncode == 0 else "error"
+        return {"status": status, "output": result.stdout, "error": result.stderr}
+
+
+def test_scan_vm_tree_hashes_once_and_reuses_baseline(tmp_path):
+    root = tmp_path / "drive"
+    (root / "docs").mkdir(parents=True)
+    keep = root / "docs" / "keep.txt"
+    edit = root / "docs" / "edit.txt"
+    keep.write_bytes(b"same")
+    edit.write_bytes(b"old")
+    baseline = str(tmp_path / ".drive_baseline.json")
+    controller = _LocalPythonController()
+
+    staged = drive_pipeline.scan_vm_tree(
+        controller, str(root), windows=False, baseline_path=baseline, write_baseline=True
+    )
+    assert staged[str(keep)]["sha256"] == hashlib.sha256(b"same").hexdigest()
+
+    # Corrupt the recorded digest for keep.txt: if the scan reuses the baseline
+    # for an unchanged size/mtime it will echo the fake digest back.
+    with open(baseline) as fh:
+        recorded = json.load(fh)
+    recorded[str(keep)][2] = "from-baseline"
+    with open(baseline, "w") as fh:
+        json.dump(recorded, fh)
+    edit.write_bytes(b"new!")
+    os.utime(edit, ns=(0, 123))
+    (root / "added.txt").write_bytes(b"added")
+
+    scanned = drive_pipeline.scan_vm_tree(controller, str(root), windows=False, baseline_path=baseline)
+
+    assert controller.calls == 2
+    assert scanned[str(keep)]["sha256"] == "from-baseline"
+    assert scanned[str(edit)]["sha256"] == hashlib.sha256(b"new!").hexdigest()
+    assert scanned[str(root / "added.txt")]["size"] == 5
+
+
+def test_scan_vm_tree_without_run_python_falls_back():
+    assert drive_pipeline.scan_vm_tree(_RecordingController(), "/drive", windows=False) is None
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from vm_manager import fake_vm_manager, vm_provider, warm_pool
+from vm_manager.config import settings
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(settings, "VM_PROVIDER", "fake")
+    monkeypatch.setattr(settings, "VM_WARM_POOL_SIZE", 3)
+    fake_vm_manager.reset()
+    pool = warm_pool.WarmPool(max_idle_seconds=3600, boot_timeout_seconds=1, health_poll_seconds=0.01)
+    yield pool
+    pool.stop()
+    fake_vm_manager.reset()
+
+
+def _idle_count(pool):
+    return sum(pool.stats()["idle"].values())
+
+
+def test_replenish_fills_to_target_without_overshooting(pool):
+    fake_vm_manager.boot_delay_seconds = 0.05
+    assert pool.replenish() == 3
+    # Launches still pending count toward the target.
+    assert pool.replenish() == 0
+    pool.wait_for_launches(timeout=5)
+    assert _idle_count(pool) == 3
+    assert len(fake_vm_manager.running_instances()) == 3
+
+
+def test_concurrent_acquires_never_share_an_instance(pool):
+    pool.replenish()
+    pool.wait_for_launches(timeout=5)
+    # Keep refills in flight while the six callers race for the three idle VMs.
+    fake_vm_manager.boot_delay_seconds = 0.2
+    barrier = threading.Barrier(6)
+
+    def grab(i):
+        barrier.wait()
+        return pool.acquire(f"user-{i}")
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(grab, range(6)))
+
+    assigned = [r[0] for r in results if r is not None]
+    assert len(assigned) == 3
+    assert len(set(assigned)) == 3
+    owners = {fake_vm_manager.get_instance(i).user_id for i in assigned}
+    assert owners <= {f"user-{i}" for i in range(6)}
+    assert pool.stats()["hits"] == 3 and pool.stats()["misses"] == 3
+
+    # Every acquire (hit or miss) triggers a refill back to the target.
+    pool.wait_for_launches(timeout=5)
+    assert _idle_count(pool) == 3
+
+
+def test_acquire_skips_unhealthy_and_falls_back_to_cold_boot(pool, monkeypatch):
+    monkeypatch.setattr(settings, "VM_WARM_POOL_SIZE", 1)
+    pool.target_size = 1
+    pool.replenish()
+    pool.wait_for_launches(timeout=5)
+    (idle_id,) = fake_vm_manager.running_instances()
+    fake_vm_manager.set_healthy(idle_id, False)
+
+    monkeypatch.setattr(warm_pool, "_pool", pool)
+    instance_id, _, _ = vm_provider.acquire_agent_instance_for_user("alice")
+
+    assert instance_id != idle_id
+    assert fake_vm_manager.get_instance(idle_id).state == "terminated"
+    assert fake_vm_manager.get_instance(instance_id).user_id == "alice"
+    pool.wait_for_launches(timeout=5)
+    assert _idle_count(pool) == 1
+
+
+def test_failed_launch_releases_pending_slot(pool):
+    fake_vm_manager.fail_next_creates = 1
+    pool.replenish()
+    pool.wait_for_launches(timeout=5)
+    assert pool.stats()["launch_failures"] == 1
+    assert _idle_count(pool) == 2
+    assert pool.replenish() == 1
+
+
+def test_reap_terminates_idle_expired_and_unhealthy(pool):
+    pool.replenish()
+    pool.wait_for_launches(timeout=5)
+    ids = sorted(fake_vm_manager.running_instances())
+    fake_vm_manager.set_healthy(ids[0], False)
+
+    assert pool.reap() == [ids[0]]
+    assert _idle_count(pool) == 2
+
+    pool.max_idle_seconds = 0
+    assert sorted(pool.reap()) == ids[1:]
+    assert _idle_count(pool) == 0
+    assert fake_vm_manager.running_instances() == {}
+
+
+def test_start_reaps_instances_left_tagged_for_the_pool(pool):
+    leftover, _, _ = fake_vm_manager.create_agent_instance_for_user(pool.owner)
+    assigned, _, _ = fake_vm_manager.create_agent_instance_for_user("alice")
+    other_pool, _, _ = fake_vm_manager.create_agent_instance_for_user("warm-pool-other-host")
+
+    pool.start(interval_seconds=3600)
+    pool.wait_for_launches(timeout=5)
+
+    assert fake_vm_manager.get_instance(leftover).state == "terminated"
+    assert fake_vm_manager.get_instance(assigned).state == "running"
+    assert fake_vm_manager.get_instance(other_pool).state == "running"
+    assert _idle_count(pool) == 3
+
+
+def test_pool_owner_is_scoped_to_the_deployment(monkeypatch):
+    monkeypatch.setattr(settings, "VM_WARM_POOL_ID", "Staging EU:1")
+    assert warm_pool.pool_owner() == "warm-pool-staging-eu-1"
+    monkeypatch.setattr(settings, "VM_WARM_POOL_ID", "")
+    assert warm_pool.pool_owner().startswith("warm-pool-")
+    assert warm_pool.pool_owner() != "warm-pool-"
+
+
+def test_one_process_owns_the_pool_and_shutdown_drains_it(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "VM_PROVIDER", "fake")
+    monkeypatch.setattr(settings, "VM_WARM_POOL_SIZE", 2)
+    monkeypatch.setattr(settings, "VM_WARM_POOL_LOCK_PATH", str(tmp_path / "pool.lock"))
+    fake_vm_manager.reset()
+    other_process = open(tmp_path / "pool.lock", "a")
+    warm_pool.fcntl.flock(other_process.fileno(), warm_pool.fcntl.LOCK_EX | warm_pool.fcntl.LOCK_NB)
+    try:
+        assert warm_pool.start_warm_pool() is None
+        assert vm_provider.acquire_agent_instance_for_user("alice")[0] in fake_vm_manager.running_instances()
+        assert len(fake_vm_manager.running_instances()) == 1
+    finally:
+        other_process.close()
+
+    pool = warm_pool.start_warm_pool()
+    assert pool is not None
+    pool.wait_for_launches(timeout=5)
+    assert len(fake_vm_manager.running_instances()) == 3
+
+    warm_pool.stop_warm_pool(drain=True)
+    assert len(fake_vm_manager.running_instances()) == 1
+    assert warm_pool._owner_lock is None
+    fake_vm_manager.reset()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from shared.db.engine import SessionLocal
+from shared.db.models import ComposedPlanCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _with_session(db: Optional[Session], op):
+    owns_session = db is None
+    session = db or SessionLocal()
+    try:
+        result = op(session)
+        if owns_session:
+            session.commit()
+        return result
+    except Exception:
+        if owns_session:
+            session.rollback()
+        raise
+    finally:
+        if owns_session:
+            session.close()
+
+
+def get_fresh(cache_key: str, *, db: Optional[Session] = None) -> Optional[Dict[str, Any]]:
+    """Return the cached raw plan for `cache_key` if it has not expired, counting the hit."""
+
+    def _op(session: Session) -> Optional[Dict[str, Any]]:
+        now = _now()
+        row = session.execute(
+            select(ComposedPlanCacheEntry).where(
+                ComposedPlanCacheEntry.cache_key == cache_key,
+                ComposedPlanCacheEntry.expires_at > now,
+            )
+        ).scalar_one_or_none()
+        if row is None or not isinstance(row.plan, dict):
+            return None
+        session.execute(
+            update(ComposedPlanCacheEntry)
+            .where(ComposedPlanCacheEntry.cache_key == cache_key)
+            .values(hits=ComposedPlanCacheEntry.hits + 1, last_hit_at=now)
+        )
+        return row.plan
+
+    return _with_session(db, _op)
+
+
+def put(
+    cache_key: str,
+    *,
+    user_id: str,
+    plan: Dict[str, Any],
+    schema_version: int,
+    capability_fingerprint: str,
+    ttl_seconds: float,
+    workflow_id: Optional[str] = None,
+    db: Optional[Session] = None,
+) -> None:
+    """Insert or replace the cache entry for `cache_key`."""
+
+    def _op(session: Session) -> None:
+        now = _now()
+        row = session.get(ComposedPlanCacheEntry, cache_key)
+        if row is None:
+            row = ComposedPlanCacheEntry(cache_key=cache_key, hits=0)
+            session.add(row)
+        row.user_id = user_id
+        row.workflow_id = workflow_id
+        row.plan = plan
+        row.schema_version = schema_version
+        row.capability_fingerprint = capability_fingerprint
+        row.created_at = now
+        row.expires_at = now + timedelta(seconds=ttl_seconds)
+        row.last_hit_at = None
+        session.flush()
+
+    _with_session(db, _op)
+
+
+def invalidate(
+    *,
+    user_id: Optional[str] = None,
+    workflow_id: Optional[str] = None,
+    db: Optional[Session] = None,
+) -> int:
+    """Delete entries for a user and/or a workflow; returns the number removed."""
+    if not user_id and not workflow_id:
+        raise ValueError("user_id or workflow_id is required")
+
+    def _op(session: Session) -> int:
+        stmt = delete(ComposedPlanCacheEntry)
+        if user_id:
+            stmt = stmt.where(ComposedPlanCacheEntry.user_id == user_id)
+        if workflow_id:
+            stmt = stmt.where(ComposedPlanCacheEntry.workflow_id == workflow_id)
+        return session.execute(stmt).rowcount or 0
+
+    return _with_session(db, _op)
+
+
+def invalidate_quietly(*, user_id: Optional[str] = None, workflow_id: Optional[str] = None) -> int:
+    """`invalidate` for cleanup hooks (provider changes, workflow edits): logs failures, returns 0."""
+    try:
+        removed = invalidate(user_id=user_id, workflow_id=workflow_id)
+    except Exception as exc:
+        logger.warning("Failed to invalidate composed plans user_id=%s workflow_id=%s: %s", user_id, workflow_id, exc)
+        return 0
+    logger.info("Invalidated %d composed plan(s) user_id=%s workflow_id=%s", removed, user_id, workflow_id)
+    return removed
+
+
+def purge_expired(*, db: Optional[Session] = None) -> int:
+    """Delete expired entries; returns the number removed."""
+
+    def _op(session: Session) -> int:
+        stmt = delete(ComposedPlanCacheEntry).where(ComposedPlanCacheEntry.expires_at <= _now())
+        return session.execute(stmt).rowcount or 0
+
+    return _with_session(db, _op)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 
-from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, JSON, String, Text, func
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, JSON, String, Text, func
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -192,3 +192,34 @@ class WorkflowRunDriveChange(Base):
     committed_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class WorkflowRunAgentStateDelta(Base):
+    __tablename__ = "workflow_run_agent_state_deltas"
+    __table_args__ = (Index("ix_workflow_run_agent_state_deltas_run_id", "run_id", "id"),)
+
+    # Monotonic id doubles as the log sequence; replay applies rows in id order.
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    run_id = Column(String, ForeignKey("workflow_runs.id", ondelete="cascade"), nullable=False)
+    kind = Column(String(32), nullable=False)
+    payload = Column(JSONType, nullable=False, server_default="{}")
+    size_bytes = Column(Integer)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ComposedPlanCacheEntry(Base):
+    __tablename__ = "composed_plan_cache"
+    __table_args__ = (Index("ix_composed_plan_cache_user_id", "user_id", "workflow_id"),)
+
+    # sha256 over (user, normalized task, tool constraints, capability fingerprint, schema version).
+    cache_key = Column(String(64), primary_key=True)
+    user_id = Column(String, nullable=False)
+    workflow_id = Column(String)
+    schema_version = Column(Integer, nullable=False)
+    capability_fingerprint = Column(String(64), nullable=False)
+    # Raw planner output; re-validated against current capabilities on every hit.
+    plan = Column(JSONType, nullable=False, server_default="{}")
+    hits = Column(Integer, nullable=False, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    last_hit_at = Column(DateTime(timezone=True))
@@ -6,9 +6,12 @@ import json
 import logging
 import os
 import random
+import threading
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
@@ -23,6 +26,17 @@ _AGENT_STATES_MAX_RETRIES = int(os.getenv("AGENT_STATES_DB_RETRIES", "2"))
 _AGENT_STATES_RETRY_BACKOFF_BASE = float(os.getenv("AGENT_STATES_DB_RETRY_BACKOFF_BASE", "0.25"))
 _AGENT_STATES_RETRY_BACKOFF_CAP = float(os.getenv("AGENT_STATES_DB_RETRY_BACKOFF_CAP", "2.0"))
 _AGENT_STATES_RETRY_BACKOFF_JITTER = float(os.getenv("AGENT_STATES_DB_RETRY_BACKOFF_JITTER", "0.25"))
+# Deltas appended before the next save rewrites the base snapshot (compaction).
+_AGENT_STATES_COMPACT_EVERY = max(1, int(os.getenv("AGENT_STATES_COMPACT_EVERY", "32")))
+# Runs whose last persisted snapshot is kept in-process for diffing.
+_AGENT_STATES_CACHE_RUNS = max(1, int(os.getenv("AGENT_STATES_CACHE_RUNS", "32")))
+_AGENT_STATES_ZSTD_LEVEL = int(os.getenv("AGENT_STATES_ZSTD_LEVEL", "4"))
+_AGENT_STATES_ZSTD_DICT_PATH = os.getenv("AGENT_STATES_ZSTD_DICT_PATH", "").strip()
+
+_state_cache: "OrderedDict[str, _CachedAgentStates]" = OrderedDict()
+_state_cache_lock = threading.Lock()
+_zstd_dict_state: Dict[str, Any] = {}
+_zstd_dict_lock = threading.Lock()
 
 
 def _is_retryable_db_error(exc: Exception) -> bool:
@@ -158,12 +172,68 @@ def _coerce_optional_bool(value: Any) -> Optional[bool]:
     return bool(value)
 
 
-def _compress_agent_states(payload: Dict[str, Any]) -> Dict[str, Any]:
+def _load_zstd_dictionary() -> Any:
     """
-    Compress agent_states into a JSON-safe wrapper.
+    Return the trained zstd dictionary configured via AGENT_STATES_ZSTD_DICT_PATH.
 
-    Uses zstd when available, otherwise gzip. Always returns a JSON-serializable
-    wrapper; callers must not store the raw payload to avoid oversized rows.
+    Loaded once per process. Returns None when no dictionary is configured,
+    zstandard is not installed, or the file cannot be read.
+    """
+    with _zstd_dict_lock:
+        if "dict" in _zstd_dict_state:
+            return _zstd_dict_state["dict"]
+        loaded = None
+        if _AGENT_STATES_ZSTD_DICT_PATH:
+            try:
+                import zstandard as zstd  # type: ignore
+
+                with open(_AGENT_STATES_ZSTD_DICT_PATH, "rb") as handle:
+                    loaded = zstd.ZstdCompressionDict(handle.read())
+            except Exception as exc:
+                logger.warning(
+                    "Failed to load agent_states zstd dictionary path=%s: %s",
+                    _AGENT_STATES_ZSTD_DICT_PATH,
+                    exc,
+                )
+                loaded = None
+        _zstd_dict_state["dict"] = loaded
+        return loaded
+
+
+def train_agent_states_dictionary(
+    samples: List[Any],
+    *,
+    dict_size: int = 16 * 1024,
+    output_path: Optional[str] = None,
+) -> bytes:
+    """
+    Train a zstd dictionary from representative agent_states payloads/deltas.
+
+    Point AGENT_STATES_ZSTD_DICT_PATH at the written file to have small delta
+    payloads compressed against it. Requires the optional zstandard package.
+    """
+    try:
+        import zstandard as zstd  # type: ignore
+    except Exception as exc:
+        raise RuntimeError("zstandard is required to train agent_states dictionaries") from exc
+
+    encoded = [json.dumps(sample, default=str).encode("utf-8") for sample in samples]
+    if not encoded:
+        raise ValueError("samples must not be empty")
+    trained = zstd.train_dictionary(dict_size, encoded)
+    data = trained.as_bytes()
+    if output_path:
+        with open(output_path, "wb") as handle:
+            handle.write(data)
+    return data
+
+
+def _encode_blob(payload: Any, *, use_dictionary: bool = False) -> Dict[str, Any]:
+    """
+    Compress a JSON payload into a JSON-safe wrapper.
+
+    Uses zstd when available (with the trained dictionary when requested and
+    configured), otherwise gzip.
     """
     try:
         raw = json.dumps(payload, default=str).encode("utf-8")
@@ -172,16 +242,55 @@ def _compress_agent_states(payload: Dict[str, Any]) -> Dict[str, Any]:
 
     codec = "gzip"
     compressed = None
+    extra: Dict[str, Any] = {}
     try:
         import zstandard as zstd  # type: ignore
 
-        compressed = zstd.ZstdCompressor(level=4).compress(raw)
-        codec = "zstd"
+        dictionary = _load_zstd_dictionary() if use_dictionary else None
+        if dictionary is not None:
+            compressed = zstd.ZstdCompressor(level=_AGENT_STATES_ZSTD_LEVEL, dict_data=dictionary).compress(raw)
+            codec = "zstd_dict"
+            extra["dict_id"] = dictionary.dict_id()
+        else:
+            compressed = zstd.ZstdCompressor(level=_AGENT_STATES_ZSTD_LEVEL).compress(raw)
+            codec = "zstd"
     except Exception:
         compressed = gzip.compress(raw)
 
     b64 = base64.b64encode(compressed).decode("ascii")
-    return {"_encoding": f"{codec}_b64", "data": b64}
+    return {"_encoding": f"{codec}_b64", "data": b64, **extra}
+
+
+def _decode_blob(value: Dict[str, Any]) -> Any:
+    """Inverse of _encode_blob; raises on unknown encodings or missing dictionaries."""
+    encoding = value.get("_encoding") or ""
+    compressed = base64.b64decode(value.get("data") or "")
+    if encoding.startswith("zstd_dict"):
+        import zstandard as zstd  # type: ignore
+
+        dictionary = _load_zstd_dictionary()
+        if dictionary is None or dictionary.dict_id() != value.get("dict_id"):
+            raise ValueError(f"zstd dictionary {value.get('dict_id')} is not loaded")
+        raw = zstd.ZstdDecompressor(dict_data=dictionary).decompress(compressed)
+    elif encoding.startswith("zstd"):
+        import zstandard as zstd  # type: ignore
+
+        raw = zstd.ZstdDecompressor().decompress(compressed)
+    elif encoding.startswith("gzip"):
+        raw = gzip.decompress(compressed)
+    else:
+        raise ValueError(f"unknown agent_states encoding {encoding}")
+    return json.loads(raw.decode("utf-8"))
+
+
+def _compress_agent_states(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compress agent_states into a JSON-safe wrapper.
+
+    Uses zstd when available, otherwise gzip. Always returns a JSON-serializable
+    wrapper; callers must not store the raw payload to avoid oversized rows.
+    """
+    return _encode_blob(payload)
 
 
 def _decompress_agent_states(value: Any) -> Dict[str, Any]:
@@ -207,23 +316,284 @@ def _decompress_agent_states(value: Any) -> Dict[str, Any]:
     if not encoding or not data_b64:
         return value if isinstance(value, dict) else {}
 
+    if not encoding.startswith(("zstd", "gzip")):
+        logger.warning("Unknown agent_states encoding %s; returning legacy value", encoding)
+        return value if isinstance(value, dict) else {}
     try:
-        compressed = base64.b64decode(data_b64)
-        if encoding.startswith("zstd"):
-            import zstandard as zstd  # type: ignore
-
-            raw = zstd.ZstdDecompressor().decompress(compressed)
-        elif encoding.startswith("gzip"):
-            raw = gzip.decompress(compressed)
-        else:
-            logger.warning("Unknown agent_states encoding %s; returning legacy value", encoding)
-            return value if isinstance(value, dict) else {}
-        return json.loads(raw.decode("utf-8"))
+        decoded = _decode_blob(value)
+        return decoded if isinstance(decoded, dict) else {}
     except Exception as exc:
         logger.error("Failed to decompress agent_states: %s", exc)
         return {}
 
 
+# ---------------------------------------------------------------------------
+# Delta log
+#
+# workflow_runs.agent_states holds a compressed base snapshot. Every save after
+# that appends one row to workflow_run_agent_state_deltas carrying the typed
+# ops that changed since the previous save:
+#   set    {"path": [...], "value": v}     replace the value at path
+#   unset  {"path": [...]}                 remove the key at path
+#   append {"path": [...], "value": [...]} extend the list at path (new trajectory entries)
+#   merge  {"path": [...], "value": {...}} deep-merge a patch (merge_agent_states)
+# Readers replay rows in id order on top of the base. Base rewrites also append
+# an empty "base" marker row so the log head id changes on every write, which
+# lets writers detect that their cached view of the run is stale.
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _CachedAgentStates:
+    state: Optional[Dict[str, Any]]
+    log_id: Optional[int]
+    pending: int = 0
+
+
+def _normalize_json(payload: Any) -> Any:
+    """Return a detached, JSON-normalized copy (what readers will reconstruct)."""
+    return json.loads(json.dumps(payload, default=str))
+
+
+def _cache_get(run_id: str) -> Optional[_CachedAgentStates]:
+    with _state_cache_lock:
+        entry = _state_cache.get(run_id)
+        if entry is not None:
+            _state_cache.move_to_end(run_id)
+        return entry
+
+
+def _cache_put(run_id: str, entry: _CachedAgentStates) -> None:
+    with _state_cache_lock:
+        _state_cache[run_id] = entry
+        _state_cache.move_to_end(run_id)
+        while len(_state_cache) > _AGENT_STATES_CACHE_RUNS:
+            _state_cache.popitem(last=False)
+
+
+def _cache_drop(run_id: str) -> None:
+    with _state_cache_lock:
+        _state_cache.pop(run_id, None)
+
+
+def _diff_states(old: Any, new: Any, path: List[str], ops: List[Dict[str, Any]]) -> None:
+    """Append the typed ops that turn ``old`` into ``new`` (both JSON-normalized)."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "unset", "path": path + [key]})
+        for key, val in new.items():
+            if key not in old:
+                ops.append({"op": "set", "path": path + [key], "value": val})
+            elif old[key] != val:
+                _diff_states(old[key], val, path + [key], ops)
+        return
+    if (
+        isinstance(old, list)
+        and isinstance(new, list)
+        and len(new) > len(old)
+        and new[: len(old)] == old
+    ):
+        ops.append({"op": "append", "path": path, "value": new[len(old):]})
+        return
+    ops.append({"op": "set", "path": path, "value": new})
+
+
+def _apply_delta_ops(state: Dict[str, Any], ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply typed delta ops to state (mutates and returns it)."""
+    for op in ops:
+        kind = op.get("op")
+        path = list(op.get("path") or [])
+        value = op.get("value")
+        if kind == "merge":
+            if isinstance(value, dict):
+                _deep_merge(_ensure_path(state, path), value)
+            continue
+        if not path:
+            if kind == "set" and isinstance(value, dict):
+                state = value
+            continue
+        parent = _ensure_path(state, path[:-1])
+        key = path[-1]
+        if kind == "set":
+            parent[key] = value
+        elif kind == "unset":
+            parent.pop(key, None)
+        elif kind == "append":
+            existing = parent.get(key)
+            if not isinstance(existing, list):
+                existing = []
+                parent[key] = existing
+            existing.extend(value or [])
+        else:
+            logger.warning("Unknown agent_states delta op %s; skipping", kind)
+    return state
+
+
+def _log_head(session: Session, run_id: str) -> Optional[int]:
+    return execute_text(
+        session,
+        "SELECT MAX(id) FROM workflow_run_agent_state_deltas WHERE run_id = :run_id",
+        {"run_id": run_id},
+    ).scalar()
+
+
+def _append_delta(session: Session, run_id: str, kind: str, ops: List[Dict[str, Any]]) -> Optional[int]:
+    """Insert one delta row; returns its id, or None when run_id does not exist."""
+    payload = _json_safe(_encode_blob(ops, use_dictionary=True)) if ops else _json_safe({})
+    return execute_text(
+        session,
+        """
+        INSERT INTO workflow_run_agent_state_deltas (run_id, kind, payload, size_bytes, created_at)
+        SELECT id, :kind, :payload, :size_bytes, :created_at
+        FROM workflow_runs
+        WHERE id = :run_id
+        RETURNING id
+        """,
+        {
+            "run_id": run_id,
+            "kind": kind,
+            "payload": payload,
+            "size_bytes": len(payload),
+            "created_at": datetime.now(timezone.utc),
+        },
+    ).scalar()
+
+
+def _touch_agent_states(session: Session, run_id: str, now: datetime) -> None:
+    execute_text(
+        session,
+        """
+        UPDATE workflow_runs
+        SET agent_states_updated_at = :updated_at,
+            updated_at = :updated_at
+        WHERE id = :run_id
+        """,
+        {"run_id": run_id, "updated_at": now},
+    )
+
+
+def _lock_run_row(session: Session, run_id: str) -> bool:
+    if DB_URL.startswith("postgres"):
+        row = execute_text(
+            session,
+            "SELECT id FROM workflow_runs WHERE id = :run_id FOR UPDATE",
+            {"run_id": run_id},
+        ).scalar_one_or_none()
+    else:
+        row = execute_text(
+            session,
+            "SELECT id FROM workflow_runs WHERE id = :run_id",
+            {"run_id": run_id},
+        ).scalar_one_or_none()
+    return row is not None
+
+
+def _load_agent_states(session: Session, run_id: str) -> Optional[Tuple[Dict[str, Any], Optional[int]]]:
+    """Reconstruct the latest state; returns (state, last_log_id) or None if the run is missing."""
+    row = execute_text(
+        session,
+        "SELECT agent_states FROM workflow_runs WHERE id = :run_id",
+        {"run_id": run_id},
+    ).first()
+    if row is None:
+        return None
+    state = _decompress_agent_states(row[0])
+    deltas = execute_text(
+        session,
+        """
+        SELECT id, kind, payload
+        FROM workflow_run_agent_state_deltas
+        WHERE run_id = :run_id
+        ORDER BY id
+        """,
+        {"run_id": run_id},
+    ).all()
+    last_id: Optional[int] = None
+    for delta_id, kind, payload in deltas:
+        last_id = delta_id
+        if kind == "base":
+            continue
+        if isinstance(payload, str):
+            try:
+                payload = json.loads(payload)
+            except Exception:
+                payload = {}
+        try:
+            ops = _decode_blob(payload) if isinstance(payload, dict) and payload.get("_encoding") else []
+        except Exception as exc:
+            logger.error("Failed to decode agent_states delta id=%s run_id=%s: %s", delta_id, run_id, exc)
+            continue
+        state = _apply_delta_ops(state, ops if isinstance(ops, list) else [])
+    if len(deltas) > 2 * _AGENT_STATES_COMPACT_EVERY:
+        logger.debug("agent_states for run_id=%s has %s uncompacted deltas", run_id, len(deltas))
+    return state, last_id
+
+
+def _write_base(
+    session: Session,
+    run_id: str,
+    state: Dict[str, Any],
+    *,
+    now: datetime,
+    fold_through: Optional[int] = None,
+) -> Optional[int]:
+    """
+    Store state as the new base snapshot and trim the log.
+
+    fold_through: when compacting, only deltas up to this id were folded into
+    state; later ones (appended concurrently) are kept. When None the base
+    replaces everything logged before it.
+    """
+    result = execute_text(
+        session,
+        """
+        UPDATE workflow_runs
+        SET agent_states = :agent_states,
+            agent_states_updated_at = :updated_at,
+            updated_at = :updated_at
+        WHERE id = :run_id
+        """,
+        {
+            "run_id": run_id,
+            "agent_states": _json_safe(_compress_agent_states(state)),
+            "updated_at": now,
+        },
+    )
+    if not result.rowcount:
+        return None
+    marker_id = _append_delta(session, run_id, "base", [])
+    cutoff = fold_through if fold_through is not None else marker_id
+    if fold_through is not None:
+        execute_text(
+            session,
+            "DELETE FROM workflow_run_agent_state_deltas WHERE run_id = :run_id AND id <= :cutoff",
+            {"run_id": run_id, "cutoff": cutoff},
+        )
+    else:
+        execute_text(
+            session,
+            "DELETE FROM workflow_run_agent_state_deltas WHERE run_id = :run_id AND id < :cutoff",
+            {"run_id": run_id, "cutoff": cutoff},
+        )
+    return marker_id
+
+
+def _compact_locked(session: Session, run_id: str) -> Optional[Dict[str, Any]]:
+    """Fold logged deltas into the base snapshot; returns the compacted state."""
+    if not _lock_run_row(session, run_id):
+        return None
+    loaded = _load_agent_states(session, run_id)
+    if loaded is None:
+        return None
+    state, last_id = loaded
+    if last_id is None:
+        return state
+    marker_id = _write_base(session, run_id, state, now=datetime.now(timezone.utc), fold_through=last_id)
+    _cache_put(run_id, _CachedAgentStates(state=_normalize_json(state), log_id=marker_id, pending=0))
+    return state
+
+
 def update_agent_states(
     run_id: str,
     agent_states: Dict[str, Any],
@@ -233,6 +603,12 @@ def update_agent_states(
     """
     Persist the latest agent_states snapshot for a workflow run.
 
+    When this process already holds the previous snapshot for the run (and no
+    other writer has touched the log since), only the delta against it is
+    appended; otherwise the snapshot is written as a new base. Every
+    AGENT_STATES_COMPACT_EVERY deltas the full snapshot is written as a base
+    again, which compacts the log.
+
     Args:
         run_id: workflow_runs.id to update
         agent_states: full JSON-safe snapshot to store
@@ -244,31 +620,50 @@ def update_agent_states(
     if not run_id:
         raise ValueError("run_id is required")
 
-    compressed = _compress_agent_states(agent_states)
+    snapshot = _normalize_json(agent_states)
 
     def _op(session: Session, owns_session: bool) -> int:
         now = datetime.now(timezone.utc)
-        result = session.execute(
-            text(
-                """
-                UPDATE workflow_runs
-                SET agent_states = :agent_states,
-                    agent_states_updated_at = :updated_at,
-                    updated_at = :updated_at
-                WHERE id = :run_id
-                """
-            ),
-            {
-                "run_id": run_id,
-                "agent_states": _json_safe(compressed),
-                "updated_at": now,
-            },
-        )
+        # Serialize writers on the run row so the head check below still holds
+        # when the delta is appended.
+        if not _lock_run_row(session, run_id):
+            return 0
+        cached = _cache_get(run_id)
+        ops: Optional[List[Dict[str, Any]]] = None
+        if (
+            cached is not None
+            and cached.state is not None
+            and cached.pending < _AGENT_STATES_COMPACT_EVERY
+            and cached.log_id == _log_head(session, run_id)
+        ):
+            ops = []
+            _diff_states(cached.state, snapshot, [], ops)
+
+        if ops == []:
+            return 1
+
+        if ops:
+            log_id = _append_delta(session, run_id, "patch", ops)
+            if log_id is None:
+                return 0
+            _touch_agent_states(session, run_id, now)
+            entry = _CachedAgentStates(state=snapshot, log_id=log_id, pending=cached.pending + 1)
+        else:
+            marker_id = _write_base(session, run_id, snapshot, now=now)
+            if marker_id is None:
+                return 0
+            entry = _CachedAgentStates(state=snapshot, log_id=marker_id, pending=0)
+
         if owns_session:
             session.commit()
-        return result.rowcount or 0
+        _cache_put(run_id, entry)
+        return 1
 
-    return _run_with_retry(label="update_agent_states", db=db, op=_op)
+    try:
+        return _run_with_retry(label="update_agent_states", db=db, op=_op)
+    except Exception:
+        _cache_drop(run_id)
+        raise
 
 
 def merge_agent_states(
@@ -279,7 +674,10 @@ def merge_agent_states(
     db: Optional[Session] = None,
 ) -> int:
     """
-    Merge a patch into agent_states (read-modify-write). Useful for per-agent partial updates.
+    Merge a patch into agent_states. Useful for per-agent partial updates.
+
+    The patch is appended to the delta log as a single "merge" op, so no
+    read-modify-write of the stored snapshot happens on the hot path.
 
     Args:
         run_id: workflow_runs.id to update
@@ -295,47 +693,84 @@ def merge_agent_states(
     if not isinstance(patch, dict):
         raise ValueError("patch must be a dict")
 
+    ops = [{"op": "merge", "path": list(path or []), "value": _normalize_json(patch)}]
+
     def _op(session: Session, owns_session: bool) -> int:
-        row = session.execute(
-            text("SELECT agent_states FROM workflow_runs WHERE id = :run_id FOR UPDATE"),
-            {"run_id": run_id},
-        ).scalar_one_or_none()
-        if row is None:
+        now = datetime.now(timezone.utc)
+        if not _lock_run_row(session, run_id):
             return 0
+        cached = _cache_get(run_id)
+        head_before = _log_head(session, run_id) if cached is not None else None
+        log_id = _append_delta(session, run_id, "merge", ops)
+        if log_id is None:
+            return 0
+        _touch_agent_states(session, run_id, now)
+
+        if cached is not None and cached.state is not None and cached.log_id == head_before:
+            entry = _CachedAgentStates(
+                state=_apply_delta_ops(cached.state, _normalize_json(ops)),
+                log_id=log_id,
+                pending=cached.pending + 1,
+            )
+        else:
+            entry = _CachedAgentStates(
+                state=None,
+                log_id=log_id,
+                pending=(cached.pending if cached is not None else 0) + 1,
+            )
+        if entry.pending >= _AGENT_STATES_COMPACT_EVERY:
+            _compact_locked(session, run_id)
+        else:
+            _cache_put(run_id, entry)
 
-        try:
-            current = _decompress_agent_states(row)
-        except Exception:
-            current = {}
+        if owns_session:
+            session.commit()
+        return 1
 
-        target = _ensure_path(current, path)
-        _deep_merge(target, patch)
+    try:
+        return _run_with_retry(label="merge_agent_states", db=db, op=_op)
+    except Exception:
+        _cache_drop(run_id)
+        raise
 
-        now = datetime.now(timezone.utc)
-        result = session.execute(
-            text(
-                """
-                UPDATE workflow_runs
-                SET agent_states = :agent_states,
-                    agent_states_updated_at = :updated_at,
-                    updated_at = :updated_at
-                WHERE id = :run_id
-                """
-            ),
-            {
-                "run_id": run_id,
-                "agent_states": _json_safe(_compress_agent_states(current)),
-                "updated_at": now,
-            },
-        )
+
+def compact_agent_states(
+    run_id: str,
+    *,
+    db: Optional[Session] = None,
+) -> int:
+    """
+    Fold the delta log for a run into its base snapshot.
+
+    Returns:
+        Number of rows updated (0 when run_id not found)
+    """
+    if not run_id:
+        raise ValueError("run_id is required")
+
+    def _op(session: Session, owns_session: bool) -> int:
+        state = _compact_locked(session, run_id)
+        if state is None:
+            return 0
         if owns_session:
             session.commit()
-        return result.rowcount or 0
+        return 1
 
-    return _run_with_retry(label="merge_agent_states", db=db, op=_op)
+    try:
+        return _run_with_retry(label="compact_agent_states", db=db, op=_op)
+    except Exception:
+        _cache_drop(run_id)
+        raise
 
 
-__all__ = ["update_agent_states", "merge_agent_states", "get_agent_states", "mark_run_attention"]
+__all__ = [
+    "update_agent_states",
+    "merge_agent_states",
+    "compact_agent_states",
+    "get_agent_states",
+    "mark_run_attention",
+    "train_agent_states_dictionary",
+]
 __all__.append("decode_agent_states")
 
 
@@ -350,7 +785,7 @@ def get_agent_states(
     db: Optional[Session] = None,
 ) -> Dict[str, Any]:
     """
-    Read the current agent_states for a workflow run.
+    Read the current agent_states for a workflow run (base snapshot plus logged deltas).
 
     Args:
         run_id: workflow_runs.id to read
@@ -365,13 +800,10 @@ def get_agent_states(
     owns_session = db is None
     session = db or SessionLocal()
     try:
-        row = session.execute(
-            text("SELECT agent_states FROM workflow_runs WHERE id = :run_id"),
-            {"run_id": run_id},
-        ).scalar_one_or_none()
-        if row is None:
+        loaded = _load_agent_states(session, run_id)
+        if loaded is None:
             return {}
-        return _decompress_agent_states(row)
+        return loaded[0]
     finally:
         if owns_session:
             session.close()
@@ -834,7 +1266,7 @@ def get_resume_row(db: Session, *, run_id: str) -> Dict[str, Any] | None:
         execute_text(
             db,
             """
-            SELECT id, user_id, status, agent_states, environment
+            SELECT id, user_id, status, environment
             FROM workflow_runs
             WHERE id = :run_id
             """,
@@ -843,7 +1275,12 @@ def get_resume_row(db: Session, *, run_id: str) -> Dict[str, Any] | None:
         .mappings()
         .first()
     )
-    return dict(row) if row else None
+    if not row:
+        return None
+    resume = dict(row)
+    loaded = _load_agent_states(db, run_id)
+    resume["agent_states"] = loaded[0] if loaded is not None else {}
+    return resume
 
 
 __all__.extend(
@@ -0,0 +1,370 @@
+"""
+Incremental parsing and cheap repair of streamed JSON objects.
+
+Planner LLMs answer with a single JSON object whose decisive fields (the
+action type and its arguments) come first and whose `reasoning` text comes
+last. `JSONObjectStream` is fed the streamed text chunk by chunk and exposes
+each top-level field as soon as its value is complete, so callers can
+validate partial structure and act before the response has finished.
+
+`repair_json_object` fixes the breakage that otherwise costs a whole extra
+LLM round trip: prose or code fences around the object, trailing text,
+trailing commas, and truncation inside a free-text field such as
+`reasoning` (unclosed strings/braces).
+
+`StreamedJSONCall` runs a streaming LLM call on a worker thread and feeds
+its text deltas into a `JSONObjectStream`.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class JSONObjectStream:
+    """Incremental parser for one top-level JSON object; text before its `{` is skipped."""
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.fields: Dict[str, Any] = {}
+        self.current_key: Optional[str] = None  # key whose value is streaming
+        self.closed = False
+        self.error: Optional[str] = None
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = "key"  # key | colon | value
+        self._token_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> bool:
+        """Append `chunk`; True when it completed at least one top-level field."""
+        if not chunk or self.closed:
+            return False
+        self.text += chunk
+        before = len(self.fields)
+        text = self.text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._start is None:
+                if ch == "{":
+                    self._start, self._depth = i, 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == "key" and self._token_start is not None:
+                        self._set_key(text[self._token_start : i + 1])
+                continue
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == "key":
+                    self._token_start = i
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_value(text, i)
+                    self.closed, self._end = True, i + 1
+                    self._pos = i + 1
+                    return len(self.fields) > before
+            elif self._depth == 1:
+                if ch == ":" and self._expect == "colon":
+                    self._expect, self._token_start = "value", i + 1
+                elif ch == ",":
+                    self._finish_value(text, i)
+        self._pos = len(text)
+        return len(self.fields) > before
+
+    @property
+    def value(self) -> Optional[Dict[str, Any]]:
+        """The whole object once closed (trailing text ignored)."""
+        if not self.closed or self._start is None or self._end is None:
+            return None
+        try:
+            parsed = json.loads(self.text[self._start : self._end])
+        except json.JSONDecodeError:
+            return None
+        return parsed if isinstance(parsed, dict) else None
+
+    def partial_text(self) -> str:
+        """Raw text of the value currently streaming (e.g. an unfinished `reasoning`)."""
+        if self._expect != "value" or self._token_start is None:
+            return ""
+        return self.text[self._token_start :].strip()
+
+    def _set_key(self, raw: str) -> None:
+        try:
+            self.current_key = json.loads(raw)
+        except json.JSONDecodeError:
+            self.current_key = None
+        self._expect, self._token_start = "colon", None
+
+    def _finish_value(self, text: str, end: int) -> None:
+        if self._expect != "value" or self.current_key is None or self._token_start is None:
+            self._expect, self._token_start = "key", None
+            return
+        raw = text[self._token_start : end].strip()
+        if raw:
+            try:
+                self.fields[self.current_key] = json.loads(raw)
+            except json.JSONDecodeError as exc:
+                self.error = f"invalid value for {self.current_key!r}: {exc.msg}"
+        self.current_key = None
+        self._expect, self._token_start = "key", None
+
+
+@dataclass
+class RepairResult:
+    value: Dict[str, Any]
+    fixes: List[str]
+
+
+def _scan(text: str) -> Tuple[Optional[int], List[str], bool, List[Tuple[int, List[str]]]]:
+    """(end of the closed object or None, open brackets, inside a string, commas with their bracket stack)."""
+    stack: List[str] = []
+    in_string = escape = False
+    commas: List[Tuple[int, List[str]]] = []
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(ch)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return i + 1, [], False, commas
+        elif ch == ",":
+            commas.append((i, list(stack)))
+    return None, stack, in_string, commas
+
+
+def _drop_trailing_commas(text: str) -> str:
+    out: List[str] = []
+    in_string = escape = False
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "}]":
+            j = len(out) - 1
+            while j >= 0 and out[j].isspace():
+                j -= 1
+            if j >= 0 and out[j] == ",":
+                del out[j]
+        out.append(ch)
+    return "".join(out)
+
+
+def _loads_object(text: str) -> Optional[Dict[str, Any]]:
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def _close(text: str, stack: List[str]) -> str:
+    text = text.rstrip()
+    if text.endswith(","):
+        text = text[:-1]
+    return text + "".join(_CLOSERS[opener] for opener in reversed(stack))
+
+
+def _truncated_in(text: str, truncatable: Iterable[str]) -> bool:
+    """True when `text` was cut off inside the value of a `truncatable` field, every earlier field complete."""
+    stream = JSONObjectStream()
+    stream.feed(text)
+    return (
+        stream.error is None
+        and not stream.closed
+        and stream._expect == "value"
+        and stream.current_key in set(truncatable)
+    )
+
+
+def repair_json_object(
+    text: str, *, max_cuts: int = 8, truncatable: Iterable[str] = ()
+) -> Optional[RepairResult]:
+    """
+    Recover a JSON object from slightly broken LLM output, or None.
+
+    Fixes that cannot change content are always applied: text around the
+    object and trailing commas. A truncated object is only closed (unclosed
+    string, unclosed braces/brackets, dropping a cut-off final member within
+    `max_cuts` members) when the cut fell inside one of the `truncatable`
+    fields (e.g. free-text `reasoning`) and every other field had already
+    closed; a cut-off action argument would otherwise be executed as if whole.
+    """
+    start = (text or "").find("{")
+    if start < 0:
+        return None
+    fixes: List[str] = []
+    if text[:start].strip():
+        fixes.append("leading_text")
+    body = text[start:]
+    end, stack, in_string, commas = _scan(body)
+    if end is not None:
+        if body[end:].strip():
+            fixes.append("trailing_text")
+        body = body[:end]
+    cleaned = _drop_trailing_commas(body)
+    if cleaned != body:
+        fixes.append("trailing_comma")
+        body = cleaned
+        end, stack, in_string, commas = _scan(body)
+    if end is not None:
+        value = _loads_object(body)
+        return RepairResult(value, fixes) if value is not None else None
+
+    # Truncated: close what is open, cutting back to earlier members if needed.
+    if not _truncated_in(body, truncatable):
+        return None
+    if in_string:
+        body = (body[:-1] if body.endswith("\\") else body) + '"'
+        fixes.append("unclosed_string")
+    fixes.append("unclosed_braces")
+    value = _loads_object(_close(body, stack))
+    if value is not None:
+        return RepairResult(value, fixes)
+    for index, cut_stack in reversed(commas[-max_cuts:]):
+        value = _loads_object(_close(body[:index], cut_stack))
+        if value is not None:
+            return RepairResult(value, fixes + ["truncated_member"])
+    return None
+
+
+def text_delta(event: Any) -> str:
+    """Output-text delta carried by a streamed LLM event ("" for other events).
+
+    Handles Responses API events (`delta` is a string) and the dict events the
+    chat-completions adapters emit (`delta` is `{"text": ...}`).
+    """
+    get = event.get if isinstance(event, dict) else lambda name, default=None: getattr(event, name, default)
+    if get("type") != "response.output_text.delta":
+        return ""
+    delta = get("delta")
+    if isinstance(delta, dict):
+        delta = delta.get("text")
+    return delta if isinstance(delta, str) else ""
+
+
+class StreamAborted(Exception):
+    """Raised from the event handler to stop consuming a stream."""
+
+
+@dataclass
+class StreamedJSONCall:
+    """
+    A streaming LLM call running on a worker thread, parsed as it arrives.
+
+    `call` receives the event handler and returns the final response (e.g.
+    `lambda handler: client.stream_response(event_handler=handler, **kwargs)`).
+    `abort_if(parser)` returning a reason stops the stream early.
+    """
+
+    call: Callable[[Callable[[Any], None]], Any]
+    abort_if: Optional[Callable[[JSONObjectStream], Optional[str]]] = None
+    parser: JSONObjectStream = field(default_factory=JSONObjectStream)
+    response: Any = None
+    exception: Optional[BaseException] = None
+    abort_reason: Optional[str] = None
+    started: float = field(default_factory=time.perf_counter)
+    first_token_ms: Optional[float] = None
+    ready_ms: Optional[float] = None
+    total_ms: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        self._changed = threading.Condition()
+        self._done = False
+        self._thread = threading.Thread(
+            target=contextvars.copy_context().run, args=(self._run,), name="llm-json-stream", daemon=True
+        )
+        self._thread.start()
+
+    def _handle(self, event: Any) -> None:
+        chunk = text_delta(event)
+        if not chunk:
+            return
+        with self._changed:
+            if self.first_token_ms is None:
+                self.first_token_ms = self._elapsed_ms()
+            self.parser.feed(chunk)
+            reason = self.abort_if(self.parser) if self.abort_if else None
+            self._changed.notify_all()
+        if reason:
+            self.abort_reason = reason
+            raise StreamAborted(reason)
+
+    def _run(self) -> None:
+        try:
+            self.response = self.call(self._handle)
+        except BaseException as exc:  # handed to the waiting thread
+            self.exception = exc
+        finally:
+            with self._changed:
+                self._done = True
+                self.total_ms = self._elapsed_ms()
+                self._changed.notify_all()
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def wait_ready(self, ready: Callable[[JSONObjectStream], bool], timeout: Optional[float] = None) -> bool:
+        """Block until `ready(parser)` holds (True) or the stream has ended (False)."""
+        with self._changed:
+            satisfied = self._changed.wait_for(lambda: self._done or ready(self.parser), timeout)
+            if satisfied and not self._done:
+                self.ready_ms = self._elapsed_ms()
+                return True
+            return False
+
+    def finish(self, timeout: Optional[float] = None) -> Any:
+        """Wait for the stream to end; the final response (re-raises a call error, not an abort)."""
+        self._thread.join(timeout)
+        if self.exception is not None and not isinstance(self.exception, StreamAborted):
+            raise self.exception
+        return self.response
+
+
+__all__ = [
+    "JSONObjectStream",
+    "RepairResult",
+    "StreamAborted",
+    "StreamedJSONCall",
+    "repair_json_object",
+    "text_delta",
+]
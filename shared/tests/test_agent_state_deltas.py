@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from shared.db import workflow_runs
+from shared.db.models import WorkflowRun, WorkflowRunAgentStateDelta
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite:///:memory:", future=True)
+    WorkflowRun.__table__.create(engine)
+    WorkflowRunAgentStateDelta.__table__.create(engine)
+    Session = sessionmaker(bind=engine, future=True)
+    session = Session()
+    session.execute(
+        text("INSERT INTO workflow_runs (id, workflow_id, user_id) VALUES ('run-1', 'wf-1', 'user-1')")
+    )
+    session.commit()
+    monkeypatch.setattr(workflow_runs, "_state_cache", workflow_runs.OrderedDict())
+    yield session
+    session.close()
+
+
+def _delta_kinds(db):
+    rows = db.execute(
+        text("SELECT kind FROM workflow_run_agent_state_deltas WHERE run_id = 'run-1' ORDER BY id")
+    ).all()
+    return [row[0] for row in rows]
+
+
+def test_first_save_writes_base_then_appends_deltas(db):
+    state = {"version": 1, "agents": {"computer_use": {"trajectory": [{"step": 1}]}}}
+    assert workflow_runs.update_agent_states("run-1", state, db=db) == 1
+    assert _delta_kinds(db) == ["base"]
+
+    state["agents"]["computer_use"]["trajectory"].append({"step": 2})
+    state["status"] = "running"
+    assert workflow_runs.update_agent_states("run-1", state, db=db) == 1
+    assert _delta_kinds(db) == ["base", "patch"]
+
+    assert workflow_runs.get_agent_states("run-1", db=db) == state
+
+
+def test_diff_emits_append_for_trajectory_growth():
+    ops: list = []
+    workflow_runs._diff_states(
+        {"t": [1, 2], "gone": True, "same": {"a": 1}},
+        {"t": [1, 2, 3], "same": {"a": 1}, "new": "x"},
+        [],
+        ops,
+    )
+    assert {"op": "unset", "path": ["gone"]} in ops
+    assert {"op": "append", "path": ["t"], "value": [3]} in ops
+    assert {"op": "set", "path": ["new"], "value": "x"} in ops
+    assert len(ops) == 3
+
+
+def test_merge_appends_without_rewriting_base(db):
+    workflow_runs.update_agent_states("run-1", {"agents": {"computer_use": {"a": 1}}}, db=db)
+    base_before = db.execute(text("SELECT agent_states FROM workflow_runs WHERE id = 'run-1'")).scalar()
+
+    assert workflow_runs.merge_agent_states("run-1", {"b": 2}, path=["agents", "computer_use"], db=db) == 1
+    assert workflow_runs.merge_agent_states("missing", {"b": 2}, db=db) == 0
+
+    base_after = db.execute(text("SELECT agent_states FROM workflow_runs WHERE id = 'run-1'")).scalar()
+    assert base_after == base_before
+    assert workflow_runs.get_agent_states("run-1", db=db) == {"agents": {"computer_use": {"a": 1, "b": 2}}}
+    assert workflow_runs.get_resume_row(db, run_id="run-1")["agent_states"] == {
+        "agents": {"computer_use": {"a": 1, "b": 2}}
+    }
+
+
+def test_stale_cache_falls_back_to_base_write(db):
+    workflow_runs.update_agent_states("run-1", {"a": 1}, db=db)
+    # Another process appends to the log; our cached view is now stale.
+    workflow_runs._append_delta(db, "run-1", "merge", [{"op": "merge", "path": [], "value": {"x": 1}}])
+
+    workflow_runs.update_agent_states("run-1", {"a": 2}, db=db)
+    assert _delta_kinds(db) == ["base"]
+    assert workflow_runs.get_agent_states("run-1", db=db) == {"a": 2}
+
+
+def test_compaction_folds_log_into_base(db, monkeypatch):
+    monkeypatch.setattr(workflow_runs, "_AGENT_STATES_COMPACT_EVERY", 3)
+    workflow_runs.update_agent_states("run-1", {"steps": []}, db=db)
+    for i in range(3):
+        workflow_runs.merge_agent_states("run-1", {f"k{i}": i}, db=db)
+
+    assert _delta_kinds(db) == ["base"]
+    assert workflow_runs.get_agent_states("run-1", db=db) == {"steps": [], "k0": 0, "k1": 1, "k2": 2}
+
+
+def test_writers_lock_the_run_row_before_reading_the_log_head(db, monkeypatch):
+    calls = []
+    lock_run_row, log_head = workflow_runs._lock_run_row, workflow_runs._log_head
+    monkeypatch.setattr(workflow_runs, "_lock_run_row", lambda s, r: calls.append("lock") or lock_run_row(s, r))
+    monkeypatch.setattr(workflow_runs, "_log_head", lambda s, r: calls.append("head") or log_head(s, r))
+
+    workflow_runs.update_agent_states("run-1", {"a": 1}, db=db)
+    workflow_runs.update_agent_states("run-1", {"a": 2}, db=db)
+    workflow_runs.merge_agent_states("run-1", {"b": 1}, db=db)
+
+    assert calls[0] == "lock" and calls.count("lock") == 3
+    assert calls.index("head") > 0
+    assert workflow_runs.update_agent_states("missing", {"a": 1}, db=db) == 0
+
@@ -5,9 +5,12 @@ import json
 import logging
 import os
 import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterator, Tuple
 
 try:
     import fcntl  # type: ignore
@@ -17,6 +20,42 @@ except Exception:  # pragma: no cover
 from shared.run_context import RUN_LOG_ID
 
 
+def _cached_ratio(cached: int, new_input: int) -> float:
+    total = cached + new_input
+    return round(cached / total, 4) if total else 0.0
+
+
+@dataclass
+class UsageScope:
+    """Tokens and cost recorded inside one `token_usage_scope()` (and threads/tasks started from it)."""
+
+    input_cached: int = 0
+    input_new: int = 0
+    output: int = 0
+    cost_usd: float = 0.0
+
+
+_USAGE_SCOPES: ContextVar[Tuple[UsageScope, ...]] = ContextVar("token_usage_scopes", default=())
+_USAGE_SCOPES_LOCK = threading.Lock()
+
+
+@contextmanager
+def token_usage_scope() -> Iterator[UsageScope]:
+    """
+    Attribute usage recorded in the current context to a fresh `UsageScope`.
+
+    Scopes follow contextvars, so concurrent asyncio tasks (and work run via
+    `contextvars.copy_context()`) each see only their own calls, unlike a
+    before/after diff of the process-wide totals. Scopes nest.
+    """
+    scope = UsageScope()
+    token = _USAGE_SCOPES.set(_USAGE_SCOPES.get() + (scope,))
+    try:
+        yield scope
+    finally:
+        _USAGE_SCOPES.reset(token)
+
+
 class TokenCostTracker:
     RATES_PER_TOKEN = {
         "o4-mini": {
@@ -42,6 +81,7 @@ class TokenCostTracker:
         self.total_input_new = 0
         self.total_output = 0
         self.total_cost_usd = 0.0
+        self.by_source: Dict[str, Dict[str, Any]] = {}
         self.summary_written = False
         run_id = os.getenv("RUN_LOG_ID") or datetime.now().strftime("%Y%m%d@%H%M%S")
         self.logs_dir = Path("logs")
@@ -103,8 +143,12 @@ class TokenCostTracker:
                 or self._get_attr(usage, "input_tokens_cached", 0)
             )
             if not cached:
-                details = self._get_attr(usage, "prompt_tokens_details", None)
-                cached = self._get_attr(details, "cached_tokens", 0)
+                # Responses API: input_tokens_details; Chat Completions: prompt_tokens_details.
+                for details_name in ("input_tokens_details", "prompt_tokens_details"):
+                    details = self._get_attr(usage, details_name, None)
+                    cached = self._get_attr(details, "cached_tokens", 0)
+                    if cached:
+                        break
 
         input_new = max(int(input_total) - int(cached), 0)
         return int(cached or 0), int(input_new or 0), int(output or 0)
@@ -115,7 +159,7 @@ class TokenCostTracker:
         source: str,
         response: Any,
         logger: logging.Logger | None = None,
-    ) -> None:
+    ) -> Dict[str, Any]:
         try:
             cached, new_input, output = self._extract_usage(response)
         except Exception:
@@ -132,6 +176,14 @@ class TokenCostTracker:
             self.total_input_new += new_input
             self.total_output += output
             self.total_cost_usd += total
+            source_totals = self.by_source.setdefault(
+                source, {"calls": 0, "input_cached": 0, "input_new": 0, "output": 0, "cost_usd": 0.0}
+            )
+            source_totals["calls"] += 1
+            source_totals["input_cached"] += cached
+            source_totals["input_new"] += new_input
+            source_totals["output"] += output
+            source_totals["cost_usd"] += total
 
             entry = {
                 "type": "call",
@@ -144,6 +196,7 @@ class TokenCostTracker:
                     "input_new": new_input,
                     "output": output,
                 },
+                "cached_input_ratio": _cached_ratio(cached, new_input),
                 "cost_usd": {
                     "input_cached": round(cost_cached, 8),
                     "input_new": round(cost_new, 8),
@@ -159,6 +212,15 @@ class TokenCostTracker:
             }
             self._append_jsonl(entry)
 
+        scopes = _USAGE_SCOPES.get()
+        if scopes:
+            with _USAGE_SCOPES_LOCK:
+                for scope in scopes:
+                    scope.input_cached += cached
+                    scope.input_new += new_input
+                    scope.output += output
+                    scope.cost_usd += total
+
         if os.getenv("TOKEN_COST_DB_ENABLED", "1").lower() in {"1", "true", "yes"}:
             run_id = RUN_LOG_ID.get()
             if run_id:
@@ -189,6 +251,33 @@ class TokenCostTracker:
                 logger.info(line)
             except Exception:
                 pass
+        return {
+            "input_cached": cached,
+            "input_new": new_input,
+            "output": output,
+            "cached_input_ratio": _cached_ratio(cached, new_input),
+            "cost_usd": round(total, 8),
+        }
+
+    def cache_report(self) -> Dict[str, Any]:
+        """Cached vs uncached input tokens, overall and per source."""
+        with self.lock:
+            sources = {
+                source: {
+                    **totals,
+                    "cost_usd": round(totals["cost_usd"], 8),
+                    "cached_input_ratio": _cached_ratio(totals["input_cached"], totals["input_new"]),
+                }
+                for source, totals in self.by_source.items()
+            }
+            return {
+                "input_cached": self.total_input_cached,
+                "input_new": self.total_input_new,
+                "output": self.total_output,
+                "cached_input_ratio": _cached_ratio(self.total_input_cached, self.total_input_new),
+                "cost_usd": round(self.total_cost_usd, 8),
+                "by_source": sources,
+            }
 
     def write_summary(self, logger: logging.Logger | None = None) -> None:
         with self.lock:
@@ -204,6 +293,7 @@ class TokenCostTracker:
                     "input_new": self.total_input_new,
                     "output": self.total_output,
                 },
+                "cached_input_ratio": _cached_ratio(self.total_input_cached, self.total_input_new),
                 "cost_usd_total": round(self.total_cost_usd, 8),
             }
             self._append_jsonl(entry)
@@ -1,7 +1,7 @@
 # vm_manager/aws_vm_manager.py
 
 import time
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
@@ -141,6 +141,33 @@ def terminate_instance(instance_id: str):
     ec2.terminate_instances(InstanceIds=[instance_id])
 
 
+def assign_instance_owner(instance_id: str, user_id: str) -> None:
+    """
+    Re-tag a pre-provisioned (warm pool) instance with the user it was handed to.
+    """
+    print(f"[aws_vm_manager] assign_instance_owner({instance_id}, user={user_id})")
+    ec2 = boto3.client("ec2", region_name=settings.AWS_REGION)
+    ec2.create_tags(Resources=[instance_id], Tags=[{"Key": "UserId", "Value": user_id}])
+
+
+def list_instances_for_owner(user_id: str) -> List[str]:
+    """
+    Ids of TakeBridge agent instances tagged with this UserId that are not terminated.
+    """
+    ec2 = boto3.client("ec2", region_name=settings.AWS_REGION)
+    filters = [
+        {"Name": "tag:Project", "Values": ["TakeBridge"]},
+        {"Name": "tag:UserId", "Values": [user_id]},
+        {"Name": "instance-state-name", "Values": ["pending", "running", "stopping", "stopped"]},
+    ]
+    instance_ids: List[str] = []
+    for page in ec2.get_paginator("describe_instances").paginate(Filters=filters):
+        for reservation in page.get("Reservations", []):
+            for inst in reservation.get("Instances", []):
+                instance_ids.append(inst["InstanceId"])
+    return instance_ids
+
+
 def stop_instance(instance_id: str, *, wait: bool = True) -> None:
     """
     Stop (power off) an EC2 instance.
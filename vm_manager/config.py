@@ -10,7 +10,7 @@ class Settings(BaseSettings):
     ORCHESTRATOR_TIMEOUT_SECONDS: int = 300
 
     # AWS + Agent VM config
-    VM_PROVIDER: str = "aws"  # aws | gcp
+    VM_PROVIDER: str = "aws"  # aws | gcp | fake (in-process, for local dev/tests)
     AWS_REGION: str = "us-west-2"
     AGENT_AMI_ID: str = "ami-xxxxxxxx"
     AGENT_INSTANCE_TYPE: str = "t3.large"
@@ -48,6 +48,14 @@ class Settings(BaseSettings):
     AGENT_CONTROLLER_HEALTH_PATH: str = "/health"
     VM_SKIP_CONTROLLER_HEALTHCHECK: bool = False
 
+    # Warm pool of pre-provisioned, unassigned agent VMs (0 disables the pool)
+    VM_WARM_POOL_SIZE: int = 0
+    VM_WARM_POOL_MAX_IDLE_SECONDS: int = 3600  # reap idle VMs older than this
+    VM_WARM_POOL_MAINTAIN_INTERVAL_SECONDS: int = 30  # health check + refill cadence
+    VM_WARM_POOL_BOOT_TIMEOUT_SECONDS: int = 600  # give up on a VM whose controller never comes up
+    VM_WARM_POOL_ID: str = ""  # tags this deployment's pool VMs; defaults to the host name
+    VM_WARM_POOL_LOCK_PATH: str = ""  # per-host ownership lock; defaults to <tmp>/takebridge-warm-pool.lock
+
     # VNC WebSocket configuration
     AGENT_VNC_SCHEME: str = "ws"  # ws or wss later
     AGENT_VNC_WS_PORT: int = 6080  # where websockify will listen
@@ -0,0 +1,118 @@
+# vm_manager/fake_vm_manager.py
+
+"""
+In-process VM provider for local development and tests (VM_PROVIDER=fake).
+
+Instances are plain records in a module-level registry; nothing is launched.
+Boot latency and failures can be simulated to exercise the warm pool.
+"""
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from vm_manager.config import settings
+
+_lock = threading.Lock()
+_counter = itertools.count(1)
+
+
+@dataclass
+class FakeInstance:
+    instance_id: str
+    user_id: str
+    controller_base_url: str
+    vnc_url: Optional[str]
+    state: str = "running"
+    healthy: bool = True
+    created_at: float = field(default_factory=time.monotonic)
+
+
+_instances: Dict[str, FakeInstance] = {}
+
+# Knobs tests can flip to simulate slow boots or a failing cloud API.
+boot_delay_seconds: float = 0.0
+fail_next_creates: int = 0
+
+
+def reset() -> None:
+    """Forget every fake instance and restore default behaviour."""
+    global boot_delay_seconds, fail_next_creates
+    with _lock:
+        _instances.clear()
+    boot_delay_seconds = 0.0
+    fail_next_creates = 0
+
+
+def create_agent_instance_for_user(user_id: str) -> Tuple[str, str, Optional[str]]:
+    global fail_next_creates
+    with _lock:
+        if fail_next_creates > 0:
+            fail_next_creates -= 1
+            raise RuntimeError("fake provider: simulated launch failure")
+        seq = next(_counter)
+    if boot_delay_seconds:
+        time.sleep(boot_delay_seconds)
+    instance_id = f"fake-{seq:06d}"
+    controller_base_url = f"http://fake-vm-{seq}.local:{settings.AGENT_CONTROLLER_PORT}"
+    vnc_url = f"http://fake-vm-{seq}.local:{settings.AGENT_GUACAMOLE_PORT}{settings.AGENT_GUACAMOLE_PATH}"
+    with _lock:
+        _instances[instance_id] = FakeInstance(
+            instance_id=instance_id,
+            user_id=user_id,
+            controller_base_url=controller_base_url,
+            vnc_url=vnc_url,
+        )
+    return instance_id, controller_base_url, vnc_url
+
+
+def terminate_instance(instance_id: str) -> None:
+    with _lock:
+        inst = _instances.get(instance_id)
+        if inst is not None:
+            inst.state = "terminated"
+            inst.healthy = False
+
+
+def stop_instance(instance_id: str, *, wait: bool = True) -> None:
+    with _lock:
+        inst = _instances.get(instance_id)
+        if inst is not None and inst.state != "terminated":
+            inst.state = "stopped"
+            inst.healthy = False
+
+
+def assign_instance_owner(instance_id: str, user_id: str) -> None:
+    with _lock:
+        inst = _instances.get(instance_id)
+        if inst is None:
+            raise RuntimeError(f"fake provider: unknown instance {instance_id}")
+        inst.user_id = user_id
+
+
+def list_instances_for_owner(user_id: str) -> List[str]:
+    with _lock:
+        return [k for k, v in _instances.items() if v.user_id == user_id and v.state != "terminated"]
+
+
+def instance_healthy(instance_id: str, controller_base_url: str) -> bool:
+    with _lock:
+        inst = _instances.get(instance_id)
+        return bool(inst and inst.state == "running" and inst.healthy)
+
+
+def set_healthy(instance_id: str, healthy: bool) -> None:
+    with _lock:
+        _instances[instance_id].healthy = healthy
+
+
+def get_instance(instance_id: str) -> Optional[FakeInstance]:
+    with _lock:
+        return _instances.get(instance_id)
+
+
+def running_instances() -> Dict[str, FakeInstance]:
+    with _lock:
+        return {k: v for k, v in _instances.items() if v.state == "running"}
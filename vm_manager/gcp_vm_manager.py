@@ -3,7 +3,7 @@
 import logging
 import time
 import uuid
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from google.api_core import exceptions as gcp_exceptions
 from google.cloud import compute_v1
@@ -372,6 +372,42 @@ def terminate_instance(instance_id: str) -> None:
     _wait_for_zone_operation(settings.GCP_PROJECT_ID, settings.GCP_ZONE, op.name)
 
 
+def assign_instance_owner(instance_id: str, user_id: str) -> None:
+    """
+    Relabel a pre-provisioned (warm pool) instance with the user it was handed to.
+    """
+    _init_cloud_logging_if_enabled()
+    logger.info("assign_instance_owner %s user=%s", instance_id, user_id)
+    client = compute_v1.InstancesClient()
+    inst = client.get(project=settings.GCP_PROJECT_ID, zone=settings.GCP_ZONE, instance=instance_id)
+    labels = dict(inst.labels or {})
+    labels["user"] = user_id
+    op = client.set_labels(
+        project=settings.GCP_PROJECT_ID,
+        zone=settings.GCP_ZONE,
+        instance=instance_id,
+        instances_set_labels_request_resource=compute_v1.InstancesSetLabelsRequest(
+            label_fingerprint=inst.label_fingerprint,
+            labels=labels,
+        ),
+    )
+    _wait_for_zone_operation(settings.GCP_PROJECT_ID, settings.GCP_ZONE, op.name)
+
+
+def list_instances_for_owner(user_id: str) -> List[str]:
+    """
+    Names of TakeBridge agent instances labelled with this user (running or stopped).
+    """
+    _init_cloud_logging_if_enabled()
+    client = compute_v1.InstancesClient()
+    request = compute_v1.ListInstancesRequest(
+        project=settings.GCP_PROJECT_ID,
+        zone=settings.GCP_ZONE,
+        filter=f'labels.project = "takebridge" AND labels.user = "{user_id}"',
+    )
+    return [inst.name for inst in client.list(request=request)]
+
+
 def stop_instance(instance_id: str, *, wait: bool = True) -> None:
     """
     Stop (power off) a GCP instance.
@@ -1,6 +1,6 @@
 # vm_manager/vm_provider.py
 
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from vm_manager.config import settings
 
@@ -17,6 +17,8 @@ def provider_location() -> str:
     provider = _provider()
     if provider == "gcp":
         return settings.GCP_ZONE
+    if provider == "fake":
+        return "local"
     return settings.AWS_REGION
 
 
@@ -40,6 +42,8 @@ def provider_spec() -> dict:
             spec["base_disk_mode"] = settings.GCP_BASE_DISK_MODE
             spec["base_disk_attach_strategy"] = settings.GCP_BASE_DISK_ATTACH_STRATEGY
         return spec
+    if provider == "fake":
+        return {"image": "fake"}
     return {
         "instance_type": settings.AGENT_INSTANCE_TYPE,
         "region": settings.AWS_REGION,
@@ -56,6 +60,10 @@ def create_agent_instance_for_user(user_id: str) -> Tuple[str, str, Optional[str
     if provider == "gcp":
         from vm_manager.gcp_vm_manager import create_agent_instance_for_user as _create
 
+        return _create(user_id)
+    if provider == "fake":
+        from vm_manager.fake_vm_manager import create_agent_instance_for_user as _create
+
         return _create(user_id)
     raise RuntimeError(f"Unsupported VM_PROVIDER '{provider}'")
 
@@ -69,6 +77,10 @@ def terminate_instance(instance_id: str) -> None:
     if provider == "gcp":
         from vm_manager.gcp_vm_manager import terminate_instance as _terminate
 
+        return _terminate(instance_id)
+    if provider == "fake":
+        from vm_manager.fake_vm_manager import terminate_instance as _terminate
+
         return _terminate(instance_id)
     raise RuntimeError(f"Unsupported VM_PROVIDER '{provider}'")
 
@@ -82,5 +94,82 @@ def stop_instance(instance_id: str, *, wait: bool = True) -> None:
     if provider == "gcp":
         from vm_manager.gcp_vm_manager import stop_instance as _stop
 
+        return _stop(instance_id, wait=wait)
+    if provider == "fake":
+        from vm_manager.fake_vm_manager import stop_instance as _stop
+
         return _stop(instance_id, wait=wait)
     raise RuntimeError(f"Unsupported VM_PROVIDER '{provider}'")
+
+
+def assign_instance_owner(instance_id: str, user_id: str) -> None:
+    """Record the user a pre-provisioned instance was handed to (tags/labels)."""
+    provider = _provider()
+    if provider == "aws":
+        from vm_manager.aws_vm_manager import assign_instance_owner as _assign
+
+        return _assign(instance_id, user_id)
+    if provider == "gcp":
+        from vm_manager.gcp_vm_manager import assign_instance_owner as _assign
+
+        return _assign(instance_id, user_id)
+    if provider == "fake":
+        from vm_manager.fake_vm_manager import assign_instance_owner as _assign
+
+        return _assign(instance_id, user_id)
+    raise RuntimeError(f"Unsupported VM_PROVIDER '{provider}'")
+
+
+def list_instances_for_owner(user_id: str) -> List[str]:
+    """Ids of live agent instances currently tagged/labelled with this owner."""
+    provider = _provider()
+    if provider == "aws":
+        from vm_manager.aws_vm_manager import list_instances_for_owner as _list
+
+        return _list(user_id)
+    if provider == "gcp":
+        from vm_manager.gcp_vm_manager import list_instances_for_owner as _list
+
+        return _list(user_id)
+    if provider == "fake":
+        from vm_manager.fake_vm_manager import list_instances_for_owner as _list
+
+        return _list(user_id)
+    raise RuntimeError(f"Unsupported VM_PROVIDER '{provider}'")
+
+
+def instance_healthy(instance_id: str, controller_base_url: str, *, timeout: float = 5.0) -> bool:
+    """Return True when the instance's VM controller answers its health check."""
+    provider = _provider()
+    if provider == "fake":
+        from vm_manager.fake_vm_manager import instance_healthy as _healthy
+
+        return _healthy(instance_id, controller_base_url)
+    if settings.VM_SKIP_CONTROLLER_HEALTHCHECK:
+        return True
+    import requests
+
+    try:
+        resp = requests.get(
+            f"{controller_base_url.rstrip('/')}{settings.AGENT_CONTROLLER_HEALTH_PATH}",
+            timeout=timeout,
+        )
+    except requests.RequestException:
+        return False
+    return resp.status_code == 200
+
+
+def acquire_agent_instance_for_user(user_id: str) -> Tuple[str, str, Optional[str]]:
+    """
+    Hand the user a healthy instance from the warm pool, or cold-boot one.
+
+    Same return shape as create_agent_instance_for_user.
+    """
+    from vm_manager.warm_pool import get_warm_pool
+
+    pool = get_warm_pool()
+    if pool is not None:
+        acquired = pool.acquire(user_id)
+        if acquired is not None:
+            return acquired
+    return create_agent_instance_for_user(user_id)
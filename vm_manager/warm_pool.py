@@ -0,0 +1,382 @@
+# vm_manager/warm_pool.py
+
+"""
+Warm pool of pre-provisioned, unassigned agent VMs.
+
+Cold-booting an agent VM dominates run start latency. The pool keeps
+VM_WARM_POOL_SIZE healthy instances per (provider, location, image) so a run
+can be handed one immediately:
+
+  * acquire() pops an idle instance under a lock (so two runs never share a
+    VM), re-checks its controller, tags it with the user and kicks off a refill;
+  * replenish() launches the deficit in background threads;
+  * reap() terminates instances that sat idle too long or stopped answering;
+  * reap_orphans() terminates instances still tagged for this pool from a
+    previous process (crash, or launches that outlived the shutdown drain).
+
+Pool instances are tagged with an owner derived from VM_WARM_POOL_ID
+(default: the host name), so hosts and deployments sharing a cloud account
+only ever list and reap their own. Within a host, one process owns the pool:
+get_warm_pool() takes an exclusive lock on VM_WARM_POOL_LOCK_PATH, and
+processes that lose the race cold-boot.
+
+All provider calls go through vm_provider, so VM_PROVIDER=fake exercises the
+same code paths in-process.
+"""
+
+import logging
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import IO, Deque, Dict, List, Optional, Tuple
+
+try:
+    import fcntl  # type: ignore
+except Exception:  # pragma: no cover - Windows
+    fcntl = None
+
+from vm_manager import vm_provider
+from vm_manager.config import settings
+
+logger = logging.getLogger("takebridge.warm_pool")
+
+# Prefix of the owner recorded on pool instances until they are assigned.
+WARM_POOL_OWNER_PREFIX = "warm-pool"
+
+PoolKey = Tuple[str, str, str]
+
+
+def pool_owner() -> str:
+    """
+    Owner tag for this deployment's pool instances: warm-pool-<pool id>.
+
+    Kept to lowercase letters, digits, '-' and '_' (63 chars max) so it is a
+    valid GCP label value as well as an EC2 tag.
+    """
+    raw = settings.VM_WARM_POOL_ID or socket.gethostname() or "default"
+    pool_id = re.sub(r"[^a-z0-9_-]+", "-", raw.strip().lower()).strip("-") or "default"
+    return f"{WARM_POOL_OWNER_PREFIX}-{pool_id}"[:63]
+
+
+def pool_key() -> PoolKey:
+    """(provider, location, image) bucket for instances launched with current settings."""
+    spec = vm_provider.provider_spec()
+    image = str(spec.get("machine_image") or spec.get("image") or spec.get("ami_id") or "")
+    return vm_provider.current_provider(), vm_provider.provider_location(), image
+
+
+@dataclass
+class PooledInstance:
+    instance_id: str
+    controller_base_url: str
+    vnc_url: Optional[str]
+    key: PoolKey
+    ready_at: float = field(default_factory=time.monotonic)
+
+
+class WarmPool:
+    def __init__(
+        self,
+        target_size: Optional[int] = None,
+        *,
+        max_idle_seconds: Optional[float] = None,
+        boot_timeout_seconds: Optional[float] = None,
+        health_poll_seconds: float = 5.0,
+        owner: Optional[str] = None,
+    ) -> None:
+        self.owner = owner or pool_owner()
+        self.target_size = settings.VM_WARM_POOL_SIZE if target_size is None else target_size
+        self.max_idle_seconds = (
+            settings.VM_WARM_POOL_MAX_IDLE_SECONDS if max_idle_seconds is None else max_idle_seconds
+        )
+        self.boot_timeout_seconds = (
+            settings.VM_WARM_POOL_BOOT_TIMEOUT_SECONDS if boot_timeout_seconds is None else boot_timeout_seconds
+        )
+        self.health_poll_seconds = health_poll_seconds
+        self._lock = threading.Lock()
+        self._idle: Dict[PoolKey, Deque[PooledInstance]] = {}
+        self._pending: Dict[PoolKey, int] = {}
+        self._launchers: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._maintainer: Optional[threading.Thread] = None
+        self._stats = {"hits": 0, "misses": 0, "launched": 0, "launch_failures": 0, "reaped": 0}
+
+    # ------------------------------------------------------------------ acquire
+
+    def acquire(self, user_id: str) -> Optional[Tuple[str, str, Optional[str]]]:
+        """
+        Hand out a healthy idle instance for the current pool key.
+
+        Returns (instance_id, controller_base_url, vnc_url), or None when the
+        pool is empty and the caller should cold-boot.
+        """
+        key = pool_key()
+        while True:
+            with self._lock:
+                bucket = self._idle.get(key)
+                inst = bucket.popleft() if bucket else None
+                if inst is None:
+                    self._stats["misses"] += 1
+            if inst is None:
+                self.replenish()
+                return None
+            # The instance is ours alone now; slow checks happen outside the lock.
+            if not vm_provider.instance_healthy(inst.instance_id, inst.controller_base_url):
+                logger.warning("[warm-pool] discarding unhealthy instance %s", inst.instance_id)
+                self._discard(inst)
+                continue
+            try:
+                vm_provider.assign_instance_owner(inst.instance_id, user_id)
+            except Exception as exc:
+                logger.warning("[warm-pool] failed to assign %s to %s: %s", inst.instance_id, user_id, exc)
+                self._discard(inst)
+                continue
+            with self._lock:
+                self._stats["hits"] += 1
+            logger.info("[warm-pool] assigned %s to user %s", inst.instance_id, user_id)
+            self.replenish()
+            return inst.instance_id, inst.controller_base_url, inst.vnc_url
+
+    # ---------------------------------------------------------------- replenish
+
+    def replenish(self) -> int:
+        """Launch enough instances in the background to reach the target size."""
+        key = pool_key()
+        with self._lock:
+            have = len(self._idle.get(key) or ()) + self._pending.get(key, 0)
+            deficit = max(0, self.target_size - have)
+            if deficit:
+                self._pending[key] = self._pending.get(key, 0) + deficit
+            self._launchers = [t for t in self._launchers if t.is_alive()]
+            for _ in range(deficit):
+                thread = threading.Thread(target=self._launch, args=(key,), name="warm-pool-launch", daemon=True)
+                self._launchers.append(thread)
+                thread.start()
+        return deficit
+
+    def _launch(self, key: PoolKey) -> None:
+        inst: Optional[PooledInstance] = None
+        try:
+            instance_id, controller_base_url, vnc_url = vm_provider.create_agent_instance_for_user(self.owner)
+            inst = PooledInstance(instance_id, controller_base_url, vnc_url, key)
+            if not self._wait_healthy(inst):
+                logger.warning("[warm-pool] instance %s never became healthy; terminating", instance_id)
+                self._discard(inst)
+                inst = None
+        except Exception as exc:
+            logger.warning("[warm-pool] launch failed for %s: %s", key, exc)
+        finally:
+            with self._lock:
+                self._pending[key] = max(0, self._pending.get(key, 0) - 1)
+                if inst is None:
+                    self._stats["launch_failures"] += 1
+                else:
+                    inst.ready_at = time.monotonic()
+                    self._idle.setdefault(key, deque()).append(inst)
+                    self._stats["launched"] += 1
+
+    def _wait_healthy(self, inst: PooledInstance) -> bool:
+        deadline = time.monotonic() + self.boot_timeout_seconds
+        while not self._stop.is_set():
+            if vm_provider.instance_healthy(inst.instance_id, inst.controller_base_url):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            self._stop.wait(self.health_poll_seconds)
+        return False
+
+    def wait_for_launches(self, timeout: Optional[float] = None) -> None:
+        """Block until in-flight launches finish (tests and graceful shutdown)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            threads = list(self._launchers)
+        for thread in threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+
+    # --------------------------------------------------------------------- reap
+
+    def reap(self) -> List[str]:
+        """Terminate idle instances past max idle age or failing health checks."""
+        now = time.monotonic()
+        expired: List[PooledInstance] = []
+        with self._lock:
+            for bucket in self._idle.values():
+                for inst in list(bucket):
+                    if now - inst.ready_at >= self.max_idle_seconds:
+                        bucket.remove(inst)
+                        expired.append(inst)
+            candidates = [inst for bucket in self._idle.values() for inst in bucket]
+
+        unhealthy = [
+            inst
+            for inst in candidates
+            if not vm_provider.instance_healthy(inst.instance_id, inst.controller_base_url)
+        ]
+        with self._lock:
+            # Only reap what is still idle; an acquire may have claimed it meanwhile.
+            for inst in unhealthy:
+                bucket = self._idle.get(inst.key)
+                if bucket is not None and inst in bucket:
+                    bucket.remove(inst)
+                    expired.append(inst)
+
+        for inst in expired:
+            self._discard(inst)
+        if expired:
+            logger.info("[warm-pool] reaped %s instance(s)", len(expired))
+        return [inst.instance_id for inst in expired]
+
+    def reap_orphans(self) -> List[str]:
+        """
+        Terminate provider instances tagged with this pool's owner that it does not hold.
+
+        Run before the pool launches anything: an instance mid-launch is already
+        tagged but not yet tracked here.
+        """
+        with self._lock:
+            known = {inst.instance_id for bucket in self._idle.values() for inst in bucket}
+        orphans = [i for i in vm_provider.list_instances_for_owner(self.owner) if i not in known]
+        for instance_id in orphans:
+            try:
+                vm_provider.terminate_instance(instance_id)
+            except Exception as exc:
+                logger.warning("[warm-pool] failed to terminate orphan %s: %s", instance_id, exc)
+        if orphans:
+            with self._lock:
+                self._stats["reaped"] += len(orphans)
+            logger.info("[warm-pool] reaped %s orphaned instance(s)", len(orphans))
+        return orphans
+
+    def _discard(self, inst: PooledInstance) -> None:
+        with self._lock:
+            self._stats["reaped"] += 1
+        try:
+            vm_provider.terminate_instance(inst.instance_id)
+        except Exception as exc:
+            logger.warning("[warm-pool] failed to terminate %s: %s", inst.instance_id, exc)
+
+    # ------------------------------------------------------------- maintenance
+
+    def maintain(self) -> None:
+        self.reap()
+        self.replenish()
+
+    def start(self, interval_seconds: Optional[float] = None) -> None:
+        """Fill the pool and keep it topped up/reaped on a background thread."""
+        if self._maintainer is not None and self._maintainer.is_alive():
+            return
+        interval = settings.VM_WARM_POOL_MAINTAIN_INTERVAL_SECONDS if interval_seconds is None else interval_seconds
+        self._stop.clear()
+        try:
+            self.reap_orphans()
+        except Exception:
+            logger.exception("[warm-pool] orphan reap failed")
+
+        def _loop() -> None:
+            while not self._stop.is_set():
+                try:
+                    self.maintain()
+                except Exception:
+                    logger.exception("[warm-pool] maintenance pass failed")
+                self._stop.wait(interval)
+
+        self._maintainer = threading.Thread(target=_loop, name="warm-pool-maintain", daemon=True)
+        self._maintainer.start()
+        logger.info("[warm-pool] started (target=%s per key, key=%s)", self.target_size, pool_key())
+
+    def stop(self, *, drain: bool = False) -> None:
+        """Stop maintenance; with drain=True also terminate every idle instance."""
+        self._stop.set()
+        if self._maintainer is not None:
+            self._maintainer.join(timeout=5)
+            self._maintainer = None
+        if drain:
+            self.wait_for_launches(timeout=5)
+            with self._lock:
+                idle = [inst for bucket in self._idle.values() for inst in bucket]
+                self._idle.clear()
+            for inst in idle:
+                self._discard(inst)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                **self._stats,
+                "idle": {"/".join(k): len(v) for k, v in self._idle.items()},
+                "pending": {"/".join(k): n for k, n in self._pending.items() if n},
+            }
+
+
+_pool: Optional[WarmPool] = None
+_pool_lock = threading.Lock()
+_owner_lock: Optional[IO[str]] = None
+
+
+def _lock_path() -> str:
+    return settings.VM_WARM_POOL_LOCK_PATH or os.path.join(tempfile.gettempdir(), "takebridge-warm-pool.lock")
+
+
+def _claim_ownership() -> bool:
+    """Take the per-host pool lock without blocking; False when another process holds it."""
+    global _owner_lock
+    if _owner_lock is not None:
+        return True
+    if fcntl is None:
+        return True
+    fp = open(_lock_path(), "a")
+    try:
+        fcntl.flock(fp.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        fp.close()
+        return False
+    _owner_lock = fp
+    return True
+
+
+def _release_ownership() -> None:
+    global _owner_lock
+    fp, _owner_lock = _owner_lock, None
+    if fp is not None:
+        try:
+            fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+        finally:
+            fp.close()
+
+
+def get_warm_pool() -> Optional[WarmPool]:
+    """Process-wide pool, or None when VM_WARM_POOL_SIZE is 0 or another process owns it."""
+    global _pool
+    if settings.VM_WARM_POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            if not _claim_ownership():
+                return None
+            _pool = WarmPool()
+        return _pool
+
+
+def start_warm_pool() -> Optional[WarmPool]:
+    pool = get_warm_pool()
+    if pool is not None:
+        pool.start()
+    elif settings.VM_WARM_POOL_SIZE > 0:
+        logger.info("[warm-pool] another process owns the pool (%s); not starting", _lock_path())
+    return pool
+
+
+def stop_warm_pool(*, drain: bool = False) -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+        try:
+            if pool is not None:
+                pool.stop(drain=drain)
+        finally:
+            _release_ownership()